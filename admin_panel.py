@@ -5,6 +5,8 @@ Verantwortlichkeiten:
 - Rendern der verschiedenen Admin-Tabs (Analyse, Export, System).
 - Bereitstellung der Item-Analyse und des Leaderboards.
 """
+import functools
+import io
 import secrets
 import string
 
@@ -14,6 +16,7 @@ from pathlib import Path
 
 from config import (
     AppConfig,
+    get_app_config,
     QuestionSet,
     load_questions,
     list_question_files,
@@ -23,7 +26,6 @@ from config import (
 )
 from i18n.context import t as translate_ui
 from helpers.chart_theme import CHART_AXIS_TEXT
-from pdf_export import generate_mini_glossary_pdf
 from user_question_sets import (
     pretty_label_from_identifier_string,
     list_user_question_sets,
@@ -32,34 +34,35 @@ from user_question_sets import (
 )
 from helpers.text import format_decimal_locale, get_user_id_hash
 from database import (
+    ANSWER_LOG_COLUMNS,
     add_user,
     delete_user_results_for_qset,
-    get_all_answer_logs,
     get_all_feedback,
+    get_answer_counts_by_questions_file,
     get_all_logs_for_leaderboard,
     get_used_pseudonyms,
     has_recovery_secret_for_pseudonym,
+    iter_answer_log_batches,
     delete_reserved_pseudonym,
     delete_reserved_pseudonyms,
     reset_all_test_data,
     set_recovery_secret,
 )
+import lazy_imports
+import export_cache
+
+generate_mini_glossary_pdf = export_cache.cached_export(
+    "mini_glossary", lazy_imports.lazy_function("pdf_export", "generate_mini_glossary_pdf")
+)
+
+
 def render_admin_panel(app_config: AppConfig, questions: QuestionSet):
     """Rendert das komplette Admin-Dashboard mit Tabs."""
     st.title(translate_ui("admin.dashboard_title"))
 
-    # Lade die Daten direkt aus der Datenbank
-    logs = get_all_answer_logs()
-    if not logs:
-        df_all_logs = pd.DataFrame()
-    else:
-        df_all_logs = pd.DataFrame(logs)
-    
-    # Filtere Logs auf das aktuell ausgewählte Fragenset für Analyse, Export etc.
+    # Antwort-Logs werden nicht mehr vorab geladen: jeder Tab fragt nur die
+    # Daten ab, die er braucht (gefiltert in SQL, in Batches).
     q_file = st.session_state.get("selected_questions_file")
-    df_filtered_logs = df_all_logs
-    if q_file and "questions_file" in df_all_logs.columns:
-        df_filtered_logs = df_all_logs[df_all_logs["questions_file"] == q_file].copy()
 
     tabs = st.tabs(
         [
@@ -76,18 +79,18 @@ def render_admin_panel(app_config: AppConfig, questions: QuestionSet):
     )
 
     with tabs[0]:
-        # Das Leaderboard soll alle Fragensets anzeigen, daher werden alle Logs übergeben
-        render_leaderboard_tab(df_all_logs, app_config)
+        # Das Leaderboard soll alle Fragensets anzeigen
+        render_leaderboard_tab(app_config)
     with tabs[1]:
-        render_analysis_tab(df_filtered_logs, questions)
+        render_analysis_tab(questions)
     with tabs[2]:
         render_feedback_tab()  # Diese Funktion holt sich ihre Daten jetzt selbst
     with tabs[3]:
-        render_export_tab(df_filtered_logs, app_config)
+        render_export_tab(q_file, app_config)
     with tabs[4]:
         render_login_generator_tab(app_config)
     with tabs[5]:
-        render_system_tab(app_config, df_filtered_logs)
+        render_system_tab(app_config)
     with tabs[6]:
         render_mini_glossary_tab()
     with tabs[7]:
@@ -96,6 +99,20 @@ def render_admin_panel(app_config: AppConfig, questions: QuestionSet):
         render_audit_log_tab()
 
 
+def load_answer_log_frame(**filters) -> pd.DataFrame:
+    """Lädt die Antwort-Logs gefiltert (siehe `iter_answer_log_batches`) als DataFrame.
+
+    Die Batches werden einzeln in spaltenorientierte Frames überführt und erst
+    am Ende zusammengefügt; eine Liste aller Zeilen als Dicts entsteht nicht.
+    """
+    frames = [pd.DataFrame(batch, columns=ANSWER_LOG_COLUMNS) for batch in iter_answer_log_batches(**filters)]
+    if not frames:
+        return pd.DataFrame(columns=ANSWER_LOG_COLUMNS)
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, ignore_index=True)
+
+
 def render_mini_glossary_tab():
     """Ermöglicht den Export der Mini-Glossare als PDF."""
     st.header(translate_ui("admin.glossary_header"))
@@ -433,7 +450,7 @@ def render_question_sets_tab():
                         st.warning(translate_ui("admin.questionsets.delete_no_target", default="Bitte ein Fragenset auswählen."))
                         return
                     admin_key_ok = True
-                    cfg = AppConfig()
+                    cfg = get_app_config()
                     if check_admin_key is not None and getattr(cfg, "admin_key", None):
                         admin_key_ok = check_admin_key(reauth_key, cfg)
                     if not admin_key_ok:
@@ -500,12 +517,12 @@ def render_question_sets_tab():
                             st.rerun()
 
 
-def render_leaderboard_tab(df_all: pd.DataFrame, app_config: AppConfig):
+def render_leaderboard_tab(app_config: AppConfig):
     """Rendert den Leaderboard-Tab."""
     st.header(translate_ui("admin.highscores_by_questionset_header"))
 
-    # Hole alle einzigartigen Fragensets aus den Logs
-    all_question_files = sorted(df_all["questions_file"].unique()) if not df_all.empty and "questions_file" in df_all.columns else []
+    # Alle Fragensets, zu denen Antworten vorliegen
+    all_question_files = sorted(get_answer_counts_by_questions_file())
 
     if not all_question_files:
         st.info(translate_ui("admin.messages.no_answers_recorded"))
@@ -652,27 +669,14 @@ def render_leaderboard_tab(df_all: pd.DataFrame, app_config: AppConfig):
         st.divider()
 
 
-def render_analysis_tab(df: pd.DataFrame, questions: QuestionSet):
+def render_analysis_tab(questions: QuestionSet):
     """Rendert den Item-Analyse-Tab."""
     st.header(translate_ui("admin.item_analysis_header"))
     
-    # Hole alle Fragensets mit ausreichend Daten (mindestens 1 Antwort)
-    from database import get_all_answer_logs
-    all_logs = get_all_answer_logs()
-    
-    if not all_logs:
-        st.info(translate_ui("admin.messages.no_answers_for_analysis"))
-        return
-    
-    df_all = pd.DataFrame(all_logs)
-    
-    # Zähle Antworten pro Fragenset
-    if "questions_file" in df_all.columns:
-        qset_counts = df_all["questions_file"].value_counts()
-        available_qsets = [qf for qf in qset_counts.index if qf and qset_counts[qf] >= 1]
-    else:
-        st.info(translate_ui("admin.messages.no_answers_for_analysis"))
-        return
+    # Hole alle Fragensets mit ausreichend Daten (mindestens 1 Antwort),
+    # absteigend nach Anzahl der Antworten
+    qset_counts = get_answer_counts_by_questions_file()
+    available_qsets = [qf for qf, count in qset_counts.items() if qf and count >= 1]
     
     if not available_qsets:
         st.info(translate_ui("admin.messages.no_answers_for_analysis"))
@@ -707,8 +711,8 @@ def render_analysis_tab(df: pd.DataFrame, questions: QuestionSet):
         key="analysis_qset_selector"
     )
     
-    # Filtere Daten für ausgewähltes Fragenset
-    df = df_all[df_all["questions_file"] == selected_qset].copy()
+    # Lade nur die Antworten des ausgewählten Fragensets
+    df = load_answer_log_frame(questions_file=selected_qset)
     
     # Lade die passenden Fragen
     from config import load_questions
@@ -1068,7 +1072,7 @@ def render_feedback_tab():
                             st.error(translate_ui("admin.messages.delete_single_feedback_error"))
 
 
-def render_export_tab(df: pd.DataFrame, app_config: AppConfig = None):
+def render_export_tab(q_file: str | None = None, app_config: AppConfig = None):
     """Rendert den Export-Tab."""
     st.header(translate_ui("admin.data_export_header"))
 
@@ -1082,33 +1086,33 @@ def render_export_tab(df: pd.DataFrame, app_config: AppConfig = None):
     try:
         from pathlib import Path
         from config import list_question_files, USER_QUESTION_PREFIX, get_package_dir
-        from user_question_sets import list_user_question_sets, resolve_question_path, format_user_label
+        from user_question_sets import resolve_question_path
+        # Titel/Labels kommen aus dem Metadaten-Katalog, ohne die Sets zu laden.
+        from question_catalog import get_user_entries
     except Exception:
         list_question_files = None  # type: ignore[assignment]
-        list_user_question_sets = None  # type: ignore[assignment]
+        get_user_entries = None  # type: ignore[assignment]
         resolve_question_path = None  # type: ignore[assignment]
-        format_user_label = None  # type: ignore[assignment]
         USER_QUESTION_PREFIX = "user::"  # type: ignore[assignment]
         get_package_dir = None  # type: ignore[assignment]
 
+    user_set_map: dict[str, object] = {}
+    try:
+        if get_user_entries:
+            user_set_map = {entry.identifier: entry for entry in get_user_entries()}
+    except Exception:
+        pass
+
     def _format_set_label(identifier: str) -> str:
-        if identifier.startswith(USER_QUESTION_PREFIX) and format_user_label:
-            try:
-                info = next((i for i in list_user_question_sets() if i.identifier == identifier), None)
-                if info:
-                    return f"👤 {format_user_label(info)}"
-            except Exception:
-                pass
+        if identifier.startswith(USER_QUESTION_PREFIX):
+            entry = user_set_map.get(identifier)
+            if entry is not None and getattr(entry, "label", None):
+                return f"👤 {entry.label}"
         return identifier.replace(USER_QUESTION_PREFIX, "").replace("questions_", "").replace(".json", "").replace("_", " ")
 
     def _friendly_user_qset_download_name(identifier: str, suffix: str, info_lookup: dict[str, object]) -> str:
-        label = None
-        try:
-            info = info_lookup.get(identifier)
-            if info and format_user_label:
-                label = format_user_label(info)
-        except Exception:
-            label = None
+        entry = info_lookup.get(identifier)
+        label = getattr(entry, "label", None) if entry is not None else None
 
         if not label:
             label = "Fragenset"
@@ -1168,14 +1172,7 @@ def render_export_tab(df: pd.DataFrame, app_config: AppConfig = None):
             available_files.extend(list_question_files())
     except Exception:
         pass
-    user_set_map: dict[str, object] = {}
-    try:
-        if list_user_question_sets:
-            user_sets = list_user_question_sets()
-            user_set_map = {info.identifier: info for info in user_sets}
-            available_files = [info.identifier for info in user_sets] + available_files
-    except Exception:
-        pass
+    available_files = list(user_set_map) + available_files
 
     if available_files:
         selected_export = st.selectbox(
@@ -1235,19 +1232,34 @@ def render_export_tab(df: pd.DataFrame, app_config: AppConfig = None):
         st.info(translate_ui("admin.export.no_question_sets", default="Keine Fragensets gefunden."))
 
     st.subheader(translate_ui("admin.export.csv_header", default="Antwort-Log (CSV)"))
-    if df.empty:
+    answer_counts = get_answer_counts_by_questions_file()
+    available = answer_counts.get(q_file, 0) if q_file else sum(answer_counts.values())
+    if available == 0:
         st.info(translate_ui("admin.messages.no_data_to_export"))
         return
 
-    csv_data = df.to_csv(index=False).encode("utf-8")
+    # Die CSV entsteht erst beim Klick (Streamlit ruft `data` dann auf), nicht
+    # bei jedem Rerun des Admin-Panels.
     st.download_button(
         label=translate_ui("admin.export.download_csv", default="⬇️ Antwort-Log herunterladen (CSV)"),
-        data=csv_data,
+        data=functools.partial(build_answer_log_csv, q_file or None),
         file_name="mc_test_answers.csv",
         mime="text/csv",
     )
 
 
+def build_answer_log_csv(questions_file: str | None = None) -> io.BytesIO:
+    """Schreibt das Antwort-Log batchweise als CSV (UTF-8), ohne es als DataFrame zu halten."""
+    buffer = io.BytesIO()
+    exported_rows = 0
+    for batch in iter_answer_log_batches(questions_file=questions_file):
+        frame = pd.DataFrame(batch, columns=ANSWER_LOG_COLUMNS)
+        buffer.write(frame.to_csv(index=False, header=exported_rows == 0).encode("utf-8"))
+        exported_rows += len(frame)
+    buffer.seek(0)
+    return buffer
+
+
 def _generate_secret(length: int) -> str:
     """Erzeugt ein zufälliges Secret aus Buchstaben und Ziffern."""
     alphabet = string.ascii_letters + string.digits
@@ -1569,7 +1581,7 @@ def render_login_generator_tab(app_config: AppConfig) -> None:
         )
 
 
-def render_system_tab(app_config: AppConfig, df: pd.DataFrame):
+def render_system_tab(app_config: AppConfig):
     """Rendert den System-Tab für Konfiguration und Statistiken."""
     st.header(translate_ui("admin.system_settings_header"))
 
@@ -1585,8 +1597,7 @@ def render_system_tab(app_config: AppConfig, df: pd.DataFrame):
         horizontal=True,
     )
     if new_mode != app_config.scoring_mode:
-        app_config.scoring_mode = new_mode
-        app_config.save()
+        app_config.copy(scoring_mode=new_mode).save()
         st.success(translate_ui("admin.system.scoring_saved", default="Scoring-Modus gespeichert. Wird bei der nächsten Antwort aktiv."))
         st.rerun()
 
@@ -1670,6 +1681,120 @@ def render_system_tab(app_config: AppConfig, df: pd.DataFrame):
                 f"{completion_str} %",
                 help=translate_ui("admin.system.stats.completion_rate_help", default="Prozentsatz der Tests, die vollständig beendet wurden")
             )
+        with col2:
+            from database import get_leaderboard_cache_stats
+            cache_stats = get_leaderboard_cache_stats()
+            hit_rate_str = format_decimal_locale(cache_stats['hit_rate'] * 100, 1)
+            st.metric(
+                translate_ui("admin.system.stats.leaderboard_cache", default="Leaderboard-Cache (Treffer / Fehlschläge)"),
+                f"{cache_stats['hits']} / {cache_stats['misses']}",
+                help=translate_ui(
+                    "admin.system.stats.leaderboard_cache_help",
+                    default="Trefferquote seit dem Start: {rate} %. Zwischengespeicherte Leaderboards: {keys}.",
+                ).format(rate=hit_rate_str, keys=cache_stats['cached_keys']),
+            )
+
+        from database import get_db_pool_stats
+        pool_stats = get_db_pool_stats()
+        with st.expander(translate_ui("admin.system.db_pool.header", default="🔌 Datenbank-Verbindungen")):
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric(
+                    translate_ui("admin.system.db_pool.in_use", default="Leseverbindungen in Benutzung"),
+                    f"{pool_stats['in_use']} / {pool_stats['size']}",
+                )
+            with col2:
+                wait_ms_str = format_decimal_locale(pool_stats['wait_seconds_max'] * 1000, 1)
+                st.metric(
+                    translate_ui("admin.system.db_pool.max_wait", default="Max. Wartezeit"),
+                    f"{wait_ms_str} ms",
+                )
+            with col3:
+                st.metric(
+                    translate_ui("admin.system.db_pool.lock_retries", default="Lock-Wiederholungen"),
+                    pool_stats['lock_retries'],
+                )
+            with col4:
+                st.metric(
+                    translate_ui("admin.system.db_pool.fallbacks", default="Ausweich auf Schreibverbindung"),
+                    pool_stats['fallbacks'],
+                )
+
+        from pdf_export import get_formula_cache_stats
+        formula_stats = get_formula_cache_stats()
+        with st.expander(translate_ui("admin.system.formula_cache.header", default="🧮 Formel-Cache")):
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                size_mb_str = format_decimal_locale(formula_stats['bytes'] / (1024 * 1024), 1)
+                st.metric(
+                    translate_ui("admin.system.formula_cache.entries", default="Gecachte Formeln"),
+                    formula_stats['files'],
+                    help=f"{size_mb_str} MiB",
+                )
+            with col2:
+                hit_rate_str = format_decimal_locale(formula_stats['hit_rate'] * 100, 1)
+                st.metric(
+                    translate_ui("admin.system.formula_cache.hits_misses", default="Treffer / Fehlschläge"),
+                    f"{formula_stats['hits']} / {formula_stats['misses']}",
+                    help=f"{hit_rate_str} %",
+                )
+            with col3:
+                st.metric(
+                    translate_ui("admin.system.formula_cache.evictions", default="Verdrängt"),
+                    formula_stats['evictions'],
+                )
+
+        export_stats = export_cache.get_export_cache_stats()
+        with st.expander(translate_ui("admin.system.export_cache.header", default="📦 Export-Cache")):
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                size_mb_str = format_decimal_locale(export_stats['bytes'] / (1024 * 1024), 1)
+                st.metric(
+                    translate_ui("admin.system.export_cache.entries", default="Gespeicherte Exporte"),
+                    export_stats['files'],
+                    help=f"{size_mb_str} MiB",
+                )
+            with col2:
+                hit_rate_str = format_decimal_locale(export_stats['hit_rate'] * 100, 1)
+                st.metric(
+                    translate_ui("admin.system.export_cache.hits_misses", default="Treffer / Fehlschläge"),
+                    f"{export_stats['hits']} / {export_stats['misses']}",
+                    help=f"{hit_rate_str} %",
+                )
+            with col3:
+                st.metric(
+                    translate_ui("admin.system.export_cache.evictions", default="Verdrängt"),
+                    export_stats['evictions'],
+                )
+            fragment_stats = export_cache.get_fragment_cache_stats()
+            st.caption(
+                translate_ui(
+                    "admin.system.export_cache.fragments",
+                    default="HTML-Bausteine: {entries} gespeichert, {hits} Treffer / {misses} Fehlschläge",
+                ).format(entries=fragment_stats['files'], hits=fragment_stats['hits'], misses=fragment_stats['misses'])
+            )
+
+        startup = lazy_imports.startup_report()
+        lazy_loads = lazy_imports.lazy_load_report()
+        with st.expander(translate_ui("admin.system.startup.header", default="⏱️ Start & Importe")):
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric(
+                    translate_ui("admin.system.startup.imports", default="Importe beim Start"),
+                    f"{format_decimal_locale(startup['imports'], 0)} ms" if 'imports' in startup else "–",
+                )
+            with col2:
+                st.metric(
+                    translate_ui("admin.system.startup.first_run", default="Erster Durchlauf"),
+                    f"{format_decimal_locale(startup['first_run'], 0)} ms" if 'first_run' in startup else "–",
+                )
+            st.caption(translate_ui("admin.system.startup.lazy_loads", default="Nachgeladene Module"))
+            if lazy_loads:
+                st.markdown("\n".join(
+                    f"- `{name}`: {format_decimal_locale(ms, 0)} ms" for name, ms in lazy_loads
+                ))
+            else:
+                st.caption(translate_ui("admin.system.startup.no_lazy_loads", default="Noch keine Module nachgeladen."))
         
         # Durchschnittliche Punktzahlen pro Fragenset
         if stats['avg_scores_by_qset']:
@@ -19,6 +19,9 @@ from dotenv import load_dotenv
 import locale
 import os
 
+# Startzeit für ``MC_IMPORT_PROFILE`` (Import-Zeit und erster Durchlauf pro Prozess).
+_app_run_started = time.perf_counter()
+
 # --- Pfad-Setup für robuste Imports (Workaround für ältere Streamlit-Versionen) ---
 # Dieser Block stellt sicher, dass die App als Skript ausgeführt werden kann,
 # indem er das Projektverzeichnis zum Suchpfad hinzufügt.
@@ -30,7 +33,7 @@ if _this_dir not in sys.path:
 if _parent_dir not in sys.path:
     sys.path.insert(0, _parent_dir)
 
-from config import AppConfig, load_questions
+from config import get_app_config, load_questions
 from database import init_database
 from auth import handle_user_session, is_admin_user, initialize_session_state
 from logic import (
@@ -38,17 +41,25 @@ from logic import (
     is_test_finished,
 )
 from helpers.text import get_user_id_hash
+from helpers.run_state import get_test_run
 from database import start_test_session
 from main_view import (
     render_question_view,
     render_final_summary,
+    start_report_prerender,
     render_welcome_page,
     _render_history_table,
 )
-from admin_panel import render_admin_panel
 from components import render_sidebar, render_admin_switch
 from i18n.context import t as translate_ui
 from legal_ui import get_requested_legal_kind, render_legal_page
+import render_scope
+import lazy_imports
+import static_assets
+
+# Admin-Panel (Plotly, PDF-Export) erst laden, wenn ein Admin es öffnet.
+render_admin_panel = lazy_imports.lazy_function("admin_panel", "render_admin_panel")
+lazy_imports.record_startup("imports", time.perf_counter() - _app_run_started)
 
 try:
     from helpers.security import is_request_from_localhost
@@ -66,61 +77,7 @@ except Exception:
 def _inject_soft_dark_theme_styles() -> None:
     """Soften dark-theme contrast without changing the app structure."""
     try:
-        style_html = """
-            <style>
-            :root {
-              --mc-bg: #181818;
-              --mc-surface: #232323;
-              --mc-surface-soft: #2a2a2a;
-              --mc-text: #cfc5bd;
-              --mc-heading: #e2d7ce;
-              --mc-muted: #afa59d;
-            }
-            .stApp,
-            [data-testid="stAppViewContainer"],
-            [data-testid="stMain"],
-            .stMain,
-            .stMainBlockContainer {
-              background-color: var(--mc-bg) !important;
-              color: var(--mc-text) !important;
-            }
-            [data-testid="stHeader"] {
-              background: rgba(24, 24, 24, 0.92) !important;
-            }
-            [data-testid="stSidebar"],
-            [data-testid="stSidebarContent"] {
-              background-color: var(--mc-surface) !important;
-              color: var(--mc-text) !important;
-            }
-            .stMainBlockContainer,
-            div[data-testid="stMarkdownContainer"],
-            div[data-testid="stMarkdownContainer"] p,
-            div[data-testid="stMarkdownContainer"] li,
-            div[data-testid="stWidgetLabel"],
-            div[data-testid="stText"],
-            label,
-            legend {
-              color: var(--mc-text) !important;
-            }
-            div[data-testid="stMarkdownContainer"] h1,
-            div[data-testid="stMarkdownContainer"] h2,
-            div[data-testid="stMarkdownContainer"] h3,
-            div[data-testid="stMarkdownContainer"] h4 {
-              color: var(--mc-heading) !important;
-            }
-            div[data-testid="stCaptionContainer"],
-            small {
-              color: var(--mc-muted) !important;
-            }
-            input,
-            textarea,
-            div[data-baseweb="select"] > div,
-            div[data-baseweb="input"] > div {
-              background-color: var(--mc-surface-soft) !important;
-              color: var(--mc-text) !important;
-            }
-            </style>
-            """
+        style_html = static_assets.stylesheet_html("soft_dark_theme.css")
         html_fn = getattr(st, "html", None)
         if callable(html_fn):
             html_fn(style_html)
@@ -183,7 +140,7 @@ def main():
     init_database()
 
     # --- 1. Lade Konfiguration und Fragen (wird für Login benötigt) ---
-    app_config = AppConfig()
+    app_config = get_app_config()
     st.session_state["app_config"] = app_config
     
     # Initialisiere das Fragenset nur, wenn eine Auswahl in der Session existiert.
@@ -261,7 +218,7 @@ def main():
         last_answered_idx = st.session_state.get("last_answered_idx")
         explanation_open = False
         if last_answered_idx is not None:
-            explanation_open = bool(st.session_state.get(f"show_explanation_{last_answered_idx}"))
+            explanation_open = get_test_run(st.session_state).explanation_visible(last_answered_idx)
         will_show_final_summary = (
             test_time_expired
             or st.session_state.get("test_manually_ended", False)
@@ -324,6 +281,8 @@ def main():
     if is_test_finished(questions) and "test_end_time" not in st.session_state:
         from datetime import datetime
         st.session_state.test_end_time = datetime.now()
+        # Letzte Antwort gespeichert: PDF-Bericht im Hintergrund vorbereiten.
+        start_report_prerender(questions, app_config)
 
     # --- 5. Logik zur Bestimmung der anzuzeigenden Frage ---
     current_idx = None
@@ -340,12 +299,12 @@ def main():
             # Reset the per-question shown timestamps so the UI cooling
             # (reading / explanation cooldowns) restarts from now when the
             # user jumps directly to a skipped/bookmarked question.
-            shown_key = f"frage_{current_idx}_shown_time_monotonic"
-            if shown_key not in st.session_state:
-                st.session_state[shown_key] = time.monotonic()
+            run = get_test_run(st.session_state)
+            if run.shown_at(current_idx) is None:
+                run.set_shown_at(current_idx, time.monotonic())
             # Remove any prior explanation-shown timestamp so the 'Next' cooldown
             # is not considered already started for this question.
-            st.session_state.pop(f"frage_{current_idx}_explanation_shown_time_monotonic", None)
+            run.set_explanation_shown_at(current_idx, None)
         except Exception:
             pass
         # Entferne den Sprungmarker nach der ersten Verarbeitung.
@@ -356,11 +315,11 @@ def main():
         current_idx = st.session_state.get("_current_question_idx")
         if current_idx is None:
             current_idx = get_current_question_index()
-    elif "last_answered_idx" in st.session_state and st.session_state.get(f"show_explanation_{st.session_state.last_answered_idx}"):
+    elif "last_answered_idx" in st.session_state and get_test_run(st.session_state).explanation_visible(st.session_state.last_answered_idx):
         # Priorität 2: Bleibe auf der letzten Frage, um die Erklärung anzuzeigen
         current_idx = st.session_state.last_answered_idx
         # Lösche den Marker, damit beim Klick auf "Nächste Frage" normal weitergemacht wird.
-        if not st.session_state.get(f"show_explanation_{current_idx}"):
+        if not get_test_run(st.session_state).explanation_visible(current_idx):
             del st.session_state.last_answered_idx
     else:
         # Priorität 3: Finde die nächste unbeantwortete Frage
@@ -416,7 +375,7 @@ def main():
         render_final_summary(questions, app_config)
     elif st.session_state.get("test_manually_ended", False) or (is_test_finished(questions) and not (
         "last_answered_idx" in st.session_state
-        and st.session_state.get(f"show_explanation_{st.session_state.last_answered_idx}")
+        and get_test_run(st.session_state).explanation_visible(st.session_state.last_answered_idx)
     )):
         # Wenn der Test beendet ist und kein Erklärungsoverlay offen, zeige die Zusammenfassung.
         _close_admin_editor()
@@ -431,4 +390,8 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        with render_scope.measure_app_run():
+            main()
+    finally:
+        lazy_imports.record_startup("first_run", time.perf_counter() - _app_run_started)
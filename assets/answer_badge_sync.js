@@ -0,0 +1,60 @@
+(() => {
+    const version = 2;
+    const install = (win) => {
+        if (!win || !win.document || win.__mcAnswerBadgeSyncInstalled === version) {
+            return;
+        }
+        win.__mcAnswerBadgeSyncInstalled = version;
+
+        const sync = () => {
+            try {
+                const doc = win.document;
+                const marker = doc.querySelector('.mc-answer-radio-marker');
+                if (!marker) {
+                    return;
+                }
+                const scope = marker.closest('[data-testid="stMainBlockContainer"]') || doc;
+                const radioGroup = scope.querySelector('[data-testid="stRadio"] [role="radiogroup"]');
+                if (!radioGroup) {
+                    return;
+                }
+                const inputs = Array.from(radioGroup.querySelectorAll('input[type="radio"]'));
+                const badges = Array.from(scope.querySelectorAll('.mc-answer-option-letter-badge'));
+                if (!badges.length || !inputs.length) {
+                    return;
+                }
+                inputs.forEach((input, idx) => {
+                    const badge = badges[idx];
+                    if (!badge) {
+                        return;
+                    }
+                    const selected = Boolean(input.checked);
+                    if (badge.classList.contains('is-selected') !== selected) {
+                        badge.classList.toggle('is-selected', selected);
+                    }
+                });
+            } catch (_) {}
+        };
+
+        win.document.addEventListener('change', (event) => {
+            const target = event.target;
+            if (
+                target &&
+                target.matches &&
+                target.matches('input[type="radio"]') &&
+                target.closest('[data-testid="stRadio"]')
+            ) {
+                sync();
+            }
+        }, true);
+
+        win.requestAnimationFrame(sync);
+    };
+
+    install(window);
+    try {
+        if (window.parent && window.parent !== window) {
+            install(window.parent);
+        }
+    } catch (_) {}
+})();
@@ -0,0 +1,167 @@
+(() => {
+    const install = (win) => {
+        if (!win || !win.document || win.__mcQuestionScrollManagerInstalled) {
+            return;
+        }
+        win.__mcQuestionScrollManagerInstalled = true;
+        const storageKey = "mcQuestionScrollRestore";
+        let handledScrollTopIdx = null;
+        let handledRestoreToken = null;
+
+        const collectScrollTargets = (doc) => [
+            doc.scrollingElement,
+            doc.documentElement,
+            doc.body,
+            doc.querySelector('[data-testid="stAppViewContainer"]'),
+            doc.querySelector('[data-testid="stMain"]'),
+            doc.querySelector('.stMainBlockContainer'),
+            doc.querySelector('[data-testid="stMainBlockContainer"]'),
+        ].filter(Boolean);
+
+        const scrollAllToTop = () => {
+            try {
+                const doc = win.document;
+                const scrollElement = (element) => {
+                    if (!element) {
+                        return;
+                    }
+                    try {
+                        if (typeof element.scrollTo === "function") {
+                            element.scrollTo({ top: 0, left: 0, behavior: "auto" });
+                        }
+                        if ("scrollTop" in element) {
+                            element.scrollTop = 0;
+                        }
+                    } catch (_) {}
+                };
+                win.scrollTo({ top: 0, left: 0, behavior: "auto" });
+                try {
+                    if (win.parent && win.parent !== win) {
+                        win.parent.scrollTo({ top: 0, left: 0, behavior: "auto" });
+                    }
+                } catch (_) {}
+                collectScrollTargets(doc).forEach(scrollElement);
+            } catch (_) {}
+        };
+
+        const saveScroll = () => {
+            try {
+                const doc = win.document;
+                const targets = collectScrollTargets(doc);
+                const positions = targets.map((target) => target.scrollTop || 0);
+                win.sessionStorage.setItem(
+                    storageKey,
+                    JSON.stringify({
+                        ts: Date.now(),
+                        windowY: win.scrollY || 0,
+                        positions,
+                    }),
+                );
+            } catch (_) {}
+        };
+
+        const restoreScroll = () => {
+            try {
+                const raw = win.sessionStorage.getItem(storageKey);
+                if (!raw) {
+                    return;
+                }
+                const payload = JSON.parse(raw);
+                if (!payload || Date.now() - Number(payload.ts || 0) > 8000) {
+                    win.sessionStorage.removeItem(storageKey);
+                    return;
+                }
+                win.sessionStorage.removeItem(storageKey);
+                const doc = win.document;
+                const targets = collectScrollTargets(doc);
+                const positions = Array.isArray(payload.positions) ? payload.positions : [];
+                targets.forEach((target, idx) => {
+                    if (typeof positions[idx] === "number") {
+                        target.scrollTop = positions[idx];
+                    }
+                });
+                if (typeof payload.windowY === "number") {
+                    win.scrollTo({ top: payload.windowY, left: 0, behavior: "auto" });
+                }
+            } catch (_) {}
+        };
+
+        const applyScrollPlan = () => {
+            const doc = win.document;
+            const topMarker = doc.querySelector(".mc-scroll-top-request");
+            if (topMarker) {
+                const frageIdx = topMarker.getAttribute("data-frage-idx") || "";
+                if (handledScrollTopIdx === frageIdx) {
+                    return;
+                }
+                handledScrollTopIdx = frageIdx;
+                handledRestoreToken = null;
+                try {
+                    win.sessionStorage.removeItem(storageKey);
+                } catch (_) {}
+                scrollAllToTop();
+                return;
+            }
+            handledScrollTopIdx = null;
+
+            let raw = null;
+            try {
+                raw = win.sessionStorage.getItem(storageKey);
+            } catch (_) {
+                raw = null;
+            }
+            if (!raw) {
+                handledRestoreToken = null;
+                return;
+            }
+            if (handledRestoreToken === raw) {
+                return;
+            }
+            handledRestoreToken = raw;
+            restoreScroll();
+        };
+
+        win.document.addEventListener("click", (event) => {
+            const target = event.target;
+            if (!target || !target.closest) {
+                return;
+            }
+            if (!win.document.querySelector(".mc-exam-mode-marker")) {
+                return;
+            }
+            const submitButton = target.closest('button[data-testid="stFormSubmitButton"]');
+            if (!submitButton) {
+                return;
+            }
+            const form = submitButton.closest("form");
+            if (!form || !form.querySelector(".mc-answer-radio-marker")) {
+                return;
+            }
+            saveScroll();
+        }, true);
+
+        let scrollTimer = null;
+        const scheduleScrollPlan = () => {
+            clearTimeout(scrollTimer);
+            scrollTimer = win.setTimeout(applyScrollPlan, 520);
+        };
+
+        try {
+            const observer = new MutationObserver(scheduleScrollPlan);
+            observer.observe(win.document.body || win.document.documentElement, {
+                childList: true,
+                subtree: true,
+            });
+            win.__mcQuestionScrollManagerObserver = observer;
+        } catch (_) {}
+
+        scheduleScrollPlan();
+    };
+
+    install(window);
+    try {
+        if (window.parent && window.parent !== window) {
+            install(window.parent);
+        }
+    } catch (_) {}
+})();
@@ -16,6 +16,7 @@ import sys
 from config import AppConfig, load_scientists, QuestionSet
 from i18n.context import t
 from helpers.text import get_user_id_hash
+from helpers.run_state import TestRun
 
 def log_state(event: str):
     """Schreibt den aktuellen Session State zur Fehlersuche in eine Log-Datei."""
@@ -60,7 +61,7 @@ def initialize_session_state(question_set: QuestionSet, app_config: AppConfig |
 
     for key in existing_keys:
         if key.startswith("frage_") or key.startswith("show_explanation_") or key.startswith("show_extended_") or key.startswith("radio_") or key in [
-            "beantwortet", "frage_indices", "initial_frage_indices", "start_zeit",
+            "test_run", "initial_frage_indices", "start_zeit",
             "progress_loaded", "optionen_shuffled", "answer_outcomes",
             "bookmarked_questions",
             "test_time_expired", "show_pseudonym_reminder",
@@ -70,7 +71,6 @@ def initialize_session_state(question_set: QuestionSet, app_config: AppConfig |
             del state[key]
 
     question_count = len(question_set)
-    _state_set("beantwortet", [None] * question_count)
     frage_indices = list(range(question_count))
     
     sort_order = state.get("question_sort_order", "difficulty_asc")
@@ -82,21 +82,18 @@ def initialize_session_state(question_set: QuestionSet, app_config: AppConfig |
     elif sort_order == "difficulty_desc":
         frage_indices.sort(key=lambda i: question_set[i].get("gewichtung", 2), reverse=True)
     elif sort_order == "cognitive_stage":
-        try:
-            from pdf_export import BLOOM_STAGE_ORDER, _normalize_stage_label
-            stage_map = {stage: i for i, stage in enumerate(BLOOM_STAGE_ORDER)}
-            
-            def get_stage_index(q_idx):
-                q = question_set[q_idx]
-                stage = _normalize_stage_label(q.get("kognitive_stufe"))
-                return stage_map.get(stage, 99)
+        from helpers.stages import BLOOM_STAGE_ORDER, _normalize_stage_label
+        stage_map = {stage: i for i, stage in enumerate(BLOOM_STAGE_ORDER)}
+
+        def get_stage_index(q_idx):
+            q = question_set[q_idx]
+            stage = _normalize_stage_label(q.get("kognitive_stufe"))
+            return stage_map.get(stage, 99)
 
-            frage_indices.sort(key=get_stage_index)
-        except ImportError:
-            # Fallback to random if pdf_export is not available
-            random.shuffle(frage_indices)
+        frage_indices.sort(key=get_stage_index)
 
-    _state_set("frage_indices", frage_indices)
+    # Antworten, Punkte, Konfidenz und Zeitstempel pro Frage liegen kompakt im TestRun.
+    _state_set("test_run", TestRun(question_count, frage_indices))
     _state_set("initial_frage_indices", list(frage_indices))  # Stabile Kopie für Nummerierung
     _state_set("start_zeit", None)
     _state_set("progress_loaded", False)
@@ -109,8 +106,8 @@ def initialize_session_state(question_set: QuestionSet, app_config: AppConfig |
 
     # Calculate exact total cooldown time for the question set (before tempo scaling)
     from pacing_helper import compute_total_cooldown_seconds
-    from config import AppConfig
-    app_cfg = AppConfig()
+    from config import get_app_config
+    app_cfg = get_app_config()
     per_weight_minutes = {}
     qmeta = getattr(question_set, 'meta', None)
     per_weight_raw = None
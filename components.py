@@ -22,12 +22,10 @@ from pathlib import Path
 from config import AppConfig, QuestionSet, USER_QUESTION_PREFIX, get_package_dir
 from logic import calculate_score, get_current_question_index, is_test_finished
 from database import update_bookmarks
-from pdf_export import (
-    _extract_glossary_terms,
-    generate_mini_glossary_pdf,
-    generate_musterloesung_pdf,
-)
-from pdf_export import estimate_formula_render
+import render_scope
+import lazy_imports
+import export_cache
+from helpers.run_state import get_test_run
 from user_question_sets import (
     format_user_label,
     get_user_question_set,
@@ -42,9 +40,21 @@ from i18n.context import t as translate_ui, get_locale, set_locale
 from i18n import translate as translate_key
 from legal_ui import render_legal_links
 from helpers.text import unwrap_markdown_document_fence
+from helpers.glossary import _extract_glossary_terms
 
 # Helpers imported at module top; do not re-import here.
 
+# PDF-Export (WeasyPrint, Markdown-It) erst beim ersten Export laden.
+generate_mini_glossary_pdf = export_cache.cached_export(
+    "mini_glossary", lazy_imports.lazy_function("pdf_export", "generate_mini_glossary_pdf")
+)
+generate_musterloesung_pdf = export_cache.cached_export(
+    "musterloesung",
+    lazy_imports.lazy_function("pdf_export", "generate_musterloesung_pdf"),
+    config_fields=("scoring_mode",),
+)
+estimate_formula_render = lazy_imports.lazy_function("pdf_export", "estimate_formula_render")
+
 _WELCOME_LOCALE_SELECTOR_KEY = "welcome_locale_selector"
 
 
@@ -2001,7 +2011,7 @@ def _render_user_qset_dialog(app_config: AppConfig) -> None:
 def _end_test_session(questions: QuestionSet, app_config: AppConfig):
     """Beendet die aktuelle Test-Session, berechnet finale Werte und bereinigt den Session-Status."""
     # Berechne finale Werte vor dem Löschen der Session
-    final_score, max_score = calculate_score([st.session_state.get(f"frage_{i}_beantwortet") for i in range(len(questions))], questions, app_config.scoring_mode)
+    final_score, max_score = calculate_score(get_test_run(st.session_state).points_list(len(questions)), questions, app_config.scoring_mode)
     duration_seconds = 0
     start_time = st.session_state.get("start_zeit")
     end_time = pd.Timestamp.now()
@@ -2009,10 +2019,10 @@ def _end_test_session(questions: QuestionSet, app_config: AppConfig):
         duration_seconds = (end_time - start_time).total_seconds()
 
     # Prüfe, ob der Nutzer es ins Leaderboard schaffen wird
-    from database import get_all_logs_for_leaderboard, recompute_session_summary
+    from database import get_all_logs_for_leaderboard, ensure_session_summary
     selected_file = st.session_state.get("selected_questions_file")
 
-    # Recompute and persist the current session summary first so the
+    # Make sure the current session summary is complete first so the
     # leaderboard decision uses the same data that will be displayed
     # to users after the session ends. This avoids transient mismatches
     # where the toast claims leaderboard membership but the public view
@@ -2020,7 +2030,7 @@ def _end_test_session(questions: QuestionSet, app_config: AppConfig):
     try:
         sid = st.session_state.get("session_id")
         if sid is not None:
-            recompute_session_summary(int(sid))
+            ensure_session_summary(int(sid))
     except Exception:
         # Best-effort: continue even if recompute fails.
         pass
@@ -2075,12 +2085,12 @@ def _end_test_session(questions: QuestionSet, app_config: AppConfig):
     # SQLite text-based duration calculations later which can be fragile
     # with timezone/formatting differences.
     try:
-        from database import recompute_session_summary
+        from database import ensure_session_summary
 
         try:
             sid = st.session_state.get("session_id")
             if sid is not None:
-                recompute_session_summary(int(sid))
+                ensure_session_summary(int(sid))
         except Exception:
             # Best-effort: do not fail the UI flow if DB update fails.
             pass
@@ -3141,9 +3151,7 @@ def render_sidebar(questions: QuestionSet, app_config: AppConfig, is_admin: bool
         # Sidebar sollte nicht wegen Glossar-Rendering abstürzen.
         pass
 
-    num_answered = sum(
-        1 for i in range(len(questions)) if st.session_state.get(f"frage_{i}_beantwortet") is not None
-    )
+    num_answered = get_test_run(st.session_state).answered
     progress_pct = int((num_answered / len(questions)) * 100) if questions else 0
 
     # Anzahl verbleibender Fragen berechnen und korrekt textuell darstellen
@@ -3194,7 +3202,7 @@ def render_sidebar(questions: QuestionSet, app_config: AppConfig, is_admin: bool
 
     st.sidebar.divider()
     current_score, max_score = calculate_score(
-        [st.session_state.get(f"frage_{i}_beantwortet") for i in range(len(questions))],
+        get_test_run(st.session_state).points_list(len(questions)),
         questions,
         app_config.scoring_mode,
     )
@@ -3221,8 +3229,11 @@ def render_sidebar(questions: QuestionSet, app_config: AppConfig, is_admin: bool
     </div>
     """, unsafe_allow_html=True)
 
-    render_bookmarks(questions)
-    render_skipped_questions(questions)
+    # Eigene Fragmente: Buttons, die nur die Liste betreffen, rendern nicht
+    # die ganze App neu.
+    with st.sidebar:
+        render_scope.run_fragment("sidebar_bookmarks", render_bookmarks, questions)
+        render_scope.run_fragment("sidebar_skipped", render_skipped_questions, questions)
 
     # Füge einen "Zurück zum Review"-Button hinzu, wenn der Test beendet ist
     # und der Nutzer gerade eine einzelne Frage ansieht (z.B. nach Sprung von Bookmark).
@@ -3578,7 +3589,7 @@ def render_sidebar(questions: QuestionSet, app_config: AppConfig, is_admin: bool
             width="stretch",
         ):
             # Berechne finale Werte vor dem Löschen der Session
-            final_score, _ = calculate_score([st.session_state.get(f"frage_{i}_beantwortet") for i in range(len(questions))], questions, app_config.scoring_mode)
+            final_score, _ = calculate_score(get_test_run(st.session_state).points_list(len(questions)), questions, app_config.scoring_mode)
             duration_seconds = 0
             start_time = st.session_state.get("test_start_time")
             end_time = st.session_state.get("test_end_time")
@@ -3629,12 +3640,12 @@ def render_sidebar(questions: QuestionSet, app_config: AppConfig, is_admin: bool
             # leaderboards and admin views read a concrete `duration_seconds`
             # value instead of recomputing it from text timestamps.
             try:
-                from database import recompute_session_summary
+                from database import ensure_session_summary
 
                 try:
                     sid = st.session_state.get("session_id")
                     if sid is not None:
-                        recompute_session_summary(int(sid))
+                        ensure_session_summary(int(sid))
                 except Exception:
                     pass
             except Exception:
@@ -3970,12 +3981,12 @@ def render_bookmarks(questions: QuestionSet):
 
     # Allow jumps if the user is currently viewing an explanation (review mode)
     # so that immediately after the last answer the user can still jump to a bookmarked question.
-    currently_reviewing = any(
-        st.session_state.get(f"show_explanation_{i}", False) for i in range(len(questions) or [])
-    ) or st.session_state.get("jump_to_idx_active", False)
+    currently_reviewing = get_test_run(st.session_state).any_explanation_visible() or st.session_state.get(
+        "jump_to_idx_active", False
+    )
     jumps_disabled = test_completed and not currently_reviewing
     # Expander nur geöffnet, wenn Inhalt vorhanden
-    with st.sidebar.expander(
+    with st.expander(
         _sidebar_text("bookmarks_expander", default="🔖 Markierte Fragen"),
         expanded=len(bookmarks) > 0,
     ):
@@ -4026,8 +4037,9 @@ def render_bookmarks(questions: QuestionSet):
                     st.session_state.jump_to_idx_active = True
                     # If the target question was already answered, show its explanation/evaluation immediately
                     try:
-                        if st.session_state.get(f"frage_{q_idx}_beantwortet") is not None:
-                            st.session_state[f"show_explanation_{q_idx}"] = True
+                        run = get_test_run(st.session_state)
+                        if run.is_answered(q_idx):
+                            run.set_explanation_visible(q_idx, True)
                             st.session_state.last_answered_idx = q_idx
                     except Exception:
                         pass
@@ -4064,12 +4076,12 @@ def render_skipped_questions(questions: QuestionSet):
     if st.session_state.get("in_final_summary", False):
         return
 
-    currently_reviewing = any(
-        st.session_state.get(f"show_explanation_{i}", False) for i in range(len(questions) or [])
-    ) or st.session_state.get("jump_to_idx_active", False)
+    currently_reviewing = get_test_run(st.session_state).any_explanation_visible() or st.session_state.get(
+        "jump_to_idx_active", False
+    )
     jumps_disabled = test_completed and not currently_reviewing
     # Expander nur geöffnet, wenn Inhalt vorhanden
-    with st.sidebar.expander(
+    with st.expander(
         _sidebar_text("skipped_expander", default="↪️ Übersprungen"),
         expanded=len(skipped) > 0,
     ):
@@ -4112,8 +4124,9 @@ def render_skipped_questions(questions: QuestionSet):
                 st.session_state["jump_to_idx"] = q_idx
                 st.session_state.jump_to_idx_active = True
                 try:
-                    if st.session_state.get(f"frage_{q_idx}_beantwortet") is not None:
-                        st.session_state[f"show_explanation_{q_idx}"] = True
+                    run = get_test_run(st.session_state)
+                    if run.is_answered(q_idx):
+                        run.set_explanation_visible(q_idx, True)
                         st.session_state.last_answered_idx = q_idx
                 except Exception:
                     pass
@@ -4129,10 +4142,10 @@ def render_skipped_questions(questions: QuestionSet):
             ),
         ):
             # Um sie zurückzusetzen, müssen wir sie aus der 'skipped' Liste entfernen
-            # und wieder an ihre ursprüngliche Position in 'frage_indices' bringen.
+            # und wieder an ihre ursprüngliche Position in der Testreihenfolge bringen.
             # Einfachere Variante: Nur die Liste leeren. Die Fragen bleiben am Ende der Warteschlange.
             st.session_state.skipped_questions = []
-            st.rerun()
+            render_scope.rerun_fragment()
 
 
 def _distribution_summary_test_time(minutes: int) -> str:
@@ -4373,7 +4386,7 @@ def get_motivation_message(questions: QuestionSet, app_config: AppConfig) -> str
     
     scoring_mode = app_config.scoring_mode
     current_score, max_score = calculate_score(
-        [st.session_state.get(f"frage_{i}_beantwortet") for i in range(len(questions))],
+        get_test_run(st.session_state).points_list(len(questions)),
         questions,
         scoring_mode,
     )
@@ -11,7 +11,12 @@ import sys
 import json
 import math
 import re
+import hashlib
+import pickle
+import copy
+import threading
 from dataclasses import dataclass
+from types import MappingProxyType
 from pathlib import Path
 from typing import List, Dict, Any
 import streamlit as st
@@ -226,15 +231,29 @@ def _compute_recommended_duration_minutes(
     return _round_duration_minutes(max(5, total_minutes))
 
 
+def _emit_question_set_warning(key: str, default: str, params: Dict[str, Any]) -> None:
+    st.warning(translate_ui(key, default=default).format(**params))
+
+
 def _build_question_set(
-    data: Any, filename: str, silent: bool = False
+    data: Any, filename: str, silent: bool = False,
+    warnings: List[tuple] | None = None,
 ) -> QuestionSet:
     """
     Normalisiert den Rohinhalt einer Fragen-Datei und liefert ein `QuestionSet`.
+
+    Hinweise (z.B. entferntes HTML) werden als `(i18n-key, default, params)`
+    an `warnings` angehängt, falls übergeben, und ohne `silent` angezeigt.
     """
     meta: Dict[str, Any] = {}
     raw_questions: Any = []
 
+    def _warn(key: str, default: str, **params: Any) -> None:
+        if warnings is not None:
+            warnings.append((key, default, params))
+        if not silent:
+            _emit_question_set_warning(key, default, params)
+
     def _sanitize_text(value: Any, context: str) -> str:
         if not isinstance(value, str):
             return ""
@@ -275,9 +294,11 @@ def _build_question_set(
         for zw in ("\u200b", "\u200c", "\u200d"):
             if zw in sanitized:
                 sanitized = sanitized.replace(zw, "")
-        if modified and not silent:
-            st.warning(
-                translate_ui("config.warning.html_sanitized", default="In '{filename}' wurde potenziell unsichere HTML-Auszeichnung entfernt ({context}).").format(filename=filename, context=context)
+        if modified:
+            _warn(
+                "config.warning.html_sanitized",
+                "In '{filename}' wurde potenziell unsichere HTML-Auszeichnung entfernt ({context}).",
+                filename=filename, context=context,
             )
         return sanitized
 
@@ -302,10 +323,11 @@ def _build_question_set(
         if isinstance(meta_candidate, dict):
             meta = dict(meta_candidate)
         else:
-            if not silent:
-                st.warning(
-                    translate_ui("config.warning.metadata_ignored", default="Metadaten in '{filename}' wurden ignoriert, da sie nicht als Objekt vorliegen.").format(filename=filename)
-                )
+            _warn(
+                "config.warning.metadata_ignored",
+                "Metadaten in '{filename}' wurden ignoriert, da sie nicht als Objekt vorliegen.",
+                filename=filename,
+            )
     elif isinstance(data, list):
         raw_questions = data
         meta = {}
@@ -318,10 +340,11 @@ def _build_question_set(
     questions: List[Dict[str, Any]] = []
     for i, raw_question in enumerate(raw_questions):
         if not isinstance(raw_question, dict):
-            if not silent:
-                st.warning(
-                    translate_ui("config.warning.question_skipped", default="Frage an Position {pos} in '{filename}' wurde übersprungen, da sie kein Objekt ist.").format(pos=i + 1, filename=filename)
-                )
+            _warn(
+                "config.warning.question_skipped",
+                "Frage an Position {pos} in '{filename}' wurde übersprungen, da sie kein Objekt ist.",
+                pos=i + 1, filename=filename,
+            )
             continue
         question = dict(raw_question)
 
@@ -446,8 +469,29 @@ def _build_question_set(
     return QuestionSet(questions=questions, meta=meta, source_filename=filename)
 
 
+# Umgebungsvariablen, die `AppConfig` auswertet; Teil des Snapshot-Fingerprints.
+_APP_CONFIG_ENV_KEYS = (
+    "MC_TEST_ADMIN_USER",
+    "MC_TEST_ADMIN_KEY",
+    "MC_TEST_DURATION_MINUTES",
+    "MC_USER_QSET_CLEANUP_HOURS",
+    "MC_USER_QSET_RESERVED_RETENTION_DAYS",
+    "MC_AUTO_RELEASE_PSEUDONYMS",
+    "MC_RATE_LIMIT_ATTEMPTS",
+    "MC_RATE_LIMIT_WINDOW_MINUTES",
+    "MC_RECOVERY_MIN_LENGTH",
+    "MC_RECOVERY_ALLOW_SHORT",
+    "MC_NEXT_COOLDOWN_NORMALIZATION_FACTOR",
+)
+
+
 class AppConfig:
-    """Eine Klasse zur Kapselung der App-Konfiguration."""
+    """Eine Klasse zur Kapselung der App-Konfiguration.
+
+    `AppConfig()` liest Secrets, Umgebung und `mc_test_config.json` jedes Mal
+    neu. Im App-Code `get_app_config()` verwenden: das liefert einen
+    prozessweit geteilten, unveränderlichen Snapshot.
+    """
 
     def __init__(self):
         self.admin_user: str = ""
@@ -691,20 +735,130 @@ class AppConfig:
         except (IOError, json.JSONDecodeError):
             pass  # Bei Fehlern werden die Defaults beibehalten
 
+    def __setattr__(self, name, value):
+        if self.__dict__.get("_frozen"):
+            raise AttributeError(
+                f"AppConfig-Snapshot ist unveränderlich ('{name}'); copy() für Änderungen verwenden"
+            )
+        object.__setattr__(self, name, value)
+
+    def copy(self, **changes) -> "AppConfig":
+        """Veränderbare Kopie (auch von Snapshots), optional mit geänderten Werten."""
+        clone = AppConfig.__new__(AppConfig)
+        for key, value in self.__dict__.items():
+            if key == "_frozen":
+                continue
+            if isinstance(value, MappingProxyType):
+                value = dict(value)
+            object.__setattr__(clone, key, copy.deepcopy(value))
+        for key, value in changes.items():
+            setattr(clone, key, value)
+        return clone
+
+    def _freeze(self) -> "AppConfig":
+        for key, value in list(self.__dict__.items()):
+            if isinstance(value, dict):
+                object.__setattr__(self, key, MappingProxyType(value))
+        object.__setattr__(self, "_frozen", True)
+        return self
+
     def save(self):
-        """Speichert die aktuelle Konfiguration in die JSON-Datei."""
+        """Speichert die aktuelle Konfiguration in die JSON-Datei.
+
+        Weitere Schlüssel der Datei bleiben erhalten. Nach dem Schreiben wird
+        der Stand als neuer Snapshot für alle Sessions veröffentlicht.
+        """
         path = os.path.join(get_package_dir(), "mc_test_config.json")
-        config_data = {
+        config_data: Dict[str, Any] = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                existing = json.load(f)
+            if isinstance(existing, dict):
+                config_data.update(existing)
+        except (IOError, ValueError):
+            pass
+        config_data.update({
             "scoring_mode": self.scoring_mode,
             "show_top5_public": self.show_top5_public,
             "test_duration_minutes": self.test_duration_minutes,
-        }
+        })
+        tmp_path = f"{path}.{os.getpid()}.tmp"
         try:
-            with open(path, "w", encoding="utf-8") as f:
+            with open(tmp_path, "w", encoding="utf-8") as f:
                 json.dump(config_data, f, indent=2)
+            os.replace(tmp_path, path)
         except IOError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
             st.error(translate_ui("config.error.config_save_failed", default="Konfiguration konnte nicht gespeichert werden."))
+            return
+        _publish_app_config(self)
+
+
+# Prozessweiter Snapshot: (Fingerprint, eingefrorene AppConfig)
+_APP_CONFIG_SNAPSHOT: tuple | None = None
+_APP_CONFIG_LOCK = threading.Lock()
+# Wird bei jeder Änderung der Streamlit-Secrets erhöht.
+_SECRETS_GENERATION = 0
+_SECRETS_LISTENER_INSTALLED = False
+
+
+def _on_secrets_changed(*_args, **_kwargs) -> None:
+    global _SECRETS_GENERATION
+    _SECRETS_GENERATION += 1
+
+
+def _install_secrets_listener() -> None:
+    global _SECRETS_LISTENER_INSTALLED
+    if _SECRETS_LISTENER_INSTALLED:
+        return
+    _SECRETS_LISTENER_INSTALLED = True
+    try:
+        st.secrets.file_change_listener.connect(_on_secrets_changed, weak=False)
+    except Exception:
+        pass
+
+
+def _app_config_fingerprint() -> tuple:
+    path = os.path.join(get_package_dir(), "mc_test_config.json")
+    try:
+        stat = os.stat(path)
+        file_state = (path, stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        file_state = (path, None, None)
+    env_state = tuple(os.environ.get(key) for key in _APP_CONFIG_ENV_KEYS)
+    return (file_state, _SECRETS_GENERATION, env_state)
+
+
+def _publish_app_config(config: "AppConfig") -> None:
+    global _APP_CONFIG_SNAPSHOT
+    snapshot = config.copy()._freeze()
+    with _APP_CONFIG_LOCK:
+        _APP_CONFIG_SNAPSHOT = (_app_config_fingerprint(), snapshot)
+
+
+def get_app_config() -> AppConfig:
+    """Liefert den geteilten, unveränderlichen Konfigurations-Snapshot.
 
+    Neu aufgebaut wird nur, wenn sich mtime/Größe von `mc_test_config.json`,
+    die Streamlit-Secrets oder eine der ausgewerteten Umgebungsvariablen
+    geändert haben. Für Änderungen `get_app_config().copy(...)` verwenden.
+    """
+    global _APP_CONFIG_SNAPSHOT
+    _install_secrets_listener()
+    fingerprint = _app_config_fingerprint()
+    current = _APP_CONFIG_SNAPSHOT
+    if current is not None and current[0] == fingerprint:
+        return current[1]
+    with _APP_CONFIG_LOCK:
+        current = _APP_CONFIG_SNAPSHOT
+        if current is not None and current[0] == fingerprint:
+            return current[1]
+        snapshot = AppConfig()._freeze()
+        _APP_CONFIG_SNAPSHOT = (fingerprint, snapshot)
+        return snapshot
 
 
 @st.cache_data
@@ -735,14 +889,11 @@ def get_question_counts() -> Dict[str, int]:
     Gibt ein Dictionary mit der Anzahl der Fragen für jede gültige Fragenset-Datei zurück.
     Dies ist performanter, als für jede Datei `load_questions` einzeln aufzurufen.
     """
-    counts = {}
-    files = list_question_files()
-    for filename in files:
-        # Lade die Fragen (aus dem Cache, falls schon geladen) und zähle sie.
-        questions = load_questions(filename, silent=True)
-        if questions:
-            counts[filename] = len(questions)
-    return counts
+    # Die Anzahl stammt aus dem Metadaten-Katalog; Fragen werden nur für
+    # Dateien geladen, die sich seit der letzten Indizierung geändert haben.
+    from question_catalog import get_core_entries  # lokaler Import vermeidet Zyklen
+
+    return {entry.identifier: entry.question_count for entry in get_core_entries() if entry.question_count > 0}
 
 
 def _resolve_question_paths(filename: str) -> List[Path]:
@@ -780,17 +931,137 @@ def _resolve_question_paths(filename: str) -> List[Path]:
     return unique_candidates
 
 
+# Kompilierter Fragenset-Cache: das fertig normalisierte und bereinigte
+# `QuestionSet` wird pro Quelldatei als Pickle abgelegt. Damit kosten ein
+# Kaltstart oder `st.cache_data.clear()` (z.B. nach einem Admin-Upload) kein
+# erneutes Parsen und Sanitizing. Bei jeder Änderung an `_build_question_set`
+# muss `_COMPILED_QUESTIONS_VERSION` erhöht werden.
+_COMPILED_QUESTIONS_VERSION = 1
+COMPILED_QUESTIONS_DIR = Path(
+    os.getenv("MC_QUESTIONS_CACHE_DIR", os.path.join(get_package_dir(), "var", "questions_cache"))
+)
+
+
+def _compiled_questions_enabled() -> bool:
+    return os.getenv("MC_QUESTIONS_CACHE", "1").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _compiled_questions_path(source_path: Path, source_name: str) -> Path:
+    key = f"{source_path.resolve()}|{source_name}".encode("utf-8")
+    return COMPILED_QUESTIONS_DIR / f"{hashlib.sha256(key).hexdigest()[:32]}.pickle"
+
+
+def _read_compiled_questions(cache_path: Path) -> Dict[str, Any] | None:
+    try:
+        with cache_path.open("rb") as f:
+            entry = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Beschädigte oder inkompatible Einträge werden neu erzeugt.
+        return None
+    if not isinstance(entry, dict) or entry.get("version") != _COMPILED_QUESTIONS_VERSION:
+        return None
+    return entry
+
+
+def _write_compiled_questions(cache_path: Path, entry: Dict[str, Any]) -> None:
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with tmp_path.open("wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Best-effort: ohne beschreibbares Cache-Verzeichnis wird jedes Mal kompiliert.
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
+def _load_compiled_question_set(
+    source_path: Path, raw: bytes, data: Any, source_name: str, silent: bool, stat: os.stat_result
+) -> QuestionSet:
+    """Baut das `QuestionSet` aus `data` oder liest es aus dem kompilierten Cache."""
+    cache_path = _compiled_questions_path(source_path, source_name)
+    content_hash = hashlib.sha256(raw).hexdigest()
+    entry = _read_compiled_questions(cache_path)
+    if entry is None or entry.get("content_hash") != content_hash:
+        warnings: List[tuple] = []
+        question_set = _build_question_set(data, source_name, silent=True, warnings=warnings)
+        entry = {
+            "version": _COMPILED_QUESTIONS_VERSION,
+            "source_name": source_name,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "content_hash": content_hash,
+            "question_set": question_set,
+            "warnings": warnings,
+        }
+        _write_compiled_questions(cache_path, entry)
+    elif entry.get("mtime_ns") != stat.st_mtime_ns or entry.get("size") != stat.st_size:
+        # Inhalt unverändert (z.B. nur `touch`): Stat-Daten für den Schnellpfad nachziehen.
+        entry["mtime_ns"] = stat.st_mtime_ns
+        entry["size"] = stat.st_size
+        _write_compiled_questions(cache_path, entry)
+
+    if not silent:
+        for key, default, params in entry["warnings"]:
+            _emit_question_set_warning(key, default, params)
+    return entry["question_set"]
+
+
+def _source_name_for(filename: str, resolved_path: Path) -> str:
+    if filename.startswith(USER_QUESTION_PREFIX):
+        return filename
+    if resolved_path.name != filename:
+        return resolved_path.name
+    return filename
+
+
+def _load_precompiled_questions(filename: str, silent: bool) -> QuestionSet | None:
+    """Schnellpfad: liefert das kompilierte Set, wenn mtime und Größe noch passen."""
+    for candidate in _resolve_question_paths(filename):
+        try:
+            stat = candidate.stat()
+        except OSError:
+            continue
+        source_name = _source_name_for(filename, candidate)
+        entry = _read_compiled_questions(_compiled_questions_path(candidate, source_name))
+        if entry is None or entry.get("mtime_ns") != stat.st_mtime_ns or entry.get("size") != stat.st_size:
+            return None
+        if not silent:
+            for key, default, params in entry["warnings"]:
+                _emit_question_set_warning(key, default, params)
+        return entry["question_set"]
+    return None
+
+
 @st.cache_data
 def load_questions(filename: str, silent: bool = False) -> QuestionSet:
-    """Lädt ein spezifisches Fragenset aus einer JSON-Datei."""
+    """Lädt ein spezifisches Fragenset aus einer JSON-Datei.
+
+    Bereits kompilierte Sets kommen aus dem Cache unter `COMPILED_QUESTIONS_DIR`
+    (Schlüssel: Pfad, mtime/Größe und SHA-256 des Inhalts; abschaltbar mit
+    `MC_QUESTIONS_CACHE=0`).
+    """
+
+    use_compiled = _compiled_questions_enabled()
+    if use_compiled:
+        precompiled = _load_precompiled_questions(filename, silent)
+        if precompiled is not None:
+            return precompiled
 
     last_error: Exception | None = None
     resolved_path: Path | None = None
 
     for candidate in _resolve_question_paths(filename):
         try:
-            with candidate.open("r", encoding="utf-8") as f:
-                data = json.load(f)
+            with candidate.open("rb") as f:
+                raw = f.read()
+                stat = os.fstat(f.fileno())
+            data = json.loads(raw.decode("utf-8"))
             resolved_path = candidate
             break
         except (IOError, json.JSONDecodeError) as exc:
@@ -815,13 +1086,11 @@ def load_questions(filename: str, silent: bool = False) -> QuestionSet:
                 error_handler(translate_ui("config.error.load_failed", default="Fehler beim Laden von '{filename}': {error}").format(filename=filename, error=last_error))
         return QuestionSet([], {}, filename)
 
-    source_name = filename
-    if filename.startswith(USER_QUESTION_PREFIX):
-        source_name = filename
-    elif resolved_path.name != filename:
-        source_name = resolved_path.name
+    source_name = _source_name_for(filename, resolved_path)
 
     try:
+        if use_compiled:
+            return _load_compiled_question_set(resolved_path, raw, data, source_name, silent, stat)
         return _build_question_set(data, source_name, silent=silent)
     except ValueError as exc:
         if not silent:
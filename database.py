@@ -7,10 +7,16 @@ import time
 import os
 import hashlib
 import binascii
+import copy
 import secrets
 from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterator
 from functools import wraps
 import threading
+import queue
+import atexit
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from helpers.text import get_user_id_hash
 from config import get_package_dir, get_question_counts
 from pacing_helper import compute_total_cooldown_seconds
@@ -96,6 +102,14 @@ def _configure_connection(conn: sqlite3.Connection) -> sqlite3.Connection:
     return conn
 
 
+def _open_connection(db_file: str) -> sqlite3.Connection:
+    db_dir = os.path.dirname(db_file)
+    if db_dir:
+        os.makedirs(db_dir, exist_ok=True)
+    conn = sqlite3.connect(db_file, timeout=_SQLITE_TIMEOUT_SECONDS)
+    return _configure_connection(conn)
+
+
 def get_db_connection():
     """
     Stellt eine thread-lokale SQLite-Verbindung bereit.
@@ -119,12 +133,7 @@ def get_db_connection():
         except sqlite3.Error:
             pass
 
-    db_dir = os.path.dirname(db_file)
-    if db_dir:
-        os.makedirs(db_dir, exist_ok=True)
-
-    conn = sqlite3.connect(db_file, timeout=_SQLITE_TIMEOUT_SECONDS)
-    _configure_connection(conn)
+    conn = _open_connection(db_file)
     _DB_LOCAL.conn = conn
     _DB_LOCAL.db_file = db_file
     return conn
@@ -144,12 +153,286 @@ def _clear_thread_db_connection() -> None:
 get_db_connection.clear = _clear_thread_db_connection  # type: ignore[attr-defined]
 
 
+# -----------------------------
+# Read-Pool für lange Lesezugriffe
+# -----------------------------
+# Die thread-lokale Verbindung aus `get_db_connection` bleibt die
+# Schreibverbindung des Threads. Lange Auswertungen (Admin-Panel,
+# Leaderboard-Neuaufbau) leihen sich stattdessen eine read-only-Verbindung
+# (`mode=ro`, `query_only`) aus einem kleinen Pool. Im WAL-Modus blockieren
+# diese Leser den Writer nicht.
+_READ_POOL_SIZE_ENV = "MC_DB_READ_POOL_SIZE"
+_READ_POOL_DEFAULT_SIZE = 4
+
+_DB_METRICS_LOCK = threading.Lock()
+_DB_LOCK_RETRIES = 0
+_DB_LOCK_FAILURES = 0
+
+
+def _read_pool_size() -> int:
+    raw = os.getenv(_READ_POOL_SIZE_ENV, "").strip()
+    try:
+        size = int(raw) if raw else _READ_POOL_DEFAULT_SIZE
+    except ValueError:
+        size = _READ_POOL_DEFAULT_SIZE
+    return max(0, size)
+
+
+def _record_lock_retry(failed: bool = False) -> None:
+    global _DB_LOCK_RETRIES, _DB_LOCK_FAILURES
+    with _DB_METRICS_LOCK:
+        if failed:
+            _DB_LOCK_FAILURES += 1
+        else:
+            _DB_LOCK_RETRIES += 1
+
+
+def _open_read_only_connection(db_file: str) -> sqlite3.Connection:
+    uri = "file:" + os.path.abspath(db_file).replace("?", "%3f").replace("#", "%23") + "?mode=ro"
+    # Die Verbindung wandert zwischen Threads, wird aber immer nur von einem
+    # Thread gleichzeitig benutzt (siehe _ReadConnectionPool).
+    conn = sqlite3.connect(uri, uri=True, timeout=_SQLITE_TIMEOUT_SECONDS, check_same_thread=False)
+    conn.execute(f"PRAGMA busy_timeout={_SQLITE_BUSY_TIMEOUT_MS};")
+    conn.execute("PRAGMA query_only=ON;")
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+class _ReadConnectionPool:
+    """Begrenzter Pool von read-only-Verbindungen auf eine Datenbankdatei."""
+
+    def __init__(self, db_file: str, size: int):
+        self.db_file = db_file
+        self.size = size
+        self._cond = threading.Condition()
+        self._idle: list[sqlite3.Connection] = []
+        self._opened = 0
+        self._in_use = 0
+        self._max_in_use = 0
+        self._acquisitions = 0
+        self._waits = 0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+        self._fallbacks = 0
+        self._closed = False
+
+    def acquire(self, timeout: float = _SQLITE_TIMEOUT_SECONDS) -> sqlite3.Connection | None:
+        """Leiht eine Verbindung aus; None, wenn der Pool erschöpft oder nicht nutzbar ist."""
+        started = time.monotonic()
+        with self._cond:
+            waited = False
+            while not self._closed and not self._idle and self._opened >= self.size:
+                remaining = timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    self._fallbacks += 1
+                    return None
+                waited = True
+                self._cond.wait(remaining)
+            if self._closed:
+                self._fallbacks += 1
+                return None
+            conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                self._opened += 1
+            self._in_use += 1
+            self._max_in_use = max(self._max_in_use, self._in_use)
+            self._acquisitions += 1
+            wait_seconds = time.monotonic() - started
+            if waited:
+                self._waits += 1
+            self._wait_seconds += wait_seconds
+            self._max_wait_seconds = max(self._max_wait_seconds, wait_seconds)
+        if conn is None:
+            try:
+                conn = _open_read_only_connection(self.db_file)
+            except sqlite3.Error as e:
+                print(f"Datenbankfehler beim Öffnen einer Leseverbindung: {e}")
+                with self._cond:
+                    self._opened -= 1
+                    self._in_use -= 1
+                    self._fallbacks += 1
+                    self._cond.notify()
+                return None
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            keep = True
+        except sqlite3.Error:
+            keep = False
+        with self._cond:
+            self._in_use -= 1
+            if keep and not self._closed:
+                self._idle.append(conn)
+            else:
+                self._opened -= 1
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._cond.notify()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._opened -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "size": self.size,
+                "open": self._opened,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "max_in_use": self._max_in_use,
+                "acquisitions": self._acquisitions,
+                "waits": self._waits,
+                "wait_seconds_total": round(self._wait_seconds, 6),
+                "wait_seconds_max": round(self._max_wait_seconds, 6),
+                "fallbacks": self._fallbacks,
+            }
+
+
+_READ_POOL: _ReadConnectionPool | None = None
+_READ_POOL_LOCK = threading.Lock()
+
+
+def _get_read_pool() -> _ReadConnectionPool | None:
+    global _READ_POOL
+    size = _read_pool_size()
+    if size <= 0:
+        return None
+    db_file = _current_database_file()
+    with _READ_POOL_LOCK:
+        pool = _READ_POOL
+        if pool is None or pool.db_file != db_file or pool.size != size:
+            if pool is not None:
+                pool.close()
+            pool = _READ_POOL = _ReadConnectionPool(db_file, size)
+        return pool
+
+
+@contextmanager
+def db_read_connection():
+    """Leiht eine read-only-Verbindung für (lange) Lesezugriffe aus.
+
+    Ist der Pool deaktiviert (`MC_DB_READ_POOL_SIZE=0`), erschöpft oder die
+    Datenbankdatei noch nicht angelegt, wird die thread-lokale Verbindung aus
+    `get_db_connection` verwendet.
+    """
+    pool = _get_read_pool()
+    conn = None
+    if pool is not None and os.path.exists(pool.db_file):
+        conn = pool.acquire()
+    if conn is None:
+        yield get_db_connection()
+        return
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+
+def close_read_pool() -> None:
+    """Schließt alle freien Verbindungen des Read-Pools."""
+    global _READ_POOL
+    with _READ_POOL_LOCK:
+        pool, _READ_POOL = _READ_POOL, None
+    if pool is not None:
+        pool.close()
+
+
+def get_db_pool_stats() -> dict:
+    """Liefert Kennzahlen zu Read-Pool und Lock-Retries (für Monitoring/Admin)."""
+    with _READ_POOL_LOCK:
+        pool = _READ_POOL
+    stats = {
+        "size": _read_pool_size(), "open": 0, "in_use": 0, "idle": 0, "max_in_use": 0,
+        "acquisitions": 0, "waits": 0, "wait_seconds_total": 0.0, "wait_seconds_max": 0.0,
+        "fallbacks": 0,
+    }
+    if pool is not None:
+        stats.update(pool.stats())
+    with _DB_METRICS_LOCK:
+        stats["lock_retries"] = _DB_LOCK_RETRIES
+        stats["lock_failures"] = _DB_LOCK_FAILURES
+    return stats
+
+
+atexit.register(close_read_pool)
+
+
+def _reset_read_pool_in_child() -> None:
+    # Verbindungen und Locks des Elternprozesses nicht weiterverwenden (z. B.
+    # in Export-Jobs): SQLite-Handles sind nach fork() nicht nutzbar, und ein
+    # gerade gehaltener Lock würde im Kind nie freigegeben.
+    global _READ_POOL, _READ_POOL_LOCK, _DB_LOCAL, _DB_WRITE_LOCK, _DB_METRICS_LOCK
+    global _SCHEMA_LOCK, _WRITE_QUEUE, _WRITE_QUEUE_LOCK, _DASHBOARD_STATS_LOCK
+    _READ_POOL = None
+    _READ_POOL_LOCK = threading.Lock()
+    _DB_LOCAL = threading.local()
+    _DB_WRITE_LOCK = threading.RLock()
+    _DB_METRICS_LOCK = threading.Lock()
+    _SCHEMA_LOCK = threading.Lock()
+    _WRITE_QUEUE = None  # Der Schreib-Thread existiert im Kind nicht.
+    _WRITE_QUEUE_LOCK = threading.Lock()
+    _DASHBOARD_STATS_LOCK = threading.Lock()
+    _LEADERBOARD_CACHE._lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_read_pool_in_child)
+
+
 @contextmanager
 def db_write_transaction(conn: sqlite3.Connection):
-    """Serialize short SQLite write transactions inside this app process."""
+    """Serialize short SQLite write transactions inside this app process.
+
+    Über `_after_commit` registrierte Callbacks laufen erst, nachdem die
+    äußerste Transaktion erfolgreich committet wurde; bei einem Rollback
+    werden sie verworfen.
+    """
     with _DB_WRITE_LOCK:
-        with conn:
-            yield
+        depth = getattr(_DB_LOCAL, "tx_depth", 0)
+        if depth == 0:
+            _DB_LOCAL.after_commit = []
+        _DB_LOCAL.tx_depth = depth + 1
+        try:
+            with conn:
+                yield
+        except BaseException:
+            # `with conn` rollt die gesamte Transaktion zurück, auch verschachtelt.
+            _DB_LOCAL.after_commit = []
+            raise
+        finally:
+            _DB_LOCAL.tx_depth = depth
+        if depth == 0:
+            callbacks, _DB_LOCAL.after_commit = _DB_LOCAL.after_commit, []
+            for callback in callbacks:
+                try:
+                    callback()
+                except Exception as e:
+                    print(f"Fehler in After-Commit-Callback: {e}")
+
+
+def _after_commit(callback) -> None:
+    """Führt `callback` nach dem Commit der laufenden Schreibtransaktion aus.
+
+    Ohne offene Transaktion wird der Callback sofort ausgeführt.
+    """
+    if getattr(_DB_LOCAL, "tx_depth", 0) > 0:
+        _DB_LOCAL.after_commit.append(callback)
+    else:
+        callback()
 
 def with_db_retry(func):
     """
@@ -167,10 +450,12 @@ def with_db_retry(func):
             except sqlite3.OperationalError as e:
                 if _is_sqlite_lock_error(e):
                     if attempt < max_retries - 1:
+                        _record_lock_retry()
                         time.sleep(delay)
                         delay *= 2  # Exponential backoff
                         continue
                     else:
+                        _record_lock_retry(failed=True)
                         st.error(t("database.overloaded", default="Die Datenbank ist momentan stark ausgelastet. Bitte versuche es später erneut."))
                         print(f"Datenbankfehler nach {max_retries} Versuchen: {e}")
                         # Gib einen neutralen Wert zurück, um einen App-Absturz zu verhindern
@@ -179,364 +464,441 @@ def with_db_retry(func):
                     raise  # Andere OperationalErrors weiterwerfen
     return wrapper
 
-def create_tables():
-    """
-    Erstellt die notwendigen Tabellen in der Datenbank, falls sie noch nicht existieren.
-    Verwendet "IF NOT EXISTS", um Fehler bei wiederholten Aufrufen zu vermeiden.
+def _create_schema(conn: sqlite3.Connection) -> None:
+    """Legt alle Tabellen und Indizes an und ergänzt fehlende Spalten.
+
+    Idempotent ("IF NOT EXISTS", Spalten-Checks); läuft innerhalb der
+    Transaktion des Aufrufers.
     """
-    conn = get_db_connection()
-    if conn is None:
-        return
-    
+    # Tabelle für Benutzer
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            user_id TEXT PRIMARY KEY,
+            user_pseudonym TEXT NOT NULL UNIQUE
+            -- recovery_salt and recovery_hash may be added via migration below
+        );
+    """)
+
+    # Tabelle für einzelne Test-Sessions
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS test_sessions (
+            session_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL,
+            questions_file TEXT NOT NULL,
+            start_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            tempo TEXT DEFAULT 'normal',
+            mode TEXT DEFAULT 'exam',
+            FOREIGN KEY (user_id) REFERENCES users (user_id)
+        );
+    """)
+
+    # Tabelle für die Antworten
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS answers (
+            answer_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id INTEGER NOT NULL,
+            question_nr INTEGER NOT NULL,
+            answer_text TEXT NOT NULL,
+            points INTEGER NOT NULL,
+            is_correct BOOLEAN NOT NULL,
+            confidence TEXT,
+            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (session_id) REFERENCES test_sessions (session_id)
+        );
+    """)
+
+    # Tabelle für Audit-Log (Phase 3: Security)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS admin_audit_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT NOT NULL,
+            user_id TEXT NOT NULL,
+            action TEXT NOT NULL,
+            details TEXT,
+            ip_address TEXT,
+            success BOOLEAN NOT NULL DEFAULT 1
+        );
+    """)
+
+    # Tabelle für Login-Versuche (Rate-Limiting)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS admin_login_attempts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            success BOOLEAN NOT NULL,
+            ip_address TEXT,
+            locked_until TEXT
+        );
+    """)
+
+    # Index für schnellere Audit-Log-Abfragen
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_audit_timestamp 
+        ON admin_audit_log(timestamp DESC);
+    """)
+
+    # Index für Login-Attempts Cleanup
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_login_attempts_user 
+        ON admin_login_attempts(user_id, timestamp DESC);
+    """)
+
+    # Tabelle für Lesezeichen (Bookmarks)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS bookmarks (
+            bookmark_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id INTEGER NOT NULL,
+            question_nr INTEGER NOT NULL,
+            FOREIGN KEY (session_id) REFERENCES test_sessions (session_id)
+        );
+    """)
+
+    # Tabelle für gemeldete Probleme
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS feedback (
+            feedback_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id INTEGER NOT NULL,
+            question_nr INTEGER NOT NULL,
+            feedback_type TEXT NOT NULL,
+            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (session_id) REFERENCES test_sessions (session_id)
+        );
+    """)
+
+    # Tabelle für Heartbeats (aktuell aktive Nutzer)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS user_heartbeats (
+            user_id TEXT PRIMARY KEY,
+            session_id INTEGER,
+            last_seen TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+
+    # --- Schema-Migration für bestehende Datenbanken ---
+    # Prüfe, ob die Spalte 'feedback_type' in der 'feedback'-Tabelle existiert.
+    # Robust gegen unerwartete PRAGMA-Rückgaben (leere/tupelartige Zeilen) und
+    # fang mögliche 'duplicate column name' Fehler beim ALTER TABLE ab.
+    cursor = conn.cursor()
     try:
-        # db_write_transaction startet eine Transaktion. Bei Erfolg wird sie committet,
-        # bei einem Fehler automatisch zurückgerollt.
-        with db_write_transaction(conn):
-            # Tabelle für Benutzer
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS users (
-                    user_id TEXT PRIMARY KEY,
-                    user_pseudonym TEXT NOT NULL UNIQUE
-                    -- recovery_salt and recovery_hash may be added via migration below
-                );
-            """)
-
-            # Tabelle für einzelne Test-Sessions
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS test_sessions (
-                    session_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id TEXT NOT NULL,
-                    questions_file TEXT NOT NULL,
-                    start_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    tempo TEXT DEFAULT 'normal',
-                    mode TEXT DEFAULT 'exam',
-                    FOREIGN KEY (user_id) REFERENCES users (user_id)
-                );
-            """)
-
-            # Tabelle für die Antworten
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS answers (
-                    answer_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    session_id INTEGER NOT NULL,
-                    question_nr INTEGER NOT NULL,
-                    answer_text TEXT NOT NULL,
-                    points INTEGER NOT NULL,
-                    is_correct BOOLEAN NOT NULL,
-                    confidence TEXT,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (session_id) REFERENCES test_sessions (session_id)
-                );
-            """)
-            
-            # Tabelle für Audit-Log (Phase 3: Security)
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS admin_audit_log (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
-                    user_id TEXT NOT NULL,
-                    action TEXT NOT NULL,
-                    details TEXT,
-                    ip_address TEXT,
-                    success BOOLEAN NOT NULL DEFAULT 1
-                );
-            """)
-            
-            # Tabelle für Login-Versuche (Rate-Limiting)
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS admin_login_attempts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id TEXT NOT NULL,
-                    timestamp TEXT NOT NULL,
-                    success BOOLEAN NOT NULL,
-                    ip_address TEXT,
-                    locked_until TEXT
-                );
-            """)
-            
-            # Index für schnellere Audit-Log-Abfragen
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_audit_timestamp 
-                ON admin_audit_log(timestamp DESC);
-            """)
-            
-            # Index für Login-Attempts Cleanup
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_login_attempts_user 
-                ON admin_login_attempts(user_id, timestamp DESC);
-            """)
-
-            # Tabelle für Lesezeichen (Bookmarks)
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS bookmarks (
-                    bookmark_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    session_id INTEGER NOT NULL,
-                    question_nr INTEGER NOT NULL,
-                    FOREIGN KEY (session_id) REFERENCES test_sessions (session_id)
-                );
-            """)
-
-            # Tabelle für gemeldete Probleme
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS feedback (
-                    feedback_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    session_id INTEGER NOT NULL,
-                    question_nr INTEGER NOT NULL,
-                    feedback_type TEXT NOT NULL,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (session_id) REFERENCES test_sessions (session_id)
-                );
-            """)
-
-            # Tabelle für Heartbeats (aktuell aktive Nutzer)
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS user_heartbeats (
-                    user_id TEXT PRIMARY KEY,
-                    session_id INTEGER,
-                    last_seen TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
-                );
-            """)
-
-            # --- Schema-Migration für bestehende Datenbanken ---
-            # Prüfe, ob die Spalte 'feedback_type' in der 'feedback'-Tabelle existiert.
-            # Robust gegen unerwartete PRAGMA-Rückgaben (leere/tupelartige Zeilen) und
-            # fang mögliche 'duplicate column name' Fehler beim ALTER TABLE ab.
-            cursor = conn.cursor()
-            try:
-                cursor.execute("PRAGMA table_info(feedback)")
-                rows = cursor.fetchall()
-            except sqlite3.Error:
-                rows = []
+        cursor.execute("PRAGMA table_info(feedback)")
+        rows = cursor.fetchall()
+    except sqlite3.Error:
+        rows = []
 
-            columns = []
-            for info in rows:
-                # info kann ein sqlite3.Row, Tuple oder ähnliches sein. Versuche
-                # zunächst den zweiten Index zu lesen, fallback auf Key 'name'.
-                name = None
-                try:
-                    if hasattr(info, 'keys') and 'name' in info.keys():
-                        name = info['name']
-                    elif isinstance(info, (list, tuple)) and len(info) > 1:
-                        name = info[1]
-                except Exception:
-                    name = None
-                if name:
-                    columns.append(name)
+    columns = []
+    for info in rows:
+        # info kann ein sqlite3.Row, Tuple oder ähnliches sein. Versuche
+        # zunächst den zweiten Index zu lesen, fallback auf Key 'name'.
+        name = None
+        try:
+            if hasattr(info, 'keys') and 'name' in info.keys():
+                name = info['name']
+            elif isinstance(info, (list, tuple)) and len(info) > 1:
+                name = info[1]
+        except Exception:
+            name = None
+        if name:
+            columns.append(name)
 
-            # Migration: Füge optionale Spalten für Recovery (salt + hash) hinzu,
-            # damit Nutzer ein Geheimwort zum späteren Wiederherstellen hinterlegen können.
-            # Zuerst Spalten der users-Tabelle laden (nicht feedback-Tabelle verwenden!)
-            try:
-                cursor.execute("PRAGMA table_info(users)")
-                u_rows = cursor.fetchall()
-            except sqlite3.Error:
-                u_rows = []
+    # Migration: Füge optionale Spalten für Recovery (salt + hash) hinzu,
+    # damit Nutzer ein Geheimwort zum späteren Wiederherstellen hinterlegen können.
+    # Zuerst Spalten der users-Tabelle laden (nicht feedback-Tabelle verwenden!)
+    try:
+        cursor.execute("PRAGMA table_info(users)")
+        u_rows = cursor.fetchall()
+    except sqlite3.Error:
+        u_rows = []
 
-            user_columns = []
-            for info in u_rows:
-                name = None
-                try:
-                    if hasattr(info, 'keys') and 'name' in info.keys():
-                        name = info['name']
-                    elif isinstance(info, (list, tuple)) and len(info) > 1:
-                        name = info[1]
-                except Exception:
-                    name = None
-                if name:
-                    user_columns.append(name)
+    user_columns = []
+    for info in u_rows:
+        name = None
+        try:
+            if hasattr(info, 'keys') and 'name' in info.keys():
+                name = info['name']
+            elif isinstance(info, (list, tuple)) and len(info) > 1:
+                name = info[1]
+        except Exception:
+            name = None
+        if name:
+            user_columns.append(name)
 
-            if 'recovery_salt' not in user_columns:
-                try:
-                    conn.execute("ALTER TABLE users ADD COLUMN recovery_salt TEXT;")
-                except sqlite3.OperationalError as e:
-                    if 'duplicate column name' in str(e).lower():
-                        pass
-                    else:
-                        raise
+    if 'recovery_salt' not in user_columns:
+        try:
+            conn.execute("ALTER TABLE users ADD COLUMN recovery_salt TEXT;")
+        except sqlite3.OperationalError as e:
+            if 'duplicate column name' in str(e).lower():
+                pass
+            else:
+                raise
 
-            if 'recovery_hash' not in user_columns:
-                try:
-                    conn.execute("ALTER TABLE users ADD COLUMN recovery_hash TEXT;")
-                except sqlite3.OperationalError as e:
-                    if 'duplicate column name' in str(e).lower():
-                        pass
-                    else:
-                        raise
+    if 'recovery_hash' not in user_columns:
+        try:
+            conn.execute("ALTER TABLE users ADD COLUMN recovery_hash TEXT;")
+        except sqlite3.OperationalError as e:
+            if 'duplicate column name' in str(e).lower():
+                pass
+            else:
+                raise
 
-            if 'feedback_type' not in columns:
-                try:
-                    conn.execute("ALTER TABLE feedback ADD COLUMN feedback_type TEXT NOT NULL DEFAULT 'Unbekannt';")
-                except sqlite3.OperationalError as e:
-                    # Wenn mehrere Prozesse gleichzeitig starten, kann es zu einem
-                    # race-condition kommen und SQLite meldet 'duplicate column name'.
-                    # Das ist ignorierebar, wir wollen idempotentes Verhalten.
-                    if 'duplicate column name' in str(e).lower():
-                        pass
-                    else:
-                        raise
+    if 'feedback_type' not in columns:
+        try:
+            conn.execute("ALTER TABLE feedback ADD COLUMN feedback_type TEXT NOT NULL DEFAULT 'Unbekannt';")
+        except sqlite3.OperationalError as e:
+            # Wenn mehrere Prozesse gleichzeitig starten, kann es zu einem
+            # race-condition kommen und SQLite meldet 'duplicate column name'.
+            # Das ist ignorierebar, wir wollen idempotentes Verhalten.
+            if 'duplicate column name' in str(e).lower():
+                pass
+            else:
+                raise
 
-            # Migration: Confidence-Spalte in answers ergänzen
-            try:
-                cursor.execute("PRAGMA table_info(answers)")
-                a_rows = cursor.fetchall()
-            except sqlite3.Error:
-                a_rows = []
-            answer_columns = []
-            for info in a_rows:
-                name = None
-                try:
-                    if hasattr(info, 'keys') and 'name' in info.keys():
-                        name = info['name']
-                    elif isinstance(info, (list, tuple)) and len(info) > 1:
-                        name = info[1]
-                except Exception:
-                    name = None
-                if name:
-                    answer_columns.append(name)
-            if 'confidence' not in answer_columns:
-                try:
-                    conn.execute("ALTER TABLE answers ADD COLUMN confidence TEXT;")
-                except sqlite3.OperationalError as e:
-                    if 'duplicate column name' in str(e).lower():
-                        pass
-                    else:
-                        raise
+    # Migration: Confidence-Spalte in answers ergänzen
+    try:
+        cursor.execute("PRAGMA table_info(answers)")
+        a_rows = cursor.fetchall()
+    except sqlite3.Error:
+        a_rows = []
+    answer_columns = []
+    for info in a_rows:
+        name = None
+        try:
+            if hasattr(info, 'keys') and 'name' in info.keys():
+                name = info['name']
+            elif isinstance(info, (list, tuple)) and len(info) > 1:
+                name = info[1]
+        except Exception:
+            name = None
+        if name:
+            answer_columns.append(name)
+    if 'confidence' not in answer_columns:
+        try:
+            conn.execute("ALTER TABLE answers ADD COLUMN confidence TEXT;")
+        except sqlite3.OperationalError as e:
+            if 'duplicate column name' in str(e).lower():
+                pass
+            else:
+                raise
 
-            # Indizes zur Beschleunigung von Abfragen
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_answers_session_id ON answers (session_id);")
-            conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_answers_session_conf_qn ON answers (session_id, confidence, question_nr);"
-            )
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_bookmarks_session_question ON bookmarks (session_id, question_nr);")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_test_sessions_user_id ON test_sessions (user_id);")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_test_sessions_questions_file ON test_sessions (questions_file);")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_feedback_session_id ON feedback (session_id);")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_feedback_timestamp ON feedback (timestamp DESC);")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_heartbeats_last_seen ON user_heartbeats (last_seen DESC);")
-
-            # --- Neue Indizes für Performance-Optimierung ---
-            # Beschleunigt das Nachschlagen von Benutzern anhand ihres Pseudonyms (UNIQUE stellt sicher, dass es eindeutig ist)
-            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_users_pseudonym ON users (user_pseudonym);")
-            # Beschleunigt die Sortierung der Antworten nach Zeitstempel im Admin-Panel
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_answers_timestamp ON answers (timestamp DESC);")
-
-            # --- Dedupe / unique index for answers per (session_id, question_nr) ---
-            # If there are duplicate rows for the same (session_id, question_nr) we
-            # remove all but the latest attempt (by timestamp) and then create a
-            # unique index to prevent future duplicates. This is a best-effort,
-            # idempotent migration step and tolerates older databases that might
-            # contain duplicates.
-            try:
-                cursor.execute(
-                    "SELECT session_id, question_nr, COUNT(*) as c FROM answers GROUP BY session_id, question_nr HAVING c > 1"
-                )
-                dupes = cursor.fetchall()
-                if dupes:
-                    print(f"Found {len(dupes)} duplicate answer groups; consolidating to latest per question.")
-                for d in dupes:
-                    sid = d['session_id']
-                    qn = d['question_nr']
-                    # Keep the latest answer (by timestamp, tie-breaker by answer_id) and delete others
-                    cursor.execute(
-                        """
-                        DELETE FROM answers
-                        WHERE answer_id NOT IN (
-                            SELECT answer_id FROM answers
-                            WHERE session_id = ? AND question_nr = ?
-                            ORDER BY timestamp DESC, answer_id DESC
-                            LIMIT 1
-                        )
-                        AND session_id = ? AND question_nr = ?
-                        """,
-                        (sid, qn, sid, qn),
-                    )
-                # Now create a unique index to prevent future duplicates.
-                conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_answers_session_question ON answers (session_id, question_nr);")
-            except Exception as e:
-                # Migration best-effort: log and continue without failing the whole init
-                print(f"Warning: could not dedupe/create unique index on answers: {e}")
-
-            # Zusammengesetzter Index für Abfragen, die nach Benutzer UND Fragenset filtern
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_test_sessions_user_qfile ON test_sessions (user_id, questions_file);")
-            # Zusammengesetzter Index für die sortierte Testhistorie eines Benutzers
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_test_sessions_user_time ON test_sessions (user_id, start_time DESC);")
-
-            # --- Neue Tabelle: Snapshot-Summaries für Sessions (Option B: robust & performant)
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS test_session_summaries (
-                    session_id INTEGER PRIMARY KEY,
-                    user_id TEXT NOT NULL,
-                    user_pseudonym TEXT,
-                    questions_file TEXT NOT NULL,
-                    questions_title TEXT,
-                    meta_created TEXT,
-                    start_time TEXT NOT NULL,
-                    end_time TEXT,
-                    duration_seconds INTEGER,
-                    question_count INTEGER,
-                    allowed_min INTEGER,
-                    effective_allowed INTEGER,
-                    tempo TEXT,
-                    mode TEXT,
-                    total_points INTEGER,
-                    max_points INTEGER,
-                    correct_count INTEGER,
-                    percent REAL,
-                    time_expired BOOLEAN DEFAULT 0,
-                    exported BOOLEAN DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                );
+    # Indizes zur Beschleunigung von Abfragen
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_answers_session_id ON answers (session_id);")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_answers_session_conf_qn ON answers (session_id, confidence, question_nr);"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_bookmarks_session_question ON bookmarks (session_id, question_nr);")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_test_sessions_user_id ON test_sessions (user_id);")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_test_sessions_questions_file ON test_sessions (questions_file);")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_feedback_session_id ON feedback (session_id);")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_feedback_timestamp ON feedback (timestamp DESC);")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_heartbeats_last_seen ON user_heartbeats (last_seen DESC);")
+
+    # --- Neue Indizes für Performance-Optimierung ---
+    # Beschleunigt das Nachschlagen von Benutzern anhand ihres Pseudonyms (UNIQUE stellt sicher, dass es eindeutig ist)
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_users_pseudonym ON users (user_pseudonym);")
+    # Beschleunigt die Sortierung der Antworten nach Zeitstempel im Admin-Panel
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_answers_timestamp ON answers (timestamp DESC);")
+
+    # --- Dedupe / unique index for answers per (session_id, question_nr) ---
+    # If there are duplicate rows for the same (session_id, question_nr) we
+    # remove all but the latest attempt (by timestamp) and then create a
+    # unique index to prevent future duplicates. This is a best-effort,
+    # idempotent migration step and tolerates older databases that might
+    # contain duplicates.
+    try:
+        cursor.execute(
+            "SELECT session_id, question_nr, COUNT(*) as c FROM answers GROUP BY session_id, question_nr HAVING c > 1"
+        )
+        dupes = cursor.fetchall()
+        if dupes:
+            print(f"Found {len(dupes)} duplicate answer groups; consolidating to latest per question.")
+        for d in dupes:
+            sid = d['session_id']
+            qn = d['question_nr']
+            # Keep the latest answer (by timestamp, tie-breaker by answer_id) and delete others
+            cursor.execute(
                 """
+                DELETE FROM answers
+                WHERE answer_id NOT IN (
+                    SELECT answer_id FROM answers
+                    WHERE session_id = ? AND question_nr = ?
+                    ORDER BY timestamp DESC, answer_id DESC
+                    LIMIT 1
+                )
+                AND session_id = ? AND question_nr = ?
+                """,
+                (sid, qn, sid, qn),
             )
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_summaries_user_time ON test_session_summaries (user_id, start_time DESC);")
-            # --- Schema migration: ensure `tempo` column exists on older DBs ---
-            try:
-                cursor.execute("PRAGMA table_info(test_sessions)")
-                cols_ts = [r['name'] for r in cursor.fetchall()]
-            except Exception:
-                cols_ts = []
+        # Now create a unique index to prevent future duplicates.
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_answers_session_question ON answers (session_id, question_nr);")
+    except Exception as e:
+        # Migration best-effort: log and continue without failing the whole init
+        print(f"Warning: could not dedupe/create unique index on answers: {e}")
+
+    # Zusammengesetzter Index für Abfragen, die nach Benutzer UND Fragenset filtern
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_test_sessions_user_qfile ON test_sessions (user_id, questions_file);")
+    # Zusammengesetzter Index für die sortierte Testhistorie eines Benutzers
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_test_sessions_user_time ON test_sessions (user_id, start_time DESC);")
+
+    # --- Neue Tabelle: Snapshot-Summaries für Sessions (Option B: robust & performant)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS test_session_summaries (
+            session_id INTEGER PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            user_pseudonym TEXT,
+            questions_file TEXT NOT NULL,
+            questions_title TEXT,
+            meta_created TEXT,
+            start_time TEXT NOT NULL,
+            end_time TEXT,
+            duration_seconds INTEGER,
+            question_count INTEGER,
+            allowed_min INTEGER,
+            effective_allowed INTEGER,
+            tempo TEXT,
+            mode TEXT,
+            total_points INTEGER,
+            max_points INTEGER,
+            correct_count INTEGER,
+            percent REAL,
+            time_expired BOOLEAN DEFAULT 0,
+            exported BOOLEAN DEFAULT 0,
+            answers_count INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_summaries_user_time ON test_session_summaries (user_id, start_time DESC);")
+    # --- Schema migration: ensure `tempo` column exists on older DBs ---
+    try:
+        cursor.execute("PRAGMA table_info(test_sessions)")
+        cols_ts = [r['name'] for r in cursor.fetchall()]
+    except Exception:
+        cols_ts = []
+
+    try:
+        if 'tempo' not in cols_ts:
+            # Add tempo with a sensible default for existing rows
+            conn.execute("ALTER TABLE test_sessions ADD COLUMN tempo TEXT DEFAULT 'normal'")
+    except sqlite3.Error:
+        # Best-effort migration; ignore failures on locked/readonly DBs
+        pass
+
+    try:
+        cursor.execute("PRAGMA table_info(test_session_summaries)")
+        cols_summ = [r['name'] for r in cursor.fetchall()]
+    except Exception:
+        cols_summ = []
+
+    try:
+        if 'answers_count' not in cols_summ:
+            conn.execute("ALTER TABLE test_session_summaries ADD COLUMN answers_count INTEGER")
+    except sqlite3.Error:
+        pass
 
+    try:
+        if 'tempo' not in cols_summ:
+            conn.execute("ALTER TABLE test_session_summaries ADD COLUMN tempo TEXT")
+        if 'effective_allowed' not in cols_summ:
+            # add column to store tempo-adjusted allowed minutes (best-effort migration)
             try:
-                if 'tempo' not in cols_ts:
-                    # Add tempo with a sensible default for existing rows
-                    conn.execute("ALTER TABLE test_sessions ADD COLUMN tempo TEXT DEFAULT 'normal'")
-            except sqlite3.Error:
-                # Best-effort migration; ignore failures on locked/readonly DBs
+                conn.execute("ALTER TABLE test_session_summaries ADD COLUMN effective_allowed INTEGER")
+            except sqlite3.OperationalError:
+                # ignore duplicate column or other race conditions
                 pass
+    except sqlite3.Error:
+        pass
+    # Table for per-user preferences (e.g. UI locale) keyed by pseudonym.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS user_preferences (
+            user_pseudonym TEXT NOT NULL,
+            pref_key TEXT NOT NULL,
+            pref_value TEXT,
+            PRIMARY KEY (user_pseudonym, pref_key)
+        );
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_user_prefs_user ON user_preferences(user_pseudonym);")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_summaries_qfile ON test_session_summaries (questions_file, start_time DESC);")
 
-            try:
-                cursor.execute("PRAGMA table_info(test_session_summaries)")
-                cols_summ = [r['name'] for r in cursor.fetchall()]
-            except Exception:
-                cols_summ = []
 
+def _migrate_add_mode_columns(conn: sqlite3.Connection) -> None:
+    """Spalte 'mode' (exam/practice) für Sessions und Summaries nachrüsten."""
+    for table in ("test_sessions", "test_session_summaries"):
+        cols = [r['name'] for r in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+        if 'mode' not in cols:
             try:
-                if 'tempo' not in cols_summ:
-                    conn.execute("ALTER TABLE test_session_summaries ADD COLUMN tempo TEXT")
-                if 'effective_allowed' not in cols_summ:
-                    # add column to store tempo-adjusted allowed minutes (best-effort migration)
-                    try:
-                        conn.execute("ALTER TABLE test_session_summaries ADD COLUMN effective_allowed INTEGER")
-                    except sqlite3.OperationalError:
-                        # ignore duplicate column or other race conditions
-                        pass
-            except sqlite3.Error:
-                pass
-            # Table for per-user preferences (e.g. UI locale) keyed by pseudonym.
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS user_preferences (
-                    user_pseudonym TEXT NOT NULL,
-                    pref_key TEXT NOT NULL,
-                    pref_value TEXT,
-                    PRIMARY KEY (user_pseudonym, pref_key)
-                );
-                """
-            )
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_user_prefs_user ON user_preferences(user_pseudonym);")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_summaries_qfile ON test_session_summaries (questions_file, start_time DESC);")
-            
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN mode TEXT DEFAULT 'exam'")
+            except sqlite3.OperationalError as e:
+                if 'duplicate column name' not in str(e).lower():
+                    raise
+
+
+# -----------------------------
+# Schema-Versionierung
+# -----------------------------
+# Jede Migration erhöht `PRAGMA user_version` auf ihre Nummer. Neue
+# Schemaänderungen werden hinten angehängt, bestehende nie verändert.
+# Version 1 ist das bisherige, idempotente `create_tables` und holt auch
+# Datenbanken ohne gesetzte user_version auf den aktuellen Stand.
+_SCHEMA_MIGRATIONS = (
+    (1, "baseline", _create_schema),
+    (2, "mode columns", _migrate_add_mode_columns),
+)
+SCHEMA_VERSION = _SCHEMA_MIGRATIONS[-1][0]
+
+# DB-Dateien, deren Schema in diesem Prozess bereits geprüft wurde.
+_SCHEMA_READY: set[str] = set()
+_SCHEMA_LOCK = threading.Lock()
+_SCHEMA_STATS = {
+    "bootstraps": 0,
+    "skipped": 0,
+    "applied": [],
+    "last_bootstrap_ms": 0.0,
+}
+
+
+def _get_schema_version(conn: sqlite3.Connection) -> int:
+    return int(conn.execute("PRAGMA user_version").fetchone()[0])
+
+
+def _apply_schema_migrations(conn: sqlite3.Connection) -> list[int]:
+    """Führt alle ausstehenden Migrationen aus und liefert deren Nummern."""
+    if _get_schema_version(conn) >= SCHEMA_VERSION:
+        return []
+    applied = []
+    with db_write_transaction(conn):
+        # Schreibsperre vor dem erneuten Lesen: ein anderer Prozess kann
+        # inzwischen migriert haben.
+        conn.execute("BEGIN IMMEDIATE")
+        current = _get_schema_version(conn)
+        for version, _name, migrate in _SCHEMA_MIGRATIONS:
+            if version <= current:
+                continue
+            migrate(conn)
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            applied.append(version)
+    return applied
+
+
+def create_tables():
+    """
+    Erstellt die notwendigen Tabellen in der Datenbank, falls sie noch nicht existieren.
+    Verwendet "IF NOT EXISTS", um Fehler bei wiederholten Aufrufen zu vermeiden.
+
+    Läuft unabhängig von der Schema-Version vollständig durch (Reparatur);
+    der normale Start geht über `init_database`.
+    """
+    conn = get_db_connection()
+    if conn is None:
+        return
+    
+    try:
+        # db_write_transaction startet eine Transaktion. Bei Erfolg wird sie committet,
+        # bei einem Fehler automatisch zurückgerollt.
+        with db_write_transaction(conn):
+            _create_schema(conn)
     except sqlite3.Error as e:
         print(f"Fehler bei der Tabellenerstellung: {e}")
 
@@ -544,41 +906,46 @@ def init_database():
     """
     Initialisiert die Datenbank. Diese Funktion sollte einmal beim Start
     der Hauptanwendung aufgerufen werden.
+
+    Das Schema wird pro Prozess und DB-Datei nur einmal geprüft; weitere
+    Aufrufe (jeder Streamlit-Rerun) kehren ohne Datenbankzugriff zurück.
+    Ausstehende Migrationen werden anhand von `PRAGMA user_version` ermittelt.
     """
-    # Stelle sicher, dass das Verzeichnis für die DB-Datei existiert, bevor
-    # versucht wird, eine Verbindung herzustellen. Dies ist besonders wichtig
-    # für Cloud-Umgebungen und vermeidet Pfad-Probleme.
-    db_dir = os.path.dirname(DATABASE_FILE)
-    os.makedirs(db_dir, exist_ok=True)
-    create_tables()
-    
-    # --- Migration: Spalte 'mode' nachträglich hinzufügen ---
-    conn = get_db_connection()
-    if conn:
+    db_file = _current_database_file()
+    if db_file in _SCHEMA_READY and os.path.exists(db_file):
+        _SCHEMA_STATS["skipped"] += 1
+        return
+
+    with _SCHEMA_LOCK:
+        if db_file in _SCHEMA_READY and os.path.exists(db_file):
+            _SCHEMA_STATS["skipped"] += 1
+            return
+        started = time.perf_counter()
+        # Stelle sicher, dass das Verzeichnis für die DB-Datei existiert, bevor
+        # versucht wird, eine Verbindung herzustellen. Dies ist besonders wichtig
+        # für Cloud-Umgebungen und vermeidet Pfad-Probleme.
+        db_dir = os.path.dirname(db_file)
+        os.makedirs(db_dir, exist_ok=True)
+        conn = get_db_connection()
+        if conn is None:
+            return
         try:
-            cursor = conn.cursor()
-            
-            # Prüfe test_sessions
-            cursor.execute("PRAGMA table_info(test_sessions)")
-            cols_ts = [r['name'] for r in cursor.fetchall()]
-            if 'mode' not in cols_ts:
-                try:
-                    with db_write_transaction(conn):
-                        conn.execute("ALTER TABLE test_sessions ADD COLUMN mode TEXT DEFAULT 'exam'")
-                except sqlite3.Error:
-                    pass
+            applied = _apply_schema_migrations(conn)
+        except sqlite3.Error as e:
+            print(f"Fehler bei der Tabellenerstellung: {e}")
+            return
+        _SCHEMA_READY.add(db_file)
+        _SCHEMA_STATS["bootstraps"] += 1
+        _SCHEMA_STATS["applied"] = applied
+        _SCHEMA_STATS["last_bootstrap_ms"] = (time.perf_counter() - started) * 1000.0
 
-            # Prüfe test_session_summaries
-            cursor.execute("PRAGMA table_info(test_session_summaries)")
-            cols_summ = [r['name'] for r in cursor.fetchall()]
-            if 'mode' not in cols_summ:
-                try:
-                    with db_write_transaction(conn):
-                        conn.execute("ALTER TABLE test_session_summaries ADD COLUMN mode TEXT DEFAULT 'exam'")
-                except sqlite3.Error:
-                    pass
-        except Exception as e:
-            print(f"Fehler bei der Migration (mode): {e}")
+
+def get_schema_bootstrap_stats() -> dict:
+    """Schema-Version, zuletzt angewandte Migrationen und Bootstrap-Dauer."""
+    stats = dict(_SCHEMA_STATS)
+    stats["applied"] = list(stats["applied"])
+    stats["schema_version"] = SCHEMA_VERSION
+    return stats
 
 
 @with_db_retry
@@ -598,10 +965,20 @@ def add_user(user_id: str, pseudonym: str):
 
 @with_db_retry
 def start_test_session(user_id: str, questions_file: str, tempo: str = 'normal', mode: str = 'exam') -> int | None:
-    """Erstellt eine neue Test-Session für einen Benutzer und gibt die session_id zurück."""
+    """Erstellt eine neue Test-Session für einen Benutzer und gibt die session_id zurück.
+
+    Die Summary-Zeile wird gleich mit angelegt, inklusive der set-abhängigen
+    Felder; Antworten aktualisieren sie danach nur noch inkrementell.
+    """
     conn = get_db_connection()
     if conn is None:
         return None
+    # Außerhalb der Schreibtransaktion: lädt das Fragenset und die AppConfig.
+    try:
+        summary_metadata = _compute_summary_metadata(questions_file, tempo)
+    except Exception:
+        # Best-effort: fehlende Metadaten ergänzt ensure_session_summary später.
+        summary_metadata = None
     try:
         with db_write_transaction(conn):
             cursor = conn.cursor()
@@ -645,86 +1022,581 @@ def start_test_session(user_id: str, questions_file: str, tempo: str = 'normal',
             except Exception:
                 # Best-effort only: do not fail session creation if this insert fails
                 pass
+            _seed_session_summary(conn, session_id, summary_metadata)
 
             return session_id
     except sqlite3.Error as e:
         return _handle_db_error("start_test_session", e, None)
 
+# -----------------------------
+# Write-behind queue (group commit)
+# -----------------------------
+# Optional: Antworten, Lesezeichen und Feedback werden von einem
+# Hintergrund-Thread gesammelt und alle paar Millisekunden in EINER
+# Transaktion committet. Aufrufer erhalten weiterhin eine Bestätigung erst
+# nach dem Commit (bzw. ein Future, auf das sie warten können).
+_WRITE_BEHIND_ENV = "MC_DB_WRITE_BEHIND"
+_WRITE_BEHIND_INTERVAL_ENV = "MC_DB_WRITE_BEHIND_INTERVAL_MS"
+_WRITE_BEHIND_DEFAULT_INTERVAL_MS = 5
+_WRITE_BEHIND_MAX_BATCH = 500
+_WRITE_BEHIND_ACK_TIMEOUT_SECONDS = 30.0
+
+
+def _write_behind_enabled() -> bool:
+    return os.getenv(_WRITE_BEHIND_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _write_behind_interval_seconds() -> float:
+    raw = os.getenv(_WRITE_BEHIND_INTERVAL_ENV, "").strip()
+    try:
+        interval_ms = float(raw) if raw else _WRITE_BEHIND_DEFAULT_INTERVAL_MS
+    except ValueError:
+        interval_ms = _WRITE_BEHIND_DEFAULT_INTERVAL_MS
+    return max(0.0, interval_ms) / 1000.0
+
+
+class _QueuedWrite:
+    """Ein einzelner, noch nicht committeter Schreibauftrag."""
+
+    __slots__ = ("name", "apply", "db_file", "future")
+
+    def __init__(self, name: str, apply, db_file: str):
+        self.name = name
+        self.apply = apply
+        self.db_file = db_file
+        self.future: Future = Future()
+
+
+class _WriteBehindQueue:
+    """Hintergrund-Writer, der Schreibaufträge per Group-Commit bündelt.
+
+    Aufträge werden pro Datenbankdatei in Einreichungsreihenfolge in einer
+    gemeinsamen Transaktion ausgeführt. Schlägt eine Sammeltransaktion fehl
+    (außer durch Lock-Fehler, die mit Backoff wiederholt werden), werden die
+    Aufträge einzeln ausgeführt, damit ein fehlerhafter Auftrag die anderen
+    nicht mitreißt.
+    """
+
+    def __init__(self, interval_seconds: float, max_batch: int = _WRITE_BEHIND_MAX_BATCH):
+        self._interval = interval_seconds
+        self._max_batch = max(1, int(max_batch))
+        self._queue: queue.Queue = queue.Queue()
+        self._connections: dict[str, sqlite3.Connection] = {}
+        self._stats = {"submitted": 0, "committed": 0, "failed": 0, "batches": 0, "max_batch_size": 0}
+        self._stats_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="mc-db-write-behind", daemon=True)
+        self._thread.start()
+
+    def is_alive(self) -> bool:
+        return self._thread.is_alive()
+
+    def submit(self, name: str, apply) -> Future:
+        item = _QueuedWrite(name, apply, _current_database_file())
+        with self._stats_lock:
+            self._stats["submitted"] += 1
+        self._queue.put(item)
+        return item.future
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            snapshot = dict(self._stats)
+        snapshot["pending"] = self._queue.qsize()
+        return snapshot
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch = [first]
+            deadline = time.monotonic() + self._interval
+            while len(batch) < self._max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._commit(batch)
+        for conn in self._connections.values():
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._connections.clear()
+
+    def _connection_for(self, db_file: str) -> sqlite3.Connection:
+        conn = self._connections.get(db_file)
+        if conn is None:
+            conn = _open_connection(db_file)
+            self._connections[db_file] = conn
+        return conn
+
+    def _commit(self, batch: list[_QueuedWrite]) -> None:
+        groups: dict[str, list[_QueuedWrite]] = {}
+        for item in batch:
+            groups.setdefault(item.db_file, []).append(item)
+        for db_file, items in groups.items():
+            try:
+                conn = self._connection_for(db_file)
+            except sqlite3.Error as e:
+                self._fail(items, e)
+                continue
+            try:
+                results = self._apply_with_retry(conn, items)
+            except sqlite3.Error as e:
+                if _is_sqlite_lock_error(e) or len(items) == 1:
+                    self._fail(items, e)
+                    continue
+                # Einzelausführung: nur der fehlerhafte Auftrag schlägt fehl.
+                for item in items:
+                    try:
+                        self._resolve([item], self._apply_with_retry(conn, [item]))
+                    except sqlite3.Error as item_error:
+                        self._fail([item], item_error)
+                continue
+            except Exception as e:  # pragma: no cover - defensive
+                self._fail(items, e)
+                continue
+            self._resolve(items, results)
+            with self._stats_lock:
+                self._stats["batches"] += 1
+                self._stats["max_batch_size"] = max(self._stats["max_batch_size"], len(items))
+
+    @staticmethod
+    def _apply_with_retry(conn: sqlite3.Connection, items: list[_QueuedWrite]) -> list:
+        delay = 0.05
+        for attempt in range(5):
+            try:
+                with db_write_transaction(conn):
+                    return [item.apply(conn) for item in items]
+            except sqlite3.OperationalError as e:
+                if _is_sqlite_lock_error(e) and attempt < 4:
+                    time.sleep(delay)
+                    delay *= 2
+                    continue
+                raise
+        return []  # pragma: no cover - loop always returns or raises
+
+    def _resolve(self, items: list[_QueuedWrite], results: list) -> None:
+        for item, result in zip(items, results):
+            if not item.future.done():
+                item.future.set_result(result)
+        with self._stats_lock:
+            self._stats["committed"] += len(items)
+
+    def _fail(self, items: list[_QueuedWrite], error: BaseException) -> None:
+        for item in items:
+            if not item.future.done():
+                item.future.set_exception(error)
+        with self._stats_lock:
+            self._stats["failed"] += len(items)
+
+
+_WRITE_QUEUE: _WriteBehindQueue | None = None
+_WRITE_QUEUE_LOCK = threading.Lock()
+
+
+def _get_write_queue() -> _WriteBehindQueue:
+    global _WRITE_QUEUE
+    with _WRITE_QUEUE_LOCK:
+        if _WRITE_QUEUE is None or not _WRITE_QUEUE.is_alive():
+            _WRITE_QUEUE = _WriteBehindQueue(_write_behind_interval_seconds())
+        return _WRITE_QUEUE
+
+
+def _submit_write(name: str, apply) -> Future:
+    """Reicht einen Schreibauftrag ein und liefert ein Future auf das Commit.
+
+    Ohne aktivierten Write-Behind-Modus wird der Auftrag sofort in einer
+    eigenen Transaktion ausgeführt und ein bereits erfülltes Future geliefert.
+    """
+    if _write_behind_enabled():
+        return _get_write_queue().submit(name, apply)
+    future: Future = Future()
+    conn = get_db_connection()
+    if conn is None:
+        future.set_result(False)
+        return future
+    try:
+        with db_write_transaction(conn):
+            future.set_result(apply(conn))
+    except sqlite3.Error as e:
+        future.set_exception(e)
+    return future
+
+
+def _await_write(name: str, future: Future, default=False):
+    """Wartet auf die Bestätigung eines Schreibauftrags (durable ack)."""
+    try:
+        return future.result(timeout=_WRITE_BEHIND_ACK_TIMEOUT_SECONDS)
+    except FutureTimeoutError:
+        print(f"Datenbankfehler in {name}: Schreibbestätigung nach {_WRITE_BEHIND_ACK_TIMEOUT_SECONDS}s ausstehend")
+        return default
+    except sqlite3.Error as e:
+        return _handle_db_error(name, e, default)
+
+
+def flush_write_queue(timeout: float | None = _WRITE_BEHIND_ACK_TIMEOUT_SECONDS) -> bool:
+    """Wartet, bis alle bisher eingereihten Schreibaufträge committet sind."""
+    if _WRITE_QUEUE is None or not _WRITE_QUEUE.is_alive():
+        return True
+    barrier = _WRITE_QUEUE.submit("flush_write_queue", lambda conn: True)
+    try:
+        barrier.result(timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+
+def shutdown_write_queue(timeout: float | None = 5.0) -> None:
+    """Leert die Queue und beendet den Writer-Thread (z.B. beim Prozessende)."""
+    global _WRITE_QUEUE
+    with _WRITE_QUEUE_LOCK:
+        write_queue, _WRITE_QUEUE = _WRITE_QUEUE, None
+    if write_queue is not None and write_queue.is_alive():
+        write_queue.stop(timeout)
+
+
+def get_write_queue_stats() -> dict:
+    """Liefert Zähler des Write-Behind-Writers (für Monitoring/Admin)."""
+    stats = {"enabled": _write_behind_enabled(), "submitted": 0, "committed": 0,
+             "failed": 0, "batches": 0, "max_batch_size": 0, "pending": 0}
+    if _WRITE_QUEUE is not None:
+        stats.update(_WRITE_QUEUE.stats())
+    return stats
+
+
+atexit.register(shutdown_write_queue)
+
+
+def _apply_save_answer(conn: sqlite3.Connection, session_id: int, question_nr: int, answer_text: str,
+                       points: int, is_correct: bool, confidence: str | None) -> bool:
+    previous = conn.execute(
+        "SELECT points, is_correct FROM answers WHERE session_id = ? AND question_nr = ?",
+        (session_id, question_nr),
+    ).fetchone()
+    # Use CURRENT_TIMESTAMP to update the timestamp when overwriting
+    conn.execute(
+        """
+        INSERT INTO answers (session_id, question_nr, answer_text, points, is_correct, confidence, timestamp)
+        VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(session_id, question_nr) DO UPDATE SET
+            answer_text = excluded.answer_text,
+            points = excluded.points,
+            is_correct = excluded.is_correct,
+            confidence = excluded.confidence,
+            timestamp = CURRENT_TIMESTAMP
+        """,
+        (session_id, question_nr, answer_text, points, 1 if is_correct else 0, confidence),
+    )
+    # Summary im selben Commit fortschreiben, damit Leaderboard/Historie nie veralten.
+    _apply_summary_delta(conn, session_id, question_nr, previous, points, is_correct)
+    return True
+
+
+def _apply_add_feedback(conn: sqlite3.Connection, session_id: int, question_nr: int,
+                        feedback_types: list[str]) -> bool:
+    feedback_to_insert = [(session_id, question_nr, f_type) for f_type in feedback_types]
+    conn.executemany(
+        "INSERT INTO feedback (session_id, question_nr, feedback_type) VALUES (?, ?, ?)",
+        feedback_to_insert
+    )
+    return True
+
+
+def _apply_update_bookmarks(conn: sqlite3.Connection, session_id: int, bookmarked_question_nrs: list[int]) -> bool:
+    # Lösche zuerst alle existierenden Lesezeichen für die Session
+    conn.execute("DELETE FROM bookmarks WHERE session_id = ?", (session_id,))
+    # Füge dann die neuen Lesezeichen hinzu
+    if bookmarked_question_nrs:
+        bookmarks_to_insert = [(session_id, q_nr) for q_nr in bookmarked_question_nrs]
+        conn.executemany(
+            "INSERT INTO bookmarks (session_id, question_nr) VALUES (?, ?)",
+            bookmarks_to_insert
+        )
+    return True
+
+
+def save_answer_async(session_id: int, question_nr: int, answer_text: str, points: int, is_correct: bool,
+                      confidence: str | None = None) -> Future:
+    """Wie `save_answer`, liefert aber ein Future, das nach dem Commit erfüllt ist.
+
+    Das UPSERT auf (session_id, question_nr) bleibt idempotent, sodass ein
+    erneutes Einreichen nach einem Fehler (at-least-once) unkritisch ist.
+    """
+    args = (session_id, question_nr, answer_text, points, is_correct, confidence)
+    return _submit_write("save_answer", lambda conn: _apply_save_answer(conn, *args))
+
+
 @with_db_retry
 def save_answer(session_id: int, question_nr: int, answer_text: str, points: int, is_correct: bool, confidence: str | None = None):
     """Speichert die Antwort eines Nutzers in der Datenbank.
 
     Verwende ein UPSERT (ON CONFLICT ... DO UPDATE) auf (session_id, question_nr),
     damit schnelle Doppel‑Submits oder Reruns nicht mehrere Zeilen anlegen.
+    Im Write-Behind-Modus (`MC_DB_WRITE_BEHIND=1`) kehrt der Aufruf erst
+    zurück, wenn der gebündelte Commit bestätigt ist. In beiden Modi ist das
+    Ergebnis True nach dem Commit und False bei einem Fehler.
     """
+    if _write_behind_enabled():
+        future = save_answer_async(session_id, question_nr, answer_text, points, is_correct, confidence)
+        return _await_write("save_answer", future, False)
     conn = get_db_connection()
     if conn is None:
-        return
+        return False
     try:
         with db_write_transaction(conn):
-            # Use CURRENT_TIMESTAMP to update the timestamp when overwriting
-            conn.execute(
-                """
-                INSERT INTO answers (session_id, question_nr, answer_text, points, is_correct, confidence, timestamp)
-                VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                ON CONFLICT(session_id, question_nr) DO UPDATE SET
-                    answer_text = excluded.answer_text,
-                    points = excluded.points,
-                    is_correct = excluded.is_correct,
-                    confidence = excluded.confidence,
-                    timestamp = CURRENT_TIMESTAMP
-                """,
-                (session_id, question_nr, answer_text, points, 1 if is_correct else 0, confidence),
-            )
+            _apply_save_answer(conn, session_id, question_nr, answer_text, points, is_correct, confidence)
+        return True
     except sqlite3.Error as e:
         return _handle_db_error("save_answer", e, False)
 
 @with_db_retry
 def add_feedback(session_id: int, question_nr: int, feedback_types: list[str]):
-    """Speichert das Feedback zu einer Frage in der Datenbank."""
+    """Speichert das Feedback zu einer Frage in der Datenbank (True nach dem Commit, sonst False)."""
+    if _write_behind_enabled():
+        future = _submit_write(
+            "add_feedback", lambda conn: _apply_add_feedback(conn, session_id, question_nr, list(feedback_types))
+        )
+        return _await_write("add_feedback", future, False)
     conn = get_db_connection()
     if conn is None:
-        return
+        return False
     try:
         with db_write_transaction(conn):
-            feedback_to_insert = [(session_id, question_nr, f_type) for f_type in feedback_types]
-            conn.executemany(
-                "INSERT INTO feedback (session_id, question_nr, feedback_type) VALUES (?, ?, ?)",
-                feedback_to_insert
-            )
+            _apply_add_feedback(conn, session_id, question_nr, feedback_types)
+        return True
     except sqlite3.Error as e:
         return _handle_db_error("add_feedback", e, False)
 
 
 @with_db_retry
 def update_bookmarks(session_id: int, bookmarked_question_nrs: list[int]):
-    """Aktualisiert die Lesezeichen für eine gegebene Test-Session atomar."""
+    """Aktualisiert die Lesezeichen für eine gegebene Test-Session atomar (True nach dem Commit, sonst False)."""
+    if _write_behind_enabled():
+        future = _submit_write(
+            "update_bookmarks", lambda conn: _apply_update_bookmarks(conn, session_id, list(bookmarked_question_nrs))
+        )
+        return _await_write("update_bookmarks", future, False)
     conn = get_db_connection()
     if conn is None:
-        return
+        return False
     try:
         with db_write_transaction(conn):
-            # Lösche zuerst alle existierenden Lesezeichen für die Session
-            conn.execute("DELETE FROM bookmarks WHERE session_id = ?", (session_id,))
-            # Füge dann die neuen Lesezeichen hinzu
-            if bookmarked_question_nrs:
-                bookmarks_to_insert = [(session_id, q_nr) for q_nr in bookmarked_question_nrs]
-                conn.executemany(
-                    "INSERT INTO bookmarks (session_id, question_nr) VALUES (?, ?)",
-                    bookmarks_to_insert
-                )
+            _apply_update_bookmarks(conn, session_id, bookmarked_question_nrs)
+        return True
     except sqlite3.Error as e:
         return _handle_db_error("update_bookmarks", e, False)
 
+# -----------------------------
+# Leaderboard-Cache
+# -----------------------------
+# Die Top-N-Liste pro (Datenbank, Fragenset, Tempo) wird im Speicher gehalten
+# und bei jeder Änderung einer Summary-Zeile nach dem Commit inkrementell
+# nachgeführt (mit der dann besten Session des Nutzers). Nur wenn ein Eintrag
+# auf den letzten Platz einer vollen Liste abrutscht (und ein nicht gecachter
+# Nutzer nachrücken könnte), wird der Schlüssel verworfen und beim nächsten
+# Lesen neu aus `test_session_summaries` aufgebaut.
+_LEADERBOARD_CACHE_ENV = "MC_LEADERBOARD_CACHE"
+_LEADERBOARD_SIZE = 10
+_LEADERBOARD_PUBLIC_FIELDS = (
+    "user_pseudonym", "total_score", "last_test_time", "duration_seconds",
+    "allowed_min", "effective_allowed", "tempo",
+)
+
+
+def _leaderboard_cache_enabled() -> bool:
+    return os.getenv(_LEADERBOARD_CACHE_ENV, "1").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _leaderboard_sort_key(entry: dict) -> tuple:
+    # Reihenfolge der öffentlichen Liste (ORDER BY total_score DESC, duration_seconds ASC).
+    return (-entry["total_score"], entry["duration_seconds"])
+
+
+class _LeaderboardCache:
+    """Materialisierte Top-N-Leaderboards mit Hit/Miss-Zählern."""
+
+    def __init__(self, size: int = _LEADERBOARD_SIZE):
+        self._size = size
+        self._lock = threading.Lock()
+        self._entries: dict[tuple, list[dict]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        # Wird bei jeder Änderung erhöht; verhindert, dass ein Neuaufbau, der
+        # parallel zu einem Schreibvorgang lief, einen veralteten Stand ablegt.
+        self._version = 0
+
+    def version(self) -> int:
+        with self._lock:
+            return self._version
+
+    def get(self, key: tuple) -> list[dict] | None:
+        with self._lock:
+            entries = self._entries.get(key)
+            if entries is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            return [{field: e[field] for field in _LEADERBOARD_PUBLIC_FIELDS} for e in entries]
+
+    def store(self, key: tuple, entries: list[dict], version: int) -> None:
+        with self._lock:
+            if version == self._version:
+                self._entries[key] = entries
+
+    def apply(self, key: tuple, row: dict) -> None:
+        """Ersetzt den Eintrag eines Nutzers durch seine aktuell beste Session."""
+        with self._lock:
+            self._version += 1
+            entries = self._entries.get(key)
+            if entries is None:
+                return
+            current = next((e for e in entries if e["user_id"] == row["user_id"]), None)
+            if current is None:
+                if len(entries) >= self._size and _leaderboard_sort_key(row) >= _leaderboard_sort_key(entries[-1]):
+                    return
+            else:
+                entries.remove(current)
+            entry = dict(row)
+            entries.append(entry)
+            entries.sort(key=_leaderboard_sort_key)
+            if (
+                current is not None
+                and len(entries) >= self._size
+                and entries[-1] is entry
+                and _leaderboard_sort_key(entry) > _leaderboard_sort_key(current)
+            ):
+                # Auf den letzten Platz abgerutscht: ein nicht gecachter Nutzer
+                # könnte jetzt davor liegen.
+                del self._entries[key]
+                self._invalidations += 1
+                return
+            del entries[self._size:]
+
+    def invalidate(self, db_file: str | None = None) -> None:
+        with self._lock:
+            self._version += 1
+            if db_file is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+            else:
+                keys = [key for key in self._entries if key[0] == db_file]
+                dropped = len(keys)
+                for key in keys:
+                    del self._entries[key]
+            self._invalidations += dropped
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits / lookups) if lookups else 0.0,
+                "invalidations": self._invalidations,
+                "cached_keys": len(self._entries),
+            }
+
+
+_LEADERBOARD_CACHE = _LeaderboardCache()
+
+
+def get_leaderboard_cache_stats() -> dict:
+    """Liefert Hit/Miss-Zähler des Leaderboard-Caches (für das Admin-Panel)."""
+    stats = _LEADERBOARD_CACHE.stats()
+    stats["enabled"] = _leaderboard_cache_enabled()
+    return stats
+
+
+def invalidate_leaderboard_cache() -> None:
+    """Verwirft alle gecachten Leaderboards der aktuellen Datenbank."""
+    _LEADERBOARD_CACHE.invalidate(_current_database_file())
+
+
+def _queue_leaderboard_update(conn: sqlite3.Connection, session_id: int) -> None:
+    """Registriert das Nachführen des Leaderboard-Caches nach dem Commit.
+
+    Pro Cache-Schlüssel wird die aktuell beste Session des Nutzers gelesen
+    (gleiche Reihenfolge wie `ROW_NUMBER` in der Leaderboard-Abfrage), damit
+    auch eine andere Session desselben Nutzers nachrücken kann.
+    """
+    if not _leaderboard_cache_enabled():
+        return
+    session = conn.execute(
+        "SELECT user_id, questions_file, mode, tempo, answers_count FROM test_session_summaries WHERE session_id = ?",
+        (session_id,),
+    ).fetchone()
+    if session is None or session["mode"] not in (None, "exam") or session["answers_count"] == 0:
+        return
+    db_file = _current_database_file()
+    tempos = [None]
+    if session["tempo"]:
+        tempos.append(session["tempo"])
+    updates = []
+    for tempo in tempos:
+        query = """
+            SELECT
+                s.session_id,
+                s.user_id,
+                COALESCE(s.user_pseudonym, u.user_pseudonym, SUBSTR(s.user_id, 1, 10)) AS user_pseudonym,
+                COALESCE(s.total_points, 0) AS total_score,
+                s.start_time AS last_test_time,
+                s.duration_seconds AS raw_duration,
+                COALESCE(s.allowed_min, 0) AS allowed_min,
+                COALESCE(s.effective_allowed, 0) AS effective_allowed,
+                s.tempo
+            FROM test_session_summaries s
+            LEFT JOIN users u ON s.user_id = u.user_id
+            WHERE s.user_id = ? AND s.questions_file = ? AND (s.mode IS NULL OR s.mode = 'exam')
+                AND COALESCE(s.answers_count, 1) > 0
+        """
+        params = [session["user_id"], session["questions_file"]]
+        if tempo:
+            query += " AND s.tempo = ?"
+            params.append(tempo)
+        query += " ORDER BY s.total_points DESC, COALESCE(s.duration_seconds, 2147483647) ASC LIMIT 1"
+        row = conn.execute(query, tuple(params)).fetchone()
+        if row is None:
+            continue
+        entry = {field: row[field] for field in _LEADERBOARD_PUBLIC_FIELDS if field != "duration_seconds"}
+        entry["session_id"] = row["session_id"]
+        entry["user_id"] = row["user_id"]
+        entry["duration_seconds"] = row["raw_duration"] if row["raw_duration"] is not None else 0
+        updates.append(((db_file, session["questions_file"], tempo), entry))
+
+    def _apply():
+        for key, entry in updates:
+            _LEADERBOARD_CACHE.apply(key, entry)
+
+    _after_commit(_apply)
+
+
 def get_all_logs_for_leaderboard(questions_file: str, tempo: str | None = None) -> list[dict]:
     """
     Ruft aggregierte Ergebnisse für das Leaderboard für ein bestimmtes Fragenset ab.
+
+    Das Ergebnis wird pro (Fragenset, Tempo) im Leaderboard-Cache gehalten und
+    bei Summary-Änderungen nachgeführt (abschaltbar mit `MC_LEADERBOARD_CACHE=0`).
     """
-    conn = get_db_connection()
-    if conn is None:
-        return []
+    use_cache = _leaderboard_cache_enabled()
+    cache_key = (_current_database_file(), questions_file, tempo or None)
+    if use_cache:
+        cached = _LEADERBOARD_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+        cache_version = _LEADERBOARD_CACHE.version()
     try:
-        cursor = conn.cursor()
         # Diese Abfrage verbindet Benutzer, Sessions und Antworten, um die Gesamtpunktzahl zu berechnen.
         # Die Dauer wird pro Session berechnet und dann pro Benutzer summiert, um die Gesamt-Testzeit zu erhalten.
         # Use the precomputed `test_session_summaries` snapshots when
@@ -754,6 +1626,8 @@ def get_all_logs_for_leaderboard(questions_file: str, tempo: str | None = None)
                 FROM test_session_summaries s
                 LEFT JOIN users u ON s.user_id = u.user_id
                 WHERE s.questions_file = ? AND (s.mode IS NULL OR s.mode = 'exam')
+                    -- Beim Start angelegte Summaries ohne Antwort gehören nicht ins Leaderboard.
+                    AND COALESCE(s.answers_count, 1) > 0
         """
         params = [questions_file]
         if tempo:
@@ -763,6 +1637,8 @@ def get_all_logs_for_leaderboard(questions_file: str, tempo: str | None = None)
         base_query += """
             )
             SELECT
+                session_id,
+                user_id,
                 user_pseudonym,
                 COALESCE(total_score, 0) AS total_score,
                 last_test_time,
@@ -773,11 +1649,18 @@ def get_all_logs_for_leaderboard(questions_file: str, tempo: str | None = None)
             FROM ranked
             WHERE rn = 1
             ORDER BY total_score DESC, duration_seconds ASC
-            LIMIT 10
+            LIMIT ?
             """
-
-        cursor.execute(base_query, tuple(params))
-        return [dict(row) for row in cursor.fetchall()]
+        params.append(_LEADERBOARD_SIZE)
+
+        with db_read_connection() as conn:
+            if conn is None:
+                return []
+            rows = conn.execute(base_query, tuple(params)).fetchall()
+        entries = [dict(row) for row in rows]
+        if use_cache:
+            _LEADERBOARD_CACHE.store(cache_key, entries, cache_version)
+        return [{field: e[field] for field in _LEADERBOARD_PUBLIC_FIELDS} for e in entries]
     except sqlite3.Error as e:
         print(f"Database error in get_all_logs_for_leaderboard: {e}")
         return []
@@ -795,41 +1678,126 @@ def get_used_pseudonyms() -> list[str]:
         print(f"Database error in get_used_pseudonyms: {e}")
         return []
 
-def get_all_answer_logs() -> list[dict]:
+ANSWER_LOG_COLUMNS = (
+    "user_id_hash", "user_id_display", "user_id_plain", "frage_nr", "antwort", "confidence",
+    "richtig", "zeit", "questions_file", "tempo", "markiert",
+)
+_ANSWER_LOG_BATCH_SIZE = 5000
+
+
+def _answer_log_timestamp(value) -> str:
+    # answers.timestamp wird als naiver UTC-Zeitstempel (CURRENT_TIMESTAMP) gespeichert.
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return str(value)
+
+
+def iter_answer_log_batches(
+    questions_file: str | None = None,
+    tempo: str | None = None,
+    since=None,
+    until=None,
+    batch_size: int = _ANSWER_LOG_BATCH_SIZE,
+) -> Iterator[dict[str, list]]:
+    """Liefert die Antwort-Logs für das Admin-Panel spaltenweise in Batches.
+
+    Filter nach Fragenset, Tempo und Zeitraum (`since` inklusiv, `until`
+    exklusiv; `datetime` oder 'YYYY-MM-DD HH:MM:SS' in UTC) werden in SQL
+    ausgewertet. Jeder Batch ist ein Dict {Spalte: Werte} mit höchstens
+    `batch_size` Zeilen und lässt sich direkt in einen DataFrame überführen,
+    ohne dass je alle Antworten gleichzeitig im Speicher liegen.
     """
-    Ruft alle Antwort-Logs aus der Datenbank für das Admin-Panel ab.
+    where = []
+    params: list = []
+    if questions_file:
+        where.append("s.questions_file = ?")
+        params.append(questions_file)
+    if tempo:
+        where.append("s.tempo = ?")
+        params.append(tempo)
+    if since is not None:
+        where.append("a.timestamp >= ?")
+        params.append(_answer_log_timestamp(since))
+    if until is not None:
+        where.append("a.timestamp < ?")
+        params.append(_answer_log_timestamp(until))
+    # Diese Abfrage rekonstruiert ein ähnliches Format wie die ursprüngliche CSV.
+    query = """
+        SELECT
+            s.user_id AS user_id_hash,
+            SUBSTR(s.user_id, 1, 10) AS user_id_display,
+            u.user_pseudonym AS user_id_plain,
+            a.question_nr AS frage_nr,
+            a.answer_text AS antwort,
+            a.confidence AS confidence,
+            a.points AS richtig,
+            a.timestamp AS zeit,
+            s.questions_file,
+            s.tempo AS tempo,
+            CASE WHEN b.bookmark_id IS NOT NULL THEN 1 ELSE 0 END AS markiert
+        FROM answers a
+        JOIN test_sessions s ON a.session_id = s.session_id
+        JOIN users u ON s.user_id = u.user_id
+        LEFT JOIN bookmarks b ON a.session_id = b.session_id AND a.question_nr = b.question_nr
     """
-    conn = get_db_connection()
-    if conn is None:
-        return []
-    try:
+    if where:
+        query += " WHERE " + " AND ".join(where)
+    query += " ORDER BY a.timestamp"
+
+    with db_read_connection() as conn:
+        if conn is None:
+            return
         cursor = conn.cursor()
-        # Diese Abfrage rekonstruiert ein ähnliches Format wie die ursprüngliche CSV.
-        cursor.execute(
-            """
-            SELECT
-                s.user_id AS user_id_hash,
-                SUBSTR(s.user_id, 1, 10) AS user_id_display,
-                u.user_pseudonym AS user_id_plain,
-                a.question_nr AS frage_nr,
-                a.answer_text AS antwort,
-                a.confidence AS confidence,
-                a.points AS richtig,
-                a.timestamp AS zeit,
-                    s.questions_file,
-                    s.tempo AS tempo,
-                CASE WHEN b.bookmark_id IS NOT NULL THEN 1 ELSE 0 END AS markiert
-            FROM answers a
-            JOIN test_sessions s ON a.session_id = s.session_id
-            JOIN users u ON s.user_id = u.user_id
-            LEFT JOIN bookmarks b ON a.session_id = b.session_id AND a.question_nr = b.question_nr
-            ORDER BY a.timestamp
-            """
-        )
-        return [dict(row) for row in cursor.fetchall()]
+        try:
+            cursor.execute(query, tuple(params))
+            while True:
+                rows = cursor.fetchmany(max(1, int(batch_size)))
+                if not rows:
+                    break
+                yield {column: [row[idx] for row in rows] for idx, column in enumerate(ANSWER_LOG_COLUMNS)}
+        except sqlite3.Error as e:
+            print(f"Datenbankfehler in iter_answer_log_batches: {e}")
+        finally:
+            cursor.close()
+
+
+def get_answer_counts_by_questions_file() -> dict[str, int]:
+    """Zählt die Antworten pro Fragenset, ohne die Logs selbst zu laden."""
+    try:
+        with db_read_connection() as conn:
+            if conn is None:
+                return {}
+            rows = conn.execute(
+                """
+                SELECT s.questions_file, COUNT(*) AS answers
+                FROM answers a
+                JOIN test_sessions s ON a.session_id = s.session_id
+                JOIN users u ON s.user_id = u.user_id
+                WHERE s.questions_file IS NOT NULL AND s.questions_file != ''
+                GROUP BY s.questions_file
+                ORDER BY answers DESC
+                """
+            ).fetchall()
+        return {row["questions_file"]: row["answers"] for row in rows}
     except sqlite3.Error as e:
-        print(f"Datenbankfehler in get_all_answer_logs: {e}")
-        return []
+        print(f"Datenbankfehler in get_answer_counts_by_questions_file: {e}")
+        return {}
+
+
+def get_all_answer_logs() -> list[dict]:
+    """
+    Ruft alle Antwort-Logs aus der Datenbank für das Admin-Panel ab.
+
+    Lädt alles auf einmal; für große Datenbestände `iter_answer_log_batches`
+    mit Filtern verwenden.
+    """
+    logs: list[dict] = []
+    for batch in iter_answer_log_batches():
+        columns = [batch[column] for column in ANSWER_LOG_COLUMNS]
+        logs.extend(dict(zip(ANSWER_LOG_COLUMNS, values)) for values in zip(*columns))
+    return logs
 
 
 def get_answers_for_session(session_id: int) -> list[dict]:
@@ -914,27 +1882,26 @@ def get_all_feedback() -> list[dict]:
     """
     Ruft alle Feedbacks aus der Datenbank für das Admin-Panel ab.
     """
-    conn = get_db_connection()
-    if conn is None:
-        return []
     try:
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT
-                f.feedback_id,
-                f.timestamp,
-                f.question_nr,
-                f.feedback_type,
-                s.questions_file,
-                u.user_pseudonym
-            FROM feedback f
-            JOIN test_sessions s ON f.session_id = s.session_id
-            JOIN users u ON s.user_id = u.user_id
-            ORDER BY f.timestamp DESC
-            """
-        )
-        return [dict(row) for row in cursor.fetchall()]
+        with db_read_connection() as conn:
+            if conn is None:
+                return []
+            rows = conn.execute(
+                """
+                SELECT
+                    f.feedback_id,
+                    f.timestamp,
+                    f.question_nr,
+                    f.feedback_type,
+                    s.questions_file,
+                    u.user_pseudonym
+                FROM feedback f
+                JOIN test_sessions s ON f.session_id = s.session_id
+                JOIN users u ON s.user_id = u.user_id
+                ORDER BY f.timestamp DESC
+                """
+            ).fetchall()
+        return [dict(row) for row in rows]
     except sqlite3.Error as e:
         print(f"Datenbankfehler in get_all_feedback: {e}")
         return []
@@ -1065,8 +2032,8 @@ def reset_all_test_data():
     if conn is None:
         return False
     try:
-        from config import AppConfig
-        admin_user_pseudonym = AppConfig().admin_user
+        from config import get_app_config
+        admin_user_pseudonym = get_app_config().admin_user
 
         with db_write_transaction(conn):
             # Lösche alle Einträge, die nicht zum Admin gehören
@@ -1076,6 +2043,9 @@ def reset_all_test_data():
             # Lösche alle Benutzer außer dem Admin
             if admin_user_pseudonym:
                 conn.execute("DELETE FROM users WHERE user_pseudonym != ?", (admin_user_pseudonym,))
+            # Pseudonyme gelöschter Nutzer fließen als Fallback ins Leaderboard ein.
+            _after_commit(invalidate_leaderboard_cache)
+            _after_commit(invalidate_dashboard_statistics)
         return True
     except sqlite3.Error as e:
         return _handle_db_error("reset_all_test_data", e, False)
@@ -1092,8 +2062,8 @@ def delete_reserved_pseudonyms() -> int:
         return 0
 
     try:
-        from config import AppConfig
-        admin_user_pseudonym = AppConfig().admin_user
+        from config import get_app_config
+        admin_user_pseudonym = get_app_config().admin_user
     except Exception:
         admin_user_pseudonym = None
 
@@ -1138,6 +2108,7 @@ def delete_reserved_pseudonyms() -> int:
                 conn.execute(f"DELETE FROM test_sessions WHERE session_id IN ({s_ph})", session_ids)
 
             conn.execute(f"DELETE FROM users WHERE user_id IN ({placeholders})", user_ids)
+            _after_commit(invalidate_leaderboard_cache)
 
         return len(user_ids)
     except sqlite3.Error as e:
@@ -1158,9 +2129,9 @@ def delete_reserved_pseudonym(pseudonym: str) -> bool:
         return False
 
     try:
-        from config import AppConfig
+        from config import get_app_config
 
-        admin_user_pseudonym = AppConfig().admin_user
+        admin_user_pseudonym = get_app_config().admin_user
     except Exception:
         admin_user_pseudonym = None
 
@@ -1200,6 +2171,7 @@ def delete_reserved_pseudonym(pseudonym: str) -> bool:
                 conn.execute(f"DELETE FROM test_sessions WHERE session_id IN ({placeholders})", session_ids)
 
             conn.execute("DELETE FROM users WHERE user_id = ?", (user_id,))
+            _after_commit(invalidate_leaderboard_cache)
 
         return True
     except sqlite3.Error as e:
@@ -1229,12 +2201,266 @@ def get_database_dump() -> str:
 # -----------------------------
 # Session summaries (snapshots)
 # -----------------------------
+def _compute_summary_metadata(questions_file: str, tempo_val: str | None) -> dict:
+    """Leitet die set-abhängigen Summary-Felder (Maximalpunkte, Zeitlimits, Titel) ab.
+
+    Diese Werte hängen nur vom Fragenset und dem Tempo ab und werden daher
+    einmal in `start_test_session` (vor der Schreibtransaktion) bzw. bei einer
+    vollständigen Neuberechnung bestimmt, nie beim Speichern einer Antwort.
+    """
+    # Load question set metadata to compute max_points and question_count
+    from config import load_questions, get_app_config
+
+    qs = load_questions(questions_file, silent=True)
+    question_count = len(qs) if qs else None
+
+    # Sum weights for max_points
+    max_points = 0
+    if qs:
+        for q in qs:
+            try:
+                max_points += int(q.get('gewichtung', 1))
+            except Exception:
+                max_points += 1
+
+    # allowed_min from QuestionSet (cooldown-aware)
+    allowed_min = None
+    base_total_minutes = None
+    base_minutes = None
+    try:
+        app_cfg = get_app_config()
+        if qs:
+            base_minutes = qs.get_test_duration_minutes(app_cfg.test_duration_minutes)
+        else:
+            base_minutes = getattr(app_cfg, "test_duration_minutes", None)
+
+        if base_minutes is not None:
+            per_weight_minutes: dict[int, float] = {}
+            try:
+                qmeta = getattr(qs, "meta", None)
+                per_weight_raw = None
+                if isinstance(qmeta, dict):
+                    per_weight_raw = qmeta.get("time_per_weight_minutes") or qmeta.get("time_per_weight")
+                if isinstance(per_weight_raw, dict):
+                    for k, v in per_weight_raw.items():
+                        try:
+                            per_weight_minutes[int(k)] = float(v)
+                        except Exception:
+                            continue
+            except Exception:
+                per_weight_minutes = {}
+            if not per_weight_minutes:
+                per_weight_minutes = {1: 0.5, 2: 0.75, 3: 1.0}
+
+            cooldown_seconds = compute_total_cooldown_seconds(
+                list(qs) if qs else [],
+                per_weight_minutes,
+                reading_cooldown_base_per_weight=app_cfg.reading_cooldown_base_per_weight,
+                next_cooldown_extra_standard=app_cfg.next_cooldown_extra_standard,
+                next_cooldown_extra_extended=app_cfg.next_cooldown_extra_extended,
+            )
+            base_total_minutes = base_minutes + (cooldown_seconds / 60.0)
+            allowed_min = int(max(1, round(base_total_minutes)))
+    except Exception:
+        allowed_min = None
+        base_total_minutes = None
+
+    # Fallback: if cooldown computation failed, retain at least the base minutes
+    if allowed_min is None and base_minutes is not None and base_total_minutes is None:
+        try:
+            allowed_min = int(max(1, round(base_minutes)))
+        except Exception:
+            allowed_min = None
+
+    # title and meta.created
+    questions_title = qs.meta.get('title') if qs else None
+    meta_created = qs.meta.get('created') if qs else None
+
+    # Compute tempo-adjusted allowed minutes (effective_allowed) so
+    # downstream evaluation doesn't need to guess the tempo later.
+    effective_allowed = None
+    try:
+        # Map known tempo codes to their multipliers
+        tempo_factor_map = {'normal': 1.0, 'speed': 0.5, 'power': 0.25}
+        factor = tempo_factor_map.get(tempo_val, 1.0) if tempo_val is not None else 1.0
+        minutes_for_effective = base_total_minutes if base_total_minutes is not None else allowed_min
+        if minutes_for_effective is not None:
+            effective_allowed = max(1, int(round(float(minutes_for_effective) * factor)))
+    except Exception:
+        effective_allowed = None
+
+    return {
+        "question_count": question_count,
+        "max_points": max_points,
+        "allowed_min": allowed_min,
+        "effective_allowed": effective_allowed,
+        "questions_title": questions_title,
+        "meta_created": meta_created,
+    }
+
+
+def _seed_session_summary(conn: sqlite3.Connection, session_id: int, metadata: dict | None = None) -> bool:
+    """Legt die Summary-Zeile einer Session an, falls sie noch fehlt.
+
+    Ohne `metadata` bleiben die set-abhängigen Felder (z.B. `max_points`) NULL;
+    `ensure_session_summary` ergänzt sie später über eine Neuberechnung.
+    """
+    meta = metadata or {}
+    cursor = conn.execute(
+        """
+        INSERT INTO test_session_summaries (
+            session_id, user_id, user_pseudonym, questions_file, questions_title, meta_created, mode,
+            start_time, question_count, allowed_min, effective_allowed, tempo,
+            total_points, max_points, correct_count, percent, time_expired, answers_count
+        )
+        SELECT s.session_id, s.user_id, u.user_pseudonym, s.questions_file, ?, ?, s.mode,
+               s.start_time, ?, ?, ?, s.tempo,
+               0, ?, 0, 0.0, 0, 0
+        FROM test_sessions s
+        LEFT JOIN users u ON s.user_id = u.user_id
+        WHERE s.session_id = ?
+        ON CONFLICT(session_id) DO NOTHING
+        """,
+        (
+            meta.get("questions_title"),
+            meta.get("meta_created"),
+            meta.get("question_count"),
+            meta.get("allowed_min"),
+            meta.get("effective_allowed"),
+            meta.get("max_points"),
+            session_id,
+        ),
+    )
+    return cursor.rowcount == 1
+
+
+def _refresh_summary_derived_fields(conn: sqlite3.Connection, session_id: int) -> None:
+    # percent und duration_seconds hängen nur von Werten derselben Zeile ab.
+    # SQLite's julianday() versteht sowohl ISO-Zeitstempel mit Offset als auch
+    # naive UTC-Zeitstempel (CURRENT_TIMESTAMP) und normalisiert beide auf UTC.
+    conn.execute(
+        """
+        UPDATE test_session_summaries SET
+            percent = CASE
+                WHEN COALESCE(max_points, 0) > 0 THEN COALESCE(total_points, 0) * 100.0 / max_points
+                ELSE 0.0
+            END,
+            duration_seconds = CAST(ROUND((julianday(end_time) - julianday(start_time)) * 86400) AS INTEGER)
+        WHERE session_id = ?
+        """,
+        (session_id,),
+    )
+
+
+def _sync_summary_totals(conn: sqlite3.Connection, session_id: int) -> None:
+    """Setzt die laufenden Summen einer Summary-Zeile aus den Antworten neu auf."""
+    conn.execute(
+        """
+        UPDATE test_session_summaries SET
+            total_points = (
+                SELECT COALESCE(SUM(best_points), 0) FROM (
+                    SELECT MAX(points) AS best_points FROM answers
+                    WHERE session_id = ? GROUP BY question_nr
+                )
+            ),
+            correct_count = (
+                SELECT COUNT(*) FROM (
+                    SELECT question_nr FROM answers
+                    WHERE session_id = ? GROUP BY question_nr
+                    HAVING MAX(CASE WHEN is_correct THEN 1 ELSE 0 END) = 1
+                )
+            ),
+            answers_count = (SELECT COUNT(*) FROM answers WHERE session_id = ?),
+            end_time = (SELECT MAX(timestamp) FROM answers WHERE session_id = ?)
+        WHERE session_id = ?
+        """,
+        (session_id, session_id, session_id, session_id, session_id),
+    )
+    _refresh_summary_derived_fields(conn, session_id)
+
+
+def _apply_summary_delta(conn: sqlite3.Connection, session_id: int, question_nr: int,
+                         previous, points: int, is_correct: bool) -> None:
+    """Aktualisiert die Summary einer Session inkrementell nach einem Antwort-UPSERT.
+
+    Da pro (session_id, question_nr) genau eine Antwortzeile existiert, ist die
+    beste Punktzahl einer Frage die der aktuellen Zeile; die laufende Summe
+    ändert sich also um die Differenz zur überschriebenen Antwort.
+    """
+    row = conn.execute(
+        "SELECT answers_count FROM test_session_summaries WHERE session_id = ?",
+        (session_id,),
+    ).fetchone()
+    if row is None:
+        # Session ohne Summary-Zeile (vor diesem Schema gestartet): nur die
+        # Zeile anlegen; die Set-Metadaten ergänzt ensure_session_summary.
+        _seed_session_summary(conn, session_id)
+    if row is None or row["answers_count"] is None:
+        # Neue Zeile bzw. Snapshot aus der Zeit vor den inkrementellen
+        # Summaries: einmalig aus den vorhandenen Antworten aufsetzen.
+        _sync_summary_totals(conn, session_id)
+        _queue_leaderboard_update(conn, session_id)
+        return
+
+    old_points = int(previous["points"]) if previous is not None else 0
+    old_correct = 1 if previous is not None and previous["is_correct"] else 0
+    ts_row = conn.execute(
+        "SELECT timestamp FROM answers WHERE session_id = ? AND question_nr = ?",
+        (session_id, question_nr),
+    ).fetchone()
+    conn.execute(
+        """
+        UPDATE test_session_summaries SET
+            total_points = COALESCE(total_points, 0) + ?,
+            correct_count = COALESCE(correct_count, 0) + ?,
+            answers_count = answers_count + ?,
+            end_time = ?
+        WHERE session_id = ?
+        """,
+        (
+            int(points) - old_points,
+            (1 if is_correct else 0) - old_correct,
+            0 if previous is not None else 1,
+            ts_row["timestamp"] if ts_row is not None else None,
+            session_id,
+        ),
+    )
+    _refresh_summary_derived_fields(conn, session_id)
+    _queue_leaderboard_update(conn, session_id)
+
+
+def ensure_session_summary(session_id: int) -> bool:
+    """Stellt sicher, dass für die Session eine vollständige Summary-Zeile existiert.
+
+    Die Summen werden von `save_answer` laufend gepflegt, daher ist dies im
+    Normalfall ein einzelner Lookup. Nur wenn die Zeile fehlt oder die
+    set-abhängigen Felder nie befüllt wurden (ältere Sessions), wird
+    `recompute_session_summary` als Reparatur ausgeführt.
+    """
+    conn = get_db_connection()
+    if conn is None:
+        return False
+    try:
+        row = conn.execute(
+            "SELECT answers_count, max_points FROM test_session_summaries WHERE session_id = ?",
+            (session_id,),
+        ).fetchone()
+    except sqlite3.Error as e:
+        return _handle_db_error("ensure_session_summary", e, False)
+    if row is not None and row["answers_count"] is not None and row["max_points"] is not None:
+        return True
+    return bool(recompute_session_summary(session_id))
+
+
 @with_db_retry
 def recompute_session_summary(session_id: int) -> bool:
     """Recompute and store the summary for a given session_id.
 
-    This gathers answers and session metadata, computes totals and
-    inserts or replaces a row in `test_session_summaries`.
+    Session metadata is resolved first; the row is then replaced and its
+    totals are aggregated from `answers` (`_sync_summary_totals`) inside one
+    write transaction, so an answer saved concurrently cannot be lost.
+    Summaries are maintained incrementally by `save_answer`; use this as a
+    repair tool (see `ensure_session_summary` and `backfill_session_summaries`).
     """
     conn = get_db_connection()
     if conn is None:
@@ -1258,184 +2484,16 @@ def recompute_session_summary(session_id: int) -> bool:
         start_time = s['start_time']
         mode = s['mode'] if 'mode' in s.keys() else 'exam'
 
-        # Aggregate answers
-        # NOTE: use per-question aggregation (best attempt per question) to avoid
-        # double-counting when multiple answers exist for the same question
-        # within one session (e.g. changed answers, retries). We still compute
-        # a quick timestamp/answers_count aggregate for metadata.
-        cursor.execute(
-            """
-            SELECT
-                MAX(timestamp) as last_answer,
-                COUNT(answer_id) as answers_count
-            FROM answers
-            WHERE session_id = ?
-            """,
-            (session_id,),
-        )
-
-        ts_agg = cursor.fetchone()
-        last_answer = None
-        answers_count = 0
-        if ts_agg:
-            if 'last_answer' in ts_agg.keys():
-                last_answer = ts_agg['last_answer']
-            if ts_agg['answers_count'] is not None:
-                answers_count = int(ts_agg['answers_count'])
-
-        # Per-question aggregation: take the best points per question and
-        # whether any attempt for that question was correct. This prevents
-        # SUM(points) from exceeding the logical max_points for the set.
-        cursor.execute(
-            """
-            SELECT question_nr,
-                   MAX(points) AS best_points,
-                   MAX(CASE WHEN is_correct THEN 1 ELSE 0 END) AS any_correct
-            FROM answers
-            WHERE session_id = ?
-            GROUP BY question_nr
-            """,
-            (session_id,),
-        )
-
-        rows = cursor.fetchall()
-        total_points = 0
-        correct_count = 0
-        if rows:
-            for r in rows:
-                try:
-                    if r['best_points'] is not None:
-                        total_points += int(r['best_points'])
-                except Exception:
-                    try:
-                        total_points += int(r[1])
-                    except Exception:
-                        pass
-                try:
-                    if r['any_correct'] is not None:
-                        correct_count += int(r['any_correct'])
-                except Exception:
-                    try:
-                        correct_count += int(r[2])
-                    except Exception:
-                        pass
-
-        # Load question set metadata to compute max_points and question_count
-        from config import load_questions, AppConfig
-
-        qs = load_questions(questions_file, silent=True)
-        question_count = len(qs) if qs else None
-
-        # Sum weights for max_points
-        max_points = 0
-        if qs:
-            for q in qs:
-                try:
-                    max_points += int(q.get('gewichtung', 1))
-                except Exception:
-                    max_points += 1
-
-        # duration_seconds
-        duration_seconds = None
-        if last_answer and start_time:
-            try:
-                # SQLite stores timestamps as text; try to parse common formats
-                from datetime import datetime
-
-                try:
-                    last_dt = datetime.fromisoformat(last_answer)
-                except Exception:
-                    try:
-                        last_dt = datetime.strptime(last_answer, '%Y-%m-%d %H:%M:%S')
-                    except Exception:
-                        last_dt = None
-
-                try:
-                    start_dt = datetime.fromisoformat(start_time)
-                except Exception:
-                    try:
-                        start_dt = datetime.strptime(start_time, '%Y-%m-%d %H:%M:%S')
-                    except Exception:
-                        start_dt = None
-
-                if last_dt and start_dt:
-                    # Normalize timezone awareness: SQLite CURRENT_TIMESTAMP is UTC
-                    # (naive string). If one datetime is naive and the other aware,
-                    # make the naive one UTC-aware before computing the delta.
-                    from datetime import timezone
-
-                    def _to_utc(dt):
-                        if dt is None:
-                            return None
-                        if dt.tzinfo is None:
-                            # assume naive timestamps are UTC
-                            return dt.replace(tzinfo=timezone.utc)
-                        return dt.astimezone(timezone.utc)
-
-                    last_utc = _to_utc(last_dt)
-                    start_utc = _to_utc(start_dt)
-                    if last_utc and start_utc:
-                        duration_seconds = int((last_utc - start_utc).total_seconds())
-            except Exception:
-                duration_seconds = None
-
-        # percent
-        percent = 0.0
-        if max_points and max_points > 0:
-            percent = (total_points / max_points) * 100
-
-        # allowed_min from QuestionSet (cooldown-aware)
-        allowed_min = None
-        base_total_minutes = None
-        base_minutes = None
+        # capture tempo if present on the originating session (optional)
+        tempo_val = None
         try:
-            app_cfg = AppConfig()
-            if qs:
-                base_minutes = qs.get_test_duration_minutes(app_cfg.test_duration_minutes)
-            else:
-                base_minutes = getattr(app_cfg, "test_duration_minutes", None)
-
-            if base_minutes is not None:
-                per_weight_minutes: dict[int, float] = {}
-                try:
-                    qmeta = getattr(qs, "meta", None)
-                    per_weight_raw = None
-                    if isinstance(qmeta, dict):
-                        per_weight_raw = qmeta.get("time_per_weight_minutes") or qmeta.get("time_per_weight")
-                    if isinstance(per_weight_raw, dict):
-                        for k, v in per_weight_raw.items():
-                            try:
-                                per_weight_minutes[int(k)] = float(v)
-                            except Exception:
-                                continue
-                except Exception:
-                    per_weight_minutes = {}
-                if not per_weight_minutes:
-                    per_weight_minutes = {1: 0.5, 2: 0.75, 3: 1.0}
-
-                cooldown_seconds = compute_total_cooldown_seconds(
-                    list(qs) if qs else [],
-                    per_weight_minutes,
-                    reading_cooldown_base_per_weight=app_cfg.reading_cooldown_base_per_weight,
-                    next_cooldown_extra_standard=app_cfg.next_cooldown_extra_standard,
-                    next_cooldown_extra_extended=app_cfg.next_cooldown_extra_extended,
-                )
-                base_total_minutes = base_minutes + (cooldown_seconds / 60.0)
-                allowed_min = int(max(1, round(base_total_minutes)))
+            if s and 'tempo' in s.keys():
+                tempo_val = s['tempo']
         except Exception:
-            allowed_min = None
-            base_total_minutes = None
-
-        # Fallback: if cooldown computation failed, retain at least the base minutes
-        if allowed_min is None and base_minutes is not None and base_total_minutes is None:
-            try:
-                allowed_min = int(max(1, round(base_minutes)))
-            except Exception:
-                allowed_min = None
+            tempo_val = None
 
-        # title and meta.created
-        questions_title = qs.meta.get('title') if qs else None
-        meta_created = qs.meta.get('created') if qs else None
+        # Lädt ggf. das Fragenset; deshalb außerhalb der Schreibsperre.
+        meta = _compute_summary_metadata(questions_file, tempo_val)
 
         # try to resolve the user's current pseudonym (may be None if user deleted)
         user_pseudonym = None
@@ -1458,63 +2516,41 @@ def recompute_session_summary(session_id: int) -> bool:
             except Exception:
                 pass
 
-        # capture tempo if present on the originating session (optional)
-        tempo_val = None
-        try:
-            if s and 'tempo' in s.keys():
-                tempo_val = s['tempo']
-        except Exception:
-            tempo_val = None
-
-        # Compute tempo-adjusted allowed minutes (effective_allowed) so
-        # downstream evaluation doesn't need to guess the tempo later.
-        effective_allowed = None
-        try:
-            # Map known tempo codes to their multipliers
-            tempo_factor_map = {'normal': 1.0, 'speed': 0.5, 'power': 0.25}
-            factor = tempo_factor_map.get(tempo_val, 1.0) if tempo_val is not None else 1.0
-            minutes_for_effective = base_total_minutes if base_total_minutes is not None else allowed_min
-            if minutes_for_effective is not None:
-                effective_allowed = max(1, int(round(float(minutes_for_effective) * factor)))
-        except Exception:
-            effective_allowed = None
-
+        # Summen, Endzeit, Dauer und Prozent setzt `_sync_summary_totals` aus
+        # den Antworten, im selben Commit wie das Ersetzen der Zeile.
         insert_sql = (
             """
             INSERT OR REPLACE INTO test_session_summaries (
                 session_id, user_id, user_pseudonym, questions_file, questions_title, meta_created, mode,
-                start_time, end_time, duration_seconds, question_count, allowed_min, effective_allowed, tempo,
-                total_points, max_points, correct_count, percent, time_expired
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                start_time, question_count, allowed_min, effective_allowed, tempo,
+                total_points, max_points, correct_count, percent, time_expired, answers_count
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?, 0, 0.0, 0, 0)
             """
         )
+        insert_params = (
+            session_id,
+            user_id,
+            user_pseudonym,
+            questions_file,
+            meta["questions_title"],
+            meta["meta_created"],
+            mode,
+            start_time,
+            meta["question_count"],
+            meta["allowed_min"],
+            meta["effective_allowed"],
+            tempo_val,
+            meta["max_points"],
+        )
 
-        try:
+        def _write_summary() -> None:
             with db_write_transaction(conn):
-                conn.execute(
-                    insert_sql,
-                    (
-                        session_id,
-                        user_id,
-                        user_pseudonym,
-                        questions_file,
-                        questions_title,
-                        meta_created,
-                        mode,
-                        start_time,
-                        last_answer,
-                        duration_seconds,
-                        question_count,
-                        allowed_min,
-                        effective_allowed,
-                        tempo_val,
-                        total_points,
-                        max_points,
-                        correct_count,
-                        percent,
-                        0,
-                    ),
-                )
+                conn.execute(insert_sql, insert_params)
+                _sync_summary_totals(conn, session_id)
+                _queue_leaderboard_update(conn, session_id)
+
+        try:
+            _write_summary()
         except sqlite3.OperationalError as e:
             raise_if_db_locked(e)
             # If the table is missing the `effective_allowed` column (older DBs),
@@ -1524,31 +2560,7 @@ def recompute_session_summary(session_id: int) -> bool:
                 try:
                     with db_write_transaction(conn):
                         conn.execute("ALTER TABLE test_session_summaries ADD COLUMN effective_allowed INTEGER")
-                    with db_write_transaction(conn):
-                        conn.execute(
-                            insert_sql,
-                            (
-                                session_id,
-                                user_id,
-                                user_pseudonym,
-                                questions_file,
-                                questions_title,
-                                meta_created,
-                                mode,
-                                start_time,
-                                last_answer,
-                                duration_seconds,
-                                question_count,
-                                allowed_min,
-                                effective_allowed,
-                                tempo_val,
-                                total_points,
-                                max_points,
-                                correct_count,
-                                percent,
-                                0,
-                            ),
-                        )
+                    _write_summary()
                 except Exception:
                     print(f"Datenbankfehler in recompute_session_summary (retry): {e}")
                     return False
@@ -1608,12 +2620,12 @@ def get_user_test_history(
 
         results: list[dict] = []
         # We lazily load question set metadata for each distinct questions_file
-        from config import load_questions, AppConfig
+        from config import load_questions, get_app_config
 
         qs_cache: dict[str, object] = {}
         app_cfg = None
         try:
-            app_cfg = AppConfig()
+            app_cfg = get_app_config()
         except Exception:
             app_cfg = None
 
@@ -1808,8 +2820,8 @@ def release_unreserved_pseudonyms() -> int:
         return 0
 
     try:
-        from config import AppConfig
-        app_config = AppConfig()
+        from config import get_app_config
+        app_config = get_app_config()
         release_hours = app_config.pseudonym_release_hours
     except Exception:
         release_hours = 24  # Fallback
@@ -1932,6 +2944,7 @@ def release_unreserved_pseudonyms() -> int:
                 cursor.execute(f"DELETE FROM test_sessions WHERE user_id IN ({placeholders})", user_ids_to_delete)
                 cursor.execute(f"DELETE FROM users WHERE user_id IN ({placeholders})", user_ids_to_delete)
                 deleted_count = cursor.rowcount
+                _after_commit(invalidate_leaderboard_cache)
 
         cursor.execute("DROP TABLE _last_sessions")
         return deleted_count
@@ -1966,8 +2979,8 @@ def set_recovery_secret(user_id: str, secret_plain: str) -> bool:
     """
     # Protect the admin pseudonym: do not allow setting/overwriting its recovery secret
     try:
-        from config import AppConfig
-        admin_hash = get_user_id_hash(AppConfig().admin_user)
+        from config import get_app_config
+        admin_hash = get_user_id_hash(get_app_config().admin_user)
         if admin_hash and user_id == admin_hash:
             return False
     except Exception:
@@ -1976,8 +2989,8 @@ def set_recovery_secret(user_id: str, secret_plain: str) -> bool:
         return False
     # Enforce configured minimum length unless explicitly allowed
     try:
-        from config import AppConfig
-        cfg = AppConfig()
+        from config import get_app_config
+        cfg = get_app_config()
         if not getattr(cfg, "recovery_allow_short", False):
             min_len = getattr(cfg, "recovery_min_length", 6)
             if isinstance(min_len, int) and len(secret_plain) < int(min_len):
@@ -2133,128 +3146,153 @@ def set_user_preference(user_pseudonym: str, pref_key: str, pref_value: str) ->
 # Admin Dashboard: Erweiterte Statistik-Funktionen
 # =====================================================================
 
-@with_db_retry
-def get_dashboard_statistics():
-    """
-    Liefert umfassende Statistiken für das Admin-Dashboard.
-    
-    Returns:
-        Dictionary mit:
-        - total_tests: Anzahl Sessions (als Proxy für Tests)
-        - unique_users: Anzahl eindeutiger Teilnehmer
-        - total_feedback: Anzahl gemeldeter Probleme
-        - avg_scores_by_qset: Dict {fragenset: {avg_score, test_count}}
-        - avg_duration: Durchschnittliche Testdauer in Sekunden
-        - completion_rate: Prozentsatz vollständiger Sessions
+_DASHBOARD_STATS_TTL_ENV = "MC_DASHBOARD_STATS_TTL_SECONDS"
+_DASHBOARD_STATS_DEFAULT_TTL_SECONDS = 30.0
+_DASHBOARD_STATS_LOCK = threading.Lock()
+# db_file -> (Zeitstempel, Statistiken)
+_DASHBOARD_STATS_CACHE: dict[str, tuple[float, dict]] = {}
+
+
+def _dashboard_stats_ttl_seconds() -> float:
+    raw = os.getenv(_DASHBOARD_STATS_TTL_ENV, "").strip()
+    try:
+        ttl = float(raw) if raw else _DASHBOARD_STATS_DEFAULT_TTL_SECONDS
+    except ValueError:
+        ttl = _DASHBOARD_STATS_DEFAULT_TTL_SECONDS
+    return max(0.0, ttl)
+
+
+def invalidate_dashboard_statistics() -> None:
+    """Verwirft die zwischengespeicherten Dashboard-Statistiken."""
+    with _DASHBOARD_STATS_LOCK:
+        _DASHBOARD_STATS_CACHE.clear()
+
+
+def _compute_dashboard_statistics(conn: sqlite3.Connection) -> dict:
+    """Berechnet alle Dashboard-Kennzahlen mit einem einzigen Scan über `answers`.
+
+    Pro Session wird einmal aggregiert (Antworten, Punkte, Dauer); diese
+    Rollups werden direkt nach (Fragenset, Anzahl Antworten) verdichtet, sodass
+    Python nur noch wenige Gruppen statt aller Sessions durchläuft.
     """
-    conn = get_db_connection()
-    if conn is None:
-        return None
-    
     cursor = conn.cursor()
-    stats = {}
-    
-    try:
-        # Gesamtzahl Sessions mit mindestens einer Antwort
-        cursor.execute("""
-            SELECT COUNT(DISTINCT s.session_id) as total
-            FROM test_sessions s
-            INNER JOIN answers a ON s.session_id = a.session_id
-        """)
-        stats['total_tests'] = cursor.fetchone()['total']
-        
-        # Anzahl eindeutiger Teilnehmer (Annahme: user_id ist gehashed user_pseudonym)
-        cursor.execute("""
-            SELECT COUNT(DISTINCT user_id) as unique_users
-            FROM test_sessions
-        """)
-        stats['unique_users'] = cursor.fetchone()['unique_users']
-        
-        # Anzahl Feedbacks
-        cursor.execute("SELECT COUNT(*) as total FROM feedback")
-        stats['total_feedback'] = cursor.fetchone()['total']
-        
-        # Durchschnittliche Punktzahl pro Fragenset
-        # Berechne Gesamtpunktzahl pro Session aus answers
-        cursor.execute("""
-            SELECT
-                session_totals.questions_file,
-                AVG(session_totals.session_score) as avg_score,
-                COUNT(*) as test_count
-            FROM (
-                SELECT
-                    s.session_id,
-                    s.questions_file,
-                    SUM(a.points) as session_score
-                FROM test_sessions s
-                INNER JOIN answers a ON s.session_id = a.session_id
-                GROUP BY s.session_id, s.questions_file
-            ) AS session_totals
-            GROUP BY session_totals.questions_file
-        """)
-        
-        avg_scores = {}
-        for row in cursor.fetchall():
-            if row['questions_file']:  # Nur wenn questions_file nicht None
-                avg_scores[row['questions_file']] = {
-                    'avg_score': round(row['avg_score'], 2),
-                    'test_count': row['test_count']
-                }
-        stats['avg_scores_by_qset'] = avg_scores
-        
-        # Durchschnittliche Testdauer
-        # Berechne aus Zeitdifferenz zwischen erster und letzter Antwort pro Session
-        # WICHTIG: JULIANDAY() für korrekte Zeitdifferenz in SQLite (TIMESTAMP als TEXT)
-        cursor.execute("""
-            SELECT AVG(duration) as avg_duration
-            FROM (
-                SELECT 
-                    s.session_id,
-                    CAST((JULIANDAY(MAX(a.timestamp)) - JULIANDAY(MIN(a.timestamp))) * 24 * 60 * 60 AS INTEGER) as duration
-                FROM test_sessions s
-                INNER JOIN answers a ON s.session_id = a.session_id
-                GROUP BY s.session_id
-                HAVING COUNT(a.answer_id) > 1
-            )
-        """)
-        result = cursor.fetchone()
-        # SQLite JULIANDAY() gibt Tage zurück, konvertiert zu Sekunden
-        stats['avg_duration'] = int(result['avg_duration']) if result['avg_duration'] else 0
-        
-        # "Abschlussquote": Anteil der Sessions, in denen alle Fragen beantwortet wurden
-        question_counts = get_question_counts()
-        cursor.execute(
-            """
+    cursor.execute(
+        """
+        WITH per_session AS (
             SELECT
                 s.session_id,
                 s.questions_file,
-                COUNT(a.answer_id) AS answers_count
+                COUNT(a.answer_id) AS answers_count,
+                SUM(a.points) AS session_score,
+                CASE WHEN COUNT(a.answer_id) > 1 THEN
+                    CAST((JULIANDAY(MAX(a.timestamp)) - JULIANDAY(MIN(a.timestamp))) * 24 * 60 * 60 AS INTEGER)
+                END AS duration
             FROM test_sessions s
             LEFT JOIN answers a ON s.session_id = a.session_id
             GROUP BY s.session_id
-            """
         )
-        session_answer_rows = cursor.fetchall()
-        total_sessions = len(session_answer_rows)
-        completed_sessions = 0
-        for row in session_answer_rows:
-            q_file = row["questions_file"]
-            answers_count = row["answers_count"]
-            question_total = question_counts.get(q_file)
-            if question_total and answers_count >= question_total:
-                completed_sessions += 1
-        stats["completion_rate"] = (
+        SELECT
+            questions_file,
+            answers_count,
+            COUNT(*) AS sessions,
+            SUM(session_score) AS score_sum,
+            SUM(duration) AS duration_sum,
+            COUNT(duration) AS duration_count
+        FROM per_session
+        GROUP BY questions_file, answers_count
+        """
+    )
+    groups = cursor.fetchall()
+    cursor.execute(
+        """
+        SELECT
+            (SELECT COUNT(DISTINCT user_id) FROM test_sessions) AS unique_users,
+            (SELECT COUNT(*) FROM feedback) AS total_feedback
+        """
+    )
+    counts = cursor.fetchone()
+
+    question_counts = get_question_counts()
+    total_sessions = 0
+    answered_sessions = 0
+    completed_sessions = 0
+    duration_sum = 0
+    duration_count = 0
+    score_by_qset: dict[str, list] = {}
+    for row in groups:
+        q_file = row["questions_file"]
+        answers_count = row["answers_count"]
+        sessions = row["sessions"]
+        total_sessions += sessions
+        duration_sum += row["duration_sum"] or 0
+        duration_count += row["duration_count"]
+        if answers_count > 0:
+            answered_sessions += sessions
+            if q_file:
+                acc = score_by_qset.setdefault(q_file, [0, 0])
+                acc[0] += row["score_sum"] or 0
+                acc[1] += sessions
+        question_total = question_counts.get(q_file)
+        if question_total and answers_count >= question_total:
+            completed_sessions += sessions
+
+    return {
+        "total_tests": answered_sessions,
+        "unique_users": counts["unique_users"],
+        "total_feedback": counts["total_feedback"],
+        "avg_scores_by_qset": {
+            q_file: {"avg_score": round(score_sum / test_count, 2), "test_count": test_count}
+            for q_file, (score_sum, test_count) in score_by_qset.items()
+        },
+        "avg_duration": int(duration_sum / duration_count) if duration_count else 0,
+        "completion_rate": (
             round((completed_sessions / total_sessions * 100), 1)
             if total_sessions > 0
             else 0
-        )
+        ),
+    }
+
+
+@with_db_retry
+def get_dashboard_statistics(max_age_seconds: float | None = None):
+    """
+    Liefert umfassende Statistiken für das Admin-Dashboard.
+
+    Das Ergebnis wird pro Datenbank kurz zwischengespeichert
+    (`MC_DASHBOARD_STATS_TTL_SECONDS`, Standard 30 s), damit wiederholte
+    Reruns des Admin-Panels keine weiteren Scans auslösen. `max_age_seconds`
+    überschreibt die TTL für einen Aufruf (0 erzwingt eine Neuberechnung).
 
-        return stats
+    Returns:
+        Dictionary mit:
+        - total_tests: Anzahl Sessions (als Proxy für Tests)
+        - unique_users: Anzahl eindeutiger Teilnehmer
+        - total_feedback: Anzahl gemeldeter Probleme
+        - avg_scores_by_qset: Dict {fragenset: {avg_score, test_count}}
+        - avg_duration: Durchschnittliche Testdauer in Sekunden
+        - completion_rate: Prozentsatz vollständiger Sessions
+    """
+    ttl = _dashboard_stats_ttl_seconds() if max_age_seconds is None else max_age_seconds
+    db_file = _current_database_file()
+    now = time.monotonic()
+    with _DASHBOARD_STATS_LOCK:
+        cached = _DASHBOARD_STATS_CACHE.get(db_file)
+    if cached is not None and now - cached[0] < ttl:
+        return copy.deepcopy(cached[1])
 
+    try:
+        with db_read_connection() as conn:
+            if conn is None:
+                return None
+            stats = _compute_dashboard_statistics(conn)
     except sqlite3.Error as e:
         print(f"Datenbankfehler in get_dashboard_statistics: {e}")
         return None
 
+    with _DASHBOARD_STATS_LOCK:
+        _DASHBOARD_STATS_CACHE[db_file] = (now, stats)
+    return copy.deepcopy(stats)
+
 
 def get_active_user_counts():
     """Liefert aktive Nutzer pro Zeitraum basierend auf test_sessions.start_time."""
@@ -90,6 +90,7 @@ CREATE TABLE IF NOT EXISTS test_session_summaries (
   percent REAL,
   time_expired BOOLEAN DEFAULT 0,
   exported BOOLEAN DEFAULT 0,
+  answers_count INTEGER,
   created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -0,0 +1,356 @@
+"""Clientseitiger Countdown und Pacing-Anzeige für den Zeitmodus.
+
+Die Komponente (``st.components.v2``) wird einmal mit Startzeit, Zeitlimit und
+dem idealen Pacing-Plan aus `pacing_helper` initialisiert und zählt danach im
+Browser herunter. Den Server ruft sie nur noch bei zwei Ereignissen auf:
+
+- ``expired``: das Zeitlimit ist abgelaufen,
+- ``panic``: die Restzeit unterschreitet ``verbleibende Fragen × Panik-Schwelle``.
+
+Beide Ereignisse lösen genau einen Rerun aus; alle übrigen Sekunden laufen ohne
+Server-Kontakt. Mit ``MC_CLIENT_TIMER=0`` (oder ohne Streamlit-Runtime, z. B. in
+Tests) verwendet `main_view` weiterhin die iframe-Variante.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+EVENT_EXPIRED = "expired"
+EVENT_PANIC = "panic"
+
+VIEW_TIMER = "timer"
+VIEW_PACING = "pacing"
+
+_COMPONENT_NAME = "mc_exam_timer"
+_COMPONENT: Any = None
+_COMPONENT_LOCK = threading.Lock()
+
+_HTML = """
+<div class="mc-exam-timer"></div>
+"""
+
+_CSS = """
+.mc-countdown {
+  min-height: 88px;
+  box-sizing: border-box;
+  padding: 0.15rem 0 0.25rem 0;
+  font-family: var(--st-font, -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif);
+}
+.mc-countdown-label {
+  color: var(--st-text-color);
+  opacity: 0.8;
+  font-size: 0.875rem;
+  font-weight: 650;
+  line-height: 1.25;
+  margin-bottom: 0.05rem;
+}
+.mc-countdown-value {
+  color: var(--st-text-color);
+  font-size: 2.05rem;
+  font-weight: 800;
+  line-height: 1.1;
+  font-variant-numeric: tabular-nums;
+}
+.mc-countdown-value.mc-urgent {
+  color: var(--st-red-color, #b00020);
+}
+.mc-countdown-warning,
+.mc-countdown-panic,
+.mc-countdown-expired {
+  display: none;
+  box-sizing: border-box;
+  width: fit-content;
+  max-width: 100%;
+  font-size: 0.92rem;
+  font-weight: 800;
+  line-height: 1.25;
+  margin-top: 0.2rem;
+}
+.mc-countdown-warning {
+  color: var(--st-orange-color, #b45309);
+}
+.mc-countdown-panic {
+  color: var(--st-red-color, #b00020);
+}
+.mc-countdown-expired {
+  border: 1px solid var(--st-orange-color, #f59e0b);
+  border-radius: 6px;
+  padding: 0.3rem 0.5rem;
+  color: var(--st-text-color);
+}
+.mc-pacer {
+  box-sizing: border-box;
+  min-height: 50px;
+  padding: 0.15rem 0 0.25rem 0;
+  font-family: var(--st-font, -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif);
+}
+.mc-pacer-track {
+  height: 0.55rem;
+  border-radius: 999px;
+  background: rgba(148, 163, 184, 0.35);
+  overflow: hidden;
+  margin-bottom: 0.35rem;
+}
+.mc-pacer-bar {
+  height: 100%;
+  width: 0%;
+  border-radius: 999px;
+  background: #22c55e;
+  transition: width 180ms linear, background-color 180ms linear;
+}
+.mc-pacer-status {
+  box-sizing: border-box;
+  min-height: 28px;
+  padding: 0.32rem 0.5rem;
+  border-radius: 6px;
+  color: #ffffff;
+  text-align: center;
+  font-size: 0.9rem;
+  font-weight: 750;
+  line-height: 1.2;
+  overflow-wrap: anywhere;
+}
+"""
+
+# Die Funktion wird bei jedem Rerun mit neuen Daten aufgerufen. Der Zustand
+# (Intervall, bereits gemeldete Ereignisse) hängt am Root-Element, damit der
+# Sekundenlauf nicht neu startet und jedes Ereignis pro Seed nur einmal an den
+# Server geht.
+_JS = """
+const COLORS = { ahead: "#0B3D91", green: "#006400", yellow: "#B45309", red: "#8B0000" };
+const BAR_COLORS = { ahead: "#2563eb", green: "#22c55e", yellow: "#f59e0b", red: "#ef4444" };
+
+function formatTime(totalSeconds) {
+  const clamped = Math.max(0, Math.floor(totalSeconds));
+  const minutes = Math.floor(clamped / 60);
+  const seconds = clamped % 60;
+  return String(minutes).padStart(2, "0") + ":" + String(seconds).padStart(2, "0");
+}
+
+function formatWarning(data, remaining) {
+  if (remaining <= 0 || remaining > 600) {
+    return "";
+  }
+  if (remaining <= 60) {
+    return data.texts.warning_seconds;
+  }
+  const minutes = Math.max(1, Math.floor(remaining / 60));
+  return data.texts.warning_minutes.replace("{minutes_text}", minutes + " min");
+}
+
+function panicActive(data, remaining) {
+  return data.panic_threshold_seconds > 0
+    && data.remaining_questions > 0
+    && remaining > 0
+    && remaining < data.remaining_questions * data.panic_threshold_seconds;
+}
+
+function sum(values) {
+  return values.reduce((acc, value) => acc + Number(value || 0), 0);
+}
+
+function pacingStatus(data, elapsed) {
+  const ideal = data.ideal_times;
+  const idx = data.current_index;
+  const remaining = data.limit_seconds - elapsed;
+  if (remaining <= 60) {
+    return "red";
+  }
+  if (remaining < (ideal.length - idx - 1) * 10) {
+    return "red";
+  }
+  if (elapsed + sum(ideal.slice(idx + 1)) > data.limit_seconds) {
+    return "red";
+  }
+  const expected = idx < 0 ? 0 : sum(ideal.slice(0, idx + 1));
+  if (expected <= 0) {
+    return "green";
+  }
+  const delta = elapsed - expected;
+  const pct = delta / expected;
+  if (delta < 0 && Math.abs(delta) >= Math.max(5, Math.round(0.05 * expected))) {
+    return "ahead";
+  }
+  if (pct <= 0.25) {
+    return "green";
+  }
+  if (pct <= 0.50) {
+    return "yellow";
+  }
+  return "red";
+}
+
+function buildTimer(root) {
+  root.innerHTML = '<div class="mc-countdown" role="timer" aria-live="polite">'
+    + '<div class="mc-countdown-label"></div>'
+    + '<div class="mc-countdown-value">--:--</div>'
+    + '<div class="mc-countdown-warning"></div>'
+    + '<div class="mc-countdown-panic"></div>'
+    + '<div class="mc-countdown-expired"></div></div>';
+}
+
+function buildPacer(root) {
+  root.innerHTML = '<div class="mc-pacer" aria-live="polite">'
+    + '<div class="mc-pacer-track" aria-hidden="true"><div class="mc-pacer-bar"></div></div>'
+    + '<div class="mc-pacer-status"></div></div>';
+}
+
+function show(el, text) {
+  el.textContent = text || "";
+  el.style.display = text ? "block" : "none";
+}
+
+export default function(component) {
+  const { data, parentElement, setTriggerValue } = component;
+  const root = parentElement.querySelector(".mc-exam-timer");
+  if (!root || !data) {
+    return;
+  }
+  const state = root.__mcTimer || (root.__mcTimer = { seed: null, reported: {} });
+  if (state.timerId) {
+    window.clearInterval(state.timerId);
+  }
+  if (state.view !== data.view) {
+    state.view = data.view;
+    (data.view === "pacing" ? buildPacer : buildTimer)(root);
+  }
+  if (state.seed !== data.seed) {
+    state.seed = data.seed;
+    state.reported = {};
+  }
+  // Serverzeit -> Browserzeit, damit abweichende Uhren den Countdown nicht verschieben.
+  const clockOffset = Date.now() - data.server_now_ms;
+  const deadline = data.start_ms + data.limit_seconds * 1000;
+  const panicAtSeed = panicActive(data, (deadline - data.server_now_ms) / 1000);
+
+  function report(event) {
+    if (state.reported[event]) {
+      return;
+    }
+    state.reported[event] = true;
+    setTriggerValue("event", event);
+  }
+
+  function tick() {
+    const now = Date.now() - clockOffset;
+    const remaining = Math.max(0, Math.ceil((deadline - now) / 1000));
+    const elapsed = Math.max(0, Math.floor((now - data.start_ms) / 1000));
+    if (data.view === "pacing") {
+      const pct = data.limit_seconds > 0 ? Math.min(100, Math.max(0, (elapsed / data.limit_seconds) * 100)) : 0;
+      const status = pacingStatus(data, elapsed);
+      const bar = root.querySelector(".mc-pacer-bar");
+      const statusEl = root.querySelector(".mc-pacer-status");
+      bar.style.width = pct.toFixed(2) + "%";
+      bar.style.background = BAR_COLORS[status] || BAR_COLORS.green;
+      statusEl.textContent = data.texts.status[status] || status;
+      statusEl.style.background = COLORS[status] || COLORS.green;
+      return;
+    }
+    root.querySelector(".mc-countdown-label").textContent = data.texts.label;
+    const valueEl = root.querySelector(".mc-countdown-value");
+    valueEl.textContent = formatTime(remaining);
+    valueEl.classList.toggle("mc-urgent", remaining <= 60);
+    show(root.querySelector(".mc-countdown-warning"), formatWarning(data, remaining));
+    const panic = panicActive(data, remaining);
+    show(root.querySelector(".mc-countdown-panic"), panic ? data.texts.panic : "");
+    if (panic && !panicAtSeed && data.report_events) {
+      report("panic");
+    }
+    if (remaining <= 0) {
+      show(root.querySelector(".mc-countdown-expired"), data.texts.expired);
+      window.clearInterval(state.timerId);
+      if (data.report_events) {
+        report("expired");
+      }
+    }
+  }
+
+  tick();
+  state.timerId = window.setInterval(tick, 1000);
+  return () => window.clearInterval(state.timerId);
+}
+"""
+
+
+def client_timer_enabled() -> bool:
+    """True, solange ``MC_CLIENT_TIMER`` nicht abgeschaltet ist."""
+    return os.getenv("MC_CLIENT_TIMER", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def _to_epoch_ms(value: Any) -> int:
+    # Der Browser rechnet nur mit Differenzen zu ``server_now_ms``; es genügt,
+    # dass Start und "jetzt" dieselbe (naive, lokale) Serverzeit verwenden.
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_localize(None)
+    return int(ts.value // 1_000_000)
+
+
+def build_timer_seed(
+    start_time: Any,
+    limit_seconds: int,
+    texts: Dict[str, Any],
+    *,
+    view: str = VIEW_TIMER,
+    ideal_times: Optional[List[int]] = None,
+    current_index: int = 0,
+    remaining_questions: int = 0,
+    panic_threshold_seconds: int = 0,
+    now: Any = None,
+) -> Dict[str, Any]:
+    """Daten für eine Komponenten-Instanz.
+
+    Zeiten werden als Millisekunden seit der Epoche auf der Serveruhr
+    übergeben; der Browser gleicht die Abweichung zu seiner Uhr über
+    ``server_now_ms`` aus. ``seed`` ändert sich nur, wenn sich Startzeit,
+    Limit oder die Panik-Parameter ändern, und steuert, welche Ereignisse
+    bereits gemeldet wurden.
+    """
+    start_ms = _to_epoch_ms(start_time)
+    now_ms = _to_epoch_ms(pd.Timestamp.now() if now is None else now)
+    limit = max(0, int(limit_seconds or 0))
+    questions_left = max(0, int(remaining_questions or 0))
+    threshold = max(0, int(panic_threshold_seconds or 0))
+    return {
+        "view": view,
+        "seed": f"{start_ms}:{limit}:{questions_left}:{threshold}",
+        "start_ms": start_ms,
+        "server_now_ms": now_ms,
+        "limit_seconds": limit,
+        "ideal_times": [int(v) for v in (ideal_times or [])],
+        "current_index": int(current_index),
+        "remaining_questions": questions_left,
+        "panic_threshold_seconds": threshold,
+        "report_events": view == VIEW_TIMER,
+        "texts": texts,
+    }
+
+
+def _component():
+    global _COMPONENT
+    if _COMPONENT is None:
+        with _COMPONENT_LOCK:
+            if _COMPONENT is None:
+                from streamlit.components import v2 as components_v2
+
+                _COMPONENT = components_v2.component(_COMPONENT_NAME, html=_HTML, css=_CSS, js=_JS)
+    return _COMPONENT
+
+
+def render_exam_timer(
+    seed: Dict[str, Any],
+    key: str,
+    on_event: Optional[Callable[[], None]] = None,
+) -> Optional[str]:
+    """Bindet die Komponente ein und liefert ein in diesem Rerun gemeldetes Ereignis."""
+    result = _component()(
+        data=seed,
+        key=key,
+        on_event_change=on_event or (lambda: None),
+    )
+    event = getattr(result, "event", None)
+    return event if event in (EVENT_EXPIRED, EVENT_PANIC) else None
@@ -0,0 +1,532 @@
+"""Artefakt-Cache für Exporte (Musterlösung, Mini-Glossar, Anki, arsnova.eu, Lernziele).
+
+Ein Export wird über den Inhalt bestimmt, nicht über den Dateinamen: Der
+Schlüssel ist ein SHA-256 über Exporttyp, Inhalts-Hash des Fragensets (Datei
+plus übergebene Fragenliste), Sprache, Optionen und den Stand des erzeugenden
+Codes (mtime/Größe der Module). Wiederholte Exporte eines unveränderten Sets
+liefern die gespeicherten Bytes ohne erneutes Rendern; jede Änderung am Set,
+an den Optionen oder am Exporter erzeugt einen neuen Schlüssel.
+
+Die Dateien liegen unter ``MC_EXPORT_CACHE_DIR`` (Standard
+``var/export_cache``), daneben führt ``index.sqlite3`` Größe, Erzeugung,
+letzte Nutzung und Treffer pro Artefakt sowie Zähler für Treffer,
+Fehlschläge und Verdrängungen – wie beim Formel-Cache prozessübergreifend.
+Eviction: Einträge älter als ``MC_EXPORT_CACHE_TTL_HOURS`` (Standard 168)
+und LRU über ``MC_EXPORT_CACHE_MAX_MB`` (Standard 500).
+``MC_EXPORT_CACHE=0`` schaltet den Cache ab.
+
+Daneben hält `cached_fragment` fertig gerenderte HTML-Bausteine einzelner
+Fragen (Markdown, Formeln eingesetzt) für Bericht und Musterlösung – im
+Unterverzeichnis ``fragments`` mit eigenem Index und davor einem kleinen LRU
+im Prozess, sodass ein Export nur noch Bausteine zusammensetzt.
+"""
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from _paths import get_package_dir
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "index.sqlite3"
+# Erhöhen, wenn sich das Format gespeicherter Artefakte ändert.
+CACHE_FORMAT_VERSION = 1
+_COUNTERS = ("files", "bytes", "hits", "misses", "evictions")
+# Module, deren Code in die Schlüssel eingeht (geänderter Exporter => neuer Schlüssel).
+_PRODUCER_MODULES = {
+    "musterloesung": ("pdf_export", "formula_render"),
+    "mini_glossary": ("pdf_export", "formula_render"),
+    "learning_objectives": ("main_view", "pdf_export", "formula_render"),
+    "anki_apkg": ("export_jobs", "exporters.anki_tsv"),
+    "arsnova_json": ("export_jobs",),
+    "question_fragment": ("pdf_export", "formula_render"),
+    "glossary_fragment": ("pdf_export", "formula_render"),
+}
+
+_CACHES: Dict[str, "ExportArtifactCache"] = {}
+_CACHES_LOCK = threading.Lock()
+_CODE_VERSIONS: Dict[str, str] = {}
+
+
+def export_cache_enabled() -> bool:
+    return os.getenv("MC_EXPORT_CACHE", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def _cache_dir() -> Path:
+    return Path(os.getenv("MC_EXPORT_CACHE_DIR", os.path.join(get_package_dir(), "var", "export_cache")))
+
+
+def _ttl_seconds() -> float:
+    try:
+        return max(0.0, float(os.getenv("MC_EXPORT_CACHE_TTL_HOURS", "168"))) * 3600.0
+    except ValueError:
+        return 168 * 3600.0
+
+
+def _max_bytes() -> int:
+    try:
+        return max(0, int(float(os.getenv("MC_EXPORT_CACHE_MAX_MB", "500")) * 1024 * 1024))
+    except ValueError:
+        return 500 * 1024 * 1024
+
+
+def _code_version(kind: str) -> str:
+    """Stand der erzeugenden Module (mtime/Größe), einmal pro Prozess ermittelt."""
+    version = _CODE_VERSIONS.get(kind)
+    if version is None:
+        parts = [str(CACHE_FORMAT_VERSION)]
+        for module_name in _PRODUCER_MODULES.get(kind, ()):
+            try:
+                spec = importlib.util.find_spec(module_name)
+                st = os.stat(spec.origin) if spec and spec.origin else None
+            except (ImportError, OSError, ValueError):
+                st = None
+            parts.append(f"{module_name}:{st.st_mtime_ns}:{st.st_size}" if st else f"{module_name}:-")
+        version = "|".join(parts)
+        _CODE_VERSIONS[kind] = version
+    return version
+
+
+def _json_default(value: Any) -> Any:
+    if hasattr(value, "__dataclass_fields__"):
+        return repr(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    if isinstance(value, Mapping):
+        return dict(value)
+    # str() enthielte bei den meisten Objekten die Speicheradresse und wäre
+    # damit je Prozess verschieden.
+    raise TypeError(f"{type(value).__name__} ist nicht als Cache-Schlüssel geeignet")
+
+
+def content_digest(*parts: Any) -> str:
+    """SHA-256 über Bytes/Strings bzw. JSON-Darstellung der übrigen Teile."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, (bytes, bytearray)):
+            data = bytes(part)
+        elif isinstance(part, str):
+            data = part.encode("utf-8")
+        else:
+            data = json.dumps(part, sort_keys=True, ensure_ascii=False, default=_json_default).encode("utf-8")
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def question_set_digest(selected_file: str, questions: Optional[Iterable[Any]] = None) -> str:
+    """Inhalts-Hash eines Fragensets: Quelldatei plus (optional) übergebene Fragenliste."""
+    try:
+        from export_jobs import _resolve_json_source
+
+        raw = _resolve_json_source(selected_file).read_bytes()
+    except (OSError, ValueError):
+        raw = b""
+    question_list = list(questions) if questions is not None else None
+    return content_digest(selected_file, raw, question_list)
+
+
+def artifact_key(kind: str, digest: str, locale: Optional[str] = None, options: Optional[dict] = None) -> str:
+    return content_digest(kind, _code_version(kind), digest, locale or "", options or {})
+
+
+class ExportArtifactCache:
+    """Export-Artefakte in einem Verzeichnis, verwaltet über einen SQLite-Index."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.directory / INDEX_FILENAME),
+                timeout=10,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS artifacts ("
+                " key TEXT PRIMARY KEY, kind TEXT NOT NULL, size INTEGER NOT NULL,"
+                " created REAL NOT NULL, atime REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_artifacts_atime ON artifacts(atime)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_artifacts_created ON artifacts(created)")
+            conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            conn.executemany(
+                "INSERT OR IGNORE INTO counters (name, value) VALUES (?, 0)", [(name,) for name in _COUNTERS]
+            )
+            self._conn = conn
+        return self._conn
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / f"{key}.bin"
+
+    @staticmethod
+    def _bump(conn: sqlite3.Connection, name: str, delta: int) -> None:
+        conn.execute("UPDATE counters SET value = value + ? WHERE name = ?", (delta, name))
+
+    def _forget(self, conn: sqlite3.Connection, key: str) -> Optional[int]:
+        row = conn.execute("SELECT size FROM artifacts WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        conn.execute("DELETE FROM artifacts WHERE key = ?", (key,))
+        self._bump(conn, "files", -1)
+        self._bump(conn, "bytes", -row[0])
+        return row[0]
+
+    def _transaction(self, body: Callable[[sqlite3.Connection], Any]) -> Any:
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = body(conn)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return result
+
+    def get_path(self, key: str, ttl_seconds: Optional[float] = None) -> Optional[Path]:
+        """Pfad eines gültigen Artefakts (zählt Treffer/Fehlschlag) oder None."""
+        ttl = _ttl_seconds() if ttl_seconds is None else ttl_seconds
+        path = self.path_for(key)
+        now = time.time()
+
+        def _lookup(conn: sqlite3.Connection) -> bool:
+            row = conn.execute("SELECT created FROM artifacts WHERE key = ?", (key,)).fetchone()
+            if row is not None and (ttl <= 0 or now - row[0] <= ttl) and path.exists():
+                conn.execute("UPDATE artifacts SET atime = ?, hits = hits + 1 WHERE key = ?", (now, key))
+                self._bump(conn, "hits", 1)
+                return True
+            self._bump(conn, "misses", 1)
+            return False
+
+        return path if self._transaction(_lookup) else None
+
+    def get(self, key: str, ttl_seconds: Optional[float] = None) -> Optional[bytes]:
+        path = self.get_path(key, ttl_seconds)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except OSError:
+            return None
+
+    def put(self, key: str, kind: str, data: bytes, max_bytes: Optional[int] = None) -> Path:
+        """Speichert ein Artefakt atomar und verdrängt bei Bedarf alte Einträge."""
+        path = self.path_for(key)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp_path, path)
+        now = time.time()
+
+        def _index(conn: sqlite3.Connection) -> None:
+            self._forget(conn, key)
+            conn.execute(
+                "INSERT INTO artifacts (key, kind, size, created, atime) VALUES (?, ?, ?, ?, ?)",
+                (key, kind, len(data), now, now),
+            )
+            self._bump(conn, "files", 1)
+            self._bump(conn, "bytes", len(data))
+
+        self._transaction(_index)
+        self.evict(max_bytes=_max_bytes() if max_bytes is None else max_bytes)
+        return path
+
+    def evict(self, max_bytes: int, ttl_seconds: Optional[float] = None) -> int:
+        """Entfernt abgelaufene und (LRU) überzählige Artefakte; liefert die Anzahl."""
+        ttl = _ttl_seconds() if ttl_seconds is None else ttl_seconds
+        victims: List[str] = []
+
+        def _select(conn: sqlite3.Connection) -> None:
+            if ttl > 0:
+                for (key,) in conn.execute(
+                    "SELECT key FROM artifacts WHERE created < ? ORDER BY created", (time.time() - ttl,)
+                ).fetchall():
+                    self._forget(conn, key)
+                    victims.append(key)
+            total = int(conn.execute("SELECT value FROM counters WHERE name = 'bytes'").fetchone()[0])
+            while total > max_bytes:
+                rows = conn.execute("SELECT key, size FROM artifacts ORDER BY atime LIMIT 16").fetchall()
+                if not rows:
+                    break
+                for key, size in rows:
+                    self._forget(conn, key)
+                    victims.append(key)
+                    total -= size
+                    if total <= max_bytes:
+                        break
+            if victims:
+                self._bump(conn, "evictions", len(victims))
+
+        self._transaction(_select)
+        for key in victims:
+            try:
+                self.path_for(key).unlink()
+            except FileNotFoundError:
+                pass
+            except OSError:
+                logger.warning("Export-Cache: %s konnte nicht entfernt werden", key)
+        return len(victims)
+
+    def stats(self) -> Dict[str, float]:
+        """Dateien, Bytes, Treffer/Fehlschläge/Verdrängungen und Trefferquote."""
+        with self._lock:
+            values = dict(self._connection().execute("SELECT name, value FROM counters").fetchall())
+        counters: Dict[str, float] = {key: int(values.get(key, 0)) for key in _COUNTERS}
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_rate"] = (counters["hits"] / lookups) if lookups else 0.0
+        return counters
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Instanzen aus dem Elternprozess: im Kind weder benutzen noch schließen.
+_INHERITED_CACHES: List["ExportArtifactCache"] = []
+
+
+def _after_fork_in_child() -> None:
+    # SQLite-Verbindungen und Locks des Elternprozesses sind nach fork()
+    # nicht nutzbar (ein dort gehaltener Lock bliebe für immer gesperrt).
+    global _CACHES, _CACHES_LOCK, _fragment_memory_lock
+    _INHERITED_CACHES.extend(_CACHES.values())
+    _CACHES = {}
+    _CACHES_LOCK = threading.Lock()
+    _fragment_memory_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def get_export_cache(directory: Optional[Path] = None) -> ExportArtifactCache:
+    """Prozessweit geteilte Cache-Instanz (Standard: ``MC_EXPORT_CACHE_DIR``)."""
+    key = str(Path(directory or _cache_dir()).resolve())
+    with _CACHES_LOCK:
+        cache = _CACHES.get(key)
+        if cache is None:
+            cache = ExportArtifactCache(Path(key))
+            _CACHES[key] = cache
+        return cache
+
+
+def get_or_create(
+    kind: str,
+    digest: str,
+    producer: Callable[[], bytes],
+    *,
+    locale: Optional[str] = None,
+    options: Optional[dict] = None,
+) -> bytes:
+    """Liefert das gespeicherte Artefakt oder erzeugt es mit `producer` und speichert es.
+
+    Leere Ergebnisse und Fehler des Producers werden nicht gespeichert.
+    """
+    if not export_cache_enabled():
+        return producer()
+    key = artifact_key(kind, digest, locale, options)
+    try:
+        cache = get_export_cache()
+        cached = cache.get(key)
+    except (OSError, sqlite3.Error) as exc:
+        logger.warning("Export-Cache nicht verfügbar: %s", exc)
+        return producer()
+    if cached is not None:
+        return cached
+    data = producer()
+    if isinstance(data, (bytes, bytearray)) and data:
+        try:
+            cache.put(key, kind, bytes(data))
+        except (OSError, sqlite3.Error) as exc:
+            logger.warning("Export-Cache: %s konnte nicht gespeichert werden: %s", kind, exc)
+    return data
+
+
+def cached_question_set_export(
+    kind: str,
+    selected_file: str,
+    questions: Optional[Iterable[Any]],
+    producer: Callable[[], bytes],
+    *,
+    locale: Optional[str] = None,
+    options: Optional[dict] = None,
+) -> bytes:
+    """`get_or_create` für Exporte eines Fragensets (Schlüssel über dessen Inhalt)."""
+    if not export_cache_enabled():
+        return producer()
+    return get_or_create(
+        kind, question_set_digest(selected_file, questions), producer, locale=locale, options=options
+    )
+
+
+def _current_locale() -> Optional[str]:
+    try:
+        from i18n.context import get_locale
+
+        return get_locale()
+    except Exception:
+        return None
+
+
+# Beeinflussen nur den Ablauf, nicht das Ergebnis.
+_UNKEYED_KWARGS = ("progress_callback", "total_timeout")
+
+
+class _CachedExport:
+    """`func(selected_file, questions, ...)` mit Artefakt-Cache; per Referenz pickelbar."""
+
+    def __init__(self, kind: str, func: Callable[..., bytes], config_fields: Sequence[str] = ()):
+        self.kind = kind
+        self.config_fields = tuple(config_fields)
+        self.__wrapped__ = func
+        self.__name__ = getattr(func, "__name__", kind)
+        self.__qualname__ = getattr(func, "__qualname__", kind)
+        self.__doc__ = getattr(func, "__doc__", None)
+
+    def __call__(self, selected_file: str, questions: Optional[Iterable[Any]] = None, *args: Any, **kwargs: Any) -> bytes:
+        options = {
+            "args": [self._key_value(value) for value in args],
+            "kwargs": {
+                key: self._key_value(value) for key, value in kwargs.items() if key not in _UNKEYED_KWARGS
+            },
+        }
+        return cached_question_set_export(
+            self.kind,
+            selected_file,
+            questions,
+            lambda: self.__wrapped__(selected_file, questions, *args, **kwargs),
+            locale=_current_locale(),
+            options=options,
+        )
+
+    def _key_value(self, value: Any) -> Any:
+        # Konfigurationsobjekte gehen nur mit den Feldern in den Schlüssel,
+        # die das Ergebnis beeinflussen.
+        if self.config_fields and any(hasattr(value, name) for name in self.config_fields):
+            return {name: getattr(value, name, None) for name in self.config_fields}
+        return value
+
+    def __reduce__(self):
+        return (cached_export, (self.kind, self.__wrapped__, self.config_fields))
+
+
+def cached_export(
+    kind: str, func: Callable[..., bytes], config_fields: Sequence[str] = ()
+) -> Callable[..., bytes]:
+    """Umhüllt eine Exportfunktion ``func(selected_file, questions, *args, **kwargs)``.
+
+    Der Schlüssel umfasst Set-Inhalt, aktuelle UI-Sprache und die übrigen
+    Argumente (ohne `progress_callback`/`total_timeout`). Ein übergebenes
+    Konfigurationsobjekt zählt nur mit den Attributen aus `config_fields`;
+    andere nicht JSON-fähige Argumente sind ein Fehler.
+    """
+    return _CachedExport(kind, func, config_fields)
+
+
+def get_export_cache_stats() -> Dict[str, float]:
+    try:
+        return get_export_cache().stats()
+    except (OSError, sqlite3.Error):
+        return {key: 0 for key in _COUNTERS} | {"hit_rate": 0.0}
+
+
+FRAGMENT_MEMORY_ENTRIES = 1024
+_fragment_memory: "OrderedDict[str, Any]" = OrderedDict()
+_fragment_memory_lock = threading.Lock()
+_fragment_memory_hits = 0
+
+
+def get_fragment_cache() -> ExportArtifactCache:
+    return get_export_cache(_cache_dir() / "fragments")
+
+
+def _remember_fragment(key: str, fragment: Any) -> None:
+    with _fragment_memory_lock:
+        _fragment_memory[key] = fragment
+        _fragment_memory.move_to_end(key)
+        while len(_fragment_memory) > FRAGMENT_MEMORY_ENTRIES:
+            _fragment_memory.popitem(last=False)
+
+
+def cached_fragment(
+    kind: str,
+    content: Any,
+    producer: Callable[[], Any],
+    *,
+    locale: Optional[str] = None,
+    options: Optional[dict] = None,
+    store_if: Optional[Callable[[Any], bool]] = None,
+) -> Any:
+    """JSON-fähiger Baustein zu `content` aus Speicher, Disk oder `producer`.
+
+    Der Schlüssel umfasst den Inhalts-Hash, die Sprache (Standard: aktuelle
+    UI-Sprache), `options` und den Stand des erzeugenden Codes. Liefert
+    `store_if` False, wird das Ergebnis nur zurückgegeben. Zurückgegebene
+    Bausteine werden geteilt und dürfen nicht verändert werden.
+    """
+    global _fragment_memory_hits
+    if not export_cache_enabled():
+        return producer()
+    key = artifact_key(kind, content_digest(content), locale or _current_locale(), options)
+    with _fragment_memory_lock:
+        if key in _fragment_memory:
+            _fragment_memory.move_to_end(key)
+            _fragment_memory_hits += 1
+            return _fragment_memory[key]
+    cache: Optional[ExportArtifactCache] = None
+    data = None
+    try:
+        cache = get_fragment_cache()
+        data = cache.get(key)
+    except (OSError, sqlite3.Error) as exc:
+        logger.warning("Fragment-Cache nicht verfügbar: %s", exc)
+    if data is not None:
+        try:
+            fragment = json.loads(data.decode("utf-8"))
+        except ValueError:
+            data = None
+    if data is None:
+        fragment = producer()
+        if store_if is not None and not store_if(fragment):
+            return fragment
+        if cache is not None:
+            try:
+                cache.put(key, kind, json.dumps(fragment, ensure_ascii=False).encode("utf-8"))
+            except (OSError, sqlite3.Error, TypeError, ValueError) as exc:
+                logger.warning("Fragment-Cache: %s konnte nicht gespeichert werden: %s", kind, exc)
+    _remember_fragment(key, fragment)
+    return fragment
+
+
+def get_fragment_cache_stats() -> Dict[str, float]:
+    """Wie `get_export_cache_stats`; Treffer umfassen den LRU im Prozess (``memory_hits``)."""
+    try:
+        stats = get_fragment_cache().stats()
+    except (OSError, sqlite3.Error):
+        stats = {key: 0 for key in _COUNTERS}
+    stats["memory_hits"] = _fragment_memory_hits
+    stats["hits"] += _fragment_memory_hits
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = (stats["hits"] / lookups) if lookups else 0.0
+    return stats
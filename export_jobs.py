@@ -1,11 +1,12 @@
 """Simple background job manager for long-running exports.
 
-This module provides a tiny in-memory job manager that runs export jobs
-in separate processes (multiprocessing). A finished PDF is written to
-the `exports/` directory and the parent process monitors the child and
-updates an in-memory job table. The design intentionally avoids
-cross-process callbacks or shared memory — the child simply writes its
-result to disk and the monitor thread marks the job finished.
+Export jobs are queued in a SQLite job table (`EXPORT_JOBS_DB`, default
+`exports/export_jobs.sqlite3`) and run in separate processes
+(multiprocessing), at most `EXPORT_JOB_WORKERS` per server process. A
+finished PDF is written to the `exports/` directory; the child reports
+progress and errors through the job table, the dispatcher thread of the
+parent marks the job finished. Status therefore survives restarts and is
+visible to every process that uses the same table.
 """
 
 from typing import Callable, Optional, Dict, List, Any, Sequence
@@ -14,8 +15,14 @@ import uuid
 import os
 from pathlib import Path
 import multiprocessing
-import sys
 import concurrent.futures
+import inspect
+import itertools
+import pickle
+import signal
+import socket
+import sqlite3
+import time
 import csv
 import io
 import json
@@ -25,6 +32,7 @@ import re
 from datetime import datetime, timezone
 import random
 from i18n.context import t as translate_ui
+import lazy_imports
 
 
 def _resolve_json_source(selected_file: str) -> Path:
@@ -74,12 +82,8 @@ ARSNOVA_EU_GLOSSARY_DEFINITION_MAX_LENGTH = int(os.getenv("ARSNOVA_EU_GLOSSARY_D
 ARSNOVA_EU_MIN_TIMER_SECONDS = 5
 ARSNOVA_EU_MAX_TIMER_SECONDS = 300
 
-# Configurable worker count (not used for processes; kept for compatibility)
-_MAX_WORKERS = int(os.getenv('EXPORT_JOB_WORKERS', '2'))
-
-# Jobs stored in-memory: job_id -> metadata
-_jobs: Dict[str, Dict] = {}
-_jobs_lock = threading.Lock()
+# Number of export processes a server process runs at the same time
+_MAX_WORKERS = max(1, int(os.getenv('EXPORT_JOB_WORKERS', '2')))
 
 # Directory to persist finished export PDFs so results survive restarts
 _EXPORTS_DIR = Path(
@@ -87,181 +91,561 @@ _EXPORTS_DIR = Path(
 )
 _EXPORTS_DIR.mkdir(parents=True, exist_ok=True)
 
+# Job table shared by all server processes/replicas that see this file
+_JOBS_DB = Path(os.getenv('EXPORT_JOBS_DB', str(_EXPORTS_DIR / 'export_jobs.sqlite3')))
+
+_POLL_SECONDS = 0.5
+_HEARTBEAT_SECONDS = 5.0
+# Running jobs whose owner has not sent a heartbeat for this long are re-queued
+_STALE_SECONDS = float(os.getenv('EXPORT_JOB_STALE_SECONDS', '60'))
+_ACTIVE_STATUSES = ('queued', 'running')
+# Running jobs are stopped and marked failed after this many seconds (0 disables)
+_MAX_RUNTIME_SECONDS = float(os.getenv('EXPORT_JOB_MAX_RUNTIME_SECONDS', '600'))
+# Result files of finished jobs are deleted after this many hours (0 keeps them)
+_RESULT_TTL_SECONDS = float(os.getenv('EXPORT_JOB_RESULT_TTL_HOURS', '168')) * 3600.0
+_PRUNE_INTERVAL_SECONDS = 3600.0
+# Reports prepared when a test ends run before queued set exports
+_REPORT_PRIORITY = 10
+
 
 def _make_job_id() -> str:
     return uuid.uuid4().hex
 
 
+def _open_jobs_db(db_path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(db_path), timeout=10, isolation_level=None, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def _job_fingerprint(func: Callable, args: tuple, kwargs: dict) -> tuple[Optional[str], Optional[bytes]]:
+    """Return (dedup key, pickled payload) or (None, None) if the job is not picklable."""
+    try:
+        payload = pickle.dumps((func, args, kwargs), protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return None, None
+    name = f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', repr(func))}"
+    return hashlib.sha256(name.encode('utf-8') + b'\0' + payload).hexdigest(), payload
+
+
+def _accepts_progress_callback(func: Callable) -> bool:
+    try:
+        return 'progress_callback' in inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return False
+
+
 def _proc_runner(
-    job_id: str, func: Callable, args: tuple, kwargs: dict
+    job_id: str, func: Callable, args: tuple, kwargs: dict, db_path: str = '', exports_dir: str = ''
 ) -> None:
     """Module-level function executed inside the child process.
 
     It calls the provided `func` with the given args/kwargs. If the
     function returns bytes, those are written to the exports directory
-    as `muster_{job_id}.pdf`.
+    as `muster_{job_id}.pdf`. Progress reported through `progress_callback`
+    and errors are written to the job table.
     """
-    result = func(*args, **kwargs)
+    if hasattr(os, 'setpgrp'):
+        # Own process group: cancel_job also stops helpers (latex, dvisvgm).
+        try:
+            os.setpgrp()
+        except OSError:
+            pass
+    # The render pool belongs to the server process; the job renders with the
+    # warm renderer it inherited from the dispatcher (see `_preload_renderer`).
+    os.environ['MC_PDF_RENDER_WORKERS'] = '0'
+    conn = _open_jobs_db(Path(db_path)) if db_path else None
+    last_pct = [-1]
+
+    def _progress(pct: Any, msg: str = '') -> None:
+        try:
+            pct = max(0, min(99, int(pct)))
+        except (TypeError, ValueError):
+            return
+        if conn is None or pct == last_pct[0]:
+            return
+        last_pct[0] = pct
+        try:
+            conn.execute(
+                "UPDATE jobs SET progress = ?, message = ? WHERE job_id = ? AND status = 'running'",
+                (pct, str(msg or '')[:200], job_id),
+            )
+        except sqlite3.Error:
+            pass
+
+    func = lazy_imports.resolve(func)
+    if conn is not None and 'progress_callback' not in kwargs and _accepts_progress_callback(func):
+        kwargs = dict(kwargs, progress_callback=_progress)
+    try:
+        result = func(*args, **kwargs)
+    except BaseException as exc:
+        if conn is not None:
+            try:
+                conn.execute(
+                    "UPDATE jobs SET exception = ? WHERE job_id = ?",
+                    (f"{type(exc).__name__}: {exc}"[:2000], job_id),
+                )
+            except sqlite3.Error:
+                pass
+        raise
     if isinstance(result, (bytes, bytearray)) and len(result) > 0:
-        filename = f"muster_{job_id}.pdf"
-        result_path = str(_EXPORTS_DIR.joinpath(filename))
-        with open(result_path, 'wb') as f:
+        target_dir = Path(exports_dir) if exports_dir else _EXPORTS_DIR
+        result_path = target_dir.joinpath(f"muster_{job_id}.pdf")
+        tmp_path = result_path.with_name(f".{result_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
             f.write(result)
+        os.replace(tmp_path, result_path)
 
 
-def start_musterloesung_job(func: Callable, *args, **kwargs) -> str:  # noqa: C901
-    """Start a background export job running `func(*args, **kwargs)`.
+class ExportJobQueue:
+    """Durable export queue: SQLite job table plus a bounded set of worker processes.
 
-    The function runs in a separate process. Returns the job_id which
-    can be polled with `get_job_status`.
+    Jobs are picked by priority (higher first), then FIFO. Each running job is
+    a child process (``fork``), so `cancel` can terminate it. Identical
+    requests (same function and arguments) share one job while it is queued,
+    running or its result file still exists. Jobs whose arguments can be
+    pickled are stored with their payload and survive restarts: a running job
+    whose owner stops sending heartbeats is queued again, also by another
+    process using the same table.
     """
-    job_id = _make_job_id()
-
-    job_entry = {
-        "status": "queued",
-        "progress": 0,
-        "message": "queued",
-        # On finish we will write result to disk and set 'result_path'
-        "result": None,
-        "result_path": None,
-        "exception": None,
-        "process": None,
-        "future": None,
-    }
 
-    with _jobs_lock:
-        _jobs[job_id] = job_entry
-        _jobs[job_id]["status"] = "running"
-        _jobs[job_id]["message"] = "started"
-
-    # If running from an interactive stdin (no __main__.__file__), the
-    # 'spawn' start method cannot locate the main script — fall back to
-    # a thread-based execution for this environment so tests can run.
-    main_file = getattr(sys.modules.get('__main__'), '__file__', None)
-    if not main_file:
-        # Interactive / stdin-based environment: run exporter in a
-        # background thread so tests can execute in this environment.
-        def _start_interactive_thread():
-            executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
-            future = executor.submit(_proc_runner, job_id, func, args, kwargs)
-            # Store the future so cancel_job can attempt cancellation.
-            with _jobs_lock:
-                _jobs[job_id]["future"] = future
-
-            # Start a monitor thread to wait for the future and update
-            # status.
-            def _monitor_future():
-                try:
-                    future.result()
-                    path_obj = _EXPORTS_DIR.joinpath(
-                        f"muster_{job_id}.pdf"
+    def __init__(self, db_path: Path = _JOBS_DB, exports_dir: Path = _EXPORTS_DIR, max_workers: int = _MAX_WORKERS):
+        self.db_path = Path(db_path)
+        self.exports_dir = Path(exports_dir)
+        self.max_workers = max(1, int(max_workers))
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        # Jobs submitted here whose payload is not picklable: job_id -> (func, args, kwargs)
+        self._local_payloads: Dict[str, tuple] = {}
+        # Jobs running in this process: job_id -> Process/Future
+        self._running: Dict[str, Any] = {}
+        self._wake = threading.Event()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._last_heartbeat = 0.0
+        self._last_prune = 0.0
+        self._renderer_preloaded = False
+
+    # -- Table -------------------------------------------------------------
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = _open_jobs_db(self.db_path)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " job_id TEXT PRIMARY KEY, kind TEXT NOT NULL, dedup_key TEXT,"
+                " priority INTEGER NOT NULL DEFAULT 0, status TEXT NOT NULL,"
+                " progress INTEGER NOT NULL DEFAULT 0, message TEXT NOT NULL DEFAULT '',"
+                " payload BLOB, result_path TEXT, exception TEXT,"
+                " owner TEXT, heartbeat REAL, created_at REAL NOT NULL,"
+                " started_at REAL, finished_at REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs(status, priority DESC, created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_dedup ON jobs(dedup_key)")
+            self._conn = conn
+        return self._conn
+
+    def _execute(self, sql: str, params: Sequence[Any] = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._connection().execute(sql, params)
+
+    # -- API ---------------------------------------------------------------
+
+    def submit(
+        self, func: Callable, args: tuple = (), kwargs: Optional[dict] = None,
+        *, priority: int = 0, kind: str = 'musterloesung',
+    ) -> str:
+        """Queue `func(*args, **kwargs)` and return its job id (or the id of an identical job)."""
+        kwargs = dict(kwargs or {})
+        dedup_key, payload = _job_fingerprint(func, tuple(args), kwargs)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if dedup_key is not None:
+                    row = conn.execute(
+                        "SELECT job_id, status, result_path FROM jobs WHERE dedup_key = ?"
+                        " AND status IN ('queued', 'running', 'finished') ORDER BY created_at DESC LIMIT 1",
+                        (dedup_key,),
+                    ).fetchone()
+                    if row is not None and (
+                        row['status'] in _ACTIVE_STATUSES
+                        or (row['result_path'] and Path(row['result_path']).exists())
+                    ):
+                        if row['status'] == 'queued':
+                            conn.execute(
+                                "UPDATE jobs SET priority = MAX(priority, ?) WHERE job_id = ?",
+                                (int(priority), row['job_id']),
+                            )
+                        conn.execute("COMMIT")
+                        return row['job_id']
+                job_id = _make_job_id()
+                if payload is None:
+                    self._local_payloads[job_id] = (func, tuple(args), kwargs)
+                conn.execute(
+                    "INSERT INTO jobs (job_id, kind, dedup_key, priority, status, message, payload, created_at)"
+                    " VALUES (?, ?, ?, ?, 'queued', 'queued', ?, ?)",
+                    (job_id, kind, dedup_key, int(priority), payload, now),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        self._ensure_dispatcher()
+        self._wake.set()
+        return job_id
+
+    def status(self, job_id: str) -> Optional[dict]:
+        """Small status view: status, progress, message, exception, result, queue_position."""
+        row = self._execute(
+            "SELECT status, progress, message, exception, result_path, priority, created_at FROM jobs WHERE job_id = ?",
+            (job_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        out = {
+            "status": row['status'],
+            "progress": row['progress'],
+            "message": row['message'],
+            "exception": row['exception'],
+            "result": row['result_path'] if row['status'] == 'finished' else None,
+            "queue_position": None,
+        }
+        if row['status'] == 'queued':
+            ahead = self._execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'queued'"
+                " AND (priority > ? OR (priority = ? AND created_at < ?))",
+                (row['priority'], row['priority'], row['created_at']),
+            ).fetchone()[0]
+            out["queue_position"] = ahead + 1
+        return out
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job; running work is terminated."""
+        cur = self._execute(
+            "UPDATE jobs SET status = 'cancelled', message = 'cancelled', finished_at = ?"
+            " WHERE job_id = ? AND status IN ('queued', 'running')",
+            (time.time(), job_id),
+        )
+        if cur.rowcount == 0:
+            return False
+        self._local_payloads.pop(job_id, None)
+        # Jobs running in another process are stopped by their owner's dispatcher.
+        self._terminate(job_id)
+        self._wake.set()
+        return True
+
+    # -- Dispatcher --------------------------------------------------------
+
+    def _ensure_dispatcher(self) -> None:
+        with self._lock:
+            if self._dispatcher is not None and self._dispatcher.is_alive():
+                return
+            self._dispatcher = threading.Thread(target=self._dispatch_loop, name='export-jobs', daemon=True)
+            self._dispatcher.start()
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            try:
+                self.dispatch_once()
+            except Exception as exc:
+                print(f"Export-Queue: {exc}")
+            self._wake.wait(_POLL_SECONDS)
+            self._wake.clear()
+
+    def dispatch_once(self) -> None:
+        """One scheduling round: reap, honour cancels, recover stale jobs, start new ones."""
+        self._reap()
+        self._stop_cancelled()
+        now = time.time()
+        self._stop_overdue(now)
+        if self._running and now - self._last_heartbeat >= _HEARTBEAT_SECONDS:
+            self._last_heartbeat = now
+            self._execute(
+                "UPDATE jobs SET heartbeat = ? WHERE owner = ? AND status = 'running'", (now, self.owner)
+            )
+        self._requeue_stale(now)
+        if now - self._last_prune >= _PRUNE_INTERVAL_SECONDS:
+            self._last_prune = now
+            self.prune_results(now)
+        while len(self._running) < self.max_workers:
+            claimed = self._claim_next()
+            if claimed is None:
+                break
+            self._launch(*claimed)
+
+    def _claim_next(self) -> Optional[tuple]:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT job_id, payload FROM jobs WHERE status = 'queued'"
+                    " ORDER BY priority DESC, created_at, rowid LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                job_id = row['job_id']
+                job = self._local_payloads.pop(job_id, None)
+                if job is None and row['payload'] is not None:
+                    try:
+                        job = pickle.loads(row['payload'])
+                    except Exception as exc:
+                        conn.execute(
+                            "UPDATE jobs SET status = 'failed', message = 'payload_unreadable', exception = ?,"
+                            " finished_at = ? WHERE job_id = ?",
+                            (str(exc), now, job_id),
+                        )
+                        conn.execute("COMMIT")
+                        return None
+                if job is None:
+                    # Payload only existed in the memory of a process that is gone.
+                    conn.execute(
+                        "UPDATE jobs SET status = 'failed', message = 'not_resumable', finished_at = ? WHERE job_id = ?",
+                        (now, job_id),
                     )
-                    result_path = str(path_obj)
-                    with _jobs_lock:
-                        if path_obj.exists():
-                            _jobs[job_id]["status"] = "finished"
-                            _jobs[job_id]["progress"] = 100
-                            _jobs[job_id]["message"] = "finished"
-                            _jobs[job_id]["result_path"] = result_path
-                        else:
-                            _jobs[job_id]["status"] = "failed"
-                            _jobs[job_id]["message"] = "no_result_file"
-                except Exception as e:
-                    with _jobs_lock:
-                        _jobs[job_id]["status"] = "failed"
-                        _jobs[job_id]["message"] = f"exception:{e}"
-
-            threading.Thread(target=_monitor_future, daemon=True).start()
-
-        _start_interactive_thread()
-    else:
-        # Spawn a separate process to run the exporter. Prefer the 'fork'
-        # start method when available (useful for interactive / stdin-based
-        # runs). Fall back to the default context otherwise.
+                    conn.execute("COMMIT")
+                    return None
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', message = 'started', owner = ?, heartbeat = ?,"
+                    " started_at = ? WHERE job_id = ?",
+                    (self.owner, now, now, job_id),
+                )
+                conn.execute("COMMIT")
+                return (job_id, *job)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _launch(self, job_id: str, func: Callable, args: tuple, kwargs: dict) -> None:
+        runner_args = (job_id, func, args, kwargs, str(self.db_path), str(self.exports_dir))
         try:
             ctx = multiprocessing.get_context('fork')
         except (ValueError, RuntimeError):
-            # Fallback to default context if 'fork' isn't available.
-            ctx = multiprocessing.get_context()  # type: ignore[assignment]
-
-        proc = ctx.Process(
-            target=_proc_runner, args=(job_id, func, args, kwargs)
-        )
+            ctx = None
+        if ctx is None:
+            # No fork (e.g. Windows): run in a thread. Cancel then only discards the result.
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+            self._running[job_id] = executor.submit(_proc_runner, *runner_args)
+            executor.shutdown(wait=False)
+            return
+        self._preload_renderer()
+        proc = ctx.Process(target=_proc_runner, args=runner_args)
         proc.daemon = True
         proc.start()
+        self._running[job_id] = proc
 
-        with _jobs_lock:
-            _jobs[job_id]["process"] = proc
-
-        # Monitor the process in a background thread — when it exits we
-        # check for the produced file and update job metadata.
-        def _monitor_proc():
-            proc.join()
-            path_obj = _EXPORTS_DIR.joinpath(f"muster_{job_id}.pdf")
-            result_path = str(path_obj)
-            with _jobs_lock:
-                if proc.exitcode == 0 and path_obj.exists():
-                    _jobs[job_id]["status"] = "finished"
-                    _jobs[job_id]["progress"] = 100
-                    _jobs[job_id]["message"] = "finished"
-                    _jobs[job_id]["result"] = None
-                    _jobs[job_id]["result_path"] = result_path
-                else:
-                    _jobs[job_id]["status"] = "failed"
-                    _jobs[job_id]["message"] = (
-                        f"process_exitcode={proc.exitcode}"
-                    )
+    def _preload_renderer(self) -> None:
+        """Warm up WeasyPrint and fonts once so forked jobs do not start cold."""
+        if self._renderer_preloaded:
+            return
+        self._renderer_preloaded = True
+        try:
+            import pdf_render
 
-        threading.Thread(target=_monitor_proc, daemon=True).start()
+            pdf_render.preload()
+        except Exception as exc:
+            print(f"Export-Queue: PDF-Renderer nicht vorgeladen: {exc}")
 
-    return job_id
+    def _reap(self) -> None:
+        for job_id, handle in list(self._running.items()):
+            if isinstance(handle, concurrent.futures.Future):
+                if not handle.done():
+                    continue
+                ok = handle.exception() is None
+                failure = f"exception:{handle.exception()}"
+            else:
+                if handle.exitcode is None:
+                    continue
+                ok = handle.exitcode == 0
+                failure = f"process_exitcode={handle.exitcode}"
+                handle.join(0)
+            if self._running.pop(job_id, None) is None:
+                continue  # cancelled meanwhile
+            path_obj = self.exports_dir.joinpath(f"muster_{job_id}.pdf")
+            if ok and path_obj.exists():
+                self._execute(
+                    "UPDATE jobs SET status = 'finished', progress = 100, message = 'finished', result_path = ?,"
+                    " finished_at = ?, payload = NULL WHERE job_id = ? AND status = 'running'",
+                    (str(path_obj), time.time(), job_id),
+                )
+            else:
+                self._execute(
+                    "UPDATE jobs SET status = 'failed', message = ?, finished_at = ?, payload = NULL"
+                    " WHERE job_id = ? AND status = 'running'",
+                    (failure if not ok else 'no_result_file', time.time(), job_id),
+                )
+
+    def _stop_cancelled(self) -> None:
+        if not self._running:
+            return
+        ids = list(self._running)
+        placeholders = ','.join('?' * len(ids))
+        rows = self._execute(
+            f"SELECT job_id FROM jobs WHERE status = 'cancelled' AND job_id IN ({placeholders})", ids
+        ).fetchall()
+        for row in rows:
+            self._terminate(row['job_id'])
+
+    def _stop_overdue(self, now: float, max_runtime: Optional[float] = None) -> None:
+        """Fail jobs of this process that run longer than `max_runtime` (e.g. a hung child)."""
+        limit = _MAX_RUNTIME_SECONDS if max_runtime is None else max_runtime
+        if limit <= 0 or not self._running:
+            return
+        ids = list(self._running)
+        placeholders = ','.join('?' * len(ids))
+        rows = self._execute(
+            f"SELECT job_id FROM jobs WHERE status = 'running' AND started_at < ? AND job_id IN ({placeholders})",
+            [now - limit, *ids],
+        ).fetchall()
+        for row in rows:
+            self._terminate(row['job_id'])
+            self._execute(
+                "UPDATE jobs SET status = 'failed', message = 'timeout', finished_at = ?, payload = NULL"
+                " WHERE job_id = ? AND status = 'running'",
+                (now, row['job_id']),
+            )
+
+    def _terminate(self, job_id: str) -> None:
+        handle = self._running.pop(job_id, None)
+        if handle is None or isinstance(handle, concurrent.futures.Future):
+            return
+        if handle.is_alive():
+            try:
+                os.killpg(handle.pid, signal.SIGTERM)
+            except (AttributeError, OSError):
+                handle.terminate()
+            handle.join(5)
+            if handle.is_alive():
+                handle.kill()
+                handle.join(1)
+        # Partial output of the terminated run
+        try:
+            self.exports_dir.joinpath(f"muster_{job_id}.pdf").unlink()
+        except OSError:
+            pass
+
+    def _requeue_stale(self, now: float) -> None:
+        cutoff = now - _STALE_SECONDS
+        self._execute(
+            "UPDATE jobs SET status = 'queued', message = 'requeued', owner = NULL, progress = 0"
+            " WHERE status = 'running' AND heartbeat < ? AND owner != ? AND payload IS NOT NULL",
+            (cutoff, self.owner),
+        )
+        self._execute(
+            "UPDATE jobs SET status = 'failed', message = 'owner_lost', finished_at = ?"
+            " WHERE status = 'running' AND heartbeat < ? AND owner != ? AND payload IS NULL",
+            (now, cutoff, self.owner),
+        )
+
+    def prune_results(self, now: Optional[float] = None, ttl_seconds: Optional[float] = None) -> int:
+        """Delete result files older than the TTL; their jobs become 'expired'.
+
+        Also removes ``muster_*.pdf`` files no job refers to any more (e.g.
+        from before the job table existed). Returns the number of deleted files.
+        """
+        ttl = _RESULT_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        if ttl <= 0:
+            return 0
+        now = time.time() if now is None else now
+        cutoff = now - ttl
+        removed = 0
+        rows = self._execute(
+            "SELECT job_id, result_path FROM jobs WHERE status = 'finished' AND finished_at < ?", (cutoff,)
+        ).fetchall()
+        for row in rows:
+            if row['result_path']:
+                try:
+                    Path(row['result_path']).unlink()
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+                except OSError as exc:
+                    print(f"Export-Queue: {row['result_path']} konnte nicht entfernt werden: {exc}")
+                    continue
+            self._execute(
+                "UPDATE jobs SET status = 'expired', message = 'expired', result_path = NULL"
+                " WHERE job_id = ? AND status = 'finished'",
+                (row['job_id'],),
+            )
+        known = {
+            row['result_path']
+            for row in self._execute("SELECT result_path FROM jobs WHERE result_path IS NOT NULL").fetchall()
+        }
+        for path in self.exports_dir.glob('muster_*.pdf'):
+            if str(path) in known or path.stem[len('muster_'):] in self._running:
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                pass
+        return removed
+
+
+_queue: Optional[ExportJobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_export_queue() -> ExportJobQueue:
+    """Process-wide export queue (created on first use)."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = ExportJobQueue()
+        return _queue
+
+
+def start_musterloesung_job(func: Callable, *args, **kwargs) -> str:
+    """Queue a background export job running `func(*args, **kwargs)`.
+
+    Returns the job_id which can be polled with `get_job_status`. An
+    identical request that is still queued, running or finished returns the
+    existing job_id.
+    """
+    return get_export_queue().submit(func, args, kwargs)
+
+
+def start_report_job(func: Callable, *args, **kwargs) -> str:
+    """Queue a user's PDF report ahead of set exports (the user is waiting for it)."""
+    return get_export_queue().submit(func, args, kwargs, priority=_REPORT_PRIORITY, kind='report')
+
+
+def report_prerender_enabled() -> bool:
+    """Prepare a user's PDF report in a job as soon as the test ends (``EXPORT_JOB_PRERENDER_REPORT``).
+
+    Needs ``fork``: the job renders on a copy of the session state that it
+    installs in its own process, which must not happen in a server thread.
+    """
+    if os.getenv('EXPORT_JOB_PRERENDER_REPORT', '1').strip().lower() in ('0', 'false', 'no', 'off'):
+        return False
+    return 'fork' in multiprocessing.get_all_start_methods()
 
 
 def get_job_status(job_id: str) -> Optional[dict]:
     """Return a small status view for the given job_id.
 
-    Returns a dict with keys 'status','progress','message','result'
-    where 'result' for finished jobs is either an in-memory value or
-    the filesystem path to the persisted PDF.
+    Returns a dict with keys 'status','progress','message','exception',
+    'result' and 'queue_position'; 'result' for finished jobs is the
+    filesystem path to the persisted PDF.
     """
-    with _jobs_lock:
-        je = _jobs.get(job_id)
-        if not je:
-            return None
-        out = {
-            "status": je.get("status"),
-            "progress": je.get("progress", 0),
-            "message": je.get("message", ""),
-            "exception": je.get("exception"),
-        }
-        if je.get("status") == "finished":
-            out["result"] = je.get("result") or je.get("result_path")
-        else:
-            out["result"] = None
-        return out
+    return get_export_queue().status(job_id)
 
 
 def cancel_job(job_id: str) -> bool:
-    """Attempt to cancel a job.
+    """Cancel a queued or running job.
 
-    Best-effort: only returns True if the job exists and the process has
-    not yet started. We avoid forcibly terminating child processes by
-    default.
+    A running job's process (and its process group) is terminated. Returns
+    False if the job is unknown or already finished, failed or cancelled.
     """
-    with _jobs_lock:
-        je = _jobs.get(job_id)
-        if not je:
-            return False
-        proc = je.get("process")
-        if proc is None:
-            # Not started yet — remove from table
-            _jobs.pop(job_id, None)
-            return True
-        # If process exists and is alive we do not cancel it here.
-        if proc.is_alive():
-            return False
-        # Process finished; cannot cancel.
-        return False
+    return get_export_queue().cancel(job_id)
 
 
 def _stable_anki_id(seed: str, scope: str) -> int:
@@ -564,19 +948,75 @@ def _build_anki_model(genanki_module, model_id: int, locale: str):
     )
 
 
-def _write_apkg_package(package) -> bytes:
-    tmp_path = None
+# Pakete bis zu dieser Größe bleiben im Speicher, größere wandern auf die Platte.
+_APKG_SPOOL_BYTES = 8 * 1024 * 1024
+_APKG_CHUNK_BYTES = 1024 * 1024
+
+
+def write_apkg(fileobj, model, decks, *, timestamp: Optional[float] = None) -> None:
+    """Schreibt ein Anki-Paket in einem Durchgang nach `fileobj`.
+
+    `decks` liefert Tupel ``(deck_id, deck_name, notes)``; `notes` darf ein
+    Generator sein. Jede Notiz wird sofort in die Sammlung geschrieben, im
+    Speicher liegt also immer nur die aktuelle Karte. Die Sammlung selbst ist
+    eine SQLite-Datei (Anki erwartet eine Datenbank), die blockweise in das
+    Zip kopiert und danach gelöscht wird. Namen mit ``::`` ergeben eine
+    Deck-Hierarchie; fehlende Elterndecks werden angelegt.
+    """
+    from genanki.apkg_col import APKG_COL
+    from genanki.apkg_schema import APKG_SCHEMA
+    import zipfile
+
+    if timestamp is None:
+        timestamp = time.time()
+    id_gen = itertools.count(int(timestamp * 1000))
+
+    db_fd, db_path = tempfile.mkstemp(suffix=".anki2")
+    os.close(db_fd)
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".apkg") as tmp:
-            tmp_path = tmp.name
-        package.write_to_file(tmp_path)
-        return Path(tmp_path).read_bytes()
+        conn = sqlite3.connect(db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.executescript(APKG_SCHEMA)
+            cursor.executescript(APKG_COL)
+            deck_json = json.loads(cursor.execute("SELECT decks FROM col").fetchone()[0])
+            models_json = {}
+            for deck_id, deck_name, notes in decks:
+                parts = deck_name.split("::")
+                for depth in range(1, len(parts)):
+                    parent_name = "::".join(parts[:depth])
+                    parent_id = _stable_anki_id(parent_name, "deck")
+                    if str(parent_id) not in deck_json:
+                        deck_json[str(parent_id)] = _anki_deck_json(parent_id, parent_name)
+                deck_json[str(deck_id)] = _anki_deck_json(deck_id, deck_name)
+                if not models_json:
+                    models_json[str(model.model_id)] = model.to_json(timestamp, deck_id)
+                for note in notes:
+                    note.write_to_db(cursor, timestamp, deck_id, id_gen)
+            cursor.execute("UPDATE col SET decks = ?, models = ?", (json.dumps(deck_json), json.dumps(models_json)))
+            conn.commit()
+        finally:
+            conn.close()
+
+        with zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_DEFLATED) as outzip:
+            with open(db_path, "rb") as src, outzip.open("collection.anki2", "w") as dst:
+                while True:
+                    chunk = src.read(_APKG_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    dst.write(chunk)
+            outzip.writestr("media", "{}")  # Keine eingebetteten Medien
     finally:
-        if tmp_path:
-            try:
-                os.remove(tmp_path)
-            except OSError:
-                pass
+        try:
+            os.remove(db_path)
+        except OSError:
+            pass
+
+
+def _anki_deck_json(deck_id: int, name: str) -> dict:
+    import genanki  # type: ignore
+
+    return genanki.Deck(deck_id, name).to_json()
 
 
 def _determine_deck_title(data: dict, selected_file: str) -> str:
@@ -607,16 +1047,18 @@ def _determine_deck_title(data: dict, selected_file: str) -> str:
     return base.strip() or "MC-Test-Quiz"
 
 
-def generate_anki_apkg(selected_file: str, locale: str) -> bytes:
-    """Erzeugt ein Anki-.apkg-Paket für das angegebene Fragen-JSON."""
-
+def _import_genanki():
     try:
         import genanki  # type: ignore
     except ModuleNotFoundError as exc:  # pragma: no cover - optional dependency
         raise ModuleNotFoundError(
             "Für den APKG-Export wird das Paket 'genanki' benötigt."
         ) from exc
+    return genanki
+
 
+def _anki_set_rows(selected_file: str):
+    """Deck-Titel und TSV-Zeilen eines Fragensets."""
     from exporters.anki_tsv import transform_to_anki_tsv
 
     file_path = _resolve_json_source(selected_file)
@@ -636,17 +1078,10 @@ def generate_anki_apkg(selected_file: str, locale: str) -> bytes:
         raise ValueError("Ungültiges JSON-Format für den Anki-Export.") from exc
 
     deck_title_data = data if isinstance(data, dict) else {}
-    deck_title = _determine_deck_title(deck_title_data, selected_file)
-    deck_id = _stable_anki_id(deck_title, "deck")
-    # Use a fresh/random model id to avoid colliding with an existing
-    # model in the user's Anki collection (which can cause Anki to keep
-    # an older template and ignore the new meta header). A random 31-bit
-    # integer is sufficient here.
-    model_id = random.randint(1, 2 ** 31 - 1)
+    return _determine_deck_title(deck_title_data, selected_file), rows
 
-    model = _build_anki_model(genanki, model_id, locale)
-    deck = genanki.Deck(deck_id, deck_title)
 
+def _anki_notes(genanki_module, model, rows):
     # genanki.Note erwartet die Klasse über das Modul
     for row in rows:
         fields = [row.get(col, "") for col in _ANKI_COLUMNS]
@@ -655,13 +1090,58 @@ def generate_anki_apkg(selected_file: str, locale: str) -> bytes:
         # duplicates of existing notes in the user's collection. Use a
         # UUID4 hex string which is sufficiently unique for imports.
         note_guid = uuid.uuid4().hex
-        note = genanki.Note(model=model, fields=fields, tags=tags, guid=note_guid)
-        deck.add_note(note)
+        yield genanki_module.Note(model=model, fields=fields, tags=tags, guid=note_guid)
+
+
+def _new_anki_model(genanki_module, locale: str):
+    # Use a fresh/random model id to avoid colliding with an existing
+    # model in the user's Anki collection (which can cause Anki to keep
+    # an older template and ignore the new meta header). A random 31-bit
+    # integer is sufficient here.
+    model_id = random.randint(1, 2 ** 31 - 1)
+    return _build_anki_model(genanki_module, model_id, locale)
+
+
+def open_anki_apkg(selected_file: str, locale: str):
+    """Anki-Paket als Dateiobjekt (am Anfang positioniert).
+
+    Kleine Pakete bleiben im Speicher, große liegen in einer temporären
+    Datei; der Aufrufer schließt das Objekt.
+    """
+    return open_anki_apkg_bulk([selected_file], locale)
 
-    package = genanki.Package(deck)
-    package.media_files = []  # Keine eingebetteten Medien
 
-    return _write_apkg_package(package)
+def open_anki_apkg_bulk(selected_files: Sequence[str], locale: str, *, parent_title: Optional[str] = None):
+    """Mehrere Fragensets als ein Anki-Paket, je Set ein Deck.
+
+    Mit `parent_title` werden die Decks unter ``parent_title::<Set>``
+    einsortiert. Die Sets werden nacheinander gelesen und geschrieben, es
+    liegt also nie mehr als ein Set im Speicher.
+    """
+    genanki = _import_genanki()
+    model = _new_anki_model(genanki, locale)
+
+    def _decks():
+        for selected_file in selected_files:
+            deck_title, rows = _anki_set_rows(selected_file)
+            if parent_title:
+                deck_title = f"{parent_title}::{deck_title}"
+            yield _stable_anki_id(deck_title, "deck"), deck_title, _anki_notes(genanki, model, rows)
+
+    buffer = tempfile.SpooledTemporaryFile(max_size=_APKG_SPOOL_BYTES, suffix=".apkg")
+    try:
+        write_apkg(buffer, model, _decks())
+    except BaseException:
+        buffer.close()
+        raise
+    buffer.seek(0)
+    return buffer
+
+
+def generate_anki_apkg(selected_file: str, locale: str) -> bytes:
+    """Erzeugt ein Anki-.apkg-Paket für das angegebene Fragen-JSON."""
+    with open_anki_apkg(selected_file, locale) as package:
+        return package.read()
 
 
 def _derive_export_name(selected_file: str) -> str:
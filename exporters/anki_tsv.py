@@ -29,17 +29,8 @@ from examples.math_utils import render_markdown_with_math
 from mdit_py_plugins.amsmath import amsmath_plugin
 import logging
 from i18n.context import t as translate_ui
-try:
-    # Reuse normalization from pdf_export to map aliases like 'wissen' -> 'Reproduktion'
-    from pdf_export import _normalize_stage_label
-except Exception:
-    from typing import Any
-
-    def _normalize_stage_label(value: Any) -> str:
-        try:
-            return str(value) if value is not None else ""
-        except Exception:
-            return ""
+# Same normalization as the PDF export, maps aliases like 'wissen' -> 'Reproduktion'
+from helpers.stages import _normalize_stage_label
 
 try:
     import bleach
@@ -0,0 +1,277 @@
+"""Inhaltsadressierter Disk-Cache für gerenderte Formelbilder.
+
+Die Bilder liegen wie bisher als ``<sha1>.png`` (QuickLaTeX) bzw.
+``<sha1>.svg`` (lokales Backend) in ``FORMULA_CACHE_DIR``. Daneben führt
+``index.sqlite3`` pro Datei Größe, letzte Nutzung (atime) und Trefferzahl sowie
+laufende Summen und Zähler für Treffer, Fehlschläge und Verdrängungen.
+
+Eviction ist LRU über einen Index auf ``atime``: statt das Verzeichnis zu
+globben und jede Datei zu statten, werden nur die ältesten Einträge gelesen.
+Mehrere Prozesse teilen sich den Index; SQLite übernimmt das Datei-Locking
+(``BEGIN IMMEDIATE`` für alle Schreibvorgänge).
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "index.sqlite3"
+_CACHE_SUFFIXES = (".png", ".svg")
+_COUNTERS = ("files", "bytes", "hits", "misses", "evictions")
+
+_CACHES: Dict[str, "FormulaDiskCache"] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def formula_cache_name(formula: str, is_block: bool, ext: str) -> str:
+    """Dateiname eines Formelbilds: sha1 über Formel und Darstellungsmodus."""
+    h = hashlib.sha1((formula + ('@block' if is_block else '@inline')).encode('utf-8')).hexdigest()
+    return f"{h}.{ext}"
+
+
+class FormulaDiskCache:
+    """Formelbilder in einem Verzeichnis, verwaltet über einen SQLite-Index."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    # -- Index -------------------------------------------------------------
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(
+                str(self.directory / INDEX_FILENAME),
+                timeout=10,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " name TEXT PRIMARY KEY, size INTEGER NOT NULL,"
+                " atime REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_atime ON entries(atime)")
+            conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            self._conn = conn
+            self._import_existing_files(conn)
+        return self._conn
+
+    def _import_existing_files(self, conn: sqlite3.Connection) -> None:
+        """Übernimmt einmalig Dateien, die vor dem Index angelegt wurden."""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM counters WHERE name = 'files'").fetchone():
+                conn.execute("COMMIT")
+                return
+            rows = []
+            for entry in os.scandir(self.directory):
+                name = entry.name
+                try:
+                    if name.endswith(".tmp"):
+                        # Reste abgebrochener Schreibvorgänge, laufende nicht anfassen
+                        if time.time() - entry.stat().st_mtime > 3600:
+                            os.unlink(entry.path)
+                        continue
+                    if not name.endswith(_CACHE_SUFFIXES):
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    # Datei wurde parallel entfernt
+                    continue
+                rows.append((name, st.st_size, st.st_mtime))
+            conn.executemany("INSERT OR IGNORE INTO entries (name, size, atime) VALUES (?, ?, ?)", rows)
+            files, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            conn.executemany(
+                "INSERT OR REPLACE INTO counters (name, value) VALUES (?, ?)",
+                [("files", files), ("bytes", total), ("hits", 0), ("misses", 0), ("evictions", 0)],
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _bump(conn: sqlite3.Connection, name: str, delta: int) -> None:
+        conn.execute("UPDATE counters SET value = value + ? WHERE name = ?", (delta, name))
+
+    def _forget(self, conn: sqlite3.Connection, name: str) -> Optional[int]:
+        row = conn.execute("SELECT size FROM entries WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return None
+        conn.execute("DELETE FROM entries WHERE name = ?", (name,))
+        self._bump(conn, "files", -1)
+        self._bump(conn, "bytes", -row[0])
+        return row[0]
+
+    # -- API ---------------------------------------------------------------
+
+    def get(self, name: str) -> Optional[bytes]:
+        """Liest ein Bild und aktualisiert atime/Treffer; None bei Fehlschlag."""
+        try:
+            data = (self.directory / name).read_bytes()
+        except OSError:
+            data = None
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if data is None:
+                    self._forget(conn, name)
+                    self._bump(conn, "misses", 1)
+                else:
+                    updated = conn.execute(
+                        "UPDATE entries SET atime = ?, hits = hits + 1 WHERE name = ?",
+                        (time.time(), name),
+                    ).rowcount
+                    if not updated:
+                        # Von einem älteren Prozess ohne Index geschrieben
+                        conn.execute(
+                            "INSERT INTO entries (name, size, atime, hits) VALUES (?, ?, ?, 1)",
+                            (name, len(data), time.time()),
+                        )
+                        self._bump(conn, "files", 1)
+                        self._bump(conn, "bytes", len(data))
+                    self._bump(conn, "hits", 1)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return data
+
+    def contains(self, name: str) -> bool:
+        """Prüft die Existenz ohne Trefferstatistik zu verändern."""
+        with self._lock:
+            conn = self._connection()
+            return conn.execute("SELECT 1 FROM entries WHERE name = ?", (name,)).fetchone() is not None
+
+    def put(self, name: str, data: bytes, max_files: int, max_bytes: int, ttl_days: int) -> None:
+        """Schreibt ein Bild atomar, indexiert es und verdrängt bei Bedarf alte Einträge."""
+        path = self.directory / name
+        tmp_path = path.with_name(f"{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'wb') as fh:
+            fh.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._forget(conn, name)
+                conn.execute(
+                    "INSERT INTO entries (name, size, atime) VALUES (?, ?, ?)",
+                    (name, len(data), time.time()),
+                )
+                self._bump(conn, "files", 1)
+                self._bump(conn, "bytes", len(data))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        self.evict(max_files=max_files, max_bytes=max_bytes, ttl_days=ttl_days)
+
+    def evict(self, max_files: int, max_bytes: int, ttl_days: int) -> int:
+        """Entfernt abgelaufene und die am längsten ungenutzten Einträge.
+
+        Liest nur so viele Zeilen über den atime-Index, wie entfernt werden
+        müssen. Liefert die Anzahl verdrängter Dateien.
+        """
+        victims: List[str] = []
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                cutoff = time.time() - ttl_days * 86400
+                for name, _size in conn.execute(
+                    "SELECT name, size FROM entries WHERE atime < ? ORDER BY atime", (cutoff,)
+                ).fetchall():
+                    self._forget(conn, name)
+                    victims.append(name)
+                counters = self._read_counters(conn)
+                files, total = counters["files"], counters["bytes"]
+                while files > max_files or total > max_bytes:
+                    batch = max(1, files - max_files)
+                    rows = conn.execute(
+                        "SELECT name, size FROM entries ORDER BY atime LIMIT ?", (batch,)
+                    ).fetchall()
+                    if not rows:
+                        break
+                    for name, size in rows:
+                        self._forget(conn, name)
+                        victims.append(name)
+                        files -= 1
+                        total -= size
+                        if files <= max_files and total <= max_bytes:
+                            break
+                if victims:
+                    self._bump(conn, "evictions", len(victims))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        for name in victims:
+            try:
+                (self.directory / name).unlink()
+            except FileNotFoundError:
+                pass
+            except OSError:
+                logger.warning('Eviction: failed to remove %s', name)
+        if victims:
+            logger.info('Formula cache eviction: removed %d files', len(victims))
+        return len(victims)
+
+    @staticmethod
+    def _read_counters(conn: sqlite3.Connection) -> Dict[str, int]:
+        values = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+        return {key: int(values.get(key, 0)) for key in _COUNTERS}
+
+    def stats(self) -> Dict[str, float]:
+        """Dateien, Bytes sowie Treffer/Fehlschläge/Verdrängungen (prozessübergreifend)."""
+        with self._lock:
+            counters = self._read_counters(self._connection())
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_rate"] = (counters["hits"] / lookups) if lookups else 0.0
+        return counters
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Instanzen aus dem Elternprozess: im Kind weder benutzen noch schließen.
+_INHERITED_CACHES: List["FormulaDiskCache"] = []
+
+
+def _after_fork_in_child() -> None:
+    # Index-Verbindung und Locks des Elternprozesses nicht weiterverwenden.
+    global _CACHES, _CACHES_LOCK
+    _INHERITED_CACHES.extend(_CACHES.values())
+    _CACHES = {}
+    _CACHES_LOCK = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def get_cache(directory: Path) -> FormulaDiskCache:
+    """Liefert die (prozessweit geteilte) Cache-Instanz für ein Verzeichnis."""
+    key = str(Path(directory).resolve())
+    with _CACHES_LOCK:
+        cache = _CACHES.get(key)
+        if cache is None:
+            cache = FormulaDiskCache(Path(directory))
+            _CACHES[key] = cache
+        return cache
@@ -0,0 +1,196 @@
+"""Formel-Backends für den PDF-Export.
+
+`pdf_export` rendert LaTeX-Formeln entweder lokal (``latex`` + ``dvisvgm``,
+Ergebnis als SVG) oder über die QuickLaTeX-API (PNG). Die Auswahl erfolgt über
+``MC_FORMULA_BACKEND``:
+
+- ``auto`` (Standard): lokal, sofern ``latex`` und ``dvisvgm`` im PATH liegen,
+  sonst QuickLaTeX.
+- ``tex``: lokal erzwingen (fällt mit Warnung auf QuickLaTeX zurück, wenn die
+  Programme fehlen).
+- ``quicklatex``: immer die Remote-API verwenden.
+
+Lokal werden alle Formeln eines Dokuments gesammelt gerendert: jeweils ein
+Chunk von Formeln landet als eigene Seite in einem einzigen LaTeX-Lauf, und
+``dvisvgm`` schreibt pro Seite ein SVG. Mehrere Chunks laufen parallel.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+BACKEND_TEX = "tex"
+BACKEND_QUICKLATEX = "quicklatex"
+
+# Formeln pro LaTeX-Lauf; größere Chunks sparen Prozessstarts, kleinere
+# verteilen sich besser auf parallele Worker.
+FORMULA_BATCH_SIZE = max(1, int(os.getenv("MC_FORMULA_BATCH_SIZE", "40")))
+# Obergrenze gleichzeitiger latex/dvisvgm-Läufe über alle Exporte hinweg.
+_MAX_TEX_PARALLEL = max(1, int(os.getenv("MC_FORMULA_TEX_PARALLEL", str(os.cpu_count() or 2))))
+_tex_semaphore = threading.BoundedSemaphore(_MAX_TEX_PARALLEL)
+
+_TEX_PREAMBLE = (
+    "\\documentclass{article}\n"
+    "\\usepackage{amsmath}\n"
+    "\\usepackage{amsfonts}\n"
+    "\\usepackage{amssymb}\n"
+    "\\pagestyle{empty}\n"
+    "\\begin{document}\n"
+)
+
+# Formeln stammen auch aus hochgeladenen Fragensets. Befehle, die Dateien
+# lesen/schreiben oder das Dokument verlassen, werden nicht an TeX gegeben.
+_FORBIDDEN_TEX = re.compile(
+    r"\\(?:input|include|openin|openout|read|write|immediate|special|catcode|"
+    r"csname|usepackage|documentclass|end\s*\{document\}|begin\s*\{document\})(?![a-zA-Z])"
+)
+
+# Display-Umgebungen bringen ihren eigenen Mathemodus mit.
+_DISPLAY_ENV = re.compile(r"\\begin\s*\{(?:equation|align|alignat|gather|multline|flalign)\*?\}")
+
+_PAGE_NUMBER = re.compile(r"page-(\d+)\.svg$")
+
+
+def local_backend_available() -> bool:
+    """True, wenn `latex` und `dvisvgm` aufrufbar sind."""
+    return all(shutil.which(tool) for tool in ("latex", "dvisvgm"))
+
+
+def get_formula_backend() -> str:
+    """Liefert das aktive Backend (`tex` oder `quicklatex`)."""
+    choice = (os.getenv("MC_FORMULA_BACKEND") or "auto").strip().lower()
+    if choice in ("quicklatex", "remote"):
+        return BACKEND_QUICKLATEX
+    if local_backend_available():
+        return BACKEND_TEX
+    if choice in ("tex", "local"):
+        logger.warning("MC_FORMULA_BACKEND=%s, aber latex/dvisvgm fehlen; nutze QuickLaTeX", choice)
+    return BACKEND_QUICKLATEX
+
+
+def is_renderable(formula: str) -> bool:
+    """Prüft, ob eine Formel lokal gerendert werden darf."""
+    return bool(formula and formula.strip()) and not _FORBIDDEN_TEX.search(formula)
+
+
+def build_tex_document(items: Sequence[Tuple[str, bool]]) -> str:
+    """Erzeugt ein LaTeX-Dokument mit genau einer Seite pro Formel."""
+    pages = []
+    for formula, is_block in items:
+        body = formula.strip()
+        if _DISPLAY_ENV.search(body):
+            pages.append(f"{body}\n\\newpage\n")
+        elif is_block:
+            pages.append(f"$\\displaystyle {body}$\n\\newpage\n")
+        else:
+            pages.append(f"${body}$\n\\newpage\n")
+    return _TEX_PREAMBLE + "".join(pages) + "\\end{document}\n"
+
+
+def _tex_env() -> dict:
+    env = dict(os.environ)
+    # kpathsea: Lesen/Schreiben nur im Arbeitsverzeichnis (temp dir) erlauben.
+    env["openin_any"] = "p"
+    env["openout_any"] = "p"
+    return env
+
+
+def _run_tex_batch(items: Sequence[Tuple[str, bool]], timeout: float) -> Optional[List[bytes]]:
+    """Rendert einen Chunk in einem LaTeX-Lauf; None bei Fehler im Chunk."""
+    with tempfile.TemporaryDirectory(prefix="mc_formula_") as tmp:
+        workdir = Path(tmp)
+        (workdir / "formulas.tex").write_text(build_tex_document(items), encoding="utf-8")
+        deadline = time.monotonic() + timeout
+        env = _tex_env()
+        latex = subprocess.run(
+            ["latex", "-interaction=nonstopmode", "-halt-on-error", "-no-shell-escape", "formulas.tex"],
+            cwd=workdir,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            timeout=max(0.1, deadline - time.monotonic()),
+            check=False,
+        )
+        if latex.returncode != 0 or not (workdir / "formulas.dvi").exists():
+            return None
+        dvisvgm = subprocess.run(
+            ["dvisvgm", "--no-fonts", "--exact-bbox", "--page=1-", "--output=page-%p.svg", "formulas.dvi"],
+            cwd=workdir,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            timeout=max(0.1, deadline - time.monotonic()),
+            check=False,
+        )
+        if dvisvgm.returncode != 0:
+            return None
+        pages = sorted(
+            (p for p in workdir.glob("page-*.svg") if _PAGE_NUMBER.search(p.name)),
+            key=lambda p: int(_PAGE_NUMBER.search(p.name).group(1)),
+        )
+        if len(pages) != len(items):
+            return None
+        return [p.read_bytes() for p in pages]
+
+
+def _render_chunk(items: Sequence[Tuple[str, bool]], deadline: float) -> List[Optional[bytes]]:
+    """Rendert einen Chunk; fehlerhafte Formeln werden per Halbierung isoliert."""
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        return [None] * len(items)
+    try:
+        with _tex_semaphore:
+            rendered = _run_tex_batch(items, remaining)
+    except (OSError, subprocess.SubprocessError):
+        logger.warning("Lokales Formel-Rendering fehlgeschlagen", exc_info=True)
+        return [None] * len(items)
+    if rendered is not None:
+        return list(rendered)
+    if len(items) == 1:
+        return [None]
+    # Ein LaTeX-Fehler bricht den ganzen Lauf ab: Chunk halbieren, damit nur
+    # die fehlerhafte Formel auf den Text-Fallback fällt.
+    middle = len(items) // 2
+    return _render_chunk(items[:middle], deadline) + _render_chunk(items[middle:], deadline)
+
+
+def render_formulas(
+    items: Sequence[Tuple[str, bool]],
+    timeout: float | None = None,
+    max_workers: int | None = None,
+) -> List[Optional[bytes]]:
+    """Rendert `(formel, is_block)`-Paare lokal zu SVG-Bytes.
+
+    Die Rückgabe hat dieselbe Reihenfolge wie `items`; nicht renderbare oder
+    fehlerhafte Formeln sowie Timeouts liefern None.
+    """
+    results: List[Optional[bytes]] = [None] * len(items)
+    todo = [idx for idx, (formula, _block) in enumerate(items) if is_renderable(formula)]
+    if not todo:
+        return results
+
+    deadline = time.monotonic() + (timeout if timeout is not None else 60.0)
+    chunks = [todo[i:i + FORMULA_BATCH_SIZE] for i in range(0, len(todo), FORMULA_BATCH_SIZE)]
+    workers = max(1, min(len(chunks), max_workers or _MAX_TEX_PARALLEL))
+
+    def run(chunk: List[int]) -> List[Optional[bytes]]:
+        return _render_chunk([items[idx] for idx in chunk], deadline)
+
+    # Die eigentliche Arbeit passiert in latex/dvisvgm-Prozessen; Threads
+    # genügen, um mehrere Chunks gleichzeitig laufen zu lassen.
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for chunk, rendered in zip(chunks, executor.map(run, chunks)):
+            for idx, svg in zip(chunk, rendered):
+                results[idx] = svg
+    return results
@@ -10,6 +10,7 @@ from i18n.context import t as translate_ui
 import streamlit as st
 
 from helpers.chart_theme import CHART_AXIS_TEXT, CHART_GRID_COLOR
+from helpers.run_state import get_test_run
 
 def _ellipsize(label: str, max_chars: int = 28) -> str:
     if not label:
@@ -25,7 +26,8 @@ def create_difficulty_heatmap(questions):
     Erstellt eine Heatmap: Topics (Y-Achse) × Cognitive Levels (X-Achse)
     Zeigt Performance in % und Anzahl Fragen pro Zelle
     """
-    
+    run = get_test_run(st.session_state)
+
     # Sammle alle einzigartigen Topics und Cognitive Levels
     topics = set()
     cognitive_levels_set = set()
@@ -96,10 +98,10 @@ def create_difficulty_heatmap(questions):
                 gewichtung = question.get('gewichtung', 1)
                 max_points += gewichtung
                 
-                answer_key = f"frage_{i}_beantwortet"
-                if answer_key in st.session_state and st.session_state[answer_key] is not None:
+                punkte = run.points(i)
+                if punkte is not None:
                     answered_count += 1
-                    points = max(0, st.session_state[answer_key])  # Nur positive Punkte
+                    points = max(0, punkte)  # Nur positive Punkte
                     total_points += points
                 else:
                     unanswered_count += 1
@@ -10,6 +10,7 @@ from i18n.context import t as translate_ui
 import streamlit as st
 
 from helpers.chart_theme import CHART_AXIS_TEXT
+from helpers.run_state import get_test_run
 
 # Default concept-mastery heuristic (EDULEARN26 paper, Section 4.3).
 CONCEPT_MASTERY_THRESHOLD = 0.7
@@ -38,6 +39,7 @@ def create_performance_column(questions):
         return None  # Keine Konzepte vorhanden
     
     # Erstelle Performance-Daten pro Konzept basierend auf echten Antworten
+    run = get_test_run(st.session_state)
     performance_data = []
     for concept in sorted(all_concepts):
         answered_count = 0
@@ -47,10 +49,10 @@ def create_performance_column(questions):
         for i, question in enumerate(questions):
             if question.get('concept') == concept:
                 total += 1
-                answer_key = f"frage_{i}_beantwortet"
-                if answer_key in st.session_state and st.session_state[answer_key] is not None:
+                punkte = run.points(i)
+                if punkte is not None:
                     answered_count += 1
-                    if st.session_state[answer_key] > 0:
+                    if punkte > 0:
                         correct_count += 1
         
         coverage = answered_count / total if total else 0
@@ -8,6 +8,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Optional
 
+from helpers.run_state import get_test_run
+
 
 @dataclass
 class Visibility:
@@ -58,7 +60,7 @@ def compute_visibility(
     remaining_questions: int,
     panic_threshold: int = 15,
 ) -> Visibility:
-    answered = session_state.get(f"frage_{frage_idx}_beantwortet") is not None
+    answered = get_test_run(session_state).is_answered(frage_idx)
     skipped = session_state.get("skipped_questions", [])
     bookmarks = session_state.get("bookmarked_questions", [])
     jump_active = bool(session_state.get("jump_to_idx_active"))
@@ -0,0 +1,300 @@
+"""
+Kompakter Zustand eines Testlaufs.
+
+Statt einzelner Session-Keys pro Frage (``frage_{i}_beantwortet``,
+``frage_{i}_antwort``, ``frage_{i}_confidence``, ``show_explanation_{i}`` und
+die Zeitstempel ``frage_{i}_*_time_monotonic``) hält ein `TestRun` alle Werte
+in Arrays, die über den Frage-Index adressiert werden. Fortschritt
+(beantwortet, offen, nächste unbeantwortete Frage) wird mitgezählt und muss
+nicht bei jedem Rerun aus dem Session State zusammengesucht werden.
+
+Das Modul kennt Streamlit nicht; Aufrufer übergeben den Session State (oder
+ein Dict in Tests).
+"""
+
+from __future__ import annotations
+
+import copy
+from array import array
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+SESSION_KEY = "test_run"
+
+# Session-Keys, die der PDF-Bericht (`pdf_export.generate_pdf_report`) liest;
+# ``active_locale`` ist die UI-Sprache (`i18n.context.LOCALE_SESSION_KEY`).
+REPORT_STATE_KEYS = (
+    SESSION_KEY,
+    "active_locale",
+    "user_id",
+    "user_pseudonym",
+    "session_id",
+    "selected_questions_file",
+    "selected_mode",
+    "selected_tempo",
+    "selected_tempo_session",
+    "tempo",
+    "test_start_time",
+    "test_end_time",
+    "test_manually_ended",
+    "test_time_limit",
+    "test_duration_minutes",
+    "effective_allowed",
+    "allowed_min",
+    "initial_frage_indices",
+    "bookmarked_questions",
+)
+
+# AppConfig-Felder, die der PDF-Bericht auswertet (Punkte, Zeitlimit, Cooldowns).
+REPORT_CONFIG_FIELDS = (
+    "scoring_mode",
+    "test_duration_minutes",
+    "reading_cooldown_base_per_weight",
+    "next_cooldown_extra_standard",
+    "next_cooldown_extra_extended",
+)
+
+# Sentinel für "nicht beantwortet" im Punkte-Array (Punkte können negativ sein).
+_UNANSWERED = -(2 ** 31)
+_NO_TIME = float("nan")
+_CONFIDENCE_LEVELS = (None, "unsure", "sure")
+
+
+class TestRun:
+    """Antworten, Punkte, Konfidenz, Erklärungs-Flags und Zeitstempel eines Laufs."""
+
+    __test__ = False  # kein pytest-Testfall
+    __slots__ = (
+        "order",
+        "_points",
+        "_answers",
+        "_confidence",
+        "_explanation",
+        "_shown_at",
+        "_explanation_shown_at",
+        "_answered",
+        "_cursor",
+    )
+
+    def __init__(self, size: int, order: Optional[Iterable[int]] = None):
+        size = max(0, int(size))
+        # Präsentationsreihenfolge; Überspringen/Springen ändern sie über defer()/bring_to_front().
+        self.order = list(range(size)) if order is None else [int(i) for i in order]
+        self._points = array("i", [_UNANSWERED]) * size
+        self._answers: list[Optional[str]] = [None] * size
+        self._confidence = bytearray(size)
+        self._explanation = bytearray(size)
+        self._shown_at = array("d", [_NO_TIME]) * size
+        self._explanation_shown_at = array("d", [_NO_TIME]) * size
+        self._answered = 0
+        # Alle Einträge in order[:_cursor] sind beantwortet.
+        self._cursor = 0
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __repr__(self) -> str:
+        return f"TestRun(size={len(self)}, answered={self._answered})"
+
+    def _valid(self, frage_idx: Any) -> bool:
+        return isinstance(frage_idx, int) and 0 <= frage_idx < len(self._points)
+
+    # --- Fortschritt -----------------------------------------------------
+    @property
+    def answered(self) -> int:
+        return self._answered
+
+    @property
+    def remaining(self) -> int:
+        return len(self._points) - self._answered
+
+    def is_finished(self) -> bool:
+        return self._answered >= len(self._points)
+
+    def next_unanswered(self) -> Optional[int]:
+        """Nächste unbeantwortete Frage in `order` (None, wenn alle beantwortet)."""
+        order = self.order
+        points = self._points
+        cursor = self._cursor
+        while cursor < len(order):
+            idx = order[cursor]
+            if 0 <= idx < len(points) and points[idx] == _UNANSWERED:
+                break
+            cursor += 1
+        self._cursor = cursor
+        return order[cursor] if cursor < len(order) else None
+
+    def defer(self, frage_idx: int) -> None:
+        """Verschiebt eine Frage ans Ende der Reihenfolge (Überspringen)."""
+        if frage_idx in self.order:
+            self.order.remove(frage_idx)
+            self.order.append(frage_idx)
+            self._cursor = 0
+
+    def bring_to_front(self, frage_idx: int) -> None:
+        """Stellt eine Frage an den Anfang der Reihenfolge (Sprung zu einer offenen Frage)."""
+        if frage_idx in self.order:
+            self.order.remove(frage_idx)
+            self.order.insert(0, frage_idx)
+            self._cursor = 0
+
+    # --- Antworten -------------------------------------------------------
+    def is_answered(self, frage_idx: int) -> bool:
+        return self._valid(frage_idx) and self._points[frage_idx] != _UNANSWERED
+
+    def points(self, frage_idx: int) -> Optional[int]:
+        """Punkte der Frage oder None, wenn unbeantwortet."""
+        if not self._valid(frage_idx):
+            return None
+        value = self._points[frage_idx]
+        return None if value == _UNANSWERED else value
+
+    def points_list(self, size: Optional[int] = None) -> list[Optional[int]]:
+        """Punkte aller Fragen (None für offene), z. B. für `calculate_score`."""
+        values = [None if p == _UNANSWERED else p for p in self._points]
+        if size is not None:
+            values = values[:size] + [None] * (size - len(values))
+        return values
+
+    def answer(self, frage_idx: int) -> Optional[str]:
+        return self._answers[frage_idx] if self._valid(frage_idx) else None
+
+    def record_answer(self, frage_idx: int, punkte: int, antwort: Optional[str]) -> None:
+        if not self._valid(frage_idx):
+            raise IndexError(f"Frage-Index {frage_idx} außerhalb des Testlaufs ({len(self)} Fragen)")
+        if self._points[frage_idx] == _UNANSWERED:
+            self._answered += 1
+        self._points[frage_idx] = int(punkte)
+        self._answers[frage_idx] = antwort
+
+    def clear_answer(self, frage_idx: int) -> None:
+        if not self._valid(frage_idx):
+            return
+        if self._points[frage_idx] != _UNANSWERED:
+            self._answered -= 1
+            self._cursor = 0
+        self._points[frage_idx] = _UNANSWERED
+        self._answers[frage_idx] = None
+        self._confidence[frage_idx] = 0
+
+    def report_copy(self) -> "TestRun":
+        """Kopie mit Reihenfolge, Punkten, Antworten und Konfidenz.
+
+        Erklärungs-Flags und Anzeige-Zeitstempel liest der Bericht nicht; sie
+        bleiben leer, damit z. B. ein Umschalten der Erklärung den Stand nicht
+        verändert.
+        """
+        run = TestRun(0)
+        run.order = list(self.order)
+        run._points = array("i", self._points)
+        run._answers = list(self._answers)
+        run._confidence = bytearray(self._confidence)
+        run._explanation = bytearray(len(self._points))
+        run._shown_at = array("d", [_NO_TIME]) * len(self._points)
+        run._explanation_shown_at = array("d", [_NO_TIME]) * len(self._points)
+        run._answered = self._answered
+        return run
+
+    # --- Konfidenz -------------------------------------------------------
+    def confidence(self, frage_idx: int) -> Optional[str]:
+        return _CONFIDENCE_LEVELS[self._confidence[frage_idx]] if self._valid(frage_idx) else None
+
+    def set_confidence(self, frage_idx: int, value: Optional[str]) -> None:
+        if self._valid(frage_idx):
+            self._confidence[frage_idx] = _CONFIDENCE_LEVELS.index(value) if value in _CONFIDENCE_LEVELS else 0
+
+    # --- Erklärungen -----------------------------------------------------
+    def explanation_visible(self, frage_idx: Any) -> bool:
+        return self._valid(frage_idx) and bool(self._explanation[frage_idx])
+
+    def set_explanation_visible(self, frage_idx: int, visible: bool) -> None:
+        if self._valid(frage_idx):
+            self._explanation[frage_idx] = 1 if visible else 0
+
+    def any_explanation_visible(self) -> bool:
+        return any(self._explanation)
+
+    # --- Zeitstempel (time.monotonic) -------------------------------------
+    def shown_at(self, frage_idx: int) -> Optional[float]:
+        return self._read_time(self._shown_at, frage_idx)
+
+    def set_shown_at(self, frage_idx: int, value: Optional[float]) -> None:
+        self._write_time(self._shown_at, frage_idx, value)
+
+    def explanation_shown_at(self, frage_idx: int) -> Optional[float]:
+        return self._read_time(self._explanation_shown_at, frage_idx)
+
+    def set_explanation_shown_at(self, frage_idx: int, value: Optional[float]) -> None:
+        self._write_time(self._explanation_shown_at, frage_idx, value)
+
+    def _read_time(self, values: array, frage_idx: int) -> Optional[float]:
+        if not self._valid(frage_idx):
+            return None
+        value = values[frage_idx]
+        return None if value != value else value
+
+    def _write_time(self, values: array, frage_idx: int, value: Optional[float]) -> None:
+        if self._valid(frage_idx):
+            values[frage_idx] = _NO_TIME if value is None else float(value)
+
+
+_EMPTY_RUN = TestRun(0)
+
+
+def get_test_run(state: Optional[Mapping[str, Any]]) -> TestRun:
+    """Liefert den `TestRun` aus dem Session State.
+
+    Ohne laufenden Test kommt ein leerer Lauf zurück, dessen Abfragen wie ein
+    fehlender Session-Key None/False liefern.
+    """
+    run = None
+    if state is not None:
+        try:
+            run = state.get(SESSION_KEY)
+        except Exception:
+            run = getattr(state, SESSION_KEY, None)
+    return run if isinstance(run, TestRun) else _EMPTY_RUN
+
+
+def start_test_run(state: Any, size: int, order: Optional[Iterable[int]] = None) -> TestRun:
+    """Legt einen neuen `TestRun` an und speichert ihn im Session State."""
+    run = TestRun(size, order)
+    try:
+        state[SESSION_KEY] = run
+    except Exception:
+        setattr(state, SESSION_KEY, run)
+    return run
+
+
+def report_state_snapshot(state: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+    """Kopie der vom PDF-Bericht gelesenen Session-Keys (`REPORT_STATE_KEYS`).
+
+    Für das Rendern in einem Export-Job; spätere Änderungen im Session State
+    berühren die Kopie nicht. Vom `TestRun` wird nur der berichtsrelevante Teil
+    übernommen (`TestRun.report_copy`), sodass der Snapshot auch als
+    Fingerabdruck des Berichts taugt.
+    """
+    snapshot: Dict[str, Any] = {}
+    if state is None:
+        return snapshot
+    for key in REPORT_STATE_KEYS:
+        try:
+            present = key in state
+        except Exception:
+            present = hasattr(state, key)
+        if present:
+            try:
+                value = state[key]
+            except Exception:
+                value = getattr(state, key, None)
+            snapshot[key] = value.report_copy() if isinstance(value, TestRun) else copy.deepcopy(value)
+    return snapshot
+
+
+def report_config_values(app_config: Any) -> Dict[str, Any]:
+    """Einfache Werte der `REPORT_CONFIG_FIELDS` (der eingefrorene Snapshot ist nicht pickelbar)."""
+    values: Dict[str, Any] = {}
+    for name in REPORT_CONFIG_FIELDS:
+        if hasattr(app_config, name):
+            value = getattr(app_config, name)
+            values[name] = dict(value) if isinstance(value, Mapping) else copy.deepcopy(value)
+    return values
@@ -0,0 +1,49 @@
+"""Kognitive Stufen (Bloom) für Fragen: Normalisierung und Reihenfolge.
+
+Liegt bewusst ohne schwere Abhängigkeiten hier, damit Testansicht und
+Sortierung die Stufen auflösen können, ohne `pdf_export` (WeasyPrint) zu laden.
+"""
+from typing import Any, Dict
+
+DEFAULT_STAGE_LABEL = "Unbekannt"
+
+_STAGE_ALIAS_MAP: Dict[str, str] = {
+    "reproduktion": "Reproduktion",
+    "reproduction": "Reproduktion",
+    "wissen": "Reproduktion",
+    "memorieren": "Reproduktion",
+    "knowledge": "Reproduktion",
+    "verstehen": "Verständnis",
+    "verständnis": "Verständnis",
+    "understanding": "Verständnis",
+    "anwenden": "Anwendung",
+    "anwendung": "Anwendung",
+    "application": "Anwendung",
+    "applying": "Anwendung",
+    "analyse": "Analyse",
+    "analysis": "Analyse",
+    "analysieren": "Analyse",
+    "analyzing": "Analyse",
+    "strukturelle analyse": "Analyse",
+    "structural analysis": "Analyse",
+}
+
+BLOOM_STAGE_ORDER = ["Reproduktion", "Anwendung", "Analyse"]
+
+
+def _normalize_stage_label(value: Any) -> str:
+    if not value:
+        return DEFAULT_STAGE_LABEL
+    key = str(value).strip()
+    if not key:
+        return DEFAULT_STAGE_LABEL
+    alias = _STAGE_ALIAS_MAP.get(key.lower())
+    return alias if alias else key
+
+
+def _get_bloom_stage_rank(stage_label: str) -> int:
+    """Numerischer Rang für eine Bloom-Stufe (nicht erkannte Labels werden hinten einsortiert)."""
+    try:
+        return BLOOM_STAGE_ORDER.index(stage_label)
+    except ValueError:
+        return len(BLOOM_STAGE_ORDER)
@@ -3,6 +3,10 @@ from __future__ import annotations
 
 import json
 import logging
+import os
+import sys
+import threading
+import time
 from pathlib import Path
 from typing import Any, Iterable, Mapping, Optional
 
@@ -10,16 +14,50 @@ logger = logging.getLogger(__name__)
 
 _DEFAULT_LOCALE = "en"
 _LOCALE_DIR = Path(__file__).resolve().parent
-_LOCALE_CACHE: dict[str, tuple[float | None, Mapping[str, Any]]] = {}
+# Seconds between checks of the locale files for changes; 0 disables the
+# automatic reload (use `reload_translations()` instead).
+_RELOAD_INTERVAL = float(os.getenv("MC_I18N_RELOAD_SECONDS", "5"))
 
 __all__ = [
     "DEFAULT_LOCALE",
     "available_locales",
+    "reload_translations",
     "translate",
     "normalize_locale",
 ]
 
 
+class _Catalogs:
+    """Compiled translation tables for all locales.
+
+    ``tables`` maps each locale to a flat ``{dotted.key: text}`` dict that
+    already contains the default-locale entries as fallback, so a lookup is a
+    single dict access.
+    """
+
+    __slots__ = ("signature", "locales", "tables", "checked_at")
+
+    def __init__(self, signature: tuple, locales: tuple[str, ...], tables: dict[str, dict[str, str]]):
+        self.signature = signature
+        self.locales = locales
+        self.tables = tables
+        self.checked_at = time.monotonic()
+
+
+_CATALOGS: Optional[_Catalogs] = None
+_CATALOGS_LOCK = threading.Lock()
+
+
+def _after_fork_in_child() -> None:
+    # Ein beim fork() gehaltener Lock würde im Kind nie freigegeben.
+    global _CATALOGS_LOCK
+    _CATALOGS_LOCK = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
 def normalize_locale(locale: Optional[str]) -> str:
     if not locale:
         return _DEFAULT_LOCALE
@@ -29,45 +67,17 @@ def normalize_locale(locale: Optional[str]) -> str:
 
 def _load_locale_data(locale: str) -> Mapping[str, Any]:
     locale_file = _LOCALE_DIR / f"{locale}.json"
-    if not locale_file.is_file():
-        logger.warning("Locale file %s not found", locale_file.name)
-        return {}
-
-    try:
-        mtime = locale_file.stat().st_mtime
-    except OSError:
-        mtime = None
-
-    if mtime is not None:
-        cached = _LOCALE_CACHE.get(locale)
-        if cached and cached[0] == mtime:
-            return cached[1]
-
     try:
-        data = json.loads(locale_file.read_text(encoding="utf-8"))
-    except json.JSONDecodeError as exc:
+        return json.loads(locale_file.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        logger.warning("Locale file %s not found", locale_file.name)
+    except (OSError, json.JSONDecodeError) as exc:
         logger.warning(
             "Failed to decode locale file %s: %s",
             locale_file.name,
             exc,
         )
-        data = {}
-
-    if mtime is None:
-        try:
-            mtime = locale_file.stat().st_mtime
-        except OSError:
-            mtime = None
-
-    _LOCALE_CACHE[locale] = (mtime, data)
-    return data
-
-
-def _clear_locale_cache() -> None:
-    _LOCALE_CACHE.clear()
-
-
-_load_locale_data.cache_clear = _clear_locale_cache
+    return {}
 
 
 def _lookup_key(data: Mapping[str, Any], key: str) -> Optional[Any]:
@@ -109,28 +119,108 @@ def _lookup_key(data: Mapping[str, Any], key: str) -> Optional[Any]:
     return candidate
 
 
-def available_locales() -> Iterable[str]:
-    json_files = sorted(
-        f.stem for f in _LOCALE_DIR.iterdir() if f.is_file() and f.suffix == ".json"
-    )
-    if not json_files:
-        return (_DEFAULT_LOCALE,)
-    return json_files
+def _iter_keys(data: Mapping[str, Any], prefix: str = "") -> Iterable[str]:
+    for name, value in data.items():
+        key = f"{prefix}{name}"
+        if isinstance(value, Mapping):
+            yield from _iter_keys(value, f"{key}.")
+        else:
+            yield key
 
 
-def translate(key: str, locale: Optional[str] = None, default: Optional[str] = None) -> str:
-    locale = normalize_locale(locale)
-    value = _lookup_key(_load_locale_data(locale), key)
+def _compile_table(data: Mapping[str, Any]) -> dict[str, str]:
+    """Flatten a locale file into ``{dotted.key: text}``.
 
-    if value is None and locale != _DEFAULT_LOCALE:
-        value = _lookup_key(_load_locale_data(_DEFAULT_LOCALE), key)
+    Values are resolved through `_lookup_key`, so nested sections and flat
+    dotted keys keep their usual precedence.
+    """
+    table: dict[str, str] = {}
+    for key in _iter_keys(data):
+        value = _lookup_key(data, key)
+        if value is None or isinstance(value, Mapping):
+            continue
+        text = value if isinstance(value, str) else str(value)
+        table[sys.intern(key)] = sys.intern(text)
+    return table
 
+
+def _locale_signature() -> tuple:
+    entries = []
+    try:
+        for entry in os.scandir(_LOCALE_DIR):
+            if not entry.name.endswith(".json") or not entry.is_file():
+                continue
+            stat = entry.stat()
+            entries.append((entry.name, stat.st_mtime_ns, stat.st_size))
+    except OSError:
+        pass
+    return tuple(sorted(entries))
+
+
+def _compile_catalogs(signature: tuple) -> _Catalogs:
+    locales = tuple(name[: -len(".json")] for name, _mtime, _size in signature) or (_DEFAULT_LOCALE,)
+    default_table = _compile_table(_load_locale_data(_DEFAULT_LOCALE))
+    tables = {_DEFAULT_LOCALE: default_table}
+    for locale in locales:
+        if locale == _DEFAULT_LOCALE:
+            continue
+        table = dict(default_table)
+        table.update(_compile_table(_load_locale_data(locale)))
+        tables[locale] = table
+    return _Catalogs(signature, locales, tables)
+
+
+def _get_catalogs() -> _Catalogs:
+    catalogs = _CATALOGS
+    if catalogs is not None and (
+        _RELOAD_INTERVAL <= 0 or time.monotonic() - catalogs.checked_at < _RELOAD_INTERVAL
+    ):
+        return catalogs
+    return _refresh_catalogs(force=False)
+
+
+def _refresh_catalogs(force: bool) -> _Catalogs:
+    global _CATALOGS
+    with _CATALOGS_LOCK:
+        catalogs = _CATALOGS
+        if catalogs is not None and not force:
+            if _RELOAD_INTERVAL > 0 and time.monotonic() - catalogs.checked_at < _RELOAD_INTERVAL:
+                # Another thread checked while we were waiting for the lock.
+                return catalogs
+            signature = _locale_signature()
+            if signature == catalogs.signature:
+                catalogs.checked_at = time.monotonic()
+                return catalogs
+        else:
+            signature = _locale_signature()
+        _CATALOGS = _compile_catalogs(signature)
+        return _CATALOGS
+
+
+def reload_translations(force: bool = True) -> None:
+    """Re-read the locale files.
+
+    With ``force=False`` the tables are only recompiled when a locale file
+    changed (one ``stat`` per file).
+    """
+    catalogs = _CATALOGS
+    if not force and catalogs is not None:
+        # Expire the debounce window so the signature is checked right away.
+        catalogs.checked_at = float("-inf")
+    _refresh_catalogs(force=force)
+
+
+def available_locales() -> Iterable[str]:
+    return _get_catalogs().locales
+
+
+def translate(key: str, locale: Optional[str] = None, default: Optional[str] = None) -> str:
+    tables = _get_catalogs().tables
+    table = tables.get(normalize_locale(locale)) or tables[_DEFAULT_LOCALE]
+    value = table.get(key)
     if value is None:
         return default if default is not None else key
-
-    if isinstance(value, str):
-        return value
-    return str(value)
+    return value
 
 
 DEFAULT_LOCALE = _DEFAULT_LOCALE
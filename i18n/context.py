@@ -5,7 +5,7 @@ from typing import Any, MutableMapping, Optional
 
 import streamlit as st
 
-from . import DEFAULT_LOCALE, available_locales, normalize_locale, translate
+from . import DEFAULT_LOCALE, available_locales, normalize_locale, reload_translations, translate
 
 LOCALE_SESSION_KEY = "active_locale"
 
@@ -32,8 +32,7 @@ def get_locale() -> str:
 
     stored = state.get(LOCALE_SESSION_KEY)
     normalized = normalize_locale(stored)
-    locales = set(available_locales())
-    if normalized in locales:
+    if normalized in available_locales():
         if state.get(LOCALE_SESSION_KEY) != normalized:
             try:
                 state[LOCALE_SESSION_KEY] = normalized
@@ -58,17 +57,10 @@ def set_locale(locale: str) -> str:
             state[LOCALE_SESSION_KEY] = normalized
         except Exception:
             pass
-    # Clear the cached locale data so changes to the JSON files are picked up
-    # immediately in long-running Streamlit sessions.
+    # Pick up edited locale files right away when the user switches language;
+    # the tables are only recompiled if a file actually changed.
     try:
-        # Import here to avoid circular import at module load time.
-        from . import _load_locale_data
-
-        try:
-            _load_locale_data.cache_clear()
-        except Exception:
-            # If the cache is not present or clearing fails, ignore silently.
-            pass
+        reload_translations(force=False)
     except Exception:
         pass
     return normalized
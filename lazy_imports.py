@@ -0,0 +1,112 @@
+"""Verzögerte Imports für schwere Module und Messung der Import-Zeiten.
+
+`lazy_function("pdf_export", "generate_musterloesung_pdf")` liefert einen
+Platzhalter, der das Modul erst beim ersten Aufruf importiert. Damit lädt der
+Kaltstart von `app.py` weder WeasyPrint/Markdown-It (PDF-Export) noch das
+Admin-Panel, solange niemand exportiert oder den Admin-Bereich öffnet.
+
+Messung: Jeder verzögerte Import wird mit seiner Dauer festgehalten
+(`lazy_load_report`). Mit ``MC_IMPORT_PROFILE=1`` protokolliert die App
+zusätzlich die Import-Zeit beim Start und die Zeit bis zum ersten fertigen
+Durchlauf. Eine Aufschlüsselung pro Modul liefert
+``python tools/import_time_report.py`` (nutzt ``python -X importtime``).
+"""
+from __future__ import annotations
+
+import importlib
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable
+
+_LOCK = threading.Lock()
+# Modulname -> Dauer des verzögerten Imports in ms (inkl. Abhängigkeiten).
+_LAZY_LOADS: dict[str, float] = {}
+_STARTUP: dict[str, float] = {}
+
+
+def _after_fork_in_child() -> None:
+    # Ein beim fork() gehaltener Lock würde im Kind nie freigegeben.
+    global _LOCK
+    _LOCK = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def import_profile_enabled() -> bool:
+    """True, wenn ``MC_IMPORT_PROFILE`` gesetzt ist (1/true/yes/on)."""
+    return os.getenv("MC_IMPORT_PROFILE", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def load(module_name: str):
+    """Importiert `module_name` (falls nötig) und misst den ersten Import."""
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    started = time.perf_counter()
+    module = importlib.import_module(module_name)
+    elapsed_ms = (time.perf_counter() - started) * 1000.0
+    with _LOCK:
+        first = module_name not in _LAZY_LOADS
+        if first:
+            _LAZY_LOADS[module_name] = elapsed_ms
+    if first and import_profile_enabled():
+        print(f"[import-profile] verzögerter Import {module_name}: {elapsed_ms:.1f} ms")
+    return module
+
+
+class _LazyFunction:
+    """Aufrufbarer Platzhalter; wird per Referenz gepickelt (z. B. für Export-Jobs)."""
+
+    def __init__(self, module_name: str, attr: str):
+        self.__name__ = attr
+        self.__qualname__ = attr
+        self.__doc__ = f"Lädt `{module_name}` beim ersten Aufruf und ruft `{attr}` auf."
+        self.__lazy_target__ = (module_name, attr)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return resolve(self)(*args, **kwargs)
+
+    def __reduce__(self):
+        return (lazy_function, self.__lazy_target__)
+
+    def __repr__(self) -> str:
+        return f"<lazy {self.__lazy_target__[0]}.{self.__name__}>"
+
+
+def lazy_function(module_name: str, attr: str) -> Callable[..., Any]:
+    """Platzhalter für `module_name.attr`, der das Modul erst beim Aufruf lädt."""
+    return _LazyFunction(module_name, attr)
+
+
+def resolve(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Liefert zu einem Platzhalter die echte Funktion (lädt das Modul), sonst `func`."""
+    target = getattr(func, "__lazy_target__", None)
+    if target is None:
+        return func
+    return getattr(load(target[0]), target[1])
+
+
+def lazy_load_report() -> list[tuple[str, float]]:
+    """Verzögert geladene Module mit Importdauer (ms), längste zuerst."""
+    with _LOCK:
+        return sorted(_LAZY_LOADS.items(), key=lambda item: item[1], reverse=True)
+
+
+def record_startup(phase: str, seconds: float) -> None:
+    """Hält eine Startphase einmal pro Prozess fest (z. B. ``imports``)."""
+    with _LOCK:
+        if phase in _STARTUP:
+            return
+        _STARTUP[phase] = seconds * 1000.0
+    if import_profile_enabled():
+        print(f"[import-profile] Start: {phase} nach {seconds * 1000.0:.1f} ms")
+
+
+def startup_report() -> dict[str, float]:
+    """Festgehaltene Startphasen in ms."""
+    with _LOCK:
+        return dict(_STARTUP)
@@ -11,6 +11,8 @@ import random
 import config
 import json
 
+from helpers.run_state import get_test_run
+
 
 def _st_module():
     try:
@@ -34,53 +36,30 @@ def get_current_question_index() -> Optional[int]:
     """
     st = _st_module()
     state = getattr(st, "session_state", None) if st is not None else None
-    # (debug prints removed)
     if state is None:
         return None
-
-    indices = state.get("frage_indices", [])
-
-    # 3. Priorität: Nächste unbeantwortete Frage in der (geshuffelten) Reihenfolge
-    for idx in indices:
-        if state.get(f"frage_{idx}_beantwortet") is None:
-            return idx
-
-    return None  # Alle Fragen beantwortet
+    return get_test_run(state).next_unanswered()
 
 
 def is_test_finished(questions: list) -> bool:
     """Prüft, ob alle Fragen beantwortet wurden."""
-    num_questions = len(questions)
     st = _st_module()
-    state = getattr(st, "session_state", {}) if st is not None else {}
-    num_answered = sum(
-        1 for i in range(num_questions) if state.get(f"frage_{i}_beantwortet") is not None
-    )
-    return num_answered == num_questions
+    state = getattr(st, "session_state", None) if st is not None else None
+    return get_test_run(state).answered == len(questions)
 
 
 def get_answer_for_question(frage_idx: int) -> str | None:
-    """Holt die gegebene Antwort für eine Frage aus dem Session State."""
+    """Holt die gegebene Antwort für eine Frage aus dem Testlauf."""
     st = _st_module()
-    state = getattr(st, "session_state", {}) if st is not None else {}
-    return state.get(f"frage_{frage_idx}_antwort")
+    state = getattr(st, "session_state", None) if st is not None else None
+    return get_test_run(state).answer(frage_idx)
 
 
 def set_question_as_answered(frage_idx: int, punkte: int, antwort: str):
     """Markiert eine Frage als beantwortet und speichert Punkte/Antwort."""
     st = _st_module()
     state = getattr(st, "session_state", {}) if st is not None else {}
-    # Support both the real Streamlit session_state object and simple dict mocks
-    try:
-        state[f"frage_{frage_idx}_beantwortet"] = punkte
-        state[f"frage_{frage_idx}_antwort"] = antwort
-    except Exception:
-        # If the session_state isn't dict-like, try setting attributes
-        try:
-            setattr(state, f"frage_{frage_idx}_beantwortet", punkte)
-            setattr(state, f"frage_{frage_idx}_antwort", antwort)
-        except Exception:
-            pass
+    get_test_run(state).record_answer(frage_idx, punkte, antwort)
 
     # Ensure answer_outcomes exists and append the boolean outcome
     try:
@@ -113,9 +92,8 @@ def reset_question_state(frage_idx: int):
         return
 
     # 1. Antwort-Status und Widget-State löschen
+    get_test_run(state).clear_answer(frage_idx)
     keys_to_delete = [
-        f"frage_{frage_idx}_beantwortet",
-        f"frage_{frage_idx}_antwort",
         f"radio_{frage_idx}",
         f"radio_prev_{frage_idx}"
     ]
@@ -25,6 +25,7 @@ import html as _html
 
 from config import (
     AppConfig,
+    get_app_config,
     list_question_files,
     load_questions,
     get_question_counts,
@@ -46,18 +47,21 @@ from helpers.text import (
     unwrap_markdown_document_fence,
 )
 from helpers.security import ACTIVE_SESSION_QUERY_PARAM
+from helpers.run_state import TestRun, get_test_run
 from database import update_bookmarks, get_db_connection
 from i18n.context import t
 from user_question_sets import (
-    list_user_question_sets,
+    list_user_question_entries,
     format_user_label,
+    pretty_label_from_identifier_string,
     resolve_question_path,
     get_user_question_set,
     is_user_question_identifier,
     # Cleanup stale temporary user uploads so they are not offered on the welcome page
     cleanup_stale_user_question_sets,
 )
-from pdf_export import _normalize_stage_label
+from helpers.stages import _normalize_stage_label
+from helpers.glossary import _extract_glossary_terms
 from i18n.context import get_locale, t as translate_ui
 from legal_ui import get_requested_legal_kind, render_legal_links, render_legal_page
 from components import (
@@ -68,6 +72,12 @@ from components import (
     _render_user_qset_dialog,
 )
 import pacing_helper as pacing
+import exam_timer
+import render_scope
+import lazy_imports
+import export_cache
+import pdf_render
+import static_assets
 from session_manager import verify_admin_session
 
 def show_ephemeral_message(message: str, seconds: float = 3.0, icon: str | None = None) -> None:
@@ -171,38 +181,7 @@ def _emit_style_html(style_html: str) -> None:
 def _inject_toast_contrast_styles() -> None:
     """Make transient Streamlit toasts clearly visible in the dark theme."""
     try:
-        _emit_style_html(
-            """
-            <style>
-            section[data-testid="stToastContainer"] div[data-testid="stToast"],
-            div[data-testid="stToast"] {
-              background: #332515 !important;
-              color: #f6ead7 !important;
-              border: 1px solid rgba(245, 158, 11, 0.72) !important;
-              border-left: 4px solid #f59e0b !important;
-              box-shadow: 0 16px 36px rgba(0, 0, 0, 0.42) !important;
-            }
-            section[data-testid="stToastContainer"] div[data-testid="stToast"] *,
-            div[data-testid="stToast"] * {
-              color: #f6ead7 !important;
-            }
-            section[data-testid="stToastContainer"] div[data-testid="stToast"] div[data-testid="stMarkdownContainer"],
-            section[data-testid="stToastContainer"] div[data-testid="stToast"] div[data-testid="stMarkdownContainer"] *,
-            div[data-testid="stToast"] div[data-testid="stMarkdownContainer"],
-            div[data-testid="stToast"] div[data-testid="stMarkdownContainer"] *,
-            div[data-testid="stToast"] div[data-testid="stMarkdownContainer"] p,
-            div[data-testid="stToast"] div[data-testid="stMarkdownContainer"] span,
-            div[data-testid="stToast"] div[data-testid="stMarkdownContainer"] strong {
-              color: #f6ead7 !important;
-            }
-            section[data-testid="stToastContainer"] div[data-testid="stToast"] svg,
-            div[data-testid="stToast"] svg {
-              color: #fbbf24 !important;
-              fill: #fbbf24 !important;
-            }
-            </style>
-            """
-        )
+        _emit_style_html(static_assets.stylesheet_html("toast_contrast.css"))
     except Exception:
         pass
 
@@ -210,491 +189,7 @@ def _inject_toast_contrast_styles() -> None:
 def _inject_question_view_compact_styles() -> None:
     """Reduce vertical whitespace in the active question view."""
     try:
-        _emit_style_html(
-            """
-            <style>
-            .mc-question-progress-heading {
-              margin: 0.15rem 0 0.35rem;
-              font-size: 1.08rem;
-              font-weight: 750;
-              line-height: 1.25;
-            }
-            .mc-question-meta-line,
-            .mc-question-weight-line {
-              color: inherit;
-              opacity: 0.72;
-              font-size: 0.94em;
-              margin: 0 0 0.25rem;
-              line-height: 1.18;
-            }
-            .mc-question-meta-group {
-              display: flex;
-              flex-wrap: wrap;
-              column-gap: 1.1rem;
-              row-gap: 0.18rem;
-              align-items: baseline;
-              margin: 0 0 0.25rem;
-            }
-            .mc-question-meta-group .mc-question-meta-line {
-              margin: 0;
-            }
-            @media (max-width: 720px) {
-              .mc-question-meta-group {
-                display: block;
-              }
-              .mc-question-meta-group .mc-question-meta-line {
-                margin: 0 0 0.25rem;
-              }
-            }
-            .stMainBlockContainer div[data-testid="stMarkdownContainer"]:has(.mc-question-progress-heading),
-            .stMainBlockContainer div[data-testid="stMarkdownContainer"]:has(.mc-question-meta-group),
-            .stMainBlockContainer div[data-testid="stMarkdownContainer"]:has(.mc-question-meta-line),
-            .stMainBlockContainer div[data-testid="stMarkdownContainer"]:has(.mc-question-weight-line),
-            .stMainBlockContainer div[data-testid="stMarkdownContainer"]:has(.mc-answer-options-begin),
-            .stMainBlockContainer div[data-testid="stMarkdownContainer"]:has(.mc-answer-option-letter-badge) {
-              margin-bottom: 0;
-            }
-            .stMainBlockContainer div[data-testid="stElementContainer"]:has(.mc-answer-options-begin) {
-              margin-bottom: 0.05rem;
-            }
-            .stMainBlockContainer div[data-testid="stElementContainer"]:has(.mc-answer-option-row)
-              + div[data-testid="stElementContainer"],
-            .stMainBlockContainer div[data-testid="stElementContainer"]:has(.mc-answer-option-row)
-              + div[data-testid="stLayoutWrapper"] {
-              margin-top: 0;
-              margin-bottom: 0.14rem;
-            }
-            .stMainBlockContainer div[data-testid="stElementContainer"]:has(.mc-answer-options-end) {
-              margin-bottom: 0.3rem;
-            }
-            .stMainBlockContainer div[data-testid="stElementContainer"]:has(.mc-answer-option-row)
-              + div[data-testid="stElementContainer"] div[data-testid="stHorizontalBlock"],
-            .stMainBlockContainer div[data-testid="stElementContainer"]:has(.mc-answer-option-row)
-              + div[data-testid="stLayoutWrapper"] div[data-testid="stHorizontalBlock"] {
-              align-items: flex-start !important;
-              display: flex !important;
-              flex-direction: row !important;
-              flex-wrap: nowrap !important;
-              gap: 0.4rem !important;
-            }
-            .stMainBlockContainer div[data-testid="stElementContainer"]:has(.mc-answer-option-row)
-              + div[data-testid="stElementContainer"] div[data-testid="stHorizontalBlock"] > div[data-testid="stColumn"]:first-of-type,
-            .stMainBlockContainer div[data-testid="stElementContainer"]:has(.mc-answer-option-row)
-              + div[data-testid="stLayoutWrapper"] div[data-testid="stHorizontalBlock"] > div[data-testid="stColumn"]:first-of-type {
-              flex: 0 0 1.75rem !important;
-              width: 1.75rem !important;
-              min-width: 1.75rem !important;
-              max-width: 1.75rem !important;
-            }
-            .stMainBlockContainer div[data-testid="stElementContainer"]:has(.mc-answer-option-row)
-              + div[data-testid="stElementContainer"] div[data-testid="stHorizontalBlock"] > div[data-testid="stColumn"]:last-of-type,
-            .stMainBlockContainer div[data-testid="stElementContainer"]:has(.mc-answer-option-row)
-              + div[data-testid="stLayoutWrapper"] div[data-testid="stHorizontalBlock"] > div[data-testid="stColumn"]:last-of-type {
-              flex: 1 1 0 !important;
-              min-width: 0 !important;
-              width: auto !important;
-            }
-            .stMainBlockContainer div[data-testid="stElementContainer"]:has(.mc-answer-option-row)
-              + div[data-testid="stElementContainer"] div[data-testid="stHorizontalBlock"] > div[data-testid="stColumn"]:last-of-type div[data-testid="stMarkdownContainer"],
-            .stMainBlockContainer div[data-testid="stElementContainer"]:has(.mc-answer-option-row)
-              + div[data-testid="stElementContainer"] div[data-testid="stHorizontalBlock"] > div[data-testid="stColumn"]:last-of-type div[data-testid="stMarkdownContainer"] p,
-            .stMainBlockContainer div[data-testid="stElementContainer"]:has(.mc-answer-option-row)
-              + div[data-testid="stLayoutWrapper"] div[data-testid="stHorizontalBlock"] > div[data-testid="stColumn"]:last-of-type div[data-testid="stMarkdownContainer"],
-            .stMainBlockContainer div[data-testid="stElementContainer"]:has(.mc-answer-option-row)
-              + div[data-testid="stLayoutWrapper"] div[data-testid="stHorizontalBlock"] > div[data-testid="stColumn"]:last-of-type div[data-testid="stMarkdownContainer"] p {
-              overflow-wrap: anywhere;
-              word-break: break-word;
-            }
-            .mc-answer-option-letter-badge {
-              display: inline-flex;
-              align-items: center;
-              justify-content: center;
-              width: 1.55rem;
-              height: 1.55rem;
-              margin-top: 0.1rem;
-              border-radius: 999px;
-              background: rgba(147, 197, 253, 0.18);
-              color: #93c5fd;
-              font-weight: 700;
-              line-height: 1;
-            }
-            .mc-answer-option-letter-badge.is-selected {
-              background: #2563eb;
-              color: #fff;
-            }
-            .stMainBlockContainer div[data-testid="stHorizontalBlock"]:has(.mc-answer-option-letter-badge.is-selected)
-              > div[data-testid="stColumn"]:last-of-type div[data-testid="stMarkdownContainer"],
-            .stMainBlockContainer div[data-testid="stHorizontalBlock"]:has(.mc-answer-option-letter-badge.is-selected)
-              > div[data-testid="stColumn"]:last-of-type div[data-testid="stMarkdownContainer"] p,
-            .stMainBlockContainer div[data-testid="stHorizontalBlock"]:has(.mc-answer-option-letter-badge.is-selected)
-              > div[data-testid="stColumn"]:last-of-type div[data-testid="stMarkdownContainer"] li {
-              color: #bfdbfe;
-              font-weight: 650;
-            }
-            @media (max-width: 640px) {
-              .stMainBlockContainer div[data-testid="stElementContainer"]:has(.mc-answer-option-row)
-                + div[data-testid="stElementContainer"] div[data-testid="stHorizontalBlock"],
-              .stMainBlockContainer div[data-testid="stElementContainer"]:has(.mc-answer-option-row)
-                + div[data-testid="stLayoutWrapper"] div[data-testid="stHorizontalBlock"] {
-                gap: 0.3rem !important;
-              }
-              .stMainBlockContainer div[data-testid="stElementContainer"]:has(.mc-answer-option-row)
-                + div[data-testid="stElementContainer"] div[data-testid="stHorizontalBlock"] > div[data-testid="stColumn"]:first-of-type,
-              .stMainBlockContainer div[data-testid="stElementContainer"]:has(.mc-answer-option-row)
-                + div[data-testid="stLayoutWrapper"] div[data-testid="stHorizontalBlock"] > div[data-testid="stColumn"]:first-of-type {
-                flex-basis: 1.65rem !important;
-                width: 1.65rem !important;
-                min-width: 1.65rem !important;
-                max-width: 1.65rem !important;
-              }
-              .mc-answer-option-letter-badge {
-                width: 1.45rem;
-                height: 1.45rem;
-                margin-top: 0.08rem;
-                font-size: 0.92rem;
-              }
-            }
-            .stMainBlockContainer div[data-testid="stMarkdownContainer"] p {
-              margin-bottom: 0.4rem;
-            }
-            .stMainBlockContainer button div[data-testid="stMarkdownContainer"],
-            .stMainBlockContainer button div[data-testid="stMarkdownContainer"] p {
-              margin: 0;
-              line-height: inherit;
-            }
-            .stMainBlockContainer div[data-testid="stMarkdownContainer"] h1,
-            .stMainBlockContainer div[data-testid="stMarkdownContainer"] h2,
-            .stMainBlockContainer div[data-testid="stMarkdownContainer"] h3,
-            .stMainBlockContainer div[data-testid="stMarkdownContainer"] h4 {
-              margin-top: 0.5rem;
-              margin-bottom: 0.35rem;
-              line-height: 1.25;
-            }
-            .stMainBlockContainer div[data-testid="stMarkdownContainer"] ul,
-            .stMainBlockContainer div[data-testid="stMarkdownContainer"] ol {
-              margin-top: 0.25rem;
-              margin-bottom: 0.4rem;
-            }
-            .stMainBlockContainer div[data-testid="stMarkdownContainer"] blockquote {
-              margin: 0.35rem 0;
-              padding-top: 0.05rem;
-              padding-bottom: 0.05rem;
-            }
-            .stMainBlockContainer div[data-testid="stAlertContainer"],
-            .stMainBlockContainer div[data-testid^="stAlertContent"] {
-              display: flex !important;
-              align-items: center !important;
-            }
-            .stMainBlockContainer div[data-testid="stAlert"] div[data-testid="stMarkdownContainer"] {
-              display: flex !important;
-              align-items: center !important;
-              margin: 0 !important;
-              min-height: 1.5rem;
-            }
-            .stMainBlockContainer div[data-testid="stAlert"] div[data-testid="stMarkdownContainer"] p {
-              line-height: 1.35 !important;
-              margin: 0 !important;
-            }
-            .stMainBlockContainer div[data-testid="stExpander"] summary > span {
-              align-items: center !important;
-            }
-            .stMainBlockContainer div[data-testid="stExpander"] summary div[data-testid="stMarkdownContainer"],
-            .stMainBlockContainer div[data-testid="stExpander"] summary div[data-testid="stMarkdownContainer"] p {
-              line-height: 1.25 !important;
-              margin: 0 !important;
-            }
-            .stMainBlockContainer div[data-testid="stExpander"] summary [data-testid="stIconMaterial"] {
-              align-items: center !important;
-              display: inline-flex !important;
-              line-height: 1 !important;
-            }
-            .stMainBlockContainer div[data-testid="stRadio"] {
-              display: flex !important;
-              flex-direction: column !important;
-              align-items: center !important;
-              margin-top: 0.15rem;
-              text-align: center !important;
-            }
-            .stMainBlockContainer div[data-testid="stRadio"] > label {
-              align-self: center !important;
-              padding-bottom: 0.15rem;
-              justify-content: center !important;
-              text-align: center !important;
-              width: auto !important;
-            }
-            .stMainBlockContainer div[data-testid="stRadio"] > label div[data-testid="stMarkdownContainer"],
-            .stMainBlockContainer div[data-testid="stRadio"] > label p {
-              width: 100% !important;
-              text-align: center !important;
-            }
-            .stMainBlockContainer div[data-testid="stRadio"] div[role="radiogroup"] {
-              display: flex !important;
-              gap: 1.1rem;
-              justify-content: center !important;
-              align-items: center !important;
-              width: max-content !important;
-              max-width: 100%;
-              margin-left: auto !important;
-              margin-right: auto !important;
-            }
-            .stMainBlockContainer div[data-testid="stRadio"] div[role="radiogroup"] > label {
-              display: inline-flex !important;
-              flex: 0 0 auto !important;
-              width: auto !important;
-              margin: 0 !important;
-              justify-content: center !important;
-            }
-            .stMainBlockContainer div[data-testid="stRadio"] div[role="radiogroup"] > label > div {
-              flex: 0 0 auto !important;
-            }
-            .stMainBlockContainer div[data-testid="stVerticalBlock"]:has(.mc-answer-radio-marker)
-              div[data-testid="stRadio"] div[role="radiogroup"] > label {
-              position: relative;
-              cursor: pointer;
-              gap: 0 !important;
-            }
-            .stMainBlockContainer div[data-testid="stVerticalBlock"]:has(.mc-answer-radio-marker)
-              div[data-testid="stRadio"] div[role="radiogroup"] > label > div:first-child {
-              position: absolute !important;
-              width: 1.55rem !important;
-              height: 1.55rem !important;
-              margin: 0 !important;
-              opacity: 0 !important;
-              z-index: 2;
-            }
-            .stMainBlockContainer div[data-testid="stVerticalBlock"]:has(.mc-answer-radio-marker)
-              div[data-testid="stRadio"] div[role="radiogroup"] > label > div:first-child input[type="radio"] {
-              width: 1.55rem !important;
-              height: 1.55rem !important;
-              margin: 0 !important;
-              cursor: pointer;
-            }
-            .stMainBlockContainer div[data-testid="stVerticalBlock"]:has(.mc-answer-radio-marker)
-              div[data-testid="stRadio"] div[role="radiogroup"] > label div[data-testid="stMarkdownContainer"] {
-              width: auto !important;
-              margin: 0 !important;
-            }
-            .stMainBlockContainer div[data-testid="stVerticalBlock"]:has(.mc-answer-radio-marker)
-              div[data-testid="stRadio"] div[role="radiogroup"] > label div[data-testid="stMarkdownContainer"] p {
-              display: inline-flex !important;
-              align-items: center !important;
-              justify-content: center !important;
-              width: 1.55rem !important;
-              height: 1.55rem !important;
-              margin: 0 !important;
-              border-radius: 999px;
-              background: rgba(147, 197, 253, 0.18);
-              color: #93c5fd !important;
-              font-weight: 700 !important;
-              line-height: 1 !important;
-              text-align: center !important;
-            }
-            .stMainBlockContainer div[data-testid="stVerticalBlock"]:has(.mc-answer-radio-marker)
-              div[data-testid="stRadio"] div[role="radiogroup"] > label:has(input:checked)
-              div[data-testid="stMarkdownContainer"] p {
-              background: #2563eb !important;
-              color: #fff !important;
-            }
-            .mc-question-choice-divider {
-              border-top: 1px solid rgba(148, 163, 184, 0.32);
-              height: 0;
-              margin: 0.85rem 0 0.45rem;
-              width: 100%;
-            }
-            .mc-explanation-divider {
-              border-top: 1px solid rgba(148, 163, 184, 0.26);
-              height: 0;
-              margin: 0.95rem 0 0.55rem;
-              width: 100%;
-            }
-            .mc-feedback-label {
-              display: inline-flex;
-              align-items: center;
-              margin: 0.35rem 0 0.12rem;
-              font-size: 0.88rem;
-              font-weight: 750;
-              line-height: 1.2;
-            }
-            .mc-feedback-label--user-correct,
-            .mc-feedback-label--correct {
-              color: #86efac;
-            }
-            .mc-feedback-label--user-wrong {
-              color: #fca5a5;
-            }
-            .mc-feedback-label--explanation {
-              color: #93c5fd;
-            }
-            .mc-timer-pacing-row-marker {
-              display: none;
-            }
-            .mc-pacing-placeholder {
-              min-height: 62px;
-              width: 100%;
-            }
-            .mc-mode-info-slot {
-              min-height: 4.75rem;
-              margin: 0 0 0.75rem;
-              width: 100%;
-            }
-            .stMainBlockContainer div[data-testid="stElementContainer"]:has(> div[data-testid="stAlert"]) {
-              min-height: 4.75rem;
-              margin-bottom: 0.75rem;
-            }
-            [data-testid="stAppViewContainer"],
-            [data-testid="stMain"],
-            .stMainBlockContainer,
-            [data-testid="stMainBlockContainer"] {
-              overflow-anchor: none;
-            }
-            .mc-exam-mode-marker,
-            .mc-scroll-top-request {
-              display: none;
-            }
-            div[data-testid="stElementContainer"]:has(.mc-timer-pacing-row-marker)
-              + div[data-testid="stHorizontalBlock"] > div[data-testid="stColumn"]:first-child
-              div[data-testid="stElementContainer"],
-            div[data-testid="stElementContainer"]:has(.mc-timer-pacing-row-marker)
-              + div[data-testid="stLayoutWrapper"] div[data-testid="stHorizontalBlock"] > div[data-testid="stColumn"]:first-child
-              div[data-testid="stElementContainer"] {
-              min-height: 124px;
-            }
-            div[data-testid="stElementContainer"]:has(.mc-timer-pacing-row-marker)
-              + div[data-testid="stHorizontalBlock"] > div[data-testid="stColumn"]:first-child iframe,
-            div[data-testid="stElementContainer"]:has(.mc-timer-pacing-row-marker)
-              + div[data-testid="stLayoutWrapper"] div[data-testid="stHorizontalBlock"] > div[data-testid="stColumn"]:first-child iframe {
-              display: block;
-              min-height: 124px;
-              width: 100%;
-            }
-            div[data-testid="stElementContainer"]:has(.mc-timer-pacing-row-marker)
-              + div[data-testid="stHorizontalBlock"] > div[data-testid="stColumn"]:last-child
-              div[data-testid="stElementContainer"],
-            div[data-testid="stElementContainer"]:has(.mc-timer-pacing-row-marker)
-              + div[data-testid="stLayoutWrapper"] div[data-testid="stHorizontalBlock"] > div[data-testid="stColumn"]:last-child
-              div[data-testid="stElementContainer"] {
-              min-height: 62px;
-            }
-            div[data-testid="stElementContainer"]:has(.mc-timer-pacing-row-marker)
-              + div[data-testid="stHorizontalBlock"] > div[data-testid="stColumn"]:last-child iframe,
-            div[data-testid="stElementContainer"]:has(.mc-timer-pacing-row-marker)
-              + div[data-testid="stLayoutWrapper"] div[data-testid="stHorizontalBlock"] > div[data-testid="stColumn"]:last-child iframe {
-              display: block;
-              min-height: 62px;
-              width: 100%;
-            }
-            div[data-testid="stElementContainer"]:has(.mc-timer-pacing-row-marker)
-              + div[data-testid="stHorizontalBlock"],
-            div[data-testid="stElementContainer"]:has(.mc-timer-pacing-row-marker)
-              + div[data-testid="stLayoutWrapper"] div[data-testid="stHorizontalBlock"] {
-              min-height: 124px;
-            }
-            div[data-testid="stElementContainer"]:has(.mc-timer-pacing-row-marker),
-            div[data-testid="stMarkdownContainer"]:has(.mc-timer-pacing-row-marker) {
-              height: 0 !important;
-              min-height: 0 !important;
-              margin: 0 !important;
-              padding: 0 !important;
-              line-height: 0 !important;
-              overflow: visible !important;
-            }
-            div[data-testid="stElementContainer"]:has(.mc-timer-pacing-row-marker)
-              + div[data-testid="stHorizontalBlock"],
-            div[data-testid="stElementContainer"]:has(.mc-timer-pacing-row-marker)
-              + div[data-testid="stLayoutWrapper"] div[data-testid="stHorizontalBlock"] {
-              display: flex !important;
-              flex-direction: row !important;
-              align-items: flex-start !important;
-              gap: 0.65rem !important;
-            }
-            div[data-testid="stElementContainer"]:has(.mc-timer-pacing-row-marker)
-              + div[data-testid="stHorizontalBlock"] > div[data-testid="stColumn"],
-            div[data-testid="stElementContainer"]:has(.mc-timer-pacing-row-marker)
-              + div[data-testid="stLayoutWrapper"] div[data-testid="stHorizontalBlock"] > div[data-testid="stColumn"] {
-              flex: 1 1 0 !important;
-              min-width: 0 !important;
-              width: calc(50% - 0.325rem) !important;
-            }
-            @media (max-width: 640px) {
-              div[data-testid="stElementContainer"]:has(.mc-timer-pacing-row-marker)
-                + div[data-testid="stHorizontalBlock"],
-              div[data-testid="stElementContainer"]:has(.mc-timer-pacing-row-marker)
-                + div[data-testid="stLayoutWrapper"] div[data-testid="stHorizontalBlock"] {
-                gap: 0.45rem !important;
-              }
-              div[data-testid="stElementContainer"]:has(.mc-timer-pacing-row-marker)
-                + div[data-testid="stHorizontalBlock"] > div[data-testid="stColumn"],
-              div[data-testid="stElementContainer"]:has(.mc-timer-pacing-row-marker)
-                + div[data-testid="stLayoutWrapper"] div[data-testid="stHorizontalBlock"] > div[data-testid="stColumn"] {
-                width: calc(50% - 0.225rem) !important;
-              }
-            }
-            .stMainBlockContainer div[data-testid="stMarkdownContainer"]:has(.mc-question-feedback-bottom-spacer) {
-              margin: 0;
-            }
-            .mc-question-feedback-bottom-spacer {
-              height: 6.5rem;
-              pointer-events: none;
-              width: 100%;
-            }
-            .mc-fixed-next-button-marker {
-              display: block;
-              height: 0;
-              pointer-events: none;
-              width: 100%;
-            }
-            .stMainBlockContainer div[data-testid="stElementContainer"]:has(.mc-fixed-next-button-marker),
-            .stMainBlockContainer div[data-testid="stMarkdownContainer"]:has(.mc-fixed-next-button-marker) {
-              margin: 0 !important;
-              padding: 0 !important;
-            }
-            .stMainBlockContainer div[data-testid="stElementContainer"]:has(.mc-fixed-next-button-marker)
-              + div[data-testid="stElementContainer"] {
-              height: 0 !important;
-              line-height: 0 !important;
-              margin: 0 !important;
-              min-height: 0 !important;
-              overflow: visible !important;
-              padding: 0 !important;
-            }
-            .stMainBlockContainer div[data-testid="stElementContainer"]:has(.mc-fixed-next-button-marker)
-              + div[data-testid="stElementContainer"] div[data-testid="stButton"] {
-              position: fixed !important;
-              left: var(--mc-fixed-next-center-x, 50%) !important;
-              bottom: calc(0.9rem + env(safe-area-inset-bottom)) !important;
-              transform: translateX(-50%) !important;
-              z-index: 1000 !important;
-              box-sizing: border-box !important;
-              width: min(30rem, var(--mc-fixed-next-width, calc(100vw - 2rem)), calc(100vw - 2rem)) !important;
-              max-width: calc(100vw - 2rem) !important;
-              padding: 0.45rem !important;
-              border: 1px solid rgba(148, 163, 184, 0.26) !important;
-              border-radius: 8px !important;
-              background: rgba(15, 23, 42, 0.92) !important;
-              box-shadow: 0 18px 44px rgba(0, 0, 0, 0.42) !important;
-              backdrop-filter: blur(12px);
-            }
-            .stMainBlockContainer div[data-testid="stElementContainer"]:has(.mc-fixed-next-button-marker)
-              + div[data-testid="stElementContainer"] div[data-testid="stButton"] > button {
-              min-height: 2.8rem !important;
-              border-radius: 6px !important;
-              font-weight: 750 !important;
-            }
-            @media (max-width: 640px) {
-              .mc-question-feedback-bottom-spacer {
-                height: 7.25rem;
-              }
-              .stMainBlockContainer div[data-testid="stElementContainer"]:has(.mc-fixed-next-button-marker)
-                + div[data-testid="stElementContainer"] div[data-testid="stButton"] {
-                bottom: calc(0.55rem + env(safe-area-inset-bottom)) !important;
-                width: calc(100vw - 1rem) !important;
-                max-width: calc(100vw - 1rem) !important;
-                padding: 0.4rem !important;
-              }
-            }
-            </style>
-            """
-        )
+        _emit_style_html(static_assets.stylesheet_html("question_view.css"))
     except Exception:
         pass
 
@@ -785,181 +280,10 @@ def _ensure_fixed_next_button_center() -> None:
 
 def _ensure_question_view_scroll_manager() -> None:
     """Handle scroll-to-top on question changes and scroll restore on exam submits."""
-    html = """
-    <script>
-    (() => {
-        const install = (win) => {
-            if (!win || !win.document || win.__mcQuestionScrollManagerInstalled) {
-                return;
-            }
-            win.__mcQuestionScrollManagerInstalled = true;
-            const storageKey = "mcQuestionScrollRestore";
-            let handledScrollTopIdx = null;
-            let handledRestoreToken = null;
-
-            const collectScrollTargets = (doc) => [
-                doc.scrollingElement,
-                doc.documentElement,
-                doc.body,
-                doc.querySelector('[data-testid="stAppViewContainer"]'),
-                doc.querySelector('[data-testid="stMain"]'),
-                doc.querySelector('.stMainBlockContainer'),
-                doc.querySelector('[data-testid="stMainBlockContainer"]'),
-            ].filter(Boolean);
-
-            const scrollAllToTop = () => {
-                try {
-                    const doc = win.document;
-                    const scrollElement = (element) => {
-                        if (!element) {
-                            return;
-                        }
-                        try {
-                            if (typeof element.scrollTo === "function") {
-                                element.scrollTo({ top: 0, left: 0, behavior: "auto" });
-                            }
-                            if ("scrollTop" in element) {
-                                element.scrollTop = 0;
-                            }
-                        } catch (_) {}
-                    };
-                    win.scrollTo({ top: 0, left: 0, behavior: "auto" });
-                    try {
-                        if (win.parent && win.parent !== win) {
-                            win.parent.scrollTo({ top: 0, left: 0, behavior: "auto" });
-                        }
-                    } catch (_) {}
-                    collectScrollTargets(doc).forEach(scrollElement);
-                } catch (_) {}
-            };
-
-            const saveScroll = () => {
-                try {
-                    const doc = win.document;
-                    const targets = collectScrollTargets(doc);
-                    const positions = targets.map((target) => target.scrollTop || 0);
-                    win.sessionStorage.setItem(
-                        storageKey,
-                        JSON.stringify({
-                            ts: Date.now(),
-                            windowY: win.scrollY || 0,
-                            positions,
-                        }),
-                    );
-                } catch (_) {}
-            };
-
-            const restoreScroll = () => {
-                try {
-                    const raw = win.sessionStorage.getItem(storageKey);
-                    if (!raw) {
-                        return;
-                    }
-                    const payload = JSON.parse(raw);
-                    if (!payload || Date.now() - Number(payload.ts || 0) > 8000) {
-                        win.sessionStorage.removeItem(storageKey);
-                        return;
-                    }
-                    win.sessionStorage.removeItem(storageKey);
-                    const doc = win.document;
-                    const targets = collectScrollTargets(doc);
-                    const positions = Array.isArray(payload.positions) ? payload.positions : [];
-                    targets.forEach((target, idx) => {
-                        if (typeof positions[idx] === "number") {
-                            target.scrollTop = positions[idx];
-                        }
-                    });
-                    if (typeof payload.windowY === "number") {
-                        win.scrollTo({ top: payload.windowY, left: 0, behavior: "auto" });
-                    }
-                } catch (_) {}
-            };
-
-            const applyScrollPlan = () => {
-                const doc = win.document;
-                const topMarker = doc.querySelector(".mc-scroll-top-request");
-                if (topMarker) {
-                    const frageIdx = topMarker.getAttribute("data-frage-idx") || "";
-                    if (handledScrollTopIdx === frageIdx) {
-                        return;
-                    }
-                    handledScrollTopIdx = frageIdx;
-                    handledRestoreToken = null;
-                    try {
-                        win.sessionStorage.removeItem(storageKey);
-                    } catch (_) {}
-                    scrollAllToTop();
-                    return;
-                }
-                handledScrollTopIdx = null;
-
-                let raw = null;
-                try {
-                    raw = win.sessionStorage.getItem(storageKey);
-                } catch (_) {
-                    raw = null;
-                }
-                if (!raw) {
-                    handledRestoreToken = null;
-                    return;
-                }
-                if (handledRestoreToken === raw) {
-                    return;
-                }
-                handledRestoreToken = raw;
-                restoreScroll();
-            };
-
-            win.document.addEventListener("click", (event) => {
-                const target = event.target;
-                if (!target || !target.closest) {
-                    return;
-                }
-                if (!win.document.querySelector(".mc-exam-mode-marker")) {
-                    return;
-                }
-                const submitButton = target.closest('button[data-testid="stFormSubmitButton"]');
-                if (!submitButton) {
-                    return;
-                }
-                const form = submitButton.closest("form");
-                if (!form || !form.querySelector(".mc-answer-radio-marker")) {
-                    return;
-                }
-                saveScroll();
-            }, true);
-
-            let scrollTimer = null;
-            const scheduleScrollPlan = () => {
-                clearTimeout(scrollTimer);
-                scrollTimer = win.setTimeout(applyScrollPlan, 520);
-            };
-
-            try {
-                const observer = new MutationObserver(scheduleScrollPlan);
-                observer.observe(win.document.body || win.document.documentElement, {
-                    childList: true,
-                    subtree: true,
-                });
-                win.__mcQuestionScrollManagerObserver = observer;
-            } catch (_) {}
-
-            scheduleScrollPlan();
-        };
-
-        install(window);
-        try {
-            if (window.parent && window.parent !== window) {
-                install(window.parent);
-            }
-        } catch (_) {}
-    })();
-    </script>
-    """
     try:
-        html_fn = getattr(st, "html", None)
-        if callable(html_fn):
-            html_fn(html, width="content", unsafe_allow_javascript=True)
+        html = static_assets.script_html("question_scroll_manager.js", st.session_state)
+        if html:
+            _emit_script_html(html)
     except Exception:
         pass
 
@@ -989,74 +313,10 @@ def _scroll_question_view_to_top(frage_idx: int) -> None:
 
 def _sync_answer_option_badge_highlight() -> None:
     """Mirror radio selection into rendered answer options without a server rerun."""
-    html = """
-    <script>
-    (() => {
-        const version = 2;
-        const install = (win) => {
-            if (!win || !win.document || win.__mcAnswerBadgeSyncInstalled === version) {
-                return;
-            }
-            win.__mcAnswerBadgeSyncInstalled = version;
-
-            const sync = () => {
-                try {
-                    const doc = win.document;
-                    const marker = doc.querySelector('.mc-answer-radio-marker');
-                    if (!marker) {
-                        return;
-                    }
-                    const scope = marker.closest('[data-testid="stMainBlockContainer"]') || doc;
-                    const radioGroup = scope.querySelector('[data-testid="stRadio"] [role="radiogroup"]');
-                    if (!radioGroup) {
-                        return;
-                    }
-                    const inputs = Array.from(radioGroup.querySelectorAll('input[type="radio"]'));
-                    const badges = Array.from(scope.querySelectorAll('.mc-answer-option-letter-badge'));
-                    if (!badges.length || !inputs.length) {
-                        return;
-                    }
-                    inputs.forEach((input, idx) => {
-                        const badge = badges[idx];
-                        if (!badge) {
-                            return;
-                        }
-                        const selected = Boolean(input.checked);
-                        if (badge.classList.contains('is-selected') !== selected) {
-                            badge.classList.toggle('is-selected', selected);
-                        }
-                    });
-                } catch (_) {}
-            };
-
-            win.document.addEventListener('change', (event) => {
-                const target = event.target;
-                if (
-                    target &&
-                    target.matches &&
-                    target.matches('input[type="radio"]') &&
-                    target.closest('[data-testid="stRadio"]')
-                ) {
-                    sync();
-                }
-            }, true);
-
-            win.requestAnimationFrame(sync);
-        };
-
-        install(window);
-        try {
-            if (window.parent && window.parent !== window) {
-                install(window.parent);
-            }
-        } catch (_) {}
-    })();
-    </script>
-    """
     try:
-        html_fn = getattr(st, "html", None)
-        if callable(html_fn):
-            html_fn(html, width="content", unsafe_allow_javascript=True)
+        html = static_assets.script_html("answer_badge_sync.js", st.session_state)
+        if html:
+            _emit_script_html(html)
     except Exception:
         pass
 
@@ -1593,9 +853,27 @@ def _find_learning_objectives_path(selected: str) -> Path | None:
 
 
 def _learning_objectives_pdf(content: str, base_path: Path | None = None) -> tuple[bytes | None, str | None]:
+    """Lernziel-PDF über den Export-Cache (Schlüssel: Inhalt und Basisverzeichnis)."""
+    errors: list[str | None] = []
+
+    def _produce() -> bytes:
+        pdf_bytes, err = _render_learning_objectives_pdf(content, base_path)
+        errors.append(err)
+        return pdf_bytes or b""
+
+    pdf_bytes = export_cache.get_or_create(
+        "learning_objectives",
+        export_cache.content_digest(content, str(base_path or "")),
+        _produce,
+    )
+    if pdf_bytes:
+        return pdf_bytes, None
+    return None, (errors[0] if errors else None) or "unbekannter Fehler beim PDF-Export"
+
+
+def _render_learning_objectives_pdf(content: str, base_path: Path | None = None) -> tuple[bytes | None, str | None]:
     try:
         import markdown as _md
-        from weasyprint import HTML
         try:
             from pdf_export import _render_latex_to_image
         except Exception:
@@ -1764,7 +1042,7 @@ def _learning_objectives_pdf(content: str, base_path: Path | None = None) -> tup
         </body></html>
         """
         base_url = str(base_path) if base_path else None
-        pdf_bytes = HTML(string=html, base_url=base_url).write_pdf(optimize_images=True)
+        pdf_bytes = pdf_render.render_pdf(html, base_url=base_url, optimize_images=True)
         return pdf_bytes, None
     except Exception as exc:
         try:
@@ -2181,6 +1459,11 @@ def _test_view_text(key: str, default: str, **kwargs) -> str:
     return template.format(**kwargs) if kwargs else template
 
 
+def _test_run() -> TestRun:
+    """Fragenzustand des laufenden Tests (leerer Lauf, wenn kein Test läuft)."""
+    return get_test_run(st.session_state)
+
+
 def _summary_text(key: str, default: str, **kwargs) -> str:
     template = translate_ui(f"summary_view.{key}", default=default)
     return template.format(**kwargs) if kwargs else template
@@ -2321,19 +1604,23 @@ def _cached_transform_anki(json_payload: bytes, source_name: str) -> str:
     return transform_to_anki_tsv(json_payload, source_name=source_name)
 
 
-@st.cache_data(show_spinner=True)
 def _cached_generate_anki_apkg(selected_file: str, locale: str) -> bytes:
-    _ensure_anki_logger_configured()
-    from export_jobs import generate_anki_apkg
-    import i18n.context
+    """Anki-Paket aus dem Export-Cache; gebaut wird nur bei geändertem Set."""
 
-    original_get_locale = i18n.context.get_locale
-    i18n.context.get_locale = lambda: locale
-    
-    try:
-        return generate_anki_apkg(selected_file, locale)
-    finally:
-        i18n.context.get_locale = original_get_locale
+    def _build() -> bytes:
+        _ensure_anki_logger_configured()
+        from export_jobs import generate_anki_apkg
+        import i18n.context
+
+        original_get_locale = i18n.context.get_locale
+        i18n.context.get_locale = lambda: locale
+
+        try:
+            return generate_anki_apkg(selected_file, locale)
+        finally:
+            i18n.context.get_locale = original_get_locale
+
+    return export_cache.cached_question_set_export("anki_apkg", selected_file, None, _build, locale=locale)
 
 
 def _open_anki_preview_dialog(questions: QuestionSet, selected_file: str) -> None:
@@ -2713,8 +2000,7 @@ def _clear_previous_test_run_state_for_start() -> None:
         "test_start_time",
         "test_end_time",
         "start_zeit",
-        "beantwortet",
-        "frage_indices",
+        "test_run",
         "initial_frage_indices",
         "progress_loaded",
         "optionen_shuffled",
@@ -3270,6 +2556,20 @@ def _render_pacing_component_html(html_doc: str) -> None:
     st.iframe(html_doc, height=62)
 
 
+def _client_timer_available() -> bool:
+    """Bidirektionale Timer-Komponente nur in einer laufenden Streamlit-App."""
+    if not exam_timer.client_timer_enabled():
+        return False
+    try:
+        return bool(st.runtime.exists())
+    except Exception:
+        return False
+
+
+def _render_exam_timer_component(seed: dict, key: str) -> str | None:
+    return exam_timer.render_exam_timer(seed, key=key)
+
+
 def _render_countdown_timer(start_zeit: Any, test_time_limit: Any, now: Any | None = None) -> int:
     remaining_time = _compute_countdown_remaining_seconds(start_zeit, test_time_limit, now=now)
     if remaining_time > 0:
@@ -3316,7 +2616,28 @@ def _render_countdown_timer_auto_refresh(
             default="⚡ Panic mode active: cooldowns are skipped on your next action.",
         )
         if panic_threshold_seconds is None:
-            panic_threshold_seconds = getattr(AppConfig(), "panic_mode_threshold_seconds", 15)
+            panic_threshold_seconds = getattr(get_app_config(), "panic_mode_threshold_seconds", 15)
+        if _client_timer_available():
+            # Zählt im Browser; ein Rerun kommt nur bei Ablauf oder beim
+            # Überschreiten der Panik-Schwelle.
+            seed = exam_timer.build_timer_seed(
+                start_zeit,
+                int(test_time_limit or 0),
+                {
+                    "label": label,
+                    "expired": expired_text,
+                    "warning_seconds": warning_seconds_text,
+                    "warning_minutes": warning_minutes_template,
+                    "panic": panic_text,
+                },
+                remaining_questions=int(remaining_questions or 0),
+                panic_threshold_seconds=int(panic_threshold_seconds or 0),
+            )
+            try:
+                _render_exam_timer_component(seed, "mc_exam_timer_countdown")
+                return remaining_time
+            except Exception:
+                logger.warning("Timer-Komponente nicht verfügbar, nutze iframe", exc_info=True)
         html_doc = _build_countdown_timer_html(
             label,
             remaining_time,
@@ -3520,11 +2841,13 @@ def _render_question_answer_interaction(
 
     try:
         now_mon = time.monotonic()
-        shown_key = f"frage_{frage_idx}_shown_time_monotonic"
-        if shown_key not in st.session_state:
-            st.session_state[shown_key] = now_mon
+        run = _test_run()
+        shown_at = run.shown_at(frage_idx)
+        if shown_at is None:
+            shown_at = now_mon
+            run.set_shown_at(frage_idx, shown_at)
 
-        app_cfg = AppConfig()
+        app_cfg = get_app_config()
 
         gewichtung = int(frage_obj.get("gewichtung", 1) or 1)
         base_seconds = app_cfg.reading_cooldown_base_per_weight.get(gewichtung, 30.0)
@@ -3539,7 +2862,7 @@ def _render_question_answer_interaction(
         tempo_mult = {"speed": 0.5, "power": 0.25}.get(tempo, 1.0)
 
         answer_cooldown = int(round(base_seconds * tempo_mult))
-        elapsed_since_shown = int(round(now_mon - float(st.session_state.get(shown_key, now_mon))))
+        elapsed_since_shown = int(round(now_mon - shown_at))
         remaining_answer_cooldown = max(0, answer_cooldown - elapsed_since_shown)
 
         try:
@@ -3562,7 +2885,7 @@ def _render_question_answer_interaction(
 
         answer_label_unsure = _test_view_text("answer_button_unsure", default="🤔 Unsicher antworten")
         answer_label_sure = _test_view_text("answer_button_sure", default="✅ Sicher antworten")
-        answered_already = st.session_state.get(f"frage_{frage_idx}_beantwortet") is not None
+        answered_already = run.is_answered(frage_idx)
         answer_disabled = answered_already
 
         def _queue_answer_click(confidence: str | None) -> None:
@@ -3607,7 +2930,7 @@ def _render_question_answer_interaction(
 
         _render_answer_radio()
 
-        if not st.session_state.get(f"show_explanation_{frage_idx}", False):
+        if not run.explanation_visible(frage_idx):
             meta_col1, meta_col2 = st.columns([1, 1])
             with meta_col1:
                 is_bookmarked = frage_idx in st.session_state.get("bookmarked_questions", [])
@@ -3618,7 +2941,7 @@ def _render_question_answer_interaction(
                     handle_bookmark_toggle(frage_idx, new_bookmark_state, questions)
                     st.rerun()
             with meta_col2:
-                answered_current = st.session_state.get(f"frage_{frage_idx}_beantwortet") is not None
+                answered_current = run.is_answered(frage_idx)
                 skipped_list = st.session_state.get("skipped_questions", [])
                 is_current_skipped = frage_idx in skipped_list
                 render_skip = (not answered_current) and not (
@@ -3633,26 +2956,19 @@ def _render_question_answer_interaction(
                     disabled=skip_disabled,
                 ):
                     _dismiss_user_qset_dialog_from_test()
-                    frage_indices = st.session_state.get("frage_indices", [])
-                    if frage_idx in frage_indices:
-                        frage_indices.remove(frage_idx)
-                        frage_indices.append(frage_idx)
-                        st.session_state.frage_indices = frage_indices
+                    if frage_idx in run.order:
+                        run.defer(frage_idx)
                         if "skipped_questions" not in st.session_state:
                             st.session_state.skipped_questions = []
                         if frage_idx not in st.session_state.skipped_questions:
                             st.session_state.skipped_questions.append(frage_idx)
-                        for key in (
-                            f"radio_{frage_idx}",
-                            f"frage_{frage_idx}_antwort",
-                            f"radio_prev_{frage_idx}",
-                            f"frage_{frage_idx}_shown_time_monotonic",
-                            f"frage_{frage_idx}_explanation_shown_time_monotonic",
-                        ):
+                        for key in (f"radio_{frage_idx}", f"radio_prev_{frage_idx}"):
                             try:
                                 st.session_state.pop(key, None)
                             except Exception:
                                 pass
+                        run.set_shown_at(frage_idx, None)
+                        run.set_explanation_shown_at(frage_idx, None)
                         st.toast(_test_view_text("skip_toast", default="Frage übersprungen. Sie wird später erneut gestellt."))
                         st.rerun()
 
@@ -4451,73 +3767,7 @@ def _emit_html(html: str) -> None:
 
 
 def _inject_refined_welcome_splash_styles() -> None:
-    _emit_html(
-        """
-        <style>
-        .mc-welcome-splash-marker {
-            display: none;
-        }
-        .mc-welcome-eyebrow {
-            color: var(--mc-muted, #afa59d);
-            font-size: 0.82rem;
-            font-weight: 700;
-            letter-spacing: 0;
-            margin: 0 0 0.2rem;
-            text-transform: none;
-        }
-        .mc-welcome-title {
-            color: var(--mc-heading, #e2d7ce);
-            font-size: 2.1rem;
-            font-weight: 760;
-            line-height: 1.08;
-            letter-spacing: 0;
-            margin: 0;
-        }
-        .mc-welcome-subtitle {
-            color: var(--mc-text, #cfc5bd);
-            font-size: 1.02rem;
-            line-height: 1.55;
-            margin: 0.15rem 0 0.25rem;
-            max-width: 48rem;
-        }
-        .mc-welcome-benefit {
-            min-height: 4.4rem;
-            padding-right: 0.75rem;
-        }
-        .mc-welcome-benefit strong {
-            color: var(--mc-heading, #e2d7ce);
-            display: block;
-            font-size: 0.95rem;
-            letter-spacing: 0;
-            margin-bottom: 0.2rem;
-        }
-        .mc-welcome-benefit span {
-            color: var(--mc-muted, #afa59d);
-            display: block;
-            font-size: 0.9rem;
-            line-height: 1.42;
-        }
-        .mc-welcome-service-caption {
-            color: #c8b6b6;
-            font-size: 0.82rem;
-            margin: 0.15rem 0 0.2rem;
-        }
-        .mc-welcome-service-separator {
-            border-top: 1px solid rgba(228, 209, 209, 0.24);
-            height: 0;
-            margin: 0.7rem 0 0.8rem;
-        }
-        @media (max-width: 640px) {
-            .mc-welcome-title {
-                font-size: 1.75rem;
-            }
-            .mc-welcome-subtitle {
-                font-size: 0.96rem;
-            }
-        }
-        </style>
-        """
-    )
+    _emit_html(static_assets.stylesheet_html("welcome_splash.css"))
 
 
 def _launch_welcome_flow(flow: str) -> None:
@@ -5135,21 +4385,9 @@ def render_welcome_page(app_config: AppConfig):
     except Exception:
         # Non-fatal: if cleanup fails, continue and list sets anyway.
         pass
-    user_question_sets = list_user_question_sets()
-    
-    # Filter out backup files from user sets to prevent them from appearing in the menu
-    user_question_sets = [
-        info for info in user_question_sets
-        if "_backup_" not in info.identifier and "_pre_overwrite_" not in info.identifier
-    ]
-
-    def _user_sort_key(info):
-        try:
-            return info.uploaded_at.timestamp() if info.uploaded_at else 0.0
-        except Exception:
-            return 0.0
-
-    user_question_sets_sorted = sorted(user_question_sets, key=_user_sort_key, reverse=True)
+    # Katalogeinträge (ohne Backups, neueste zuerst): die Uploads werden für
+    # die Auswahlliste nicht geparst, geladen wird nur das gewählte Set.
+    user_question_sets_sorted = list_user_question_entries()
     user_set_lookup = {info.identifier: info for info in user_question_sets_sorted}
     user_set_identifiers = [info.identifier for info in user_question_sets_sorted]
 
@@ -5281,7 +4519,7 @@ def render_welcome_page(app_config: AppConfig):
     # Nutze die optimierte Funktion, um die Anzahl der Fragen zu bekommen.
     question_counts = get_question_counts()
     for info in user_question_sets_sorted:
-        question_counts[info.identifier] = len(info.question_set)
+        question_counts[info.identifier] = info.question_count
 
     valid_question_files = [
         info.identifier for info in user_question_sets_sorted if question_counts.get(info.identifier, 0) > 0
@@ -5298,6 +4536,8 @@ def render_welcome_page(app_config: AppConfig):
     # Lade Metadaten (z.B. empfohlene Testdauer) für alle Sets vorab.
     question_set_cache: dict[str, "QuestionSet"] = {}
     question_durations: dict[str, int] = {}
+    # Für Sprache und Suche genügen die Metadaten; bei Nutzer-Sets aus dem Katalog.
+    question_meta: dict[str, dict] = {}
     default_duration = app_config.test_duration_minutes
     for filename in core_question_files:
         if question_counts.get(filename, 0) <= 0:
@@ -5305,12 +4545,16 @@ def render_welcome_page(app_config: AppConfig):
         question_set = load_questions(filename, silent=True)
         question_set_cache[filename] = question_set
         question_durations[filename] = question_set.get_test_duration_minutes(default_duration)
+        question_meta[filename] = question_set.meta if isinstance(question_set.meta, dict) else {}
 
     for info in user_question_sets_sorted:
         if question_counts.get(info.identifier, 0) <= 0:
             continue
-        question_set_cache[info.identifier] = info.question_set
-        question_durations[info.identifier] = info.question_set.get_test_duration_minutes(default_duration)
+        question_durations[info.identifier] = info.get_test_duration_minutes(default_duration)
+        question_meta[info.identifier] = {
+            "title": info.title,
+            "language": info.languages[0] if info.languages else None,
+        }
 
     # Erstelle eine benutzerfreundlichere Anzeige für die Dateinamen
     def _parse_meta_date(value):
@@ -5370,13 +4614,7 @@ def render_welcome_page(app_config: AppConfig):
             return None
 
     def _language_flag_for_question_set(filename: str) -> str:
-        question_set = question_set_cache.get(filename)
-        language = None
-        try:
-            if question_set and isinstance(getattr(question_set, "meta", None), dict):
-                language = question_set.meta.get("language")
-        except Exception:
-            language = None
+        language = question_meta.get(filename, {}).get("language")
 
         code = str(language or "de").strip().lower().replace("_", "-")
         code = code.split("-", 1)[0] if code else "de"
@@ -5406,21 +4644,12 @@ def render_welcome_page(app_config: AppConfig):
                 # On any error, fall back to yellow to be conservative/visible
                 marker = '🟡'
 
-            label_name = None
-            try:
-                meta = info.question_set.meta if info and info.question_set else {}
-                title_val = meta.get("title") if isinstance(meta, dict) else None
-                if isinstance(title_val, str):
-                    title_val = title_val.strip()
-                else:
-                    title_val = None
-                if title_val and title_val.lower() != "pasted":
-                    label_name = title_val
-            except Exception:
-                label_name = None
-
-            if not label_name:
-                label_name = format_user_label(info)
+            title_val = info.title.strip() if isinstance(info.title, str) else None
+            if title_val and title_val.lower() != "pasted":
+                label_name = title_val
+            else:
+                # Vom Katalog beim Indizieren über `format_user_label` gebildet.
+                label_name = info.label or pretty_label_from_identifier_string(filename)
 
             label = f"{language_flag} {marker} {label_name}"
             num_questions = question_counts.get(filename)
@@ -5558,13 +4787,7 @@ def render_welcome_page(app_config: AppConfig):
     # Verfügbare Sprachen der Fragensets anzeigen
     language_counts: dict[str, int] = {}
     for fname in valid_question_files:
-        qs = question_set_cache.get(fname)
-        lang = None
-        try:
-            if qs and isinstance(getattr(qs, "meta", None), dict):
-                lang = qs.meta.get("language")
-        except Exception:
-            lang = None
+        lang = question_meta.get(fname, {}).get("language")
         if not lang:
             lang = "de"
         lang_norm = str(lang).strip() or "de"
@@ -5700,13 +4923,7 @@ def render_welcome_page(app_config: AppConfig):
                 except Exception:
                     pass
                 # Add meta-based fields to search: title/topic/language
-                qs_meta = {}
-                try:
-                    qs = question_set_cache.get(fname)
-                    if qs and isinstance(getattr(qs, "meta", None), dict):
-                        qs_meta = qs.meta or {}
-                except Exception:
-                    qs_meta = {}
+                qs_meta = question_meta.get(fname) or {}
                 for key in ("title", "topic"):
                     val = qs_meta.get(key)
                     if val:
@@ -5765,6 +4982,9 @@ def render_welcome_page(app_config: AppConfig):
     # Only attempt to load the question set when a file has actually been selected.
     if selected_file:
         selected_question_set = question_set_cache.get(selected_file)
+        if selected_question_set is None and selected_file in user_set_lookup:
+            selected_question_set = load_questions(selected_file, silent=True)
+            question_set_cache[selected_file] = selected_question_set
         if selected_question_set:
             duration = question_durations.get(selected_file)
             difficulty_profile = selected_question_set.meta.get("difficulty_profile", {})
@@ -5825,8 +5045,8 @@ def render_welcome_page(app_config: AppConfig):
 
                     # Calculate exact total cooldown time for the question set (before tempo scaling)
                     from pacing_helper import compute_total_cooldown_seconds
-                    from config import AppConfig
-                    app_cfg = AppConfig()
+                    from config import get_app_config
+                    app_cfg = get_app_config()
                     per_weight_minutes = {}
                     qmeta = getattr(questions, 'meta', None)
                     per_weight_raw = None
@@ -5940,9 +5160,9 @@ def render_welcome_page(app_config: AppConfig):
                             except Exception:
                                 st.error(translate_ui("welcome.leaderboard.refresh_failed", default="Aktualisierung fehlgeschlagen"))
                         else:
-                            from database import recompute_session_summary
+                            from database import ensure_session_summary
                             with st.spinner(translate_ui("welcome.leaderboard.refreshing", default="Aktualisiere Rangliste…")):
-                                ok = recompute_session_summary(int(session_id))
+                                ok = ensure_session_summary(int(session_id))
                             if ok:
                                 st.session_state[last_key] = _dt.datetime.utcnow().isoformat()
                                 st.success(translate_ui("welcome.leaderboard.updated", default="Rangliste aktualisiert"))
@@ -5990,17 +5210,17 @@ def render_welcome_page(app_config: AppConfig):
             try:
                 session_id = st.session_state.get("session_id")
                 if session_id:
-                    # Always recompute the session summary when the expander
-                    # is opened. This ensures the leaderboard reflects the
-                    # latest answers immediately, at the cost of extra DB work.
-                    from database import recompute_session_summary
+                    # The summary is maintained incrementally by save_answer;
+                    # this only repairs sessions whose summary row is missing
+                    # or incomplete (e.g. started before the upgrade).
+                    from database import ensure_session_summary
                     # Ensure the spinner is visible for a short minimum duration
                     # so the user notices the refresh even when the DB work is very fast.
                     try:
                         from time import monotonic, sleep
                         t0 = monotonic()
                         with st.spinner(translate_ui("welcome.leaderboard.refreshing", default="Aktualisiere Rangliste…")):
-                            recompute_session_summary(int(session_id))
+                            ensure_session_summary(int(session_id))
                         elapsed = monotonic() - t0
                         if elapsed < 0.3:
                             # Small sleep to make the spinner perceptible but short.
@@ -6025,7 +5245,7 @@ def render_welcome_page(app_config: AppConfig):
                     except Exception:
                         # Fallback to simple call if time helpers are unavailable
                         with st.spinner(translate_ui("welcome.leaderboard.refreshing", default="Aktualisiere Rangliste…")):
-                            recompute_session_summary(int(session_id))
+                            ensure_session_summary(int(session_id))
             except Exception:
                 # Don't raise — leaderboard should still render even if DB
                 # update fails for any reason.
@@ -6587,8 +5807,8 @@ def render_welcome_page(app_config: AppConfig):
     
                     # Client-side validation: show min-length hint and inline warning
                     try:
-                        from config import AppConfig
-                        cfg = AppConfig()
+                        from config import get_app_config
+                        cfg = get_app_config()
                         min_len = int(getattr(cfg, "recovery_min_length", 6))
                         allow_short = bool(getattr(cfg, "recovery_allow_short", False))
                     except Exception:
@@ -6777,8 +5997,8 @@ def render_welcome_page(app_config: AppConfig):
                             # Apply rate-limiting and audit logging
                             try:
                                 from audit_log import check_rate_limit, log_login_attempt, reset_login_attempts
-                                from config import AppConfig
-                                cfg = AppConfig()
+                                from config import get_app_config
+                                cfg = get_app_config()
                                 allowed, locked_until = check_rate_limit(
                                     pseudonym_recover,
                                     max_attempts=getattr(cfg, 'rate_limit_attempts', 3),
@@ -7178,8 +6398,9 @@ def render_question_view(questions: QuestionSet, frage_idx: int, app_config: App
                 st.session_state.pop(f"save_q_{prev_idx}_warnings", None)
                 st.session_state.pop(f"save_q_{prev_idx}_warnings_text", None)
             st.session_state["_current_question_idx"] = frage_idx
-            st.session_state[f"frage_{frage_idx}_shown_time_monotonic"] = time.monotonic()
-            st.session_state.pop(f"frage_{frage_idx}_explanation_shown_time_monotonic", None)
+            run = _test_run()
+            run.set_shown_at(frage_idx, time.monotonic())
+            run.set_explanation_shown_at(frage_idx, None)
     except Exception:
         pass
 
@@ -7984,9 +7205,7 @@ def render_question_view(questions: QuestionSet, frage_idx: int, app_config: App
             close_user_qset_dialog(clear_results=False)
 
     # Zähler für verbleibende Fragen (früh berechnen für Dialog-Check)
-    num_answered = sum(
-        1 for i in range(len(questions)) if st.session_state.get(f"frage_{i}_beantwortet") is not None
-    )
+    num_answered = _test_run().answered
     remaining = len(questions) - num_answered
 
     try:
@@ -8204,9 +7423,9 @@ def render_question_view(questions: QuestionSet, frage_idx: int, app_config: App
 
                         # Compute ideal times for the current question sequence
                         try:
-                            # Build question list in the current presentation order (frage_indices)
+                            # Build question list in the current presentation order
                             # so pacing reflects the actual sequence the user will see
-                            indices = st.session_state.get("frage_indices")
+                            indices = _test_run().order
                             if isinstance(indices, (list, tuple)) and len(indices) == len(questions):
                                 qlist = [questions[i] for i in indices]
                             else:
@@ -8227,7 +7446,7 @@ def render_question_view(questions: QuestionSet, frage_idx: int, app_config: App
 
                             # Determine the current index within the presentation order
                             try:
-                                idx = st.session_state.get("frage_indices", []).index(frage_idx)
+                                idx = _test_run().order.index(frage_idx)
                             except Exception:
                                 idx = session_local_idx if 'session_local_idx' in locals() else 0
 
@@ -8266,14 +7485,27 @@ def render_question_view(questions: QuestionSet, frage_idx: int, app_config: App
                                     "red": translate_ui("test_view.pacing.behind", default="You are behind schedule"),
                                 }
                                 try:
-                                    pacing_html = _build_pacing_status_html(
-                                        int(et),
-                                        ideal_times,
-                                        idx,
-                                        total_allowed,
-                                        status_text_map,
-                                    )
-                                    _render_pacing_component_html(pacing_html)
+                                    if _client_timer_available():
+                                        _render_exam_timer_component(
+                                            exam_timer.build_timer_seed(
+                                                start_zeit,
+                                                total_allowed,
+                                                {"status": status_text_map},
+                                                view=exam_timer.VIEW_PACING,
+                                                ideal_times=ideal_times,
+                                                current_index=idx,
+                                            ),
+                                            "mc_exam_timer_pacing",
+                                        )
+                                    else:
+                                        pacing_html = _build_pacing_status_html(
+                                            int(et),
+                                            ideal_times,
+                                            idx,
+                                            total_allowed,
+                                            status_text_map,
+                                        )
+                                        _render_pacing_component_html(pacing_html)
                                 except Exception:
                                     st.progress(pct)
                                     color_map = {
@@ -8516,7 +7748,7 @@ def render_question_view(questions: QuestionSet, frage_idx: int, app_config: App
             pass
 
         # --- Optionen und Antwort-Logik ---
-        is_answered = st.session_state.get(f"frage_{frage_idx}_beantwortet") is not None
+        is_answered = _test_run().is_answered(frage_idx)
         optionen = st.session_state.optionen_shuffled[frage_idx]
         shuffled_optionen = optionen if isinstance(optionen, list) else []
         # Safety: if shuffled options no longer match the current question,
@@ -8550,7 +7782,12 @@ def render_question_view(questions: QuestionSet, frage_idx: int, app_config: App
             pass
         
         gespeicherte_antwort = get_answer_for_question(frage_idx)
-        _render_question_answer_interaction(
+        # Auswahl und abgelehnte Abgaben laufen nur im Fragment neu; Antwort,
+        # Lesezeichen und Überspringen lösen danach per st.rerun() einen
+        # App-Rerun aus, damit Sidebar und Erklärung nachziehen.
+        render_scope.run_fragment(
+            "answer",
+            _render_question_answer_interaction,
             frage_idx=frage_idx,
             optionen=optionen,
             shuffled_optionen=shuffled_optionen,
@@ -8711,7 +7948,7 @@ def render_question_view(questions: QuestionSet, frage_idx: int, app_config: App
 
         # --- Logik für den Fall, dass zu einer bereits beantworteten Frage gesprungen wird ---
         # Bei übersprungenen Fragen (die unbeantwortet sein müssen) darf hier nichts blockieren.
-        is_answered = st.session_state.get(f"frage_{frage_idx}_beantwortet") is not None
+        is_answered = _test_run().is_answered(frage_idx)
         is_bookmarked = frage_idx in st.session_state.get("bookmarked_questions", [])
         is_skipped = frage_idx in st.session_state.get("skipped_questions", [])
 
@@ -8744,10 +7981,7 @@ def render_question_view(questions: QuestionSet, frage_idx: int, app_config: App
                             st.session_state["jump_to_idx"] = next_idx
                             st.session_state.jump_to_idx_active = False
                             st.session_state.pop("jump_source", None)
-                            try:
-                                st.session_state.pop(f"show_explanation_{next_idx}", None)
-                            except Exception:
-                                pass
+                            _test_run().set_explanation_visible(next_idx, False)
                             if "last_answered_idx" in st.session_state:
                                 del st.session_state.last_answered_idx
                             st.rerun()
@@ -8767,10 +8001,7 @@ def render_question_view(questions: QuestionSet, frage_idx: int, app_config: App
                                 st.session_state.pop("jump_source", None)
                             except Exception:
                                 pass
-                            try:
-                                st.session_state.pop(f"show_explanation_{frage_idx}", None)
-                            except Exception:
-                                pass
+                            _test_run().set_explanation_visible(frage_idx, False)
                             if "last_answered_idx" in st.session_state:
                                 del st.session_state.last_answered_idx
                             st.rerun()
@@ -8907,7 +8138,7 @@ def render_question_view(questions: QuestionSet, frage_idx: int, app_config: App
     try:
         # Generic navigation hidden when unanswered or when explicit skip/bookmark review is active.
         jump_source = st.session_state.get("jump_source")
-        is_answered_local = st.session_state.get(f"frage_{frage_idx}_beantwortet") is not None
+        is_answered_local = _test_run().is_answered(frage_idx)
         if is_answered_local and not (st.session_state.get("jump_to_idx_active") and jump_source in ("skip", "bookmark")):
             render_next_question_button(questions, frage_idx, remaining_time, remaining)
     except Exception:
@@ -8928,7 +8159,7 @@ def render_question_view(questions: QuestionSet, frage_idx: int, app_config: App
         st.markdown(st.session_state.last_motivation_message, unsafe_allow_html=True)
     
     # --- Erklärung anzeigen ---
-    if st.session_state.get(f"show_explanation_{frage_idx}", False):
+    if _test_run().explanation_visible(frage_idx):
         # Im Zeitmodus kein sofortiges Feedback während des Durchlaufs
         if current_mode == 'exam':
             st.info(translate_ui("test_view.answer_saved", default="Antwort gespeichert."))
@@ -8940,13 +8171,8 @@ def render_question_view(questions: QuestionSet, frage_idx: int, app_config: App
 
 def handle_jump_to_unanswered_question(frage_idx: int):
     """Passt die Reihenfolge der Fragen an, wenn zu einer unbeantworteten Frage gesprungen wird."""
-    frage_indices = st.session_state.get("frage_indices", [])
-    if frage_idx in frage_indices:
-        # Entferne die angesprungene Frage von ihrer alten Position
-        frage_indices.remove(frage_idx)
-        # Füge sie an der aktuellen Position (vorne) wieder ein
-        frage_indices.insert(0, frage_idx)
-        st.session_state.frage_indices = frage_indices
+    # Die angesprungene Frage rückt an die aktuelle Position (vorne).
+    _test_run().bring_to_front(frage_idx)
     # Setze das Flag zurück, da der Sprung nun verarbeitet wurde.
     st.session_state.jump_to_idx_active = False
     try:
@@ -9006,10 +8232,8 @@ def handle_answer_submission(frage_idx: int, antwort: str, frage_obj: dict, app_
     if st.session_state.start_zeit is None:
         _ensure_countdown_start_time()
 
-    try:
-        st.session_state[f"frage_{frage_idx}_confidence"] = confidence
-    except Exception:
-        pass
+    run = _test_run()
+    run.set_confidence(frage_idx, confidence)
 
     richtige_antwort_text = frage_obj["optionen"][frage_obj["loesung"]]
     ist_richtig = antwort == richtige_antwort_text
@@ -9040,11 +8264,8 @@ def handle_answer_submission(frage_idx: int, antwort: str, frage_obj: dict, app_
     if "skipped_questions" in st.session_state and frage_idx in st.session_state.skipped_questions:
         st.session_state.skipped_questions.remove(frage_idx)
         # Clear any leftover skip-related timestamps so cooldowns for other questions stay consistent
-        try:
-            st.session_state.pop(f"frage_{frage_idx}_shown_time_monotonic", None)
-            st.session_state.pop(f"frage_{frage_idx}_explanation_shown_time_monotonic", None)
-        except Exception:
-            pass
+        run.set_shown_at(frage_idx, None)
+        run.set_explanation_shown_at(frage_idx, None)
 
 
     # Extrahiere die Frage-Nummer aus dem Fragetext (bevorzuge 'question', fallback 'frage')
@@ -9088,22 +8309,16 @@ def handle_answer_submission(frage_idx: int, antwort: str, frage_obj: dict, app_
     current_mode = st.session_state.get('selected_mode', 'exam')
     if current_mode == 'exam':
         # Do not show inline explanations during exams.
-        st.session_state[f"show_explanation_{frage_idx}"] = False
-        try:
-            st.session_state.pop(f"frage_{frage_idx}_explanation_shown_time_monotonic", None)
-        except Exception:
-            pass
+        run.set_explanation_visible(frage_idx, False)
+        run.set_explanation_shown_at(frage_idx, None)
     else:
-        st.session_state[f"show_explanation_{frage_idx}"] = True
+        run.set_explanation_visible(frage_idx, True)
         if current_mode == 'practice':
             st.session_state["_scroll_to_next_button_after_answer_idx"] = frage_idx
     st.session_state.last_answered_idx = frage_idx
     # record when the explanation was shown (monotonic timestamp) for next-button cooldown
     if current_mode != 'exam':
-        try:
-            st.session_state[f"frage_{frage_idx}_explanation_shown_time_monotonic"] = time.monotonic()
-        except Exception:
-            pass
+        run.set_explanation_shown_at(frage_idx, time.monotonic())
     st.rerun()
 
 
@@ -9441,10 +8656,8 @@ def render_next_question_button(questions: QuestionSet, frage_idx: int, remainin
     except Exception:
         frage_obj = {}
     
-    num_answered = sum(
-        1 for i in range(len(questions)) if st.session_state.get(f"frage_{i}_beantwortet") is not None
-    )
-    is_last_question_in_test = (num_answered == len(questions))
+    run = _test_run()
+    is_last_question_in_test = (run.answered == len(questions))
 
     current_review_pos = -1
     if frage_idx in answered_indices:
@@ -9478,8 +8691,8 @@ def render_next_question_button(questions: QuestionSet, frage_idx: int, remainin
                 if st.session_state.get("user_qset_dialog_open"):
                     close_user_qset_dialog(clear_results=False)
                 prev_idx = answered_indices[current_review_pos - 1]
-                st.session_state[f"show_explanation_{frage_idx}"] = False
-                st.session_state[f"show_explanation_{prev_idx}"] = True
+                run.set_explanation_visible(frage_idx, False)
+                run.set_explanation_visible(prev_idx, True)
                 st.session_state.last_answered_idx = prev_idx
                 # Navigating via Prev should cancel any active 'jump to' review mode
                 try:
@@ -9506,17 +8719,16 @@ def render_next_question_button(questions: QuestionSet, frage_idx: int, remainin
         # Compute dynamic cooldown for the Next button (if explanation was shown)
         try:
             now_mon = time.monotonic()
-            shown_key = f"frage_{frage_idx}_explanation_shown_time_monotonic"
-            shown_time = float(st.session_state.get(shown_key, 0))
+            shown_time = run.explanation_shown_at(frage_idx) or 0.0
             if shown_time:
                 if current_mode == 'exam':
                     remaining_next_cooldown = 0
                     raise StopIteration
                 try:
-                    from config import AppConfig
-                    app_cfg = AppConfig()
+                    from config import get_app_config
+                    app_cfg = get_app_config()
                 except Exception:
-                    app_cfg = AppConfig()
+                    app_cfg = get_app_config()
 
                 if panic_mode:
                     remaining_next_cooldown = 0
@@ -9582,7 +8794,7 @@ def render_next_question_button(questions: QuestionSet, frage_idx: int, remainin
                     correct = False
                     last_answered_idx = st.session_state.get("last_answered_idx")
                     if last_answered_idx is not None:
-                        punkte = st.session_state.get(f"frage_{last_answered_idx}_beantwortet")
+                        punkte = run.points(last_answered_idx)
                         if punkte is not None and punkte > 0:
                             correct = True
 
@@ -9599,11 +8811,11 @@ def render_next_question_button(questions: QuestionSet, frage_idx: int, remainin
                 if st.session_state.get("user_qset_dialog_open"):
                     close_user_qset_dialog(clear_results=False)
 
-                st.session_state[f"show_explanation_{frage_idx}"] = False
+                run.set_explanation_visible(frage_idx, False)
 
                 if is_in_review_mode:
                     next_idx = answered_indices[current_review_pos + 1]
-                    st.session_state[f"show_explanation_{next_idx}"] = True
+                    run.set_explanation_visible(next_idx, True)
                     st.session_state.last_answered_idx = next_idx
                 else:
                     st.session_state.last_answered_idx = -1
@@ -9619,9 +8831,89 @@ def render_next_question_button(questions: QuestionSet, frage_idx: int, remainin
         _mark_question_view_scroll_to_top(frage_idx)
 
 
+_REPORT_PRERENDER_KEY = "_report_prerender"
+_REPORT_JOB_ACTIVE = ("queued", "running")
+
+
+def start_report_prerender(questions: Any, app_config: AppConfig | None) -> None:
+    """Startet den PDF-Bericht als Export-Job, sobald der Test beendet ist.
+
+    Der Job rendert auf einer Kopie der Session-Keys, die der Bericht liest;
+    die Zusammenfassung holt nur noch die fertigen Bytes ab. Ändert sich davon
+    etwas (z. B. Sprache oder Lesezeichen), wird der Job neu gestartet; das
+    Ein- und Ausblenden von Erklärungen zählt nicht dazu.
+    """
+    if app_config is None:
+        return
+    try:
+        import pickle
+
+        import export_jobs
+        from helpers.run_state import report_config_values, report_state_snapshot
+
+        if not export_jobs.report_prerender_enabled():
+            return
+        snapshot = report_state_snapshot(st.session_state)
+        fingerprint = export_cache.content_digest(pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL))
+        current = st.session_state.get(_REPORT_PRERENDER_KEY) or {}
+        if current.get("fingerprint") == fingerprint:
+            return
+        if current.get("job_id") and not current.get("pdf"):
+            export_jobs.cancel_job(current["job_id"])
+        job_id = export_jobs.start_report_job(
+            lazy_imports.lazy_function("pdf_export", "generate_pdf_report_from_state"),
+            list(questions),
+            report_config_values(app_config),
+            snapshot,
+        )
+        st.session_state[_REPORT_PRERENDER_KEY] = {"fingerprint": fingerprint, "job_id": job_id}
+    except Exception as exc:
+        logging.getLogger(__name__).warning("PDF-Bericht nicht vorbereitet: %s", exc)
+
+
+def _prerendered_report() -> dict | None:
+    """Stand des vorbereiteten Berichts (``status``, ``progress``, ``pdf``) oder None."""
+    entry = st.session_state.get(_REPORT_PRERENDER_KEY)
+    if not entry or not entry.get("job_id"):
+        return None
+    if entry.get("pdf"):
+        return {"status": "finished", "progress": 100, "pdf": entry["pdf"]}
+    try:
+        import export_jobs
+
+        status = export_jobs.get_job_status(entry["job_id"])
+        if status and status["status"] == "finished" and status.get("result"):
+            entry["pdf"] = Path(status["result"]).read_bytes()
+            return {"status": "finished", "progress": 100, "pdf": entry["pdf"]}
+    except Exception as exc:
+        logging.getLogger(__name__).warning("Vorbereiteter PDF-Bericht nicht lesbar: %s", exc)
+        return None
+    return status
+
+
+def _render_report_prerender_status() -> None:
+    """Fortschritt des vorbereiteten Berichts; danach voller Rerun mit Download-Button."""
+    prerendered = _prerendered_report()
+    if prerendered is None or prerendered["status"] not in _REPORT_JOB_ACTIVE:
+        if render_scope.in_fragment_rerun():
+            st.rerun()
+        return
+    st.caption(
+        _summary_text(
+            "export_testbericht_preparing",
+            default="Bericht wird im Hintergrund erstellt … {progress} %",
+            progress=prerendered.get("progress") or 0,
+        )
+    )
+    if not render_scope.fragments_enabled():
+        st.button(_summary_text("export_testbericht_refresh", default="🔄 Aktualisieren"), key="refresh_prerendered_report")
+
+
 def render_final_summary(questions: QuestionSet, app_config: AppConfig):
     """Zeigt die finale Zusammenfassung und den Review-Modus an."""
     _set_page_reload_guard(False)
+    # Bericht schon jetzt im Hintergrund rendern (no-op, wenn bereits gestartet).
+    start_report_prerender(questions, app_config)
 
     # Mark that we are currently showing the final summary. Sidebar logic
     # will use this flag to hide per-question navigation widgets like
@@ -9634,7 +8926,7 @@ def render_final_summary(questions: QuestionSet, app_config: AppConfig):
     # Persist the session summary to the DB when the user reaches the final
     # summary view. Many users close the session without a clean shutdown,
     # leaving the session stale and preventing leaderboard/summaries from
-    # appearing. We call `recompute_session_summary` once per session_id and
+    # appearing. We call `ensure_session_summary` once per session_id and
     # record a session_state flag to ensure idempotence.
     try:
         session_id = st.session_state.get("session_id")
@@ -9643,11 +8935,11 @@ def render_final_summary(questions: QuestionSet, app_config: AppConfig):
             if not st.session_state.get(saved_key):
                 try:
                     # Local import to avoid circular imports at module load.
-                    from database import recompute_session_summary
+                    from database import ensure_session_summary
 
-                    # recompute_session_summary is robust and idempotent
-                    # (INSERT OR REPLACE into `test_session_summaries`).
-                    recompute_session_summary(int(session_id))
+                    # ensure_session_summary is cheap and idempotent; it only
+                    # falls back to a full recompute for incomplete rows.
+                    ensure_session_summary(int(session_id))
                     st.session_state[saved_key] = True
                 except Exception:
                     # Don't break the UI on DB errors; log for debugging.
@@ -9882,7 +9174,7 @@ def render_final_summary(questions: QuestionSet, app_config: AppConfig):
             st.info(msg)
 
     current_score, max_score = calculate_score(
-        [st.session_state.get(f"frage_{i}_beantwortet") for i in range(len(questions))],
+        _test_run().points_list(len(questions)),
         questions,
         app_config.scoring_mode,
     )
@@ -9914,10 +9206,10 @@ def render_final_summary(questions: QuestionSet, app_config: AppConfig):
 
     # Schreibe eine Snapshot-Zeile in die DB, damit die Historie später schnell abgefragt werden kann.
     try:
-        from database import recompute_session_summary
+        from database import ensure_session_summary
         session_id = st.session_state.get("session_id")
         if session_id and not st.session_state.get(f"summary_saved_{session_id}"):
-            recompute_session_summary(session_id)
+            ensure_session_summary(session_id)
             st.session_state[f"summary_saved_{session_id}"] = True
     except Exception:
         # Nicht kritisch für die UI; Fehler werden im DB-Modul geloggt.
@@ -10198,7 +9490,7 @@ def render_final_summary(questions: QuestionSet, app_config: AppConfig):
         topic_performance[thema]["maximal"] += max_punkte
         topic_performance[thema]["question_count"] += 1
 
-        punkte = st.session_state.get(f"frage_{i}_beantwortet")
+        punkte = _test_run().points(i)
         if punkte is not None:
             # Nur positive Punkte für die Leistungsanalyse zählen, um negative Scores zu vermeiden.
             erreichte_punkte = max(0, punkte)
@@ -10371,7 +9663,7 @@ def render_final_summary(questions: QuestionSet, app_config: AppConfig):
     # --- Radar chart: Leistung nach kognitiven Stufen (Bloom) ---
     try:
         # Use PDF export helpers for normalization and canonical order
-        from pdf_export import _normalize_stage_label, BLOOM_STAGE_ORDER
+        from helpers.stages import _normalize_stage_label, BLOOM_STAGE_ORDER
 
         def _extract_stage_value(frage):
             return frage.get('cognitive_level') or frage.get('kognitive_stufe') or frage.get('cognitiveLevel')
@@ -10385,7 +9677,7 @@ def render_final_summary(questions: QuestionSet, app_config: AppConfig):
                 # Skip non-canonical stages for this radar (keeps chart focused)
                 continue
             max_punkte = float(frage.get("gewichtung", 1) or 1)
-            pkt = st.session_state.get(f"frage_{i}_beantwortet")
+            pkt = _test_run().points(i)
             achieved = float(max(0, pkt)) if pkt is not None else 0.0
             stage_totals[stage_label]["achieved"] += achieved
             stage_totals[stage_label]["max"] += max_punkte
@@ -10405,7 +9697,7 @@ def render_final_summary(questions: QuestionSet, app_config: AppConfig):
                 else:
                     diff = "leicht"
                 max_punkte = float(gewichtung)
-                pkt = st.session_state.get(f"frage_{i}_beantwortet")
+                pkt = _test_run().points(i)
                 achieved = float(max(0, pkt)) if pkt is not None else 0.0
                 difficulty_totals[diff]["achieved"] += achieved
                 difficulty_totals[diff]["max"] += max_punkte
@@ -10668,11 +9960,16 @@ def render_final_summary(questions: QuestionSet, app_config: AppConfig):
 def render_review_mode(questions: QuestionSet, app_config=None):
     if app_config is None:
         app_config = st.session_state.get("app_config")
-    from pdf_export import (
-        generate_musterloesung_pdf,
-        generate_mini_glossary_pdf,
-        generate_pdf_report,
+    # Exportfunktionen laden pdf_export (WeasyPrint) erst beim Klick.
+    generate_musterloesung_pdf = export_cache.cached_export(
+        "musterloesung",
+        lazy_imports.lazy_function("pdf_export", "generate_musterloesung_pdf"),
+        config_fields=("scoring_mode",),
+    )
+    generate_mini_glossary_pdf = export_cache.cached_export(
+        "mini_glossary", lazy_imports.lazy_function("pdf_export", "generate_mini_glossary_pdf")
     )
+    generate_pdf_report = lazy_imports.lazy_function("pdf_export", "generate_pdf_report")
 
     # Dateinamen und User-Info
     selected_file = st.session_state.get(
@@ -10722,7 +10019,7 @@ def render_review_mode(questions: QuestionSet, app_config=None):
             gegebene_antwort = get_answer_for_question(i)
             richtige_antwort_text = q["optionen"][q["loesung"]]
             ist_richtig = gegebene_antwort == richtige_antwort_text
-            punkte = st.session_state.get(f"frage_{i}_beantwortet")
+            punkte = _test_run().points(i)
             is_bookmarked = i in st.session_state.get("bookmarked_questions", [])
 
             matches_status = True
@@ -10774,7 +10071,7 @@ def render_review_mode(questions: QuestionSet, app_config=None):
         richtige_antwort_text = frage["optionen"][frage["loesung"]]
         formatted_richtige_antwort = smart_quotes_de(str(richtige_antwort_text))
         ist_richtig = gegebene_antwort == richtige_antwort_text
-        punkte = st.session_state.get(f"frage_{i}_beantwortet")
+        punkte = _test_run().points(i)
         is_bookmarked = i in st.session_state.get("bookmarked_questions", [])
 
         # Themen-Filter anwenden
@@ -10906,19 +10203,17 @@ def render_review_mode(questions: QuestionSet, app_config=None):
             # Lade sowohl die Kern-Fragensets als auch die von Nutzern hochgeladenen.
             core_files = list_question_files()
             try:
-                from user_question_sets import list_user_question_sets
-                user_sets = list_user_question_sets()
-                user_files = [info.identifier for info in sorted(user_sets, key=lambda i: getattr(i, 'uploaded_at', None) is not None and i.uploaded_at.timestamp() or 0.0, reverse=True)]
+                user_entries = {entry.identifier: entry for entry in list_user_question_entries()}
             except Exception:
-                user_files = []
-            available_files = user_files + core_files
+                user_entries = {}
+            available_files = list(user_entries) + core_files
 
             if available_files:
                 def _format_export_name(filename: str) -> str:
                     if filename.startswith(USER_QUESTION_PREFIX):
-                        from user_question_sets import get_user_question_set, format_user_label
-                        info = get_user_question_set(filename)
-                        return f"👤 {format_user_label(info)}" if info else filename
+                        entry = user_entries.get(filename)
+                        label = entry and (entry.label or entry.title)
+                        return f"👤 {label}" if label else filename
                     return filename.replace("questions_", "").replace(".json", "").replace("_", " ")
 
                 default_choice = st.session_state.get(
@@ -11376,7 +10671,7 @@ def render_review_mode(questions: QuestionSet, app_config=None):
             except ImportError:
                 st.info(_export_unavailable_msg())
             else:
-                generate_fn = generate_arsnova_json
+                generate_fn = export_cache.cached_export("arsnova_json", generate_arsnova_json)
                 try:
                     arsnova_warnings = validate_arsnova_questions(list(export_questions))
                 except Exception as exc:
@@ -11530,8 +10825,6 @@ def render_review_mode(questions: QuestionSet, app_config=None):
                         )
 
         # Mini-Glossar nur anzeigen, wenn Glossar-Einträge vorhanden sind
-        from pdf_export import _extract_glossary_terms
-
         glossary_terms = _extract_glossary_terms(list(questions))
         if glossary_terms:
             with st.expander(_summary_text(
@@ -11611,7 +10904,19 @@ def render_review_mode(questions: QuestionSet, app_config=None):
             )
             testbericht_btn_key = f"download_testbericht_review_{selected_file}"
             testbericht_dl_key = f"dl_testbericht_direct_{selected_file}"
-            if st.button(_download_button_label(), key=testbericht_btn_key):
+            prerendered = _prerendered_report()
+            if prerendered is not None and prerendered.get("pdf"):
+                st.download_button(
+                    label=download_label,
+                    data=prerendered["pdf"],
+                    file_name=report_download_name,
+                    mime=MIME_PDF,
+                    key=testbericht_dl_key,
+                    type="primary",
+                )
+            elif prerendered is not None and prerendered["status"] in _REPORT_JOB_ACTIVE:
+                render_scope.poll_fragment("report_prerender", 1.0, _render_report_prerender_status)
+            elif st.button(_download_button_label(), key=testbericht_btn_key):
                 try:
                     from pdf_export import estimate_formula_render
                     formula_count, to_render = estimate_formula_render(list(questions), locale=get_locale())
@@ -11,7 +11,9 @@ import io
 
 import streamlit as st
 import requests
-from weasyprint import HTML
+# Gleiche Schnittstelle wie weasyprint.HTML, rendert aber über den warmen Renderer/Render-Pool.
+from pdf_render import WarmHTML as HTML
+import pdf_render
 import urllib.parse as _urlparse
 import html as _html
 from markdown_it import MarkdownIt
@@ -19,13 +21,23 @@ from markdown_it import MarkdownIt
 from logic import get_answer_for_question, calculate_score
 from config import AppConfig
 from pacing_helper import compute_total_cooldown_seconds
+import export_cache
+import formula_cache
+import formula_render
 from helpers.text import format_decimal_locale, smart_quotes_de, normalize_detailed_explanation
+from helpers.run_state import get_test_run
+from helpers.stages import (  # Re-Export: bestehende Aufrufer importieren die Namen aus pdf_export
+    BLOOM_STAGE_ORDER,
+    DEFAULT_STAGE_LABEL,
+    _get_bloom_stage_rank,
+    _normalize_stage_label,
+)
+from helpers.glossary import _extract_glossary_terms
 from i18n.context import t as translate_ui
 import os
 import logging
 import traceback
 import threading
-import hashlib
 from pathlib import Path
 
 # Global semaphore to limit concurrent formula renderers across jobs.
@@ -85,50 +97,6 @@ FORMULA_CACHE_MAX_FILES = int(os.getenv('FORMULA_CACHE_MAX_FILES', '100'))
 FORMULA_CACHE_MAX_MB = int(os.getenv('FORMULA_CACHE_MAX_MB', '50'))
 FORMULA_CACHE_TTL_DAYS = int(os.getenv('FORMULA_CACHE_TTL_DAYS', '7'))
 
-DEFAULT_STAGE_LABEL = "Unbekannt"
-
-_STAGE_ALIAS_MAP: Dict[str, str] = {
-    "reproduktion": "Reproduktion",
-    "reproduction": "Reproduktion",
-    "wissen": "Reproduktion",
-    "memorieren": "Reproduktion",
-    "knowledge": "Reproduktion",
-    "verstehen": "Verständnis",
-    "verständnis": "Verständnis",
-    "understanding": "Verständnis",
-    "anwenden": "Anwendung",
-    "anwendung": "Anwendung",
-    "application": "Anwendung",
-    "applying": "Anwendung",
-    "analyse": "Analyse",
-    "analysis": "Analyse",
-    "analysieren": "Analyse",
-    "analyzing": "Analyse",
-    "strukturelle analyse": "Analyse",
-    "structural analysis": "Analyse",
-}
-
-BLOOM_STAGE_ORDER = ["Reproduktion", "Anwendung", "Analyse"]
-
-
-def _normalize_stage_label(value: Any) -> str:
-    if not value:
-        return DEFAULT_STAGE_LABEL
-    key = str(value).strip()
-    if not key:
-        return DEFAULT_STAGE_LABEL
-    alias = _STAGE_ALIAS_MAP.get(key.lower())
-    return alias if alias else key
-
-
-def _get_bloom_stage_rank(stage_label: str) -> int:
-    """Numerischer Rang für eine Bloom-Stufe (nicht erkannte Labels werden hinten einsortiert)."""
-    try:
-        return BLOOM_STAGE_ORDER.index(stage_label)
-    except ValueError:
-        return len(BLOOM_STAGE_ORDER)
-
-
 def _markdown_to_html(text: str) -> str:
     """Convert simple markdown-style text to HTML for PDF rendering.
     
@@ -508,148 +476,72 @@ def _render_topic_stacked_bar_svg(themes: List[str], pct_correct: List[float], p
     return svg
 
 
-def _evict_formula_cache(max_files: int = 200, max_total_mb: int = 200, ttl_days: int = 7) -> None:
-    """Evict old entries from the disk formula cache.
-
-    Strategy:
-    - Remove files older than ttl_days.
-    - If total files > max_files or total size > max_total_mb, remove
-      oldest files until under limits.
-    """
-    try:
-        if not FORMULA_CACHE_DIR:
-            return
+def _formula_disk_cache() -> Optional[formula_cache.FormulaDiskCache]:
+    if not FORMULA_CACHE_DIR:
+        return None
+    return formula_cache.get_cache(FORMULA_CACHE_DIR)
 
-        import time
 
-        files = list(FORMULA_CACHE_DIR.glob('*.png'))
-        # Filter out any entries that don't currently exist to avoid
-        # races where another process removed files between glob() and stat().
-        files = [f for f in files if f.exists()]
-        if not files:
-            return
-        pre_count = len(files)
-        # Use a safe stat pattern: individually try stat() and ignore files that
-        # disappeared between listing and stat() to avoid FileNotFoundError.
-        pre_total_bytes = 0
-        safe_files = []
-        for f in files:
-            try:
-                stsz = f.stat().st_size
-                pre_total_bytes += stsz
-                safe_files.append(f)
-            except FileNotFoundError:
-                # file vanished concurrently; skip it
-                continue
-            except Exception:
-                # Any other stat error: skip file but keep going
-                continue
-        files = safe_files
-        pre_total_mb = pre_total_bytes / (1024 * 1024)
+def _formula_cache_name(formula: str, is_block: bool, backend: str) -> str:
+    """Dateiname im Disk-Cache; die Endung trennt die Backends."""
+    ext = 'svg' if backend == formula_render.BACKEND_TEX else 'png'
+    return formula_cache.formula_cache_name(formula, is_block, ext)
 
-        logger.info('Eviction: starting with %d files, %.2f MiB (limits: files=%d, MB=%d, ttl_days=%d)',
-                    pre_count, pre_total_mb, max_files, max_total_mb, ttl_days)
 
-        # Remove any lingering temporary files first (from previous interrupted writes)
-        tmp_files = list(FORMULA_CACHE_DIR.glob('*.tmp'))
-        for tf in tmp_files:
-            try:
-                b = tf.stat().st_size if tf.exists() else 0
-                tf.unlink()
-                logger.info('Eviction: removed lingering tmp file %s (%.1f KiB)', tf, b / 1024.0)
-            except Exception:
-                logger.warning('Eviction: failed to remove tmp file %s', tf)
+def _formula_memory_key(formula: str, is_block: bool, backend: str) -> tuple:
+    if backend == formula_render.BACKEND_TEX:
+        return (formula, is_block, backend)
+    return (formula, is_block)
 
-        # Remove files older than ttl_days
-        now = time.time()
-        ttl_seconds = ttl_days * 86400
-        survivors = []
-        removed_files = []
-        removed_bytes = 0
 
-        for f in files:
-            try:
-                mtime = f.stat().st_mtime
-            except FileNotFoundError:
-                # File disappeared; skip it
-                continue
-            except Exception:
-                # Any other stat error: skip this file
-                continue
-
-            if now - mtime > ttl_seconds:
-                try:
-                    try:
-                        b = f.stat().st_size
-                    except Exception:
-                        b = 0
-                    f.unlink()
-                    removed_files.append(f)
-                    removed_bytes += b
-                    logger.info('Eviction: removed old file %s (%.1f KiB)', f, b / 1024.0)
-                except Exception:
-                    logger.warning('Eviction: failed to remove old file %s', f)
-            else:
-                survivors.append(f)
+def _read_formula_cache(name: str) -> Optional[bytes]:
+    disk_cache = _formula_disk_cache()
+    if disk_cache is None:
+        return None
+    try:
+        return disk_cache.get(name)
+    except Exception:
+        logger.warning('Failed to read formula cache entry %s, will regenerate', name)
+        return None
 
-        # If we still exceed limits, sort by mtime ascending and delete oldest
-        # Recompute total_size defensively: ignore files that vanish during this step
-        total_size = 0
-        fresh_survivors = []
-        for f in survivors:
-            try:
-                if not f.exists():
-                    continue
-                total_size += f.stat().st_size
-                fresh_survivors.append(f)
-            except FileNotFoundError:
-                continue
-            except Exception:
-                continue
-        survivors = fresh_survivors
-        total_mb = total_size / (1024 * 1024)
 
-        if len(survivors) > max_files or total_mb > max_total_mb:
-            # Sorting must tolerate files that disappear between calls to stat()
-            try:
-                survivors_sorted = sorted(
-                    survivors,
-                    key=lambda p: p.stat().st_mtime if p.exists() else 0
-                )
-            except FileNotFoundError:
-                # As a fallback, filter and re-sort
-                survivors = [p for p in survivors if p.exists()]
-                survivors_sorted = sorted(survivors, key=lambda p: p.stat().st_mtime)
-            # Delete until under both thresholds
-            for f in survivors_sorted:
-                try:
-                    if not f.exists():
-                        continue
-                    b = f.stat().st_size
-                    f.unlink()
-                    removed_files.append(f)
-                    removed_bytes += b
-                    total_size -= b
-                    total_mb = total_size / (1024 * 1024)
-                    logger.info('Eviction: pruned file %s (%.1f KiB). New total: %.2f MiB', f, b / 1024.0, total_mb)
-                except Exception:
-                    logger.warning('Eviction: failed to prune file %s', f)
+def _write_formula_cache(name: str, data: bytes) -> None:
+    disk_cache = _formula_disk_cache()
+    if disk_cache is None:
+        return
+    try:
+        disk_cache.put(
+            name,
+            data,
+            max_files=FORMULA_CACHE_MAX_FILES,
+            max_bytes=FORMULA_CACHE_MAX_MB * 1024 * 1024,
+            ttl_days=FORMULA_CACHE_TTL_DAYS,
+        )
+    except Exception:
+        # Ignore disk write errors; proceed with in-memory result
+        logger.warning('Failed to write formula cache entry %s: %s', name, traceback.format_exc())
 
-                current_count = len(list(FORMULA_CACHE_DIR.glob('*.png')))
-                if current_count <= max_files and total_mb <= max_total_mb:
-                    break
 
-        post_files = list(FORMULA_CACHE_DIR.glob('*.png'))
-        post_count = len(post_files)
-        post_total_bytes = sum((f.stat().st_size for f in post_files if f.exists()))
-        post_total_mb = post_total_bytes / (1024 * 1024)
+def get_formula_cache_stats() -> Dict[str, float]:
+    """Treffer, Fehlschläge, Verdrängungen und Belegung des Formel-Disk-Caches."""
+    disk_cache = _formula_disk_cache()
+    if disk_cache is None:
+        return {"files": 0, "bytes": 0, "hits": 0, "misses": 0, "evictions": 0, "hit_rate": 0.0}
+    return disk_cache.stats()
 
-        removed_count = len(removed_files)
 
-        if removed_count > 0:
-            logger.info('Eviction summary: removed %d files (%.2f MiB). Before: %d files / %.2f MiB; After: %d files / %.2f MiB',
-                        removed_count, removed_bytes / (1024 * 1024), pre_count, pre_total_mb, post_count, post_total_mb)
+def _evict_formula_cache(max_files: int = 200, max_total_mb: int = 200, ttl_days: int = 7) -> None:
+    """Evict old entries from the disk formula cache.
 
+    Removes entries unused for more than ttl_days, then the least recently
+    used ones until both limits hold. Works on the index in `formula_cache`
+    instead of listing and stat-ing the directory.
+    """
+    try:
+        disk_cache = _formula_disk_cache()
+        if disk_cache is None:
+            return
+        disk_cache.evict(max_files=max_files, max_bytes=max_total_mb * 1024 * 1024, ttl_days=ttl_days)
     except Exception:
         # Be conservative: failure to evict is non-fatal
         logger.exception('Eviction failed')
@@ -664,45 +556,43 @@ def _render_latex_to_image(formula: str, is_block: bool) -> str:
     """
     Rendert LaTeX-Formel zu PNG-Bild via QuickLaTeX API.
     Mit Caching für bessere Performance.
+
+    Ist das lokale Backend aktiv (siehe `formula_render`), wird stattdessen
+    offline ein SVG erzeugt.
     """
+    if formula_render.get_formula_backend() == formula_render.BACKEND_TEX:
+        kind = 'block' if is_block else 'inline'
+        rendered = _render_formulas_local([(kind, formula)]).get(0)
+        if rendered:
+            return rendered
+        error = f'[Formel: {formula}]'
+        return f'<div style="text-align: center;">{error}</div>' if is_block else f'<span>{error}</span>'
+
     # Cache-Key erstellen
     cache_key = (formula, is_block)
     if cache_key in _formula_cache:
         return _formula_cache[cache_key]
 
-    # Attempt disk-backed cache: derive filename from sha1(formula+flag)
-    cache_filename = None
-    try:
-        if FORMULA_CACHE_DIR:
-            h = hashlib.sha1((formula + ('@block' if is_block else '@inline')).encode('utf-8')).hexdigest()
-            cache_filename = FORMULA_CACHE_DIR.joinpath(f"{h}.png")
-            if cache_filename.exists():
-                # Read file and return as data URI img tag (prefer block/inline styles)
-                try:
-                    with open(cache_filename, 'rb') as cf:
-                        img_bytes = cf.read()
-                        img_data = base64.b64encode(img_bytes).decode()
-                        logger.info('Formula disk cache HIT: %s', cache_filename)
-                        image_url = f'data:image/png;base64,{img_data}'
-                        if is_block:
-                            result = (f'<div style="text-align: center; margin: 1.2em 0; '
-                                      f'padding: 0.5em; background-color: #f8f9fa;">'
-                                      f'<img src="{image_url}" alt="LaTeX formula" '
-                                      f'style="max-width: 100%; height: auto; vertical-align: middle;">'
-                                      f'</div>')
-                        else:
-                            result = (f'<img src="{image_url}" alt="LaTeX formula" '
-                                      f'style="vertical-align: middle; margin: 0 0.15em; max-height: 1.2em;">')
-                        _formula_cache[cache_key] = result
-                        return result
-                except Exception:
-                    # If reading cache fails, continue to generate anew
-                    logger.warning('Failed to read formula cache file %s, will regenerate', cache_filename)
-                    cache_filename = None
-                    pass
-    except Exception:
-        cache_filename = None
-    
+    # Attempt disk-backed cache (content-addressed, see formula_cache)
+    cache_name = _formula_cache_name(formula, is_block, formula_render.BACKEND_QUICKLATEX)
+    img_bytes = _read_formula_cache(cache_name)
+    if img_bytes is not None:
+        # Return as data URI img tag (prefer block/inline styles)
+        img_data = base64.b64encode(img_bytes).decode()
+        logger.info('Formula disk cache HIT: %s', cache_name)
+        image_url = f'data:image/png;base64,{img_data}'
+        if is_block:
+            result = (f'<div style="text-align: center; margin: 1.2em 0; '
+                      f'padding: 0.5em; background-color: #f8f9fa;">'
+                      f'<img src="{image_url}" alt="LaTeX formula" '
+                      f'style="max-width: 100%; height: auto; vertical-align: middle;">'
+                      f'</div>')
+        else:
+            result = (f'<img src="{image_url}" alt="LaTeX formula" '
+                      f'style="vertical-align: middle; margin: 0 0.15em; max-height: 1.2em;">')
+        _formula_cache[cache_key] = result
+        return result
+
     try:
         # Kleinere Schriftgröße aber extrem hohe DPI für beste Qualität
         font_size = '12px' if is_block else '14px'
@@ -749,24 +639,8 @@ def _render_latex_to_image(formula: str, is_block: bool) -> str:
                     img_response = requests.get(image_url, timeout=10)
                     if img_response.ok:
                         img_bytes = img_response.content
-                        # If disk cache is available, write the PNG atomically
-                        try:
-                            if cache_filename is not None and FORMULA_CACHE_DIR is not None:
-                                # Run eviction before writing to keep cache within limits
-                                _evict_formula_cache(
-                                    max_files=FORMULA_CACHE_MAX_FILES,
-                                    max_total_mb=FORMULA_CACHE_MAX_MB,
-                                    ttl_days=FORMULA_CACHE_TTL_DAYS,
-                                )
-                                tmp_path = cache_filename.with_suffix('.tmp')
-                                with open(tmp_path, 'wb') as tf:
-                                    tf.write(img_bytes)
-                                os.replace(tmp_path, cache_filename)
-                                logger.info('Wrote formula image to disk cache: %s (bytes=%d)', cache_filename, len(img_bytes))
-                        except Exception:
-                            # Ignore disk write errors; proceed with in-memory result
-                            logger.warning('Failed to write formula cache file %s: %s', cache_filename, traceback.format_exc())
-                            pass
+                        # Write the PNG to the disk cache (evicts LRU entries as needed)
+                        _write_formula_cache(cache_name, img_bytes)
                         img_data = base64.b64encode(img_bytes).decode()
                         image_url = f'data:image/png;base64,{img_data}'
                 except Exception:
@@ -880,11 +754,77 @@ def _strip_leading_dict_prefix(text: str) -> str:
 
     return text
 
+def _formula_img_html(image_url: str, formula: str, is_block: bool) -> str:
+    if is_block:
+        return (f'<div style="text-align: center; margin: 1.2em 0; '
+                f'padding: 0.5em; background-color: #f8f9fa;">'
+                f'<img src="{image_url}" alt="LaTeX formula" '
+                f'style="max-width: 100%; height: auto; vertical-align: middle;">'
+                f'</div>')
+    # SVGs bringen ihre Größe in pt mit und skalieren mit dem Text;
+    # nur breite Matrizen werden begrenzt.
+    if 'matrix' in formula:
+        return (f'<img src="{image_url}" alt="LaTeX formula" '
+                f'style="vertical-align: middle; margin: 0 0.15em; max-width: 90%;">')
+    return (f'<img src="{image_url}" alt="LaTeX formula" '
+            f'style="vertical-align: middle; margin: 0 0.15em;">')
+
+
+def _render_formulas_local(formulas: List[tuple], total_timeout: float | None = None) -> Dict[int, str]:
+    """
+    Rendert Formeln offline über `formula_render` (latex + dvisvgm).
+
+    Bereits gecachte Formeln (Speicher/Disk) werden übersprungen, alle übrigen
+    in einem Batch gerendert. Fehlerhafte Formeln fehlen im Ergebnis, damit
+    `_render_latex_in_html` den Quelltext als Fallback einsetzt.
+    """
+    backend = formula_render.BACKEND_TEX
+    results: Dict[int, str] = {}
+    missing: Dict[tuple, List[int]] = {}
+
+    for idx, (ftype, formula) in enumerate(formulas):
+        is_block = (ftype == 'block')
+        key = _formula_memory_key(formula, is_block, backend)
+        cached = _formula_cache.get(key)
+        if cached is None:
+            svg_bytes = _read_formula_cache(_formula_cache_name(formula, is_block, backend))
+            if svg_bytes is not None:
+                image_url = f'data:image/svg+xml;base64,{base64.b64encode(svg_bytes).decode()}'
+                cached = _formula_img_html(image_url, formula, is_block)
+                _formula_cache[key] = cached
+        if cached is not None:
+            results[idx] = cached
+        else:
+            missing.setdefault((formula, is_block), []).append(idx)
+
+    if not missing:
+        return results
+
+    items = list(missing)
+    rendered = formula_render.render_formulas(
+        items,
+        timeout=total_timeout if total_timeout is not None else FORMULA_RENDER_TOTAL_TIMEOUT,
+    )
+    for (formula, is_block), svg_bytes in zip(items, rendered):
+        if not svg_bytes:
+            continue
+        _write_formula_cache(_formula_cache_name(formula, is_block, backend), svg_bytes)
+        image_url = f'data:image/svg+xml;base64,{base64.b64encode(svg_bytes).decode()}'
+        html_fragment = _formula_img_html(image_url, formula, is_block)
+        _formula_cache[_formula_memory_key(formula, is_block, backend)] = html_fragment
+        for idx in missing[(formula, is_block)]:
+            results[idx] = html_fragment
+    return results
+
+
 def _render_formulas_parallel(formulas: List[tuple], total_timeout: float | None = None) -> Dict[int, str]:
     """
     Rendert mehrere Formeln parallel für bessere Performance.
     Verwendet dynamische Worker-Anzahl basierend auf CPU-Kernen.
     """
+    if formula_render.get_formula_backend() == formula_render.BACKEND_TEX:
+        return _render_formulas_local(formulas, total_timeout=total_timeout)
+
     results = {}
     
     def render_one(idx, formula_type, formula):
@@ -1291,8 +1231,8 @@ def _calculate_average_stats(questions_file: str, questions: List[Dict[str, Any]
         if result and result['total_users'] and result['total_users'] > 0:
             # Berechne maximale Punktzahl
             from logic import calculate_score
-            from config import AppConfig
-            app_config = AppConfig()
+            from config import get_app_config
+            app_config = get_app_config()
             _, max_score = calculate_score([None] * len(questions), questions, app_config.scoring_mode)
             
             avg_score = result['avg_score'] or 0
@@ -1375,86 +1315,6 @@ def _calculate_average_stats(questions_file: str, questions: List[Dict[str, Any]
         return None
 
 
-def _extract_glossary_terms(
-    questions: List[Dict[str, Any]]
-) -> Dict[str, Dict[str, str]]:
-    """
-    Extrahiert Mini-Glossar-Einträge aus den Fragen,
-    gruppiert nach Themen.
-    Sammelt alle 'mini_glossary' Felder und entfernt Duplikate.
-
-    Returns:
-        Dict mit {Thema: {Begriff: Definition}} -
-        Begriffe innerhalb Thema alphabetisch sortiert
-    """
-    glossary_by_theme: Dict[str, Dict[str, str]] = {}
-    seen_terms = set()  # Tracking für globale Duplikate
-    
-    # Durchsuche alle Fragen nach mini_glossary Einträgen
-    for frage_obj in questions:
-        if "mini_glossary" in frage_obj:
-            mini_gloss = frage_obj["mini_glossary"]
-            # Fallback zu "Allgemein" wenn kein Thema
-            thema = frage_obj.get("thema", "Allgemein")
-            
-            # Support two common formats used in question sets:
-            # 1) dict mapping term -> definition
-            # 2) list of objects [{"term": "...", "definition": "..."}, ...]
-            if isinstance(mini_gloss, dict):
-                # Initialisiere Thema, falls noch nicht vorhanden
-                if thema not in glossary_by_theme:
-                    glossary_by_theme[thema] = {}
-
-                # Füge alle Begriffe aus diesem mini_glossary hinzu
-                for term, definition in mini_gloss.items():
-                    # Verhindere globale Duplikate
-                    if isinstance(term, str) and term not in seen_terms and isinstance(definition, str):
-                        glossary_by_theme[thema][term] = definition
-                        seen_terms.add(term)
-
-            elif isinstance(mini_gloss, list):
-                # List-of-objects format (common in some exports):
-                if thema not in glossary_by_theme:
-                    glossary_by_theme[thema] = {}
-
-                for entry in mini_gloss:
-                    try:
-                        if isinstance(entry, dict):
-                            # Typical shape: {"term": "Sensor", "definition": "..."}
-                            if 'term' in entry and 'definition' in entry:
-                                term = entry.get('term')
-                                definition = entry.get('definition')
-                            else:
-                                # Fallback: single-key dict mapping term->definition
-                                if len(entry) == 1:
-                                    term, definition = next(iter(entry.items()))
-                                else:
-                                    # Try common alternate keys
-                                    term = entry.get('Begriff') or entry.get('Term') or entry.get('key')
-                                    definition = entry.get('definition') or entry.get('Definition') or entry.get('def')
-                        else:
-                            # unsupported entry type
-                            term = None
-                            definition = None
-                    except Exception:
-                        term = None
-                        definition = None
-
-                    if isinstance(term, str) and isinstance(definition, str) and term and term not in seen_terms:
-                        glossary_by_theme[thema][term] = definition
-                        seen_terms.add(term)
-    
-    # Sortiere Themen alphabetisch und Begriffe innerhalb jedes Themas
-    sorted_glossary = {}
-    for thema in sorted(glossary_by_theme.keys()):
-        sorted_glossary[thema] = dict(sorted(
-            glossary_by_theme[thema].items(),
-            key=lambda x: x[0].lower()
-        ))
-    
-    return sorted_glossary
-
-
 # NOTE: UX tweak (2025-10-14): The mini-glossary in the user-facing PDF
 # now uses subtle category dividers (same visual style as the admin
 # mini-glossary export) instead of heavy bordered panels. The change
@@ -1596,17 +1456,15 @@ def estimate_formula_render(questions: List[Dict[str, Any]], locale: Optional[st
         # Check cache presence per formula
         to_render = 0
         try:
-            import hashlib as _hashlib
+            backend = formula_render.get_formula_backend()
+            disk_cache = _formula_disk_cache()
             for kind, formula in unique:
-                cache_key = (formula, True if kind == 'block' else False)
-                in_memory = cache_key in _formula_cache
+                is_block = (kind == 'block')
+                in_memory = _formula_memory_key(formula, is_block, backend) in _formula_cache
                 on_disk = False
-                if not in_memory and FORMULA_CACHE_DIR:
+                if not in_memory and disk_cache is not None:
                     try:
-                        suffix = '@block' if kind == 'block' else '@inline'
-                        h = _hashlib.sha1((formula + suffix).encode('utf-8')).hexdigest()
-                        if FORMULA_CACHE_DIR.joinpath(f"{h}.png").exists():
-                            on_disk = True
+                        on_disk = disk_cache.contains(_formula_cache_name(formula, is_block, backend))
                     except Exception:
                         on_disk = False
 
@@ -1743,6 +1601,68 @@ def _build_extended_explanation_html(frage_obj: Dict[str, Any], total_timeout: f
     return explanation_html
 
 
+def _without_formula_fallback(fragment: Any) -> bool:
+    # Fallbacks (Renderer nicht erreichbar) nicht speichern, damit der nächste Export es erneut versucht.
+    return 'formula-fallback' not in repr(fragment)
+
+
+def _fragment_options() -> Dict[str, Any]:
+    return {"formula_backend": formula_render.get_formula_backend()}
+
+
+def _question_fragments(frage: Dict[str, Any], total_timeout: float | None = None) -> Dict[str, Any]:
+    """
+    Fertiges HTML der Inhalte einer Frage: Text, Thema, Konzept, Optionen und Erklärungen.
+    Hängt nur von der Frage, der UI-Sprache und dem Formel-Backend ab und kommt daher aus dem
+    Fragment-Cache; Bericht und Musterlösung ergänzen nur Nummerierung, Status und Markierungen.
+    """
+    def _build() -> Dict[str, Any]:
+        inline_html: Dict[str, str] = {}
+
+        def _inline(value: Any) -> str:
+            if not value:
+                return ""
+            text = str(value)
+            if text not in inline_html:
+                inline_html[text] = _render_latex_in_html(smart_quotes_de(text), total_timeout=total_timeout, md_inline=True)
+            return inline_html[text]
+
+        frage_text = frage.get("question", frage.get("frage", ""))
+        erklaerung = frage.get("erklaerung")
+        return {
+            "question": _render_latex_in_html(
+                smart_quotes_de(_strip_leading_numbering(str(frage_text))),
+                total_timeout=total_timeout,
+            ),
+            "thema": _inline(frage.get("thema")),
+            "topic": _inline(frage.get("topic") or frage.get("thema")),
+            "concept": _inline(frage.get("concept") or frage.get("konzept")),
+            "options": [
+                _render_latex_in_html(smart_quotes_de(opt), total_timeout=total_timeout)
+                for opt in _get_options(frage)
+            ],
+            "explanation": _render_latex_in_html(smart_quotes_de(erklaerung), total_timeout=total_timeout) if erklaerung else "",
+            "extended": _build_extended_explanation_html(frage, total_timeout=total_timeout),
+        }
+
+    return export_cache.cached_fragment(
+        "question_fragment", frage, _build, options=_fragment_options(), store_if=_without_formula_fallback,
+    )
+
+
+def _glossary_fragment(glossary_by_theme: Dict[str, Dict[str, str]]) -> str:
+    """`_build_glossary_html` über den Fragment-Cache (Schlüssel: extrahierte Begriffe)."""
+    if not glossary_by_theme:
+        return ""
+    return export_cache.cached_fragment(
+        "glossary_fragment",
+        glossary_by_theme,
+        lambda: _build_glossary_html(glossary_by_theme),
+        options=_fragment_options(),
+        store_if=_without_formula_fallback,
+    )
+
+
 def _cooldown_adjusted_total_minutes(
     questions: List[Dict[str, Any]],
     app_config: AppConfig,
@@ -1875,7 +1795,7 @@ def generate_pdf_report(questions: List[Dict[str, Any]], app_config: AppConfig)
         header_subtitle = f'<p class="header-subtitle">{"".join(subtitle_parts)}</p>'
 
     current_score, max_score = calculate_score(
-        [st.session_state.get(f"frage_{i}_beantwortet") for i in range(len(questions))],
+        get_test_run(st.session_state).points_list(len(questions)),
         questions, app_config.scoring_mode
     )
     prozent = (current_score / max_score * 100) if max_score > 0 else 0
@@ -2860,7 +2780,7 @@ def generate_pdf_report(questions: List[Dict[str, Any]], app_config: AppConfig)
     
     # Mini-Glossar erstellen (nach Themen gruppiert)
     glossary_by_theme = _extract_glossary_terms(questions)
-    glossary_html = _build_glossary_html(glossary_by_theme)
+    glossary_html = _glossary_fragment(glossary_by_theme)
     
     # Lesezeichen-Übersicht erstellen
     bookmarked_indices = st.session_state.get("bookmarked_questions", [])
@@ -3070,8 +2990,8 @@ def generate_pdf_report(questions: List[Dict[str, Any]], app_config: AppConfig)
         except (ValueError, IndexError):
             original_number = original_index + 1
         
-        raw_question_text = _strip_leading_numbering(str(frage_obj.get("question", frage_obj.get("frage", ""))))
-        frage_text = _render_latex_in_html(smart_quotes_de(raw_question_text))
+        fragments = _question_fragments(frage_obj)
+        frage_text = fragments["question"]
         
         # Bestimme Farbe und Status basierend auf richtig/falsch/unbeantwortet
         gegebene_antwort = get_answer_for_question(original_index)
@@ -3145,8 +3065,7 @@ def generate_pdf_report(questions: List[Dict[str, Any]], app_config: AppConfig)
         
         # Thema-Badge (falls vorhanden)
         if thema:
-            thema_html = _render_latex_in_html(smart_quotes_de(str(thema)), md_inline=True)
-            html_body += f'<div class="question-topic">{thema_html}</div>'
+            html_body += f'<div class="question-topic">{fragments["thema"]}</div>'
         # Konzept anzeigen (falls vorhanden)
         try:
             concept_val = frage_obj.get("concept") or frage_obj.get("konzept")
@@ -3157,8 +3076,7 @@ def generate_pdf_report(questions: List[Dict[str, Any]], app_config: AppConfig)
                 label = translate_ui('metadata.concept', default='Konzept')
             except Exception:
                 label = 'Konzept'
-            concept_html = _render_latex_in_html(smart_quotes_de(str(concept_val)), md_inline=True)
-            html_body += f"<div style='margin-top:6px;margin-bottom:8px;color:#555;font-size:0.95em;'><strong>{_html.escape(label)}:</strong> {concept_html}</div>"
+            html_body += f"<div style='margin-top:6px;margin-bottom:8px;color:#555;font-size:0.95em;'><strong>{_html.escape(label)}:</strong> {fragments['concept']}</div>"
             # Decorative separator after meta-lines to visually separate
             # the concept line from the question text (kept aria-hidden).
             try:
@@ -3169,7 +3087,7 @@ def generate_pdf_report(questions: List[Dict[str, Any]], app_config: AppConfig)
         html_body += f'<div class="question-text">{frage_text}</div>'
 
         html_body += '<ul class="options">'
-        for option in _get_options(frage_obj):
+        for option, option_html in zip(_get_options(frage_obj), fragments["options"]):
             is_correct = (option == richtige_antwort_text)
             is_selected = (option == gegebene_antwort)
             
@@ -3191,7 +3109,6 @@ def generate_pdf_report(questions: List[Dict[str, Any]], app_config: AppConfig)
                     class_name = 'wrong-selected'
                     prefix = '✗'
 
-            option_html = _render_latex_in_html(smart_quotes_de(option))
             html_body += (
                 f'<li class="{class_name}">'
                 f'<span class="prefix">{prefix}</span>'
@@ -3203,9 +3120,9 @@ def generate_pdf_report(questions: List[Dict[str, Any]], app_config: AppConfig)
         erklaerung = frage_obj.get("erklaerung")
         if erklaerung:
             label = translate_ui("test_view.explanation_label", default="Erklärung:")
-            html_body += f'<div class="explanation"><strong>{_html.escape(label)}</strong> {_render_latex_in_html(smart_quotes_de(erklaerung))}</div>'
+            html_body += f'<div class="explanation"><strong>{_html.escape(label)}</strong> {fragments["explanation"]}</div>'
 
-        html_body += _build_extended_explanation_html(frage_obj)
+        html_body += fragments["extended"]
         
         # Schließe Question-Box
         html_body += '</div>'
@@ -3999,6 +3916,24 @@ def generate_pdf_report(questions: List[Dict[str, Any]], app_config: AppConfig)
     return pdf_bytes
 
 
+def generate_pdf_report_from_state(questions: List[Dict[str, Any]], config: Dict[str, Any], state: Dict[str, Any]) -> bytes:
+    """
+    Wie `generate_pdf_report`, aber mit einer Kopie des Session State
+    (`helpers.run_state.report_state_snapshot`) statt des laufenden Streamlit-Skripts
+    und den Konfigurationswerten aus `helpers.run_state.report_config_values`.
+    Für Export-Jobs, die den Bericht nach Testende im Hintergrund vorbereiten.
+    """
+    from config import get_app_config
+
+    app_config = get_app_config().copy(**config)
+    previous = getattr(st, "session_state", None)
+    st.session_state = dict(state)
+    try:
+        return generate_pdf_report(questions, app_config)
+    finally:
+        st.session_state = previous
+
+
 def generate_mini_glossary_pdf(q_file: str, questions: List[Dict[str, Any]]) -> bytes:
     """
     Erstellt ein PDF mit allen Mini-Glossar-Einträgen eines Fragensets.
@@ -4339,6 +4274,8 @@ def generate_musterloesung_pdf(q_file: str, questions: List[Dict[str, Any]], app
     )
     html_parts.append('<div class="section">')
     sorted_entries = _prepare_stage_sorted_questions(questions)
+    # Index des `<div class="question">` jeder Frage in html_parts (für Teildokumente)
+    question_starts: list[int] = []
 
     # Nummeriere die Fragen nach Bloom-Taxonomie geordnet
     # Use the sorted/filtered entries for all display-related counting so
@@ -4348,12 +4285,9 @@ def generate_musterloesung_pdf(q_file: str, questions: List[Dict[str, Any]], app
     for display_num, (_, stage_label, _, frage) in enumerate(sorted_entries, start=1):
         # coarse progress report: parsing/rendering block per question
         _report(int((display_num - 1) / max(1, len(questions)) * 60), f"Verarbeite Frage {display_num}/{len(questions)}")
-        frage_text = frage.get("question", frage.get("frage", ""))
-        # Parst Markdown/LaTeX in sicheres HTML
-        parsed_frage = _render_latex_in_html(
-            smart_quotes_de(_strip_leading_numbering(str(frage_text))),
-            total_timeout=total_timeout,
-        )
+        # Markdown/LaTeX als sicheres HTML (aus dem Fragment-Cache)
+        fragments = _question_fragments(frage, total_timeout=total_timeout)
+        parsed_frage = fragments["question"]
 
         # Insert a subtle separator before each question so the PDF shows
         # a consistent divider line prior to every question block. Only
@@ -4365,6 +4299,7 @@ def generate_musterloesung_pdf(q_file: str, questions: List[Dict[str, Any]], app
                 html_parts.append('<div class="muster-concept-sep" aria-hidden="true"></div>')
         except Exception:
             pass
+        question_starts.append(len(html_parts))
         html_parts.append('<div class="question">')
         q_header = translate_ui("pdf.question_header", default="Frage {current} / {total}").format(current=display_num, total=len(questions))
         html_parts.append(f'<h3>{_html.escape(q_header)}</h3>')
@@ -4388,8 +4323,7 @@ def generate_musterloesung_pdf(q_file: str, questions: List[Dict[str, Any]], app
         topic_val = frage.get("topic") or frage.get("thema") or ''
         if topic_val:
             topic_label = translate_ui('pdf.meta.topic', default='Topic:')
-            topic_html = _render_latex_in_html(smart_quotes_de(str(topic_val)), total_timeout=total_timeout, md_inline=True)
-            html_parts.append(f'<div class="muster-meta-line">{_html.escape(topic_label)} {topic_html}</div>')
+            html_parts.append(f'<div class="muster-meta-line">{_html.escape(topic_label)} {fragments["topic"]}</div>')
 
         # Concept line (if present) — otherwise insert a subtle separator
         try:
@@ -4405,8 +4339,7 @@ def generate_musterloesung_pdf(q_file: str, questions: List[Dict[str, Any]], app
                 c_label = translate_ui('metadata.concept', default='Concept')
             except Exception:
                 c_label = 'Concept'
-            concept_html = _render_latex_in_html(smart_quotes_de(str(concept_val)), total_timeout=total_timeout, md_inline=True)
-            html_parts.append(f'<div class="muster-meta-line">{_html.escape(c_label)}: {concept_html}</div>')
+            html_parts.append(f'<div class="muster-meta-line">{_html.escape(c_label)}: {fragments["concept"]}</div>')
 
         # Always insert a very light separator after the meta-lines.
         # Decorative only; keep `aria-hidden` so screen readers ignore it.
@@ -4443,8 +4376,7 @@ def generate_musterloesung_pdf(q_file: str, questions: List[Dict[str, Any]], app
             except Exception:
                 pass
 
-        for oi, opt in enumerate(opts):
-            parsed_opt = _render_latex_in_html(smart_quotes_de(opt), total_timeout=total_timeout)
+        for oi, parsed_opt in enumerate(fragments["options"]):
             if oi == correct_idx:
                 html_parts.append(f'<li class="option correct"><span class="option-marker">✔</span><div class="option-content">{parsed_opt}</div></li>')
             else:
@@ -4457,21 +4389,22 @@ def generate_musterloesung_pdf(q_file: str, questions: List[Dict[str, Any]], app
         if erklaerung:
             label = translate_ui("test_view.explanation_label", default="Erklärung:")
             html_parts.append(
-                f'<div class="explanation"><strong>{_html.escape(label)}</strong> {_render_latex_in_html(smart_quotes_de(erklaerung), total_timeout=total_timeout)}</div>'
+                f'<div class="explanation"><strong>{_html.escape(label)}</strong> {fragments["explanation"]}</div>'
             )
 
-        html_parts.append(_build_extended_explanation_html(frage, total_timeout=total_timeout))
+        html_parts.append(fragments["extended"])
 
         html_parts.append('</div>')
 
     # report that question parsing is mostly done (~60%)
     _report(65, "Fragen verarbeitet, baue Glossar und HTML")
 
+    questions_end = len(html_parts)
     html_parts.append('</div>')
 
     # Glossar anhängen — force new page before glossary
     glossary_by_theme = _extract_glossary_terms(questions)
-    glossary_html = _build_glossary_html(glossary_by_theme)
+    glossary_html = _glossary_fragment(glossary_by_theme)
     # Ensure the mini-glossary starts on a new page in the PDF output.
     # Decorative empty div with page-break CSS (aria-hidden for screen readers).
     html_parts.append('<div class="glossary-page-break" aria-hidden="true"></div>')
@@ -4481,13 +4414,7 @@ def generate_musterloesung_pdf(q_file: str, questions: List[Dict[str, Any]], app
     footer_template = translate_ui('pdf.page_footer', default='Seite {page} von {pages}')
     css_footer = _build_css_footer(footer_template)
 
-    # Full HTML
-    full_html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="utf-8">
-        <style>
+    page_css = f"""
             @page {{
                 size: A4;
                 margin: 2cm 2cm 3cm 2cm;
@@ -4496,7 +4423,8 @@ def generate_musterloesung_pdf(q_file: str, questions: List[Dict[str, Any]], app
                     font-size: 9pt;
                     color: #666;
                 }}
-            }}
+            }}"""
+    style_css = f"""{page_css}
             body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif; color: #222; line-height:1.6; }}
             .header {{ background: #f1f5f9; padding: 18px; border-radius: 6px; margin-bottom: 12px; }}
             .header h1 {{ margin: 0 0 6px 0; font-size: 22pt; }}
@@ -4601,14 +4529,27 @@ def generate_musterloesung_pdf(q_file: str, questions: List[Dict[str, Any]], app
             .glossary-term {{ font-size: 12pt; font-weight: 800; color: #2d3748; margin-bottom: 6px; display: block; }}
             .glossary-definition {{ font-size: 10pt; color: #4a5568; line-height: 1.6; font-weight: 400; }}
             {_build_markdown_pdf_css(".question-text", ".option-content", ".explanation", ".glossary-term", ".glossary-definition")}
-        </style>
+    """
+
+    def _document(body: str, extra_css: str = "") -> str:
+        extra_style = f"<style>{extra_css}</style>" if extra_css else ""
+        return f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="utf-8">
+        <style>{style_css}
+        </style>{extra_style}
     </head>
     <body>
-        {''.join(html_parts)}
+        {body}
     </body>
     </html>
     """
 
+    # Full HTML
+    full_html = _document(''.join(html_parts))
+
     # Before writing PDF, report that we're starting the final render
     # Optionally dump the assembled HTML to `exports/` for inspection
     try:
@@ -4623,8 +4564,85 @@ def generate_musterloesung_pdf(q_file: str, questions: List[Dict[str, Any]], app
         pass
 
     _report(80, "Konvertiere HTML zu PDF")
-    pdf_bytes = HTML(string=full_html, base_url=__file__).write_pdf(optimize_images=True)
+    sections = None
+    if _use_parallel_sections(len(question_starts)):
+        sections = _musterloesung_sections(html_parts, question_starts, questions_end, glossary_html)
+    if sections and len(sections) > 1:
+        pdf_bytes = _render_sections_merged(
+            [_document(body, _SECTION_WITHOUT_FOOTER_CSS) for body in sections],
+            lambda pages: _document(_blank_pages_html(pages), _BLANK_PAGES_CSS),
+            lambda done: _report(80 + int(15 * done / len(sections)), f"Abschnitt {done}/{len(sections)} gerendert"),
+        )
+    else:
+        pdf_bytes = HTML(string=full_html, base_url=__file__).write_pdf(optimize_images=True)
 
     # Final progress update
     _report(100, "Fertig")
     return pdf_bytes
+
+
+# Teildokumente: Fußzeile erst nach dem Zusammenführen (einheitliche Seitenzählung).
+_SECTION_WITHOUT_FOOTER_CSS = "@page { @bottom-center { content: none; } }"
+_BLANK_PAGES_CSS = "body { background: none; } .mc-blank-page { height: 1px; break-after: page; } .mc-blank-page:last-child { break-after: auto; }"
+
+
+def _parallel_min_questions() -> int:
+    try:
+        return max(0, int(os.getenv('MC_PDF_PARALLEL_MIN_QUESTIONS', '40')))
+    except ValueError:
+        return 40
+
+
+def _use_parallel_sections(question_count: int) -> bool:
+    """Große Musterlösungen in Abschnitten parallel rendern (``MC_PDF_PARALLEL_MIN_QUESTIONS``)."""
+    threshold = _parallel_min_questions()
+    return bool(threshold) and question_count >= threshold and pdf_render.pdf_merge_available()
+
+
+def _musterloesung_sections(
+    html_parts: List[str], question_starts: List[int], questions_end: int, glossary_html: str,
+) -> List[str]:
+    """Teilt den Body der Musterlösung in unabhängig setzbare Abschnitte.
+
+    Jede Frage ab der zweiten beginnt ohnehin auf einer neuen Seite; die
+    Abschnittsgrenzen liegen genau dort. Der Trenner vor einer Frage bleibt wie
+    im Gesamtdokument am Ende des vorigen Abschnitts. Kopf und erste Fragen
+    bilden den ersten Abschnitt, das Glossar (eigene Seite) den letzten.
+    """
+    count = len(question_starts)
+    if not count:
+        return []
+    chunks = min(count, pdf_render.parallel_workers() * 2)
+    bounds = [round(i * count / chunks) for i in range(chunks + 1)]
+    sections = []
+    for first, last in zip(bounds, bounds[1:]):
+        start = 0 if first == 0 else question_starts[first]
+        # bis einschließlich des Trenners vor der nächsten Frage
+        end = question_starts[last] if last < count else questions_end
+        prefix = '' if first == 0 else '<div class="section">'
+        sections.append(prefix + ''.join(html_parts[start:end]) + '</div>')
+    if glossary_html.strip():
+        sections.append(glossary_html)
+    return sections
+
+
+def _blank_pages_html(pages: int) -> str:
+    return '<div class="mc-blank-page"></div>' * max(1, pages)
+
+
+def _render_sections_merged(
+    documents: List[str],
+    overlay_document: Callable[[int], str],
+    on_done: Optional[Callable[[int], None]] = None,
+) -> bytes:
+    """Rendert Abschnitte parallel und führt sie mit durchgehender Fußzeile zusammen.
+
+    Die Fußzeile kommt aus einem zweiten Dokument mit gleich vielen leeren
+    Seiten und derselben ``@page``-Regel, das Seite für Seite über das
+    zusammengeführte PDF gelegt wird – Zähler, Gesamtseitenzahl, Schrift und
+    Lokalisierung bleiben so wie beim Rendern am Stück.
+    """
+    parts = pdf_render.render_pdfs(documents, base_url=__file__, on_done=on_done, optimize_images=True)
+    total_pages = sum(pdf_render.pdf_page_count(part) for part in parts)
+    overlay = HTML(string=overlay_document(total_pages), base_url=__file__).write_pdf()
+    return pdf_render.merge_pdfs(parts, overlay=overlay)
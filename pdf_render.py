@@ -0,0 +1,571 @@
+"""Warme PDF-Renderer für alle WeasyPrint-Exporte.
+
+Bisher startete jeder Export (Bericht, Musterlösung, Mini-Glossar,
+Lernziele) WeasyPrint kalt: Fontconfig-Suche und das Parsen der großen
+``<style>``-Blöcke fielen bei jedem PDF erneut an. `render_pdf` (bzw.
+`WarmHTML` mit der Schnittstelle von ``weasyprint.HTML``) ist der gemeinsame
+Einstieg:
+
+- Pro Prozess hält ein `WarmRenderer` eine `FontConfiguration` und die
+  kompilierten Stylesheets (LRU über den CSS-Text, ``MC_PDF_STYLESHEET_CACHE``,
+  Standard 64). Die ``<style>``-Blöcke werden aus dem Dokument gelöst und als
+  fertige `CSS`-Objekte in derselben Reihenfolge übergeben – für die Kaskade
+  ist das gleichwertig, der Parser läuft aber nur einmal pro Stylesheet.
+- In der laufenden App rendert ein `PdfRenderPool` aus
+  ``MC_PDF_RENDER_WORKERS`` (Standard 2, ``0`` schaltet ab) langlebigen
+  Prozessen. Sie laden WeasyPrint und Fonts beim Start mit einem
+  Aufwärm-Dokument vor und nehmen danach HTML-Dokumente über eine Queue an.
+  Der Server-Prozess selbst muss WeasyPrint dafür nicht laden.
+
+Skripte, Tests und Export-Job-Prozesse rendern im eigenen Prozess (ebenfalls
+warm). Mehrere unabhängige Dokumente rendert `render_pdfs` parallel;
+`merge_pdfs` führt sie zusammen (optional, benötigt ``pypdf``). Durchsatz und Latenz liefert `get_render_stats`, vergleichen lässt sich
+mit ``tools/benchmark_pdf_render.py``.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import functools
+import hashlib
+import importlib.util
+import io
+import itertools
+import logging
+import multiprocessing
+import multiprocessing.connection
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_STYLE_RE = re.compile(r"<style(?:\s+type=[\"']text/css[\"'])?\s*>(.*?)</style>", re.S | re.I)
+_LINKED_STYLESHEET_RE = re.compile(r"<link\b[^>]*\bstylesheet\b", re.I)
+_WARMUP_HTML = (
+    "<!DOCTYPE html><html><head><meta charset='UTF-8'><style>"
+    "body { font-family: -apple-system, 'Segoe UI', 'Helvetica Neue', Arial, sans-serif; font-size: 11pt; }"
+    "code { font-family: 'SF Mono', 'Courier New', monospace; }"
+    "</style></head><body><h1>Aufwärmen</h1><p>Äöü ß <strong>fett</strong> <code>x = 1</code></p></body></html>"
+)
+
+
+def render_workers() -> int:
+    """Anzahl Render-Prozesse (``MC_PDF_RENDER_WORKERS``, Standard 2)."""
+    try:
+        return max(0, int(os.getenv("MC_PDF_RENDER_WORKERS", "2")))
+    except ValueError:
+        return 2
+
+
+def _stylesheet_cache_size() -> int:
+    try:
+        return max(0, int(os.getenv("MC_PDF_STYLESHEET_CACHE", "64")))
+    except ValueError:
+        return 64
+
+
+def split_stylesheets(html: str) -> Tuple[str, List[str]]:
+    """Trennt einfache ``<style>``-Blöcke vom Dokument (in Dokumentreihenfolge).
+
+    Dokumente mit verlinkten Stylesheets bleiben unverändert, damit sich die
+    Reihenfolge der Kaskade nicht verschiebt.
+    """
+    if _LINKED_STYLESHEET_RE.search(html):
+        return html, []
+    sheets: List[str] = []
+
+    def _take(match: re.Match) -> str:
+        sheets.append(match.group(1))
+        return ""
+
+    return _STYLE_RE.sub(_take, html), sheets
+
+
+class WarmRenderer:
+    """WeasyPrint mit geteilter Font-Konfiguration und kompilierten Stylesheets."""
+
+    def __init__(self, cache_size: Optional[int] = None):
+        self.cache_size = _stylesheet_cache_size() if cache_size is None else cache_size
+        self._lock = threading.Lock()
+        self._font_config: Any = None
+        self._counter_style: Any = None
+        self._stylesheets: "OrderedDict[str, Any]" = OrderedDict()
+        self.rendered = 0
+        self.render_seconds = 0.0
+        self.stylesheet_hits = 0
+        self.stylesheet_misses = 0
+
+    def _reset_lock(self) -> None:
+        # Nach fork: ein Lock, den ein anderer Thread gerade hielt, bliebe für immer belegt.
+        self._lock = threading.Lock()
+
+    def _ensure_fonts(self) -> None:
+        if self._font_config is not None:
+            return
+        from weasyprint.text.fonts import FontConfiguration
+
+        self._font_config = FontConfiguration()
+        try:
+            from weasyprint.css.counters import CounterStyle
+
+            self._counter_style = CounterStyle()
+        except ImportError:
+            self._counter_style = None
+
+    def _stylesheet(self, css_text: str, base_url: Optional[str]) -> Any:
+        key = hashlib.sha256(f"{base_url or ''}\0{css_text}".encode("utf-8")).hexdigest()
+        sheet = self._stylesheets.get(key)
+        if sheet is not None:
+            self._stylesheets.move_to_end(key)
+            self.stylesheet_hits += 1
+            return sheet
+        from weasyprint import CSS
+
+        kwargs: Dict[str, Any] = {"string": css_text, "base_url": base_url, "font_config": self._font_config}
+        if self._counter_style is not None:
+            kwargs["counter_style"] = self._counter_style
+        sheet = CSS(**kwargs)
+        self.stylesheet_misses += 1
+        if self.cache_size > 0:
+            self._stylesheets[key] = sheet
+            while len(self._stylesheets) > self.cache_size:
+                self._stylesheets.popitem(last=False)
+        return sheet
+
+    def preload(self) -> None:
+        """Lädt WeasyPrint und Fonts und rendert ein kleines Dokument."""
+        self.render(_WARMUP_HTML, count=False)
+
+    def render(self, html: str, base_url: Optional[str] = None, count: bool = True, **write_kwargs: Any) -> bytes:
+        from weasyprint import HTML
+
+        started = time.perf_counter()
+        with self._lock:
+            self._ensure_fonts()
+            body, css_texts = split_stylesheets(html)
+            stylesheets = [self._stylesheet(text, base_url) for text in css_texts]
+            stylesheets.extend(write_kwargs.pop("stylesheets", None) or [])
+            if self._counter_style is not None:
+                write_kwargs.setdefault("counter_style", self._counter_style)
+            pdf_bytes = HTML(string=body, base_url=base_url).write_pdf(
+                stylesheets=stylesheets, font_config=self._font_config, **write_kwargs
+            )
+            if count:
+                self.rendered += 1
+                self.render_seconds += time.perf_counter() - started
+        return pdf_bytes
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "rendered": self.rendered,
+            "mean_ms": (self.render_seconds / self.rendered * 1000.0) if self.rendered else 0.0,
+            "stylesheets": len(self._stylesheets),
+            "stylesheet_hits": self.stylesheet_hits,
+            "stylesheet_misses": self.stylesheet_misses,
+        }
+
+
+_local_renderer: Optional[WarmRenderer] = None
+_local_lock = threading.Lock()
+
+
+def _after_fork_in_child() -> None:
+    global _local_lock
+    _local_lock = threading.Lock()
+    if _local_renderer is not None:
+        _local_renderer._reset_lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def get_local_renderer() -> WarmRenderer:
+    """Der warme Renderer dieses Prozesses."""
+    global _local_renderer
+    with _local_lock:
+        if _local_renderer is None:
+            _local_renderer = WarmRenderer()
+        return _local_renderer
+
+
+def preload() -> None:
+    """Wärmt den Renderer dieses Prozesses vor (z. B. vor dem Forken von Export-Jobs)."""
+    get_local_renderer().preload()
+
+
+def _render_locally(html: str, base_url: Optional[str] = None, **write_kwargs: Any) -> bytes:
+    return get_local_renderer().render(html, base_url=base_url, **write_kwargs)
+
+
+class PdfRenderError(RuntimeError):
+    """Ein Render-Prozess ist beim Rendern ausgefallen oder hat einen Fehler gemeldet."""
+
+
+def _worker_main(index: int, conn: Any, render: Optional[Callable[..., bytes]], warm_up: bool) -> None:
+    """Schleife eines Render-Prozesses: vorladen, dann Dokumente von `conn` rendern."""
+    # Wie in pdf_export: WeasyPrint-Warnungen (CSS, Layout) nicht ins Server-Log.
+    logging.getLogger("weasyprint").setLevel(logging.ERROR)
+    if warm_up:
+        try:
+            preload()
+        except Exception as exc:
+            logger.warning("PDF-Renderer %s: Vorladen fehlgeschlagen: %s", index, exc)
+    render = render or _render_locally
+    conn.send(("ready", None, None, None))
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        task_id, html, base_url, options = task
+        started = time.perf_counter()
+        try:
+            data = render(html, base_url=base_url, **options)
+        except Exception as exc:
+            conn.send(("error", task_id, f"{type(exc).__name__}: {exc}", time.perf_counter() - started))
+        else:
+            conn.send(("done", task_id, bytes(data), time.perf_counter() - started))
+
+
+class _Worker:
+    __slots__ = ("index", "proc", "conn", "ready", "task_id")
+
+    def __init__(self, index: int, proc: Any, conn: Any):
+        self.index = index
+        self.proc = proc
+        self.conn = conn
+        self.ready = False
+        # Auftrag, den der Prozess gerade rendert
+        self.task_id: Optional[int] = None
+
+
+class PdfRenderPool:
+    """Langlebige Render-Prozesse, die HTML-Dokumente über eine Queue annehmen.
+
+    Die Prozesse werden mit ``spawn`` gestartet (kein Fork des Server-Prozesses
+    mit seinen Threads) und beim Start vorgeladen. Jeder Prozess hat eine eigene
+    Pipe; die Warteschlange liegt im Elternprozess, der freie Prozesse bedient.
+    Fällt ein Prozess aus, endet sein laufender Auftrag mit `PdfRenderError`
+    und er wird ersetzt – die übrigen Prozesse sind davon nicht betroffen.
+    """
+
+    def __init__(self, workers: int, render: Optional[Callable[..., bytes]] = None, warm_up: bool = True):
+        self.workers = max(1, int(workers))
+        self.render_func = render
+        self.warm_up = warm_up
+        self.pid = os.getpid()
+        self._ctx = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._slots: List[_Worker] = []
+        self._backlog: Deque[tuple] = deque()
+        self._collector: Optional[threading.Thread] = None
+        self._closed = False
+        self._ids = itertools.count(1)
+        self._futures: Dict[int, Future] = {}
+        self.ready = 0
+        self.rendered = 0
+        self.failed = 0
+        self.render_seconds = 0.0
+        # Zeit, in der mindestens ein Auftrag offen war (Basis für PDFs/Minute).
+        self.busy_seconds = 0.0
+        self._busy_since: Optional[float] = None
+
+    def _spawn(self, index: int) -> _Worker:
+        parent_conn, child_conn = self._ctx.Pipe()
+        proc = self._ctx.Process(
+            target=_worker_main,
+            args=(index, child_conn, self.render_func, self.warm_up),
+            name=f"pdf-render-{index}",
+            daemon=True,
+        )
+        proc.start()
+        child_conn.close()
+        return _Worker(index, proc, parent_conn)
+
+    def start(self) -> None:
+        with self._lock:
+            if self._slots or self._closed:
+                return
+            self._slots = [self._spawn(index) for index in range(self.workers)]
+            self._collector = threading.Thread(target=self._collect, name="pdf-render-results", daemon=True)
+            self._collector.start()
+
+    def submit(self, html: str, base_url: Optional[str] = None, **options: Any) -> Future:
+        """Reiht ein Dokument ein; das Future liefert die PDF-Bytes."""
+        self.start()
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise PdfRenderError("PDF-Render-Pool ist geschlossen")
+            task_id = next(self._ids)
+            if not self._futures:
+                self._busy_since = time.perf_counter()
+            self._futures[task_id] = future
+            self._backlog.append((task_id, html, base_url, options))
+            self._dispatch_locked()
+        return future
+
+    def render(self, html: str, base_url: Optional[str] = None, timeout: Optional[float] = None, **options: Any) -> bytes:
+        return self.submit(html, base_url=base_url, **options).result(timeout)
+
+    def _dispatch_locked(self) -> None:
+        for slot in self._slots:
+            if not self._backlog:
+                return
+            if not slot.ready or slot.task_id is not None:
+                continue
+            task = self._backlog.popleft()
+            try:
+                slot.conn.send(task)
+            except (OSError, ValueError):
+                # Prozess ist weg; der Collector ersetzt ihn, der Auftrag wartet weiter.
+                self._backlog.appendleft(task)
+                slot.ready = False
+                continue
+            slot.task_id = task[0]
+
+    def _finish(self, task_id: int, result: Any = None, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            future = self._futures.pop(task_id, None)
+            if not self._futures and self._busy_since is not None:
+                self.busy_seconds += time.perf_counter() - self._busy_since
+                self._busy_since = None
+        if future is None:
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _collect(self) -> None:
+        while not self._closed:
+            with self._lock:
+                conns = {slot.conn: slot for slot in self._slots}
+            for conn in multiprocessing.connection.wait(list(conns), timeout=1.0):
+                slot = conns[conn]
+                try:
+                    kind, task_id, payload, seconds = conn.recv()
+                except (EOFError, OSError):
+                    self._replace(slot)
+                    continue
+                if kind == "ready":
+                    self.ready += 1
+                    with self._lock:
+                        slot.ready = True
+                elif kind in ("done", "error"):
+                    with self._lock:
+                        slot.task_id = None
+                    if kind == "done":
+                        self.rendered += 1
+                        self.render_seconds += seconds
+                        self._finish(task_id, result=payload)
+                    else:
+                        self.failed += 1
+                        self._finish(task_id, error=PdfRenderError(payload))
+                with self._lock:
+                    self._dispatch_locked()
+
+    def _replace(self, slot: _Worker) -> None:
+        slot.proc.join(1)
+        if self._closed:
+            return
+        if slot.task_id is not None:
+            self.failed += 1
+            self._finish(
+                slot.task_id,
+                error=PdfRenderError(f"PDF-Renderer {slot.index} beendet (exitcode={slot.proc.exitcode})"),
+            )
+        logger.warning("PDF-Renderer %s beendet (exitcode=%s), starte neu", slot.index, slot.proc.exitcode)
+        slot.conn.close()
+        replacement = self._spawn(slot.index)
+        with self._lock:
+            self._slots[slot.index] = replacement
+
+    def stats(self) -> Dict[str, float]:
+        """Prozesse, gerenderte/fehlgeschlagene PDFs, mittlere Renderzeit und PDFs pro Minute."""
+        with self._lock:
+            busy = self.busy_seconds
+            if self._busy_since is not None:
+                busy += time.perf_counter() - self._busy_since
+            pending = len(self._futures)
+        return {
+            "workers": self.workers,
+            "ready": self.ready,
+            "pending": pending,
+            "rendered": self.rendered,
+            "failed": self.failed,
+            "mean_ms": (self.render_seconds / self.rendered * 1000.0) if self.rendered else 0.0,
+            "pdfs_per_minute": (self.rendered / busy * 60.0) if busy > 0 else 0.0,
+        }
+
+    def close(self, timeout: float = 5.0) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            slots = list(self._slots)
+        for slot in slots:
+            try:
+                slot.conn.send(None)
+            except (OSError, ValueError):
+                pass
+        for slot in slots:
+            slot.proc.join(timeout)
+            if slot.proc.is_alive():
+                slot.proc.terminate()
+                slot.proc.join(1)
+        with self._lock:
+            pending = list(self._futures)
+        for task_id in pending:
+            self._finish(task_id, error=PdfRenderError("PDF-Render-Pool wurde geschlossen"))
+        for slot in slots:
+            slot.conn.close()
+
+
+_pool: Optional[PdfRenderPool] = None
+_pool_lock = threading.Lock()
+
+
+def _pool_wanted() -> bool:
+    if render_workers() <= 0:
+        return False
+    try:
+        import streamlit as st
+
+        return bool(st.runtime.exists())
+    except Exception:
+        return False
+
+
+def get_render_pool() -> Optional[PdfRenderPool]:
+    """Pool dieses Server-Prozesses oder None (abgeschaltet, ohne App, geforktes Kind)."""
+    global _pool
+    if not _pool_wanted():
+        return None
+    with _pool_lock:
+        if _pool is not None and _pool.pid != os.getpid():
+            # Geforkter Prozess (z. B. Export-Job): der Pool gehört dem Elternprozess.
+            return None
+        if _pool is None:
+            _pool = PdfRenderPool(render_workers())
+        return _pool
+
+
+def render_pdf(html: str, *, base_url: Optional[str] = None, **write_kwargs: Any) -> bytes:
+    """Rendert ein HTML-Dokument zu PDF – im Render-Pool oder warm im eigenen Prozess."""
+    pool = get_render_pool()
+    if pool is not None:
+        try:
+            return pool.render(html, base_url=base_url, **write_kwargs)
+        except PdfRenderError:
+            raise
+        except OSError as exc:
+            logger.warning("PDF-Render-Pool nicht verfügbar, rendere im Prozess: %s", exc)
+    return _render_locally(html, base_url=base_url, **write_kwargs)
+
+
+def parallel_workers() -> int:
+    """Prozesse für parallel gerenderte Teildokumente (``MC_PDF_PARALLEL_WORKERS``)."""
+    try:
+        value = int(os.getenv("MC_PDF_PARALLEL_WORKERS", "0"))
+    except ValueError:
+        value = 0
+    return value if value > 0 else max(1, min(4, os.cpu_count() or 1))
+
+
+def render_pdfs(
+    documents: Sequence[str],
+    *,
+    base_url: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    on_done: Optional[Callable[[int], None]] = None,
+    **write_kwargs: Any,
+) -> List[bytes]:
+    """Rendert unabhängige Dokumente parallel; Ergebnis in Eingabereihenfolge.
+
+    In der App über den Render-Pool, sonst (Skripte, Export-Jobs) über
+    geforkte Kopien dieses vorgewärmten Prozesses; ohne ``fork`` seriell.
+    `on_done` erhält nach jedem fertigen Dokument die Anzahl der fertigen.
+    """
+    documents = list(documents)
+    results: List[Optional[bytes]] = [None] * len(documents)
+    pool = get_render_pool()
+    if pool is not None:
+        futures = {pool.submit(doc, base_url=base_url, **write_kwargs): i for i, doc in enumerate(documents)}
+    else:
+        workers = min(len(documents), max_workers or parallel_workers())
+        try:
+            ctx = multiprocessing.get_context("fork") if workers > 1 else None
+        except ValueError:
+            ctx = None
+        if ctx is None:
+            for i, doc in enumerate(documents):
+                results[i] = _render_locally(doc, base_url=base_url, **write_kwargs)
+                if on_done:
+                    on_done(i + 1)
+            return results  # type: ignore[return-value]
+        # Einmal hier laden, damit die geforkten Prozesse warm starten.
+        preload()
+        render = functools.partial(_render_locally, base_url=base_url, **write_kwargs)
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+        futures = {executor.submit(render, doc): i for i, doc in enumerate(documents)}
+        executor.shutdown(wait=False)
+    for done, future in enumerate(concurrent.futures.as_completed(futures), start=1):
+        results[futures[future]] = future.result()
+        if on_done:
+            on_done(done)
+    return results  # type: ignore[return-value]
+
+
+def pdf_merge_available() -> bool:
+    """True, wenn `pypdf` (optional) zum Zusammenführen installiert ist."""
+    return importlib.util.find_spec("pypdf") is not None
+
+
+def pdf_page_count(data: bytes) -> int:
+    from pypdf import PdfReader
+
+    return len(PdfReader(io.BytesIO(data)).pages)
+
+
+def merge_pdfs(parts: Sequence[bytes], overlay: Optional[bytes] = None) -> bytes:
+    """Hängt PDFs aneinander und legt Seite i von `overlay` über Seite i des Ergebnisses."""
+    from pypdf import PdfReader, PdfWriter
+
+    writer = PdfWriter()
+    for part in parts:
+        writer.append(PdfReader(io.BytesIO(part)))
+    if overlay:
+        stamps = PdfReader(io.BytesIO(overlay)).pages
+        if len(stamps) != len(writer.pages):
+            logger.warning("PDF-Overlay hat %s statt %s Seiten", len(stamps), len(writer.pages))
+        for page, stamp in zip(writer.pages, stamps):
+            page.merge_page(stamp)
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+class WarmHTML:
+    """Ersatz für ``weasyprint.HTML`` im Stil ``HTML(string=..., base_url=...).write_pdf(...)``."""
+
+    def __init__(self, string: str, base_url: Optional[str] = None):
+        self.string = string
+        self.base_url = base_url
+
+    def write_pdf(self, **write_kwargs: Any) -> bytes:
+        return render_pdf(self.string, base_url=self.base_url, **write_kwargs)
+
+
+def get_render_stats() -> Dict[str, Any]:
+    """Kennzahlen des Pools (falls aktiv) und des Renderers in diesem Prozess."""
+    stats: Dict[str, Any] = {"local": _local_renderer.stats() if _local_renderer is not None else None}
+    stats["pool"] = _pool.stats() if _pool is not None and _pool.pid == os.getpid() else None
+    return stats
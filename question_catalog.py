@@ -0,0 +1,260 @@
+"""Persistenter Metadaten-Katalog aller Fragensets.
+
+Der Katalog hält pro Datei (Kern-Sets in `data/`, temporäre Sets in
+`data-user/`) nur die Metadaten, die Listen- und Aufräum-Ansichten brauchen:
+Titel, Anzeigename, Anzahl Fragen, Schwierigkeitsprofil, Sprache, Testdauer,
+Uploader und mtime. Er liegt als JSON-Sidecar unter `var/question_catalog.json`
+und wird bei jedem Zugriff inkrementell aktualisiert: nur Dateien, deren mtime
+oder Größe sich geändert hat, werden neu geladen.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config import get_package_dir
+
+_CATALOG_VERSION = 1
+CATALOG_FILE = Path(
+    os.getenv("MC_QUESTION_CATALOG_FILE", os.path.join(get_package_dir(), "var", "question_catalog.json"))
+)
+
+_LOCK = threading.Lock()
+# Im Prozess gehaltene Kopie des Sidecars: {pfad: QuestionSetEntry}
+_ENTRIES: Dict[str, "QuestionSetEntry"] | None = None
+
+
+def _after_fork_in_child() -> None:
+    # Ein beim fork() gehaltener Lock würde im Kind nie freigegeben.
+    global _LOCK
+    _LOCK = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+@dataclass
+class QuestionSetEntry:
+    """Metadaten eines Fragensets ohne Fragentexte."""
+
+    identifier: str
+    filename: str
+    file_path: str
+    mtime_ns: int
+    size: int
+    is_user_set: bool
+    title: Optional[str] = None
+    label: Optional[str] = None
+    question_count: int = 0
+    difficulty_profile: Dict[str, Any] = field(default_factory=dict)
+    languages: List[str] = field(default_factory=list)
+    test_duration_minutes: Optional[float] = None
+    computed_test_duration_minutes: Optional[float] = None
+    uploaded_by: Optional[str] = None
+    uploaded_by_hash: Optional[str] = None
+    uploaded_at_raw: Optional[str] = None
+
+    @property
+    def path(self) -> Path:
+        return Path(self.file_path)
+
+    def get_test_duration_minutes(self, default_minutes: int) -> int:
+        """Wie `QuestionSet.get_test_duration_minutes`, aber ohne das Set zu laden."""
+        from config import _round_duration_minutes
+
+        for value in (self.test_duration_minutes, self.computed_test_duration_minutes):
+            if isinstance(value, (int, float)) and value > 0:
+                return _round_duration_minutes(value)
+        return _round_duration_minutes(default_minutes)
+
+    @property
+    def uploaded_at(self) -> Optional[datetime]:
+        if not isinstance(self.uploaded_at_raw, str):
+            return None
+        try:
+            return datetime.fromisoformat(self.uploaded_at_raw)
+        except ValueError:
+            return None
+
+
+def _languages_from_meta(meta: Dict[str, Any]) -> List[str]:
+    raw = meta.get("languages", meta.get("language"))
+    if isinstance(raw, str):
+        return [part.strip() for part in raw.split(",") if part.strip()]
+    if isinstance(raw, list):
+        return [str(part).strip() for part in raw if str(part).strip()]
+    return []
+
+
+def _entry_from_question_set(
+    question_set, identifier: str, path: Path, stat: os.stat_result, is_user_set: bool, label: str | None
+) -> QuestionSetEntry:
+    meta = question_set.meta if isinstance(question_set.meta, dict) else {}
+    uploaded_by = meta.get("uploaded_by") if isinstance(meta.get("uploaded_by"), str) else None
+    uploaded_by_hash = meta.get("uploaded_by_hash") if isinstance(meta.get("uploaded_by_hash"), str) else None
+    uploaded_at_raw = meta.get("uploaded_at") if isinstance(meta.get("uploaded_at"), str) else None
+    profile = meta.get("difficulty_profile")
+    explicit = meta.get("test_duration_minutes")
+    computed = meta.get("computed_test_duration_minutes")
+    return QuestionSetEntry(
+        identifier=identifier,
+        filename=path.name,
+        file_path=str(path),
+        mtime_ns=stat.st_mtime_ns,
+        size=stat.st_size,
+        is_user_set=is_user_set,
+        title=meta.get("title") if isinstance(meta.get("title"), str) else None,
+        label=label,
+        question_count=len(question_set),
+        difficulty_profile=dict(profile) if isinstance(profile, dict) else {},
+        languages=_languages_from_meta(meta),
+        test_duration_minutes=explicit if isinstance(explicit, (int, float)) else None,
+        computed_test_duration_minutes=computed if isinstance(computed, (int, float)) else None,
+        uploaded_by=uploaded_by,
+        uploaded_by_hash=uploaded_by_hash,
+        uploaded_at_raw=uploaded_at_raw,
+    )
+
+
+def _index_core_file(filename: str, path: Path, stat: os.stat_result) -> QuestionSetEntry:
+    from config import load_questions
+
+    question_set = load_questions(filename, silent=True)
+    return _entry_from_question_set(question_set, filename, path, stat, False, None)
+
+
+def _index_user_file(path: Path, stat: os.stat_result) -> QuestionSetEntry | None:
+    from user_question_sets import (
+        UserQuestionSetInfo,
+        _build_question_set,
+        _to_identifier,
+        ensure_meta_title,
+        format_user_label,
+    )
+
+    try:
+        with path.open("r", encoding="utf-8") as fh:
+            data = json.load(fh)
+        question_set = _build_question_set(data, path.name, silent=True)
+    except Exception:
+        return None
+    # Titel nur für die Anzeige ableiten; die Datei selbst bleibt unverändert.
+    ensure_meta_title(question_set, path.name)
+    identifier = _to_identifier(path.name)
+    entry = _entry_from_question_set(question_set, identifier, path, stat, True, None)
+    try:
+        entry.label = format_user_label(
+            UserQuestionSetInfo(
+                identifier=identifier,
+                filename=path.name,
+                path=path,
+                question_set=question_set,
+                uploaded_by=entry.uploaded_by,
+                uploaded_by_hash=entry.uploaded_by_hash,
+                uploaded_at=entry.uploaded_at,
+            )
+        )
+    except Exception:
+        entry.label = entry.title
+    return entry
+
+
+def _read_sidecar() -> Dict[str, QuestionSetEntry]:
+    try:
+        with CATALOG_FILE.open("r", encoding="utf-8") as fh:
+            raw = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(raw, dict) or raw.get("version") != _CATALOG_VERSION:
+        return {}
+    entries: Dict[str, QuestionSetEntry] = {}
+    for key, value in (raw.get("entries") or {}).items():
+        try:
+            entries[key] = QuestionSetEntry(**value)
+        except TypeError:
+            continue
+    return entries
+
+
+def _write_sidecar(entries: Dict[str, QuestionSetEntry]) -> None:
+    payload = {"version": _CATALOG_VERSION, "entries": {key: asdict(entry) for key, entry in entries.items()}}
+    tmp_path = CATALOG_FILE.with_name(f"{CATALOG_FILE.name}.{os.getpid()}.tmp")
+    try:
+        CATALOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, CATALOG_FILE)
+    except OSError:
+        # Best-effort: ohne beschreibbares var/ bleibt der Katalog nur im Speicher.
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
+def _scan_sources() -> List[tuple[str, Path, bool]]:
+    # Lokale Imports: Tests und Upload-Flows patchen die Pfad-Helfer zur Laufzeit.
+    from config import get_package_dir, list_question_files
+    from user_question_sets import _iter_user_files, _to_identifier
+
+    sources: List[tuple[str, Path, bool]] = []
+    data_dir = Path(get_package_dir()) / "data"
+    for filename in list_question_files():
+        sources.append((filename, data_dir / filename, False))
+    for path in _iter_user_files():
+        sources.append((_to_identifier(path.name), path, True))
+    return sources
+
+
+def refresh_catalog() -> Dict[str, QuestionSetEntry]:
+    """Gleicht den Katalog mit dem Dateisystem ab und liefert {identifier: Eintrag}.
+
+    Unveränderte Dateien (gleiche mtime und Größe) werden nicht geöffnet.
+    """
+    global _ENTRIES
+    with _LOCK:
+        if _ENTRIES is None:
+            _ENTRIES = _read_sidecar()
+        previous = _ENTRIES
+        current: Dict[str, QuestionSetEntry] = {}
+        changed = False
+        for identifier, path, is_user_set in _scan_sources():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            key = str(path)
+            entry = previous.get(key)
+            if entry is None or entry.mtime_ns != stat.st_mtime_ns or entry.size != stat.st_size:
+                if is_user_set:
+                    entry = _index_user_file(path, stat)
+                else:
+                    entry = _index_core_file(identifier, path, stat)
+                changed = True
+                if entry is None:
+                    continue
+            current[key] = entry
+        if changed or current.keys() != previous.keys():
+            _write_sidecar(current)
+        _ENTRIES = current
+        return {entry.identifier: entry for entry in current.values()}
+
+
+def get_core_entries() -> List[QuestionSetEntry]:
+    """Katalogeinträge der Kern-Fragensets, sortiert wie `list_question_files`."""
+    return [entry for entry in refresh_catalog().values() if not entry.is_user_set]
+
+
+def get_user_entries() -> List[QuestionSetEntry]:
+    """Katalogeinträge der temporären Nutzer-Fragensets."""
+    return [entry for entry in refresh_catalog().values() if entry.is_user_set]
+
+
+def get_entry(identifier: str) -> Optional[QuestionSetEntry]:
+    return refresh_catalog().get(identifier)
+
@@ -0,0 +1,213 @@
+"""Fragment-Rendering und Server-CPU pro Interaktion.
+
+`run_fragment` führt einen UI-Abschnitt als `st.fragment` aus. Widgets darin
+lösen dann nur einen Rerun dieses Abschnitts aus statt eines kompletten
+Durchlaufs von `app.main` (Sidebar, Styles, Leaderboard-Prüfungen, Frage).
+Aktionen, die auch andere Teile betreffen, rufen wie bisher `st.rerun()` auf
+und laufen damit als voller App-Rerun weiter. `MC_FRAGMENTS=0` schaltet auf
+direkte Aufrufe zurück; ohne Streamlit-Runtime (Tests, Skripte) wird der
+Abschnitt immer direkt ausgeführt.
+
+Messung: Ist ``MC_RENDER_PROFILE_FILE`` gesetzt, wird pro Nutzer-Interaktion
+eine JSON-Zeile mit der Server-CPU-Zeit (``time.thread_time``) angehängt.
+Läufe, die per `st.rerun()` aufeinander folgen, werden zu einer Interaktion
+zusammengefasst. Zusätzlich wird die Größe der an den Browser gesendeten
+Deltas gezählt (``delta_bytes``, serialisierte ForwardMsgs dieses Laufs).
+`tools/render_profile_report.py` wertet die Datei aus, getrennt nach
+``MC_FRAGMENTS`` an/aus.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Iterator
+
+import streamlit as st
+
+_CHAIN_KEY = "_render_profile_chain"
+_FILE_LOCK = threading.Lock()
+# Pro Script-Thread: laufender App-Durchlauf und Stapel aktiver Fragmente.
+_ACTIVE = threading.local()
+
+
+def fragments_enabled() -> bool:
+    """True, wenn Abschnitte als Fragmente laufen sollen (``MC_FRAGMENTS``)."""
+    if os.getenv("MC_FRAGMENTS", "1").strip().lower() in ("0", "false", "no", "off"):
+        return False
+    try:
+        return hasattr(st, "fragment") and bool(st.runtime.exists())
+    except Exception:
+        return False
+
+
+def in_fragment_rerun() -> bool:
+    """True innerhalb eines Fragments, das ohne vollen App-Lauf ausgeführt wird."""
+    return bool(getattr(_ACTIVE, "fragments", None)) and not getattr(_ACTIVE, "app_run", False)
+
+
+def rerun_fragment() -> None:
+    """Rerun des aktuellen Fragments; sonst (voller Lauf, keine Fragmente) der App."""
+    if in_fragment_rerun():
+        st.rerun(scope="fragment")
+    else:
+        st.rerun()
+
+
+def run_fragment(name: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Führt `func` als Fragment aus (oder direkt, wenn Fragmente aus sind).
+
+    Streamlit hält die Argumente des letzten vollen Laufs fest und verwendet sie
+    für Fragment-Reruns wieder; `func` muss veränderlichen Zustand daher aus
+    `st.session_state` lesen.
+    """
+    return _run_fragment(name, None, func, args, kwargs)
+
+
+def poll_fragment(name: str, interval: float, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Wie `run_fragment`, der Abschnitt läuft zusätzlich alle `interval` Sekunden neu.
+
+    Für Statusanzeigen von Hintergrundarbeit; ohne Fragmente nur ein Aufruf.
+    """
+    return _run_fragment(name, interval, func, args, kwargs)
+
+
+def _run_fragment(name: str, run_every: Any, func: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+    if not fragments_enabled():
+        return func(*args, **kwargs)
+
+    # Die Fragment-ID leitet sich aus Modul und Name der Funktion ab.
+    @wraps(func)
+    def body(*inner_args: Any, **inner_kwargs: Any) -> Any:
+        stack = _ACTIVE.__dict__.setdefault("fragments", [])
+        stack.append(name)
+        try:
+            if getattr(_ACTIVE, "app_run", False):
+                return func(*inner_args, **inner_kwargs)
+            # Fragment-Rerun: eigene Interaktion messen.
+            with _measure(f"fragment:{name}"):
+                return func(*inner_args, **inner_kwargs)
+        finally:
+            stack.pop()
+
+    if run_every is None:
+        return st.fragment(body)(*args, **kwargs)
+    return st.fragment(body, run_every=run_every)(*args, **kwargs)
+
+
+@contextmanager
+def measure_app_run() -> Iterator[None]:
+    """Umschließt einen vollständigen Durchlauf von `app.main`."""
+    _ACTIVE.app_run = True
+    try:
+        with _measure("app"):
+            yield
+    finally:
+        _ACTIVE.app_run = False
+
+
+@contextmanager
+def _measure(kind: str) -> Iterator[None]:
+    path = os.getenv("MC_RENDER_PROFILE_FILE")
+    if not path:
+        yield
+        return
+    cpu_start = time.thread_time()
+    wall_start = time.perf_counter()
+    chained = False
+    with _count_delta_bytes() as delta:
+        try:
+            yield
+        except BaseException as exc:
+            # st.rerun(): der Folgelauf gehört noch zur selben Interaktion.
+            chained = type(exc).__name__ == "RerunException"
+            raise
+        finally:
+            _record(
+                path,
+                kind,
+                (time.thread_time() - cpu_start) * 1000.0,
+                (time.perf_counter() - wall_start) * 1000.0,
+                chained,
+                delta,
+            )
+
+
+def _script_run_ctx() -> Any:
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except Exception:
+        return None
+    return get_script_run_ctx(suppress_warning=True)
+
+
+@contextmanager
+def _count_delta_bytes() -> Iterator[dict]:
+    """Zählt die ForwardMsgs, die der laufende Script-Thread an den Browser sendet.
+
+    Gezählt wird nach Streamlits Nachrichten-Cache (bereits gecachte Elemente
+    gehen nur als Referenz raus), also die tatsächlich serialisierte Größe vor
+    der Websocket-Kompression.
+    """
+    delta = {"bytes": 0, "msgs": 0}
+    ctx = _script_run_ctx()
+    original = getattr(ctx, "_enqueue", None)
+    if original is None:
+        yield delta
+        return
+
+    def _counting_enqueue(msg: Any) -> None:
+        try:
+            delta["bytes"] += msg.ByteSize()
+            delta["msgs"] += 1
+        except Exception:
+            pass
+        original(msg)
+
+    ctx._enqueue = _counting_enqueue
+    try:
+        yield delta
+    finally:
+        ctx._enqueue = original
+
+
+def _record(path: str, kind: str, cpu_ms: float, wall_ms: float, chained: bool, delta: dict) -> None:
+    try:
+        state = st.session_state
+        chain = state.get(_CHAIN_KEY) or {
+            "kind": kind, "runs": 0, "cpu_ms": 0.0, "wall_ms": 0.0, "delta_bytes": 0, "delta_msgs": 0,
+        }
+        chain["runs"] += 1
+        chain["cpu_ms"] += cpu_ms
+        chain["wall_ms"] += wall_ms
+        chain["delta_bytes"] = chain.get("delta_bytes", 0) + delta["bytes"]
+        chain["delta_msgs"] = chain.get("delta_msgs", 0) + delta["msgs"]
+        if chained:
+            state[_CHAIN_KEY] = chain
+            return
+        state.pop(_CHAIN_KEY, None)
+    except Exception:
+        chain = {
+            "kind": kind, "runs": 1, "cpu_ms": cpu_ms, "wall_ms": wall_ms,
+            "delta_bytes": delta["bytes"], "delta_msgs": delta["msgs"],
+        }
+    line = json.dumps(
+        {
+            "ts": round(time.time(), 3),
+            "fragments": fragments_enabled(),
+            "kind": chain["kind"],
+            "runs": chain["runs"],
+            "cpu_ms": round(chain["cpu_ms"], 3),
+            "wall_ms": round(chain["wall_ms"], 3),
+            "delta_bytes": chain["delta_bytes"],
+            "delta_msgs": chain["delta_msgs"],
+        }
+    )
+    try:
+        with _FILE_LOCK, open(path, "a", encoding="utf-8") as fh:
+            fh.write(line + "\n")
+    except OSError:
+        pass
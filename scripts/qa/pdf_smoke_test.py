@@ -3,6 +3,7 @@ import pdf_export
 from pdf_export import generate_pdf_report
 import streamlit as st
 from i18n.context import set_locale
+from helpers.run_state import start_test_run
 
 
 def _make_question(idx: int, text: str, options, correct_idx: int):
@@ -35,10 +36,10 @@ if not hasattr(st, 'session_state'):
     st.session_state = {}
 
 st.session_state.clear()
+run = start_test_run(st.session_state, len(questions))
 for i, q in enumerate(questions):
     # mark question as answered and set the stored answer to the correct option
-    st.session_state[f"frage_{i}_beantwortet"] = q.get("gewichtung", 1)
-    st.session_state[f"frage_{i}_antwort"] = q["optionen"][q["loesung"]]
+    run.record_answer(i, q.get("gewichtung", 1), q["optionen"][q["loesung"]])
 
 st.session_state["selected_questions_file"] = "questions_test.json"
 st.session_state["user_id"] = "smoketester"
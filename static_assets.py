@@ -0,0 +1,146 @@
+"""Statische CSS-/JS-Assets mit Inhalts-Hash.
+
+Die großen Style- und Script-Blöcke der Oberfläche (Theme, Toasts,
+Fragenansicht, Willkommensseite, Scroll-Manager, Badge-Sync) liegen als
+Dateien unter ``assets/``. Beim ersten Zugriff im Prozess wird jede Datei als
+``static/build/<name>.<hash>.<ext>`` veröffentlicht und über Streamlits Static
+Serving (``server.enableStaticServing``) unter ``app/static/build/...``
+ausgeliefert. Der Hash im Dateinamen wechselt mit dem Inhalt; der Browser lädt
+jede Version einmal und nimmt danach seinen Cache. Das Modul liefert nur das
+Markup; ausgegeben wird es von den Aufrufern (`st.html`).
+
+- CSS (`stylesheet_html`): Pro Durchlauf geht nur ``<style>@import url(...)</style>``
+  über den Websocket statt des ganzen Stylesheets. Das Element folgt dem
+  normalen Streamlit-Lebenszyklus – wird es nicht mehr ausgegeben, gelten die
+  Styles wie bisher nicht mehr.
+- JS (`script_html`): Die Skripte installieren sich idempotent im Fenster. Ein
+  kurzer Loader hängt die Datei einmal pro Seite an ``document.head``.
+
+Ohne Static Serving oder mit ``MC_STATIC_ASSETS=0`` wird CSS wie bisher inline
+ausgegeben, Skripte inline einmal pro Session.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, MutableMapping, Optional
+
+import streamlit as st
+
+ASSET_DIR = Path(__file__).resolve().parent / "assets"
+BUILD_DIR = Path(__file__).resolve().parent / "static" / "build"
+URL_PREFIX = "app/static/build/"
+
+_LOCK = threading.Lock()
+_SOURCES: dict[str, str] = {}
+# Asset-Name -> URL der veröffentlichten Datei (None: Veröffentlichen fehlgeschlagen).
+_PUBLISHED: dict[str, Optional[str]] = {}
+
+
+def static_assets_enabled() -> bool:
+    """True, wenn Assets als Dateien ausgeliefert werden können (``MC_STATIC_ASSETS``)."""
+    if os.getenv("MC_STATIC_ASSETS", "1").strip().lower() in ("0", "false", "no", "off"):
+        return False
+    try:
+        return bool(st.runtime.exists()) and bool(st.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+
+def asset_source(name: str) -> str:
+    """Inhalt von ``assets/<name>`` (pro Prozess einmal gelesen)."""
+    text = _SOURCES.get(name)
+    if text is None:
+        text = (ASSET_DIR / name).read_text(encoding="utf-8")
+        _SOURCES[name] = text
+    return text
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]
+
+
+def asset_url(name: str) -> Optional[str]:
+    """Veröffentlicht ``assets/<name>`` mit Hash im Namen und liefert die URL."""
+    with _LOCK:
+        if name in _PUBLISHED:
+            return _PUBLISHED[name]
+        url = None
+        try:
+            text = asset_source(name)
+            stem, ext = os.path.splitext(name)
+            filename = f"{stem}.{content_hash(text)}{ext}"
+            target = BUILD_DIR / filename
+            if not target.exists():
+                BUILD_DIR.mkdir(parents=True, exist_ok=True)
+                tmp_path = target.with_name(f".{filename}.{os.getpid()}.tmp")
+                tmp_path.write_text(text, encoding="utf-8")
+                os.replace(tmp_path, target)
+                _remove_stale_versions(stem, ext, keep=filename)
+            url = URL_PREFIX + filename
+        except OSError as exc:
+            print(f"Static-Asset {name} konnte nicht veröffentlicht werden: {exc}")
+        _PUBLISHED[name] = url
+        return url
+
+
+def _remove_stale_versions(stem: str, ext: str, keep: str) -> None:
+    for path in BUILD_DIR.glob(f"{stem}.*{ext}"):
+        if path.name != keep:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def reset_assets() -> None:
+    """Vergisst gelesene und veröffentlichte Assets (Tests, geänderte Dateien)."""
+    with _LOCK:
+        _SOURCES.clear()
+        _PUBLISHED.clear()
+
+
+def stylesheet_html(name: str) -> str:
+    """Markup für das Stylesheet `name` in diesem Durchlauf."""
+    url = asset_url(name) if static_assets_enabled() else None
+    if url:
+        return f'<style>@import url("{url}");</style>'
+    return f"<style>\n{asset_source(name)}</style>"
+
+
+def script_html(name: str, state: Optional[MutableMapping[str, Any]] = None) -> Optional[str]:
+    """Markup, das das Script `name` auf der Seite installiert.
+
+    Mit Static Serving ist das bei jedem Aufruf nur ein Loader, der die Datei
+    lädt, falls sie noch nicht auf der Seite ist. Inline wird das Script einmal
+    pro Session (`state`) geliefert, danach None.
+    """
+    url = asset_url(name) if static_assets_enabled() else None
+    if url:
+        return _loader_html(name, url)
+    if state is not None:
+        session_key = f"_mc_asset_script_{name}"
+        try:
+            if state.get(session_key):
+                return None
+            state[session_key] = True
+        except Exception:
+            pass
+    return f"<script>\n{asset_source(name)}</script>"
+
+
+def _loader_html(name: str, url: str) -> str:
+    selector = json.dumps(f'script[data-mc-asset="{name}"]')
+    return (
+        "<script>(() => {"
+        "const doc = window.document;"
+        f"if (doc.querySelector({selector})) return;"
+        "const el = doc.createElement('script');"
+        f"el.src = new URL({json.dumps(url)}, doc.baseURI).href;"
+        f"el.dataset.mcAsset = {json.dumps(name)};"
+        "doc.head.appendChild(el);"
+        "})();</script>"
+    )
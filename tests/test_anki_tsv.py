@@ -1,6 +1,9 @@
 import json
 import csv
 import io
+
+import pytest
+
 from exporters.anki_tsv import transform_to_anki_tsv
 
 
@@ -184,3 +187,44 @@ def test_apkg_css_scopes_answer_option_markers_to_outer_list():
 
     assert ".options > ol.answer-options > li::before" in _ANKI_CARD_CSS
     assert ".options ol li::before" not in _ANKI_CARD_CSS
+
+
+def _apkg_collection(package, tmp_path):
+    import sqlite3
+    import zipfile
+
+    with zipfile.ZipFile(package) as archive:
+        assert sorted(archive.namelist()) == ["collection.anki2", "media"]
+        db_path = tmp_path / "collection.anki2"
+        db_path.write_bytes(archive.read("collection.anki2"))
+    conn = sqlite3.connect(db_path)
+    try:
+        decks = json.loads(conn.execute("SELECT decks FROM col").fetchone()[0])
+        cards = conn.execute("SELECT did, COUNT(*) FROM cards GROUP BY did").fetchall()
+    finally:
+        conn.close()
+    names = {int(deck_id): deck["name"] for deck_id, deck in decks.items()}
+    return names, {names[did]: count for did, count in cards}
+
+
+def test_apkg_bulk_export_builds_deck_hierarchy_in_one_package(tmp_path, monkeypatch):
+    pytest.importorskip("genanki")
+    import export_jobs
+
+    second = make_sample_json()
+    second["meta"]["title"] = "Zweiter Test"
+    (tmp_path / "a.json").write_text(json.dumps(make_sample_json()), encoding="utf-8")
+    (tmp_path / "b.json").write_text(json.dumps(second), encoding="utf-8")
+    monkeypatch.setattr(export_jobs, "_resolve_json_source", lambda name: tmp_path / name)
+
+    with export_jobs.open_anki_apkg_bulk(["a.json", "b.json"], "de", parent_title="Kurs") as package:
+        assert package.tell() == 0
+        names, cards = _apkg_collection(package, tmp_path)
+
+    assert {"Kurs", "Kurs::Beispieltest", "Kurs::Zweiter Test"} <= set(names.values())
+    count = len(second["questions"])
+    assert cards == {"Kurs::Beispieltest": count, "Kurs::Zweiter Test": count}
+
+    single = export_jobs.generate_anki_apkg("a.json", "de")
+    _, cards = _apkg_collection(io.BytesIO(single), tmp_path)
+    assert cards == {"Beispieltest": count}
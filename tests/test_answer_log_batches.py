@@ -0,0 +1,80 @@
+import functools
+from datetime import datetime, timezone
+
+import database
+
+
+def _setup_db(monkeypatch, tmp_path):
+    db_file = str(tmp_path / "mc_test_data.db")
+    monkeypatch.setattr(database, "DATABASE_FILE", db_file)
+    database.init_database()
+
+    conn = database.get_db_connection()
+    with database.db_write_transaction(conn):
+        for user_id, pseudonym in (("hash_alice", "Alice"), ("hash_bob", "Bob")):
+            conn.execute("INSERT INTO users (user_id, user_pseudonym) VALUES (?, ?)", (user_id, pseudonym))
+
+    s_a = database.start_test_session("hash_alice", "qset_a", tempo="normal")
+    s_b = database.start_test_session("hash_bob", "qset_b", tempo="speed")
+    for nr in range(1, 4):
+        database.save_answer(s_a, nr, f"A{nr}", 1, True)
+        database.save_answer(s_b, nr, f"B{nr}", 0, False)
+    database.update_bookmarks(s_a, [2])
+
+    with database.db_write_transaction(conn):
+        for session_id, day in ((s_a, "2026-01-01"), (s_b, "2026-02-01")):
+            conn.execute(
+                "UPDATE answers SET timestamp = ? || ' 10:00:0' || question_nr WHERE session_id = ?",
+                (day, session_id),
+            )
+    return s_a, s_b
+
+
+def _rows(batches):
+    rows = []
+    for batch in batches:
+        assert set(batch) == set(database.ANSWER_LOG_COLUMNS)
+        rows.extend(dict(zip(batch, values)) for values in zip(*batch.values()))
+    return rows
+
+
+def test_answer_log_batches_push_filters_into_sql(monkeypatch, tmp_path):
+    _setup_db(monkeypatch, tmp_path)
+
+    rows = _rows(database.iter_answer_log_batches(questions_file="qset_a"))
+    assert [r["antwort"] for r in rows] == ["A1", "A2", "A3"]
+    assert [r["markiert"] for r in rows] == [0, 1, 0]
+    assert {r["user_id_plain"] for r in rows} == {"Alice"}
+
+    assert {r["questions_file"] for r in _rows(database.iter_answer_log_batches(tempo="speed"))} == {"qset_b"}
+
+    since = datetime(2026, 1, 15, tzinfo=timezone.utc)
+    assert len(_rows(database.iter_answer_log_batches(since=since))) == 3
+    assert len(_rows(database.iter_answer_log_batches(until="2026-01-01 10:00:02"))) == 1
+
+    assert database.get_answer_counts_by_questions_file() == {"qset_a": 3, "qset_b": 3}
+
+
+def test_answer_log_batches_respect_batch_size(monkeypatch, tmp_path):
+    _setup_db(monkeypatch, tmp_path)
+
+    batches = list(database.iter_answer_log_batches(batch_size=4))
+    assert [len(b["frage_nr"]) for b in batches] == [4, 2]
+
+    # The legacy list-of-dicts API is built from the same batches.
+    assert database.get_all_answer_logs() == _rows(batches)
+
+
+def test_admin_csv_export_is_built_from_batches(monkeypatch, tmp_path):
+    import admin_panel
+
+    _setup_db(monkeypatch, tmp_path)
+    # Small batches: the header must be written once, not per batch.
+    monkeypatch.setattr(
+        admin_panel, "iter_answer_log_batches", functools.partial(database.iter_answer_log_batches, batch_size=2)
+    )
+
+    lines = admin_panel.build_answer_log_csv("qset_a").read().decode("utf-8").splitlines()
+    assert lines[0].split(",") == list(database.ANSWER_LOG_COLUMNS)
+    assert [line.split(",")[4] for line in lines[1:]] == ["A1", "A2", "A3"]
+    assert len(admin_panel.build_answer_log_csv().read().decode("utf-8").splitlines()) == 7
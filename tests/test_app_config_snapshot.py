@@ -0,0 +1,73 @@
+import json
+import os
+
+import pytest
+
+import config
+
+
+@pytest.fixture
+def config_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "get_package_dir", lambda: str(tmp_path))
+    monkeypatch.setattr(config, "_APP_CONFIG_SNAPSHOT", None)
+    for key in config._APP_CONFIG_ENV_KEYS:
+        monkeypatch.delenv(key, raising=False)
+    yield tmp_path
+    config._APP_CONFIG_SNAPSHOT = None
+
+
+def _write_config(directory, **values):
+    path = directory / "mc_test_config.json"
+    path.write_text(json.dumps(values), encoding="utf-8")
+    return path
+
+
+def test_snapshot_is_shared_until_something_changes(config_dir, monkeypatch):
+    first = config.get_app_config()
+    assert config.get_app_config() is first
+
+    monkeypatch.setenv("MC_TEST_DURATION_MINUTES", "42")
+    second = config.get_app_config()
+    assert second is not first
+    assert second.test_duration_minutes == 42
+
+
+def test_snapshot_reloads_after_config_file_change(config_dir):
+    path = _write_config(config_dir, scoring_mode="positive_only")
+    first = config.get_app_config()
+    assert first.scoring_mode == "positive_only"
+
+    _write_config(config_dir, scoring_mode="negative")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+    second = config.get_app_config()
+    assert second is not first
+    assert second.scoring_mode == "negative"
+
+
+def test_snapshot_reloads_after_secrets_change(config_dir):
+    first = config.get_app_config()
+    config._on_secrets_changed()
+    assert config.get_app_config() is not first
+
+
+def test_snapshot_is_immutable_and_copy_is_not(config_dir):
+    snapshot = config.get_app_config()
+    original = snapshot.scoring_mode
+    with pytest.raises(AttributeError):
+        snapshot.scoring_mode = "negative"
+
+    clone = snapshot.copy(scoring_mode="negative")
+    clone.show_top5_public = not snapshot.show_top5_public
+    assert clone.scoring_mode == "negative"
+    assert snapshot.scoring_mode == original
+
+
+def test_save_publishes_snapshot_and_keeps_other_keys(config_dir):
+    path = _write_config(config_dir, scoring_mode="positive_only", custom_key="keep")
+    config.get_app_config().copy(scoring_mode="negative").save()
+
+    stored = json.loads(path.read_text(encoding="utf-8"))
+    assert stored["scoring_mode"] == "negative"
+    assert stored["custom_key"] == "keep"
+    assert config.get_app_config().scoring_mode == "negative"
@@ -0,0 +1,83 @@
+import json
+import os
+
+import pytest
+
+import config
+
+
+@pytest.fixture
+def question_file(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    path = data_dir / "questions_compiled.json"
+    payload = {
+        "meta": {"title": "Compiled"},
+        "questions": [
+            {"question": "What is <b>2+2</b>?<script>x</script>", "options": ["3", "4"], "answer": 1, "weight": 1},
+            {"question": "Solve $a<b$", "options": ["x", "y"], "answer": 0, "weight": 2},
+        ],
+    }
+    path.write_text(json.dumps(payload), encoding="utf-8")
+    monkeypatch.setattr(config, "get_package_dir", lambda: str(tmp_path))
+    monkeypatch.setattr(config, "COMPILED_QUESTIONS_DIR", tmp_path / "compiled")
+    monkeypatch.setenv("MC_QUESTIONS_CACHE", "1")
+    config.load_questions.clear()
+    yield path
+    config.load_questions.clear()
+
+
+def _load(name):
+    config.load_questions.clear()
+    return config.load_questions(name, silent=True)
+
+
+def _forbid_build(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("question set was rebuilt")
+
+    monkeypatch.setattr(config, "_build_question_set", fail)
+
+
+def test_compiled_cache_skips_rebuild(question_file, monkeypatch):
+    first = _load(question_file.name)
+    assert len(list((question_file.parent.parent / "compiled").iterdir())) == 1
+
+    _forbid_build(monkeypatch)
+    second = _load(question_file.name)
+    assert second.questions == first.questions
+    assert second.meta == first.meta
+    assert second.questions[1]["question"] == "2. Solve $a<b$"
+
+
+def test_compiled_cache_tracks_content_changes(question_file, monkeypatch):
+    _load(question_file.name)
+
+    # Same content, new mtime: revalidated via content hash without rebuilding.
+    stat = question_file.stat()
+    os.utime(question_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+    original_build = config._build_question_set
+    _forbid_build(monkeypatch)
+    assert len(_load(question_file.name)) == 2
+
+    # Changed content: rebuilt and stored again.
+    monkeypatch.setattr(config, "_build_question_set", original_build)
+    payload = json.loads(question_file.read_text(encoding="utf-8"))
+    payload["questions"].append({"question": "Third", "options": ["a", "b"], "answer": 0})
+    question_file.write_text(json.dumps(payload), encoding="utf-8")
+    assert len(_load(question_file.name)) == 3
+
+
+def test_compiled_cache_replays_sanitizer_warnings(question_file, monkeypatch):
+    emitted = []
+    monkeypatch.setattr(config, "_emit_question_set_warning", lambda key, default, params: emitted.append(key))
+
+    config.load_questions.clear()
+    config.load_questions(question_file.name)
+    assert "config.warning.html_sanitized" in emitted
+
+    emitted.clear()
+    _forbid_build(monkeypatch)
+    config.load_questions.clear()
+    config.load_questions(question_file.name)
+    assert "config.warning.html_sanitized" in emitted
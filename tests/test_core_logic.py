@@ -54,6 +54,7 @@ sys.modules["streamlit"] = mock_st
 # Jetzt können die Module der App sicher importiert werden.
 import config
 import logic
+from helpers.run_state import start_test_run
 
 
 # --- Test-Setup ---
@@ -237,9 +238,7 @@ def test_test_flow_and_completion(test_questions):
     # --- 1. Initialzustand ---
     # Arrange: Initialisiere den Session State für einen Testlauf.
     # Die Fixture `mock_session_state` hat `answer_outcomes` bereits initialisiert.
-    mock_st.session_state["frage_indices"] = list(range(len(test_questions)))
-    for i in range(len(test_questions)):
-        mock_st.session_state[f"frage_{i}_beantwortet"] = None
+    run = start_test_run(mock_st.session_state, len(test_questions))
 
     # Act & Assert: Zu Beginn ist der Test nicht beendet und die erste Frage ist dran.
     assert not logic.is_test_finished(test_questions)
@@ -250,9 +249,10 @@ def test_test_flow_and_completion(test_questions):
     logic.set_question_as_answered(frage_idx=0, punkte=1, antwort="2")
     logic.set_question_as_answered(frage_idx=1, punkte=0, antwort="München")
 
-    # Assert: Die `beantwortet`-Flags im Session State müssen gesetzt sein.
-    assert mock_st.session_state["frage_0_beantwortet"] == 1
-    assert mock_st.session_state["frage_1_beantwortet"] == 0
+    # Assert: Punkte und Antworten müssen im Testlauf stehen.
+    assert mock_st.session_state["test_run"] is run
+    assert run.points_list() == [1, 0]
+    assert logic.get_answer_for_question(1) == "München"
 
     # --- 3. Endzustand ---
     # Act & Assert: Nach Beantwortung aller Fragen ist der Test beendet.
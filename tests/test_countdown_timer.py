@@ -230,3 +230,47 @@ def test_expired_countdown_sets_session_state_and_reruns(monkeypatch):
     assert fake_st.session_state["test_end_time"] == now.to_pydatetime()
     assert fake_st.error_calls
     assert fake_st.rerun_called is True
+
+
+def _patch_texts(monkeypatch, fake_st):
+    monkeypatch.setattr(mv, "st", fake_st)
+    monkeypatch.setattr(mv, "_test_view_text", lambda _key, default=None: default or "")
+    monkeypatch.setattr(mv, "translate_ui", lambda _key, default=None: default or "")
+
+
+def test_countdown_uses_client_component_when_available(monkeypatch):
+    fake_st = _FakeStreamlit()
+    _patch_texts(monkeypatch, fake_st)
+    seeds = []
+    iframes = []
+    monkeypatch.setattr(mv, "_client_timer_available", lambda: True)
+    monkeypatch.setattr(mv, "_render_exam_timer_component", lambda seed, key: seeds.append((key, seed)))
+    monkeypatch.setattr(mv, "_render_countdown_component_html", iframes.append)
+
+    remaining = mv._render_countdown_timer_auto_refresh(
+        pd.Timestamp.now(), 120, remaining_questions=3, panic_threshold_seconds=15
+    )
+
+    assert remaining > 0
+    assert not iframes
+    key, seed = seeds[0]
+    assert key == "mc_exam_timer_countdown"
+    assert seed["limit_seconds"] == 120
+    assert seed["remaining_questions"] == 3
+    assert seed["texts"]["label"] == "⏳ Verbleibende Zeit"
+
+
+def test_countdown_falls_back_to_iframe_when_component_fails(monkeypatch):
+    fake_st = _FakeStreamlit()
+    _patch_texts(monkeypatch, fake_st)
+    iframes = []
+
+    def broken(seed, key):
+        raise RuntimeError("components unavailable")
+
+    monkeypatch.setattr(mv, "_client_timer_available", lambda: True)
+    monkeypatch.setattr(mv, "_render_exam_timer_component", broken)
+    monkeypatch.setattr(mv, "_render_countdown_component_html", iframes.append)
+
+    assert mv._render_countdown_timer_auto_refresh(pd.Timestamp.now(), 120) > 0
+    assert "initialRemainingSeconds" in iframes[0]
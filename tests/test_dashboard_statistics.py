@@ -0,0 +1,80 @@
+import database
+
+
+def _setup_db(monkeypatch, tmp_path):
+    db_file = str(tmp_path / "mc_test_data.db")
+    monkeypatch.setattr(database, "DATABASE_FILE", db_file)
+    database.init_database()
+    monkeypatch.setattr(database, "get_question_counts", lambda: {"qset_a": 2, "qset_b": 3})
+    database.invalidate_dashboard_statistics()
+
+
+def _set_timestamps(session_id, *timestamps):
+    conn = database.get_db_connection()
+    with database.db_write_transaction(conn):
+        for nr, ts in enumerate(timestamps, start=1):
+            conn.execute(
+                "UPDATE answers SET timestamp = ? WHERE session_id = ? AND question_nr = ?",
+                (ts, session_id, nr),
+            )
+
+
+def test_dashboard_statistics_aggregates_in_one_pass(monkeypatch, tmp_path):
+    _setup_db(monkeypatch, tmp_path)
+
+    # qset_a: one complete session (60 s), one partial session
+    s1 = database.start_test_session("user_1", "qset_a")
+    database.save_answer(s1, 1, "A", 1, True)
+    database.save_answer(s1, 2, "B", 1, True)
+    _set_timestamps(s1, "2026-01-01 10:00:00", "2026-01-01 10:01:00")
+    s2 = database.start_test_session("user_2", "qset_a")
+    database.save_answer(s2, 1, "A", 0, False)
+
+    # qset_b: one complete session (120 s), one session without answers
+    s3 = database.start_test_session("user_1", "qset_b")
+    for nr in (1, 2, 3):
+        database.save_answer(s3, nr, "X", 2, True)
+    _set_timestamps(s3, "2026-01-01 10:00:00", "2026-01-01 10:01:00", "2026-01-01 10:02:00")
+    database.start_test_session("user_3", "qset_b")
+
+    database.add_feedback(s1, 1, ["typo"])
+
+    stats = database.get_dashboard_statistics(max_age_seconds=0)
+
+    assert stats["total_tests"] == 3
+    assert stats["unique_users"] == 3
+    assert stats["total_feedback"] == 1
+    assert stats["avg_scores_by_qset"] == {
+        "qset_a": {"avg_score": 1.0, "test_count": 2},
+        "qset_b": {"avg_score": 6.0, "test_count": 1},
+    }
+    assert stats["avg_duration"] in (89, 90)  # JULIANDAY truncation
+    assert stats["completion_rate"] == 50.0
+
+
+def test_dashboard_statistics_are_cached_with_ttl(monkeypatch, tmp_path):
+    _setup_db(monkeypatch, tmp_path)
+    monkeypatch.setenv("MC_DASHBOARD_STATS_TTL_SECONDS", "60")
+
+    s1 = database.start_test_session("user_1", "qset_a")
+    database.save_answer(s1, 1, "A", 1, True)
+
+    calls = []
+    original = database._compute_dashboard_statistics
+
+    def counting(conn):
+        calls.append(1)
+        return original(conn)
+
+    monkeypatch.setattr(database, "_compute_dashboard_statistics", counting)
+
+    first = database.get_dashboard_statistics()
+    first["avg_scores_by_qset"].clear()  # callers get copies
+    second = database.get_dashboard_statistics()
+    assert len(calls) == 1
+    assert second["total_tests"] == 1
+    assert second["avg_scores_by_qset"]["qset_a"]["test_count"] == 1
+
+    database.start_test_session("user_2", "qset_a")
+    assert database.get_dashboard_statistics(max_age_seconds=0)["unique_users"] == 2
+    assert len(calls) == 2
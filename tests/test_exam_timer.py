@@ -0,0 +1,73 @@
+import pandas as pd
+
+import exam_timer
+
+
+TEXTS = {
+    "label": "Time left",
+    "expired": "Time is up",
+    "warning_seconds": "seconds",
+    "warning_minutes": "{minutes_text}",
+    "panic": "panic",
+}
+
+
+def test_timer_seed_is_stable_across_reruns():
+    start = pd.Timestamp("2026-06-13 10:00:00")
+    first = exam_timer.build_timer_seed(
+        start, 600, TEXTS, remaining_questions=5, panic_threshold_seconds=15, now=start + pd.Timedelta(seconds=30)
+    )
+    second = exam_timer.build_timer_seed(
+        start, 600, TEXTS, remaining_questions=5, panic_threshold_seconds=15, now=start + pd.Timedelta(seconds=90)
+    )
+
+    assert first["seed"] == second["seed"]
+    assert second["server_now_ms"] - second["start_ms"] == 90_000
+    assert first["report_events"] is True
+    assert exam_timer.build_timer_seed(start, 600, TEXTS, remaining_questions=4, now=start)["seed"] != first["seed"]
+
+
+def test_pacing_seed_carries_plan_and_never_reports():
+    start = pd.Timestamp("2026-06-13 10:00:00")
+    seed = exam_timer.build_timer_seed(
+        start,
+        300,
+        {"status": {"green": "On track"}},
+        view=exam_timer.VIEW_PACING,
+        ideal_times=[60.0, 120, 120],
+        current_index=1,
+        now=start,
+    )
+
+    assert seed["ideal_times"] == [60, 120, 120]
+    assert seed["current_index"] == 1
+    assert seed["report_events"] is False
+
+
+def test_render_exam_timer_returns_only_known_events(monkeypatch):
+    calls = []
+
+    class _Result:
+        def __init__(self, event):
+            self.event = event
+
+    events = iter(["expired", None, "bogus"])
+
+    def fake_component(**kwargs):
+        calls.append(kwargs)
+        return _Result(next(events))
+
+    monkeypatch.setattr(exam_timer, "_COMPONENT", fake_component)
+
+    assert exam_timer.render_exam_timer({"seed": "x"}, key="timer") == exam_timer.EVENT_EXPIRED
+    assert exam_timer.render_exam_timer({"seed": "x"}, key="timer") is None
+    assert exam_timer.render_exam_timer({"seed": "x"}, key="timer") is None
+    assert calls[0]["key"] == "timer"
+    assert callable(calls[0]["on_event_change"])
+
+
+def test_client_timer_can_be_disabled(monkeypatch):
+    monkeypatch.setenv("MC_CLIENT_TIMER", "0")
+    assert exam_timer.client_timer_enabled() is False
+    monkeypatch.setenv("MC_CLIENT_TIMER", "1")
+    assert exam_timer.client_timer_enabled() is True
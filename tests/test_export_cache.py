@@ -0,0 +1,234 @@
+import pickle
+import time
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import pytest
+
+import export_cache
+from export_jobs import ExportJobQueue
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "export_cache"
+    monkeypatch.setenv("MC_EXPORT_CACHE_DIR", str(directory))
+    monkeypatch.delenv("MC_EXPORT_CACHE", raising=False)
+    return directory
+
+
+def _counting_producer(payload=b"%PDF data"):
+    calls = []
+
+    def _produce():
+        calls.append(1)
+        return payload
+
+    return _produce, calls
+
+
+def _render_set(selected_file, questions=None, title="", progress_callback=None):
+    return f"{selected_file}|{len(questions or [])}|{title}".encode()
+
+
+def test_repeat_export_is_served_from_cache(cache_dir):
+    produce, calls = _counting_producer()
+
+    assert export_cache.get_or_create("musterloesung", "abc", produce, locale="de") == b"%PDF data"
+    assert export_cache.get_or_create("musterloesung", "abc", produce, locale="de") == b"%PDF data"
+    assert len(calls) == 1
+
+    stats = export_cache.get_export_cache_stats()
+    assert (stats["files"], stats["hits"], stats["misses"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_key_follows_content_locale_and_options(cache_dir):
+    produce, calls = _counting_producer()
+
+    export_cache.get_or_create("mini_glossary", "abc", produce, locale="de")
+    export_cache.get_or_create("mini_glossary", "changed", produce, locale="de")
+    export_cache.get_or_create("mini_glossary", "abc", produce, locale="en")
+    export_cache.get_or_create("mini_glossary", "abc", produce, locale="de", options={"title": "x"})
+    export_cache.get_or_create("anki_apkg", "abc", produce, locale="de")
+    assert len(calls) == 5
+
+    export_cache.get_or_create("mini_glossary", "abc", produce, locale="de", options={"title": "x"})
+    assert len(calls) == 5
+
+
+def test_empty_results_are_not_stored(cache_dir):
+    produce, calls = _counting_producer(b"")
+
+    export_cache.get_or_create("learning_objectives", "abc", produce)
+    export_cache.get_or_create("learning_objectives", "abc", produce)
+    assert len(calls) == 2
+    assert export_cache.get_export_cache_stats()["files"] == 0
+
+
+def test_ttl_and_size_eviction(tmp_path):
+    cache = export_cache.ExportArtifactCache(tmp_path)
+    cache.put("old", "musterloesung", b"x" * 10, max_bytes=1024)
+    cache._transaction(lambda conn: conn.execute("UPDATE artifacts SET created = ? WHERE key = 'old'", (time.time() - 7200,)))
+    assert cache.get("old", ttl_seconds=3600) is None
+    assert cache.evict(max_bytes=1024, ttl_seconds=3600) == 1
+    assert not cache.path_for("old").exists()
+
+    for key in ("a", "b", "c"):
+        cache.put(key, "anki_apkg", b"y" * 10, max_bytes=1024)
+        time.sleep(0.01)
+    assert cache.get("a") is not None  # a ist jetzt zuletzt genutzt
+
+    cache.put("d", "anki_apkg", b"y" * 10, max_bytes=25)
+    assert sorted(p.stem for p in tmp_path.glob("*.bin")) == ["a", "d"]
+    stats = cache.stats()
+    assert (stats["files"], stats["bytes"], stats["evictions"]) == (2, 20, 3)
+
+
+def test_cached_export_wraps_set_exports_and_pickles(cache_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(export_cache, "_current_locale", lambda: "de")
+    source = tmp_path / "questions_demo.json"
+    source.write_text('{"questions": []}', encoding="utf-8")
+    calls = []
+
+    def _counting(selected_file, questions=None, title="", progress_callback=None):
+        calls.append(title)
+        return _render_set(selected_file, questions, title)
+
+    wrapped = export_cache.cached_export("musterloesung", _counting)
+    first = wrapped(str(source), [{"question": "Q"}], title="A", progress_callback=lambda *a: None)
+    assert wrapped(str(source), [{"question": "Q"}], title="A") == first
+    wrapped(str(source), [{"question": "Q"}], title="B")
+    assert calls == ["A", "B"]
+
+    source.write_text('{"questions": [1]}', encoding="utf-8")
+    wrapped(str(source), [{"question": "Q"}], title="A")
+    assert calls == ["A", "B", "A"]
+
+    clone = pickle.loads(pickle.dumps(export_cache.cached_export("musterloesung", _render_set)))
+    assert clone.kind == "musterloesung"
+    assert clone(str(source), []) == _render_set(str(source), [])
+
+
+def test_cached_export_keys_config_by_fields_not_identity(cache_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(export_cache, "_current_locale", lambda: "de")
+    source = tmp_path / "questions_demo.json"
+    source.write_text('{"questions": []}', encoding="utf-8")
+    calls = []
+
+    def _counting(selected_file, questions, app_config):
+        calls.append(app_config.scoring_mode)
+        return _render_set(selected_file, questions, app_config.scoring_mode)
+
+    wrapped = export_cache.cached_export("musterloesung", _counting, config_fields=("scoring_mode",))
+    wrapped(str(source), [], SimpleNamespace(scoring_mode="positive_only", admin_key="x"))
+    wrapped(str(source), [], SimpleNamespace(scoring_mode="positive_only", admin_key="y"))
+    wrapped(str(source), [], SimpleNamespace(scoring_mode="negative"))
+    assert calls == ["positive_only", "negative"]
+
+    with pytest.raises(TypeError, match="Cache-Schlüssel"):
+        export_cache.cached_export("musterloesung", _counting)(str(source), [], object())
+
+
+def test_disabled_cache_always_renders(cache_dir, monkeypatch):
+    monkeypatch.setenv("MC_EXPORT_CACHE", "0")
+    produce, calls = _counting_producer()
+
+    export_cache.get_or_create("arsnova_json", "abc", produce)
+    export_cache.get_or_create("arsnova_json", "abc", produce)
+    assert len(calls) == 2
+    assert not cache_dir.exists()
+
+
+def test_job_result_files_expire(tmp_path, monkeypatch):
+    monkeypatch.setattr(ExportJobQueue, "_ensure_dispatcher", lambda self: None)
+    queue = ExportJobQueue(tmp_path / "jobs.sqlite3", tmp_path)
+    job_id = queue.submit(_render_set, ("A",))
+    result = tmp_path / f"muster_{job_id}.pdf"
+    result.write_bytes(b"%PDF")
+    queue._execute(
+        "UPDATE jobs SET status = 'finished', result_path = ?, finished_at = ? WHERE job_id = ?",
+        (str(result), time.time() - 7200, job_id),
+    )
+    orphan = tmp_path / "muster_orphan.pdf"
+    orphan.write_bytes(b"%PDF")
+
+    assert queue.prune_results(ttl_seconds=3600) == 1
+    assert not result.exists() and orphan.exists()
+    assert queue.status(job_id)["status"] == "expired"
+
+    assert queue.prune_results(now=time.time() + 7200, ttl_seconds=3600) == 1
+    assert not orphan.exists()
+
+
+@pytest.fixture
+def fresh_fragments(cache_dir, monkeypatch):
+    monkeypatch.setattr(export_cache, "_fragment_memory", OrderedDict())
+    monkeypatch.setattr(export_cache, "_fragment_memory_hits", 0)
+    return cache_dir
+
+
+def test_fragments_come_from_memory_then_disk(fresh_fragments, monkeypatch):
+    produce, calls = _counting_producer({"question": "<p>Q</p>", "options": ["a"]})
+
+    first = export_cache.cached_fragment("question_fragment", {"q": 1}, produce, locale="de")
+    assert export_cache.cached_fragment("question_fragment", {"q": 1}, produce, locale="de") == first
+    monkeypatch.setattr(export_cache, "_fragment_memory", OrderedDict())
+    assert export_cache.cached_fragment("question_fragment", {"q": 1}, produce, locale="de") == first
+    export_cache.cached_fragment("question_fragment", {"q": 1}, produce, locale="en")
+    assert len(calls) == 2
+
+    stats = export_cache.get_fragment_cache_stats()
+    assert (stats["files"], stats["memory_hits"], stats["hits"]) == (2, 1, 2)
+    # Ganze Exporte bleiben davon unberührt.
+    assert export_cache.get_export_cache_stats()["files"] == 0
+
+
+def test_fragments_with_formula_fallback_are_not_stored(fresh_fragments):
+    produce, calls = _counting_producer('<code class="formula-fallback">x^2</code>')
+
+    for _ in range(2):
+        export_cache.cached_fragment(
+            "glossary_fragment", "x", produce, store_if=lambda html: "formula-fallback" not in html
+        )
+    assert len(calls) == 2
+    assert export_cache.get_fragment_cache_stats()["files"] == 0
+
+
+def test_repeat_pdf_exports_reuse_question_fragments(fresh_fragments, monkeypatch):
+    import config
+    import pdf_export
+
+    rendered = []
+
+    def _fake_latex(text, total_timeout=None, md_inline=False):
+        rendered.append(text)
+        return f"<span>{text}</span>"
+
+    class _FakeHTML:
+        def __init__(self, string=None, **kwargs):
+            self.string = string
+
+        def write_pdf(self, **kwargs):
+            return self.string.encode()
+
+    monkeypatch.setattr(config, "load_questions", lambda *args, **kwargs: None)
+    monkeypatch.setattr(pdf_export, "_render_latex_in_html", _fake_latex)
+    monkeypatch.setattr(pdf_export, "HTML", _FakeHTML)
+    monkeypatch.setenv("MC_PDF_PARALLEL_MIN_QUESTIONS", "0")
+    questions = [
+        {"question": "1. Was ist $x$?", "options": ["eins", "zwei"], "answer": 1, "erklaerung": "Weil.",
+         "thema": "Algebra", "concept": "Variablen",
+         "mini_glossary": [{"term": "Variable", "definition": "Platzhalter"}]},
+    ]
+    app_config = SimpleNamespace(scoring_mode="default")
+
+    first = pdf_export.generate_musterloesung_pdf("questions_demo.json", questions, app_config)
+    calls_first = len(rendered)
+    assert calls_first and "<span>zwei</span>" in first.decode()
+    second = pdf_export.generate_musterloesung_pdf("questions_demo.json", questions, app_config).decode()
+    assert "<span>zwei</span>" in second and len(rendered) == calls_first
+
+    questions[0]["options"][0] = "drei"
+    third = pdf_export.generate_musterloesung_pdf("questions_demo.json", questions, app_config).decode()
+    assert "<span>drei</span>" in third and len(rendered) > calls_first
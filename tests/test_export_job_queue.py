@@ -0,0 +1,268 @@
+import pickle
+import time
+from pathlib import Path
+from types import MappingProxyType, SimpleNamespace
+
+import pytest
+
+from export_jobs import ExportJobQueue
+
+
+def _render(label, progress_callback=None):
+    if progress_callback:
+        progress_callback(40, "halfway")
+    return f"%PDF {label}".encode()
+
+
+def _wait_for_file_then_render(flag_path, label):
+    deadline = time.time() + 20
+    while not Path(flag_path).exists() and time.time() < deadline:
+        time.sleep(0.02)
+    return f"%PDF {label}".encode()
+
+
+def _report_then_wait(flag_path, progress_callback=None):
+    progress_callback(40, "halfway")
+    return _wait_for_file_then_render(flag_path, "progress")
+
+
+def _sleep_forever(label):
+    time.sleep(600)
+    return b"%PDF never"
+
+
+def _inspect_inherited_state(label):
+    import export_cache
+    import i18n
+
+    acquired = i18n._CATALOGS_LOCK.acquire(timeout=1) and export_cache._CACHES_LOCK.acquire(timeout=1)
+    return f"%PDF {len(export_cache._CACHES)} {'unlocked' if acquired else 'locked'}".encode()
+
+
+def _fail(label):
+    raise ValueError(f"broken {label}")
+
+
+def _wait_until(queue, job_id, statuses, timeout=20):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        queue.dispatch_once()
+        status = queue.status(job_id)
+        if status["status"] in statuses:
+            return status
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} stuck in {queue.status(job_id)}")
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    # Ohne Dispatcher-Thread: die Tests treiben die Runden über dispatch_once().
+    monkeypatch.setattr(ExportJobQueue, "_ensure_dispatcher", lambda self: None)
+    q = ExportJobQueue(tmp_path / "jobs.sqlite3", tmp_path, max_workers=1)
+    yield q
+    for job_id in list(q._running):
+        q.cancel(job_id)
+
+
+def test_job_runs_in_worker_and_reports_result(queue):
+    job_id = queue.submit(_render, ("A",))
+    assert queue.status(job_id)["status"] == "queued"
+
+    status = _wait_until(queue, job_id, {"finished", "failed"})
+    assert status["status"] == "finished" and status["progress"] == 100
+    assert Path(status["result"]).read_bytes() == b"%PDF A"
+
+    # Neuer Prozess (andere Queue-Instanz) sieht denselben Status.
+    other = ExportJobQueue(queue.db_path, queue.exports_dir)
+    assert other.status(job_id)["result"] == status["result"]
+
+
+def test_identical_requests_share_one_job(queue):
+    first = queue.submit(_render, ("A",))
+    assert queue.submit(_render, ("A",)) == first
+    assert queue.submit(_render, ("B",)) != first
+
+    _wait_until(queue, first, {"finished"})
+    assert queue.submit(_render, ("A",)) == first
+
+
+def test_priority_then_fifo_with_bounded_workers(queue, tmp_path):
+    flag = tmp_path / "go"
+    blocker = queue.submit(_wait_for_file_then_render, (str(flag), "blocker"))
+    queue.dispatch_once()
+    low = queue.submit(_render, ("low",))
+    first_normal = queue.submit(_render, ("n1",), priority=5)
+    second_normal = queue.submit(_render, ("n2",), priority=5)
+
+    queue.dispatch_once()
+    assert len(queue._running) == 1
+    assert [queue.status(j)["queue_position"] for j in (first_normal, second_normal, low)] == [1, 2, 3]
+
+    flag.write_text("1")
+    _wait_until(queue, blocker, {"finished"})
+    order = []
+    while len(order) < 3:
+        queue.dispatch_once()
+        for job_id in queue._running:
+            if job_id not in order:
+                order.append(job_id)
+        time.sleep(0.02)
+    assert order == [first_normal, second_normal, low]
+
+
+def test_progress_comes_from_callback(queue, tmp_path):
+    flag = tmp_path / "go"
+    job_id = queue.submit(_report_then_wait, (str(flag),))
+
+    deadline = time.time() + 20
+    while queue.status(job_id)["progress"] != 40 and time.time() < deadline:
+        queue.dispatch_once()
+        time.sleep(0.02)
+    status = queue.status(job_id)
+    assert (status["status"], status["progress"], status["message"]) == ("running", 40, "halfway")
+
+    flag.write_text("1")
+    assert _wait_until(queue, job_id, {"finished"})["progress"] == 100
+
+
+def test_cancel_terminates_running_process(queue):
+    job_id = queue.submit(_sleep_forever, ("X",))
+    queue.dispatch_once()
+    proc = queue._running[job_id]
+    assert proc.is_alive()
+
+    assert queue.cancel(job_id) is True
+    assert not proc.is_alive()
+    assert queue.status(job_id)["status"] == "cancelled"
+    assert queue.cancel(job_id) is False
+
+
+def test_job_exceeding_max_runtime_is_stopped_and_failed(queue):
+    job_id = queue.submit(_sleep_forever, ("T",))
+    queue.dispatch_once()
+    proc = queue._running[job_id]
+
+    queue._stop_overdue(time.time() + 5, max_runtime=1)
+    assert not proc.is_alive()
+    assert job_id not in queue._running
+    status = queue.status(job_id)
+    assert (status["status"], status["message"]) == ("failed", "timeout")
+
+
+def test_forked_job_does_not_inherit_cache_connections_or_locks(queue, tmp_path):
+    import export_cache
+    import i18n
+
+    export_cache.get_export_cache(tmp_path / "cache")
+    # Ein im Elternprozess gehaltener Lock darf den Job nicht blockieren.
+    with i18n._CATALOGS_LOCK, export_cache._CACHES_LOCK:
+        job_id = queue.submit(_inspect_inherited_state, ("fork",))
+        queue.dispatch_once()
+    status = _wait_until(queue, job_id, {"finished", "failed"})
+    assert Path(status["result"]).read_bytes() == b"%PDF 0 unlocked"
+
+
+def test_failure_is_recorded(queue):
+    job_id = queue.submit(_fail, ("F",))
+    status = _wait_until(queue, job_id, {"finished", "failed"})
+    assert status["status"] == "failed"
+    assert "ValueError: broken F" in status["exception"]
+
+
+def test_stale_running_job_is_requeued_by_another_process(queue):
+    job_id = queue.submit(_render, ("S",))
+    queue._execute(
+        "UPDATE jobs SET status = 'running', owner = 'gone:1', heartbeat = ? WHERE job_id = ?",
+        (time.time() - 3600, job_id),
+    )
+    status = _wait_until(queue, job_id, {"finished", "failed"})
+    assert status["status"] == "finished"
+
+
+def test_report_job_renders_from_session_snapshot(queue, monkeypatch):
+    import pdf_export
+    from helpers.run_state import get_test_run, report_state_snapshot, start_test_run
+
+    def _fake_report(questions, app_config):
+        state = pdf_export.st.session_state
+        return f"%PDF {state['user_id']} {get_test_run(state).answer(0)} {len(questions)}".encode()
+
+    monkeypatch.setattr(pdf_export, "generate_pdf_report", _fake_report)
+    state = {"user_id": "alice", "widget_key": object()}
+    start_test_run(state, 1).record_answer(0, 1, "B")
+    snapshot = report_state_snapshot(state)
+    assert set(snapshot) == {"test_run", "user_id"}
+    get_test_run(state).record_answer(0, 0, "C")  # spätere Änderungen erreichen die Kopie nicht
+
+    job_id = queue.submit(
+        pdf_export.generate_pdf_report_from_state,
+        ([{"question": "Q"}], {"scoring_mode": "positive_only"}, snapshot),
+        kind="report",
+    )
+    # Plain config values keep the job picklable: it is stored and survives restarts.
+    assert queue._execute("SELECT payload FROM jobs WHERE job_id = ?", (job_id,)).fetchone()["payload"]
+    status = _wait_until(queue, job_id, {"finished", "failed"})
+    assert Path(status["result"]).read_bytes() == b"%PDF alice B 1"
+
+
+def test_summary_starts_report_job_once_per_state(monkeypatch):
+    import export_jobs
+    import main_view
+
+    session = {"user_id": "alice", "active_locale": "de"}
+    monkeypatch.setattr(main_view.st, "session_state", session, raising=False)
+    monkeypatch.setattr(export_jobs, "report_prerender_enabled", lambda: True)
+    submitted, cancelled = [], []
+    monkeypatch.setattr(
+        export_jobs, "start_report_job", lambda func, *args: submitted.append(args) or f"job{len(submitted)}"
+    )
+    monkeypatch.setattr(export_jobs, "cancel_job", cancelled.append)
+
+    app_config = SimpleNamespace(scoring_mode="negative", reading_cooldown_base_per_weight=MappingProxyType({1: 5.0}))
+    main_view.start_report_prerender([{"question": "Q"}], app_config)
+    main_view.start_report_prerender([{"question": "Q"}], app_config)
+    assert len(submitted) == 1 and submitted[0][2] == {"user_id": "alice", "active_locale": "de"}
+    assert submitted[0][1] == {"scoring_mode": "negative", "reading_cooldown_base_per_weight": {1: 5.0}}
+    pickle.dumps(submitted[0])
+
+    session["active_locale"] = "en"
+    main_view.start_report_prerender([{"question": "Q"}], app_config)
+    assert len(submitted) == 2 and cancelled == ["job1"]
+    assert session["_report_prerender"]["job_id"] == "job2"
+
+
+def test_report_prerender_ignores_explanation_toggles(monkeypatch):
+    import export_jobs
+    import main_view
+    from helpers.run_state import get_test_run, start_test_run
+
+    session = {"user_id": "alice"}
+    run = start_test_run(session, 2)
+    run.record_answer(0, 1, "A")
+    run.record_answer(1, 0, "B")
+    run.set_shown_at(1, 12.5)
+    run.set_explanation_visible(1, True)
+    run.set_explanation_shown_at(1, 13.0)
+    monkeypatch.setattr(main_view.st, "session_state", session, raising=False)
+    monkeypatch.setattr(export_jobs, "report_prerender_enabled", lambda: True)
+    submitted = []
+    monkeypatch.setattr(
+        export_jobs, "start_report_job", lambda func, *args: submitted.append(args) or f"job{len(submitted)}"
+    )
+    monkeypatch.setattr(export_jobs, "cancel_job", lambda job_id: None)
+
+    app_config = SimpleNamespace(scoring_mode="negative")
+    main_view.start_report_prerender([{"question": "Q"}] * 2, app_config)
+    # "Next" hides the explanation of the last answer before the summary renders.
+    run.set_explanation_visible(1, False)
+    run.set_explanation_shown_at(1, None)
+    main_view.start_report_prerender([{"question": "Q"}] * 2, app_config)
+    assert len(submitted) == 1
+
+    snapshot_run = get_test_run(submitted[0][2])
+    assert snapshot_run.points_list() == [1, 0] and snapshot_run.answer(1) == "B"
+    assert not snapshot_run.any_explanation_visible() and snapshot_run.shown_at(1) is None
+
+    run.record_answer(1, 1, "C")
+    main_view.start_report_prerender([{"question": "Q"}] * 2, app_config)
+    assert len(submitted) == 2
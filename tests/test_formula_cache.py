@@ -0,0 +1,74 @@
+import os
+import time
+
+import formula_cache
+
+
+def _cache(tmp_path):
+    return formula_cache.FormulaDiskCache(tmp_path)
+
+
+def test_get_and_put_track_hits_misses_and_size(tmp_path):
+    cache = _cache(tmp_path)
+    name = formula_cache.formula_cache_name("x^2", False, "svg")
+
+    assert cache.get(name) is None
+    cache.put(name, b"<svg/>", max_files=10, max_bytes=1024, ttl_days=7)
+    assert cache.get(name) == b"<svg/>"
+    assert cache.contains(name)
+
+    stats = cache.stats()
+    assert (stats["files"], stats["bytes"]) == (1, len(b"<svg/>"))
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 1, 0)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_eviction_is_lru_by_last_use(tmp_path):
+    cache = _cache(tmp_path)
+    for name in ("a.png", "b.png", "c.png"):
+        cache.put(name, b"x" * 10, max_files=10, max_bytes=1024, ttl_days=7)
+        time.sleep(0.01)
+    cache.get("a.png")  # a is now the most recently used entry
+
+    cache.put("d.png", b"x" * 10, max_files=2, max_bytes=1024, ttl_days=7)
+
+    assert sorted(p.name for p in tmp_path.glob("*.png")) == ["a.png", "d.png"]
+    stats = cache.stats()
+    assert stats["files"] == 2
+    assert stats["evictions"] == 2
+
+    # Byte limit alone also evicts the oldest entries.
+    assert cache.evict(max_files=10, max_bytes=10, ttl_days=7) == 1
+    assert [p.name for p in tmp_path.glob("*.png")] == ["d.png"]
+
+
+def test_existing_files_are_imported_and_expired(tmp_path):
+    old = tmp_path / "old.png"
+    old.write_bytes(b"o" * 5)
+    stale = time.time() - 10 * 86400
+    os.utime(old, (stale, stale))
+    (tmp_path / "fresh.svg").write_bytes(b"f" * 7)
+
+    cache = _cache(tmp_path)
+    assert cache.stats()["files"] == 2
+
+    assert cache.evict(max_files=10, max_bytes=1024, ttl_days=7) == 1
+    assert not old.exists()
+    assert cache.stats()["bytes"] == 7
+
+    # The index is shared: a second instance (another process) sees the same state.
+    other = _cache(tmp_path)
+    assert other.contains("fresh.svg")
+    assert other.stats()["evictions"] == 1
+    cache.close()
+    other.close()
+
+
+def test_missing_file_is_dropped_from_index(tmp_path):
+    cache = _cache(tmp_path)
+    cache.put("gone.png", b"x", max_files=10, max_bytes=1024, ttl_days=7)
+    (tmp_path / "gone.png").unlink()
+
+    assert cache.get("gone.png") is None
+    assert not cache.contains("gone.png")
+    assert cache.stats()["files"] == 0
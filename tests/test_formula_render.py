@@ -0,0 +1,65 @@
+import pytest
+
+import formula_render
+
+
+def test_backend_selection(monkeypatch):
+    monkeypatch.setattr(formula_render, "local_backend_available", lambda: True)
+    monkeypatch.delenv("MC_FORMULA_BACKEND", raising=False)
+    assert formula_render.get_formula_backend() == formula_render.BACKEND_TEX
+
+    monkeypatch.setenv("MC_FORMULA_BACKEND", "quicklatex")
+    assert formula_render.get_formula_backend() == formula_render.BACKEND_QUICKLATEX
+
+    # Forcing the local engine without latex/dvisvgm falls back to the remote API.
+    monkeypatch.setenv("MC_FORMULA_BACKEND", "tex")
+    monkeypatch.setattr(formula_render, "local_backend_available", lambda: False)
+    assert formula_render.get_formula_backend() == formula_render.BACKEND_QUICKLATEX
+
+
+def test_tex_document_has_one_page_per_formula():
+    doc = formula_render.build_tex_document(
+        [("x^2", False), (r"\frac{a}{b}", True), (r"\begin{align} a &= b \end{align}", True)]
+    )
+    assert doc.count(r"\newpage") == 3
+    assert "$x^2$" in doc
+    assert r"$\displaystyle \frac{a}{b}$" in doc
+    assert r"$\begin{align}" not in doc
+    assert doc.rstrip().endswith(r"\end{document}")
+
+
+def test_unsafe_formulas_are_not_passed_to_tex(monkeypatch):
+    batches = []
+    monkeypatch.setattr(formula_render, "_run_tex_batch", lambda items, timeout: batches.append(items) or [b"<svg/>"] * len(items))
+
+    out = formula_render.render_formulas([(r"\input{/etc/passwd}", False), ("", True), ("a+b", False)])
+    assert out == [None, None, b"<svg/>"]
+    assert batches == [[("a+b", False)]]
+
+
+def test_failing_formula_is_isolated_by_bisection(monkeypatch):
+    runs = []
+
+    def fake_batch(items, timeout):
+        runs.append(len(items))
+        if any(formula == "bad" for formula, _ in items):
+            return None
+        return [f"<svg>{formula}</svg>".encode() for formula, _ in items]
+
+    monkeypatch.setattr(formula_render, "_run_tex_batch", fake_batch)
+    monkeypatch.setattr(formula_render, "FORMULA_BATCH_SIZE", 8)
+
+    items = [(f"f{i}", False) for i in range(7)] + [("bad", True)]
+    out = formula_render.render_formulas(items)
+    assert out[:7] == [f"<svg>f{i}</svg>".encode() for i in range(7)]
+    assert out[7] is None
+    # 1 full batch, then halves down to the broken formula: far fewer than 8 single runs.
+    assert len(runs) <= 7
+
+
+@pytest.mark.skipif(not formula_render.local_backend_available(), reason="latex/dvisvgm not installed")
+def test_local_backend_renders_svg():
+    out = formula_render.render_formulas([(r"\frac{a}{b}", True), ("x^2", False), (r"\frac{", False)], timeout=60)
+    assert b"<svg" in out[0]
+    assert b"<svg" in out[1]
+    assert out[2] is None
@@ -0,0 +1,64 @@
+import json
+import os
+
+import pytest
+
+import i18n
+
+
+@pytest.fixture
+def locale_dir(tmp_path, monkeypatch):
+    (tmp_path / "en.json").write_text(
+        json.dumps({"greeting": "Hello", "menu": {"start": "Start", "items.count": "{n} items"}}),
+        encoding="utf-8",
+    )
+    (tmp_path / "de.json").write_text(json.dumps({"greeting": "Hallo"}), encoding="utf-8")
+    monkeypatch.setattr(i18n, "_LOCALE_DIR", tmp_path)
+    monkeypatch.setattr(i18n, "_CATALOGS", None)
+    yield tmp_path
+    i18n._CATALOGS = None
+
+
+def test_compiled_tables_fall_back_to_default_locale(locale_dir):
+    assert i18n.translate("greeting", locale="de") == "Hallo"
+    assert i18n.translate("menu.start", locale="de") == "Start"
+    assert i18n.translate("menu.items.count", locale="de-AT") == "{n} items"
+    assert i18n.translate("missing", locale="de", default="fallback") == "fallback"
+    assert i18n.translate("missing", locale="xx") == "missing"
+    assert tuple(i18n.available_locales()) == ("de", "en")
+
+
+def test_locale_files_are_not_touched_within_reload_interval(locale_dir, monkeypatch):
+    monkeypatch.setattr(i18n, "_RELOAD_INTERVAL", 3600.0)
+    i18n.translate("greeting", locale="de")
+
+    def fail():
+        raise AssertionError("locale directory was scanned")
+
+    monkeypatch.setattr(i18n, "_locale_signature", fail)
+    for _ in range(100):
+        assert i18n.translate("greeting", locale="de") == "Hallo"
+        assert "de" in i18n.available_locales()
+
+
+def test_reload_picks_up_changed_files(locale_dir, monkeypatch):
+    monkeypatch.setattr(i18n, "_RELOAD_INTERVAL", 3600.0)
+    assert i18n.translate("greeting", locale="de") == "Hallo"
+
+    path = locale_dir / "de.json"
+    path.write_text(json.dumps({"greeting": "Servus"}), encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+    assert i18n.translate("greeting", locale="de") == "Hallo"
+
+    i18n.reload_translations(force=False)
+    assert i18n.translate("greeting", locale="de") == "Servus"
+
+
+def test_debounced_watcher_reloads_after_interval(locale_dir, monkeypatch):
+    monkeypatch.setattr(i18n, "_RELOAD_INTERVAL", 0.01)
+    assert i18n.translate("greeting", locale="de") == "Hallo"
+    (locale_dir / "fr.json").write_text(json.dumps({"greeting": "Bonjour"}), encoding="utf-8")
+    i18n._CATALOGS.checked_at -= 1
+    assert i18n.translate("greeting", locale="fr") == "Bonjour"
+    assert "fr" in i18n.available_locales()
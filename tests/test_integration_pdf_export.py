@@ -2,6 +2,8 @@ from config import AppConfig
 from pdf_export import generate_pdf_report
 import streamlit as st
 
+from helpers.run_state import start_test_run
+
 
 def _make_question(idx: int, text: str, options, correct_idx: int):
     return {
@@ -25,10 +27,10 @@ def test_generate_pdf_all_answered(tmp_path, monkeypatch):
 
     # Simulate session state: all answered
     st.session_state.clear()
+    run = start_test_run(st.session_state, len(questions))
     for i, q in enumerate(questions):
-        st.session_state[f"frage_{i}_beantwortet"] = q.get("gewichtung", 1)
-        # store the answer text as used by pdf_export
-        st.session_state[f"frage_{i}_antwort"] = q["optionen"][q["loesung"]]
+        # store points and the answer text as used by pdf_export
+        run.record_answer(i, q.get("gewichtung", 1), q["optionen"][q["loesung"]])
 
     st.session_state["selected_questions_file"] = "questions_test.json"
     st.session_state["user_id"] = "tester"
@@ -50,9 +52,8 @@ def test_generate_pdf_with_unanswered_and_bookmarks(tmp_path):
 
     st.session_state.clear()
     # First answered, second unanswered
-    st.session_state["frage_0_beantwortet"] = questions[0].get("gewichtung", 1)
-    st.session_state["frage_0_antwort"] = questions[0]["optionen"][0]
-    # second remains unanswered: no keys set
+    run = start_test_run(st.session_state, len(questions))
+    run.record_answer(0, questions[0].get("gewichtung", 1), questions[0]["optionen"][0])
 
     st.session_state["bookmarked_questions"] = [1]
     st.session_state["test_manually_ended"] = True
@@ -0,0 +1,43 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import lazy_imports
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_lazy_function_imports_on_first_call(tmp_path, monkeypatch, capsys):
+    (tmp_path / "mc_lazy_probe.py").write_text("def double(x):\n    return 2 * x\n", encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setenv("MC_IMPORT_PROFILE", "1")
+    monkeypatch.delitem(sys.modules, "mc_lazy_probe", raising=False)
+
+    double = lazy_imports.lazy_function("mc_lazy_probe", "double")
+    assert double.__name__ == "double"
+    assert "mc_lazy_probe" not in sys.modules
+
+    assert double(21) == 42
+    assert double(1) == 2
+    assert "mc_lazy_probe" in sys.modules
+    assert [name for name, _ in lazy_imports.lazy_load_report()].count("mc_lazy_probe") == 1
+    assert "verzögerter Import mc_lazy_probe" in capsys.readouterr().out
+
+
+def test_record_startup_keeps_first_value(monkeypatch):
+    monkeypatch.setattr(lazy_imports, "_STARTUP", {})
+    lazy_imports.record_startup("first_run", 0.25)
+    lazy_imports.record_startup("first_run", 5.0)
+    assert lazy_imports.startup_report() == {"first_run": 250.0}
+
+
+def test_app_cold_start_skips_export_and_admin_modules():
+    code = (
+        "import sys, app\n"
+        "heavy = ('pdf_export', 'weasyprint', 'admin_panel', 'markdown_it', 'export_jobs')\n"
+        "print(','.join(m for m in heavy if m in sys.modules))\n"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], cwd=str(ROOT), capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    assert proc.stdout.strip().splitlines()[-1:] in ([], [""])
@@ -0,0 +1,157 @@
+import random
+
+import config
+import database
+from config import QuestionSet
+
+
+def _setup_db(monkeypatch, tmp_path, num_questions=4):
+    db_file = str(tmp_path / "mc_test_data.db")
+    monkeypatch.setattr(database, "DATABASE_FILE", db_file)
+    database.init_database()
+
+    def fake_load_questions(qfile, silent=False):
+        questions = [{"gewichtung": 1} for _ in range(num_questions)]
+        return QuestionSet(questions=questions, meta={})
+
+    monkeypatch.setattr(config, "load_questions", fake_load_questions)
+
+
+def _uncached_leaderboard(monkeypatch, qfile, tempo=None):
+    monkeypatch.setenv("MC_LEADERBOARD_CACHE", "0")
+    try:
+        return database.get_all_logs_for_leaderboard(qfile, tempo=tempo)
+    finally:
+        monkeypatch.delenv("MC_LEADERBOARD_CACHE")
+
+
+def _scores(rows):
+    return sorted((r["user_pseudonym"], r["total_score"]) for r in rows)
+
+
+def _ranking(rows):
+    return [(r["user_pseudonym"], r["total_score"], r["duration_seconds"]) for r in rows]
+
+
+def _backdate_summary(session_id, seconds):
+    conn = database.get_db_connection()
+    with database.db_write_transaction(conn):
+        conn.execute(
+            "UPDATE test_session_summaries SET start_time = datetime(start_time, ?) WHERE session_id = ?",
+            (f"-{seconds} seconds", session_id),
+        )
+
+
+def test_leaderboard_cache_counts_hits_and_misses(monkeypatch, tmp_path):
+    _setup_db(monkeypatch, tmp_path)
+    session_id = database.start_test_session("user_a", "qset_cache")
+    database.save_answer(session_id, 1, "A", 1, True)
+
+    before = database.get_leaderboard_cache_stats()
+    first = database.get_all_logs_for_leaderboard("qset_cache")
+    second = database.get_all_logs_for_leaderboard("qset_cache")
+    after = database.get_leaderboard_cache_stats()
+
+    assert first == second
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
+
+    # Returned rows are copies: mutating them must not corrupt the cache.
+    second[0]["total_score"] = 999
+    assert database.get_all_logs_for_leaderboard("qset_cache")[0]["total_score"] == 1
+
+
+def test_leaderboard_cache_follows_summary_changes(monkeypatch, tmp_path):
+    _setup_db(monkeypatch, tmp_path)
+    qfile = "qset_follow"
+    rng = random.Random(7)
+
+    sessions = []
+    for idx in range(14):
+        tempo = "normal" if idx % 2 else "speed"
+        sessions.append(database.start_test_session(f"user_{idx % 12}", qfile, tempo=tempo))
+        # Distinct durations keep the public ordering free of ties.
+        _backdate_summary(sessions[-1], 100 * (idx + 1))
+
+    # Warm both cache keys before any answers arrive.
+    assert database.get_all_logs_for_leaderboard(qfile) == []
+    assert database.get_all_logs_for_leaderboard(qfile, tempo="speed") == []
+
+    misses_before = database.get_leaderboard_cache_stats()["misses"]
+    for _ in range(60):
+        session_id = rng.choice(sessions)
+        points = rng.choice([0, 1])
+        database.save_answer(session_id, rng.randint(1, 4), "X", points, bool(points))
+
+        for tempo in (None, "speed"):
+            cached = database.get_all_logs_for_leaderboard(qfile, tempo=tempo)
+            fresh = _uncached_leaderboard(monkeypatch, qfile, tempo=tempo)
+            assert len(cached) <= 10
+            assert _ranking(cached) == _ranking(fresh)
+
+    # Most writes are applied in place instead of forcing a rebuild.
+    assert database.get_leaderboard_cache_stats()["misses"] - misses_before < 60
+
+
+def test_leaderboard_cache_ignores_rolled_back_writes(monkeypatch, tmp_path):
+    _setup_db(monkeypatch, tmp_path)
+    session_id = database.start_test_session("user_rb", "qset_rb")
+    database.save_answer(session_id, 1, "A", 1, True)
+    assert _scores(database.get_all_logs_for_leaderboard("qset_rb")) == [("user_rb", 1)]
+
+    conn = database.get_db_connection()
+    try:
+        with database.db_write_transaction(conn):
+            database._apply_save_answer(conn, session_id, 2, "B", 1, True, None)
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+
+    assert _scores(database.get_all_logs_for_leaderboard("qset_rb")) == [("user_rb", 1)]
+
+
+def test_leaderboard_cache_keeps_key_when_only_duration_grows():
+    cache = database._LeaderboardCache(size=3)
+    key = ("db", "qset_duration", None)
+
+    def row(user, session_id, score, duration):
+        return {
+            "user_id": user,
+            "session_id": session_id,
+            "total_score": score,
+            "duration_seconds": duration,
+        }
+
+    cache.store(key, [row("a", 1, 5, 100), row("b", 2, 4, 90), row("c", 3, 3, 80)], cache.version())
+
+    # A wrong answer leaves the score unchanged but extends the duration.
+    cache.apply(key, row("a", 1, 5, 160))
+    entries = cache._entries[key]
+    assert [(e["user_id"], e["duration_seconds"]) for e in entries] == [("a", 160), ("b", 90), ("c", 80)]
+    assert cache.stats()["invalidations"] == 0
+
+    # Dropping to the last slot of a full list could let an uncached user overtake.
+    cache.store(key, [row("a", 1, 5, 160), row("b", 2, 4, 90), row("c", 3, 4, 80)], cache.version())
+    cache.apply(key, row("c", 3, 4, 120))
+    assert key not in cache._entries
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_leaderboard_cache_switches_to_users_faster_session(monkeypatch, tmp_path):
+    _setup_db(monkeypatch, tmp_path)
+    qfile = "qset_switch"
+    slow = database.start_test_session("user_s", qfile)
+    _backdate_summary(slow, 200)
+    database.save_answer(slow, 1, "A", 1, True)
+    fast = database.start_test_session("user_s", qfile)
+    _backdate_summary(fast, 100)
+    database.save_answer(fast, 1, "A", 1, True)
+    assert _ranking(database.get_all_logs_for_leaderboard(qfile)) == _ranking(_uncached_leaderboard(monkeypatch, qfile))
+
+    # Same score, but the cached session is now slower than the other one.
+    _backdate_summary(fast, 300)
+    database.save_answer(fast, 2, "B", 0, False)
+
+    cached = database.get_all_logs_for_leaderboard(qfile)
+    assert _ranking(cached) == _ranking(_uncached_leaderboard(monkeypatch, qfile))
+    assert 199 <= cached[0]["duration_seconds"] <= 210
@@ -1,23 +1,18 @@
-import sys
-from types import SimpleNamespace
-
 import main_view
 
 
 def _capture_learning_objectives_html(monkeypatch):
     captured = {}
 
-    class DummyHTML:
-        def __init__(self, string=None, base_url=None, **kwargs):
-            captured["html"] = string or ""
-            captured["base_url"] = base_url
-            captured["init_kwargs"] = kwargs
-
-        def write_pdf(self, **kwargs):
-            captured["write_kwargs"] = kwargs
-            return b"%PDF-TEST%"
+    def _render_pdf(html, base_url=None, **kwargs):
+        captured["html"] = html or ""
+        captured["base_url"] = base_url
+        captured["write_kwargs"] = kwargs
+        return b"%PDF-TEST%"
 
-    monkeypatch.setitem(sys.modules, "weasyprint", SimpleNamespace(HTML=DummyHTML))
+    monkeypatch.setattr(main_view.pdf_render, "render_pdf", _render_pdf)
+    # Jeder Test soll wirklich rendern, nicht ein Artefakt aus dem Export-Cache bekommen.
+    monkeypatch.setenv("MC_EXPORT_CACHE", "0")
     return captured
 
 
@@ -1,16 +1,19 @@
 import pytest
 
 from helpers.navigation_model import compute_visibility
+from helpers.run_state import start_test_run
 
 
 def base_state():
-    return {
+    state = {
         "test_time_limit": 120,
         "initial_frage_indices": [0, 1, 2, 3],
         "skipped_questions": [],
         "bookmarked_questions": [],
         "jump_to_idx_active": False,
     }
+    start_test_run(state, 4)
+    return state
 
 
 @pytest.mark.parametrize(
@@ -19,7 +22,7 @@ def base_state():
 def test_normal_mode(answered):
     state = base_state()
     if answered:
-        state["frage_0_beantwortet"] = 1
+        state["test_run"].record_answer(0, 1, "A")
     vis = compute_visibility(state, frage_idx=0, remaining_time=90, remaining_questions=3)
     assert vis.mode == "Normal"
     assert vis.options_enabled == (not answered)
@@ -30,7 +33,6 @@ def test_normal_mode(answered):
 
 def test_panic_mode_always_allows_actions():
     state = base_state()
-    state["frage_0_beantwortet"] = None
     vis = compute_visibility(state, frage_idx=0, remaining_time=5, remaining_questions=3)
     assert vis.mode == "Panic"
     assert vis.options_enabled
@@ -42,7 +44,7 @@ def test_panic_mode_always_allows_actions():
 
 def test_panic_mode_keeps_answered_questions_locked():
     state = base_state()
-    state["frage_0_beantwortet"] = 1
+    state["test_run"].record_answer(0, 1, "A")
     vis = compute_visibility(state, frage_idx=0, remaining_time=5, remaining_questions=3)
     assert vis.mode == "Panic"
     assert not vis.options_enabled
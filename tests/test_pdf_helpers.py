@@ -80,10 +80,7 @@ def test_generate_pdf_report_applies_normalization(monkeypatch, tmp_path):
     monkeypatch.setattr(pdf_export, 'calculate_score', lambda answered, qs, mode: (0, 1))
 
     # Ensure a minimal session_state exists
-    try:
-        pdf_export.st.session_state = {}
-    except Exception:
-        pdf_export.st.session_state = {}
+    monkeypatch.setattr(pdf_export.st, 'session_state', {}, raising=False)
 
     # Minimal AppConfig substitute
     app_config = SimpleNamespace(scoring_mode='default')
@@ -162,10 +159,7 @@ def test_generate_pdf_report_renders_block_markdown_in_questions_and_options(mon
     monkeypatch.setattr(pdf_export, "get_answer_for_question", lambda i: None)
     monkeypatch.setattr(pdf_export, "calculate_score", lambda answered, qs, mode: (0, 1))
 
-    try:
-        pdf_export.st.session_state = {}
-    except Exception:
-        pdf_export.st.session_state = {}
+    monkeypatch.setattr(pdf_export.st, "session_state", {}, raising=False)
     pdf_export.st.session_state["selected_questions_file"] = "questions_Markdown_Stress.json"
 
     result = pdf_export.generate_pdf_report(questions, SimpleNamespace(scoring_mode="default"))
@@ -273,3 +267,64 @@ def test_generate_musterloesung_pdf_renders_block_markdown_options(monkeypatch):
     assert '<span class="option-marker">\u2714</span>' in html
     assert "### Markdown-Konventionen" not in html
     assert "| Feld | Status |" not in html
+
+
+def test_generate_musterloesung_pdf_renders_large_sets_in_sections(monkeypatch):
+    questions = [
+        {
+            "question": f"Frage Nummer {i}?",
+            "options": ["ja", "nein"],
+            "answer": 0,
+            "explanation": "Kurz",
+            "weight": 1,
+            "topic": "Abschnitte",
+            "cognitive_level": "Reproduktion",
+            "mini_glossary": [{"term": f"Begriff {i}", "definition": "Erklärung"}],
+        }
+        for i in range(1, 6)
+    ]
+    rendered = {}
+
+    def fake_render_pdfs(documents, base_url=None, on_done=None, **kwargs):
+        rendered["documents"] = documents
+        for done in range(1, len(documents) + 1):
+            on_done(done)
+        return [f"part{i}".encode() for i in range(len(documents))]
+
+    def fake_merge(parts, overlay=None):
+        rendered["merged"] = (parts, overlay)
+        return b"%PDF-MERGED%"
+
+    class OverlayHTML:
+        def __init__(self, string=None, **kwargs):
+            rendered["overlay"] = string
+
+        def write_pdf(self, **kwargs):
+            return b"%PDF-FOOTER%"
+
+    import config
+
+    monkeypatch.setattr(config, "load_questions", lambda *args, **kwargs: None)
+    monkeypatch.setenv("MC_PDF_PARALLEL_MIN_QUESTIONS", "2")
+    monkeypatch.setenv("MC_PDF_PARALLEL_WORKERS", "1")
+    monkeypatch.setattr(pdf_export.pdf_render, "pdf_merge_available", lambda: True)
+    monkeypatch.setattr(pdf_export.pdf_render, "render_pdfs", fake_render_pdfs)
+    monkeypatch.setattr(pdf_export.pdf_render, "pdf_page_count", lambda data: 2)
+    monkeypatch.setattr(pdf_export.pdf_render, "merge_pdfs", fake_merge)
+    monkeypatch.setattr(pdf_export, "HTML", OverlayHTML)
+
+    result = pdf_export.generate_musterloesung_pdf(
+        "questions_Abschnitte.json", questions, SimpleNamespace(scoring_mode="default")
+    )
+
+    assert result == b"%PDF-MERGED%"
+    first, second, glossary = rendered["documents"]
+    assert all("@bottom-center { content: none; }" in doc for doc in rendered["documents"])
+    assert 'class="header"' in first and "Frage Nummer 2?" in first and "Frage Nummer 3?" not in first
+    # Der Trenner vor Frage 3 bleibt am Ende des ersten Abschnitts.
+    assert first.split("</body>")[0].rstrip().endswith('<div class="muster-concept-sep" aria-hidden="true"></div></div>')
+    assert 'class="header"' not in second and "Frage Nummer 3?" in second and "Frage Nummer 5?" in second
+    assert "Begriff 1" in glossary and "Frage Nummer" not in glossary
+    assert rendered["overlay"].count('class="mc-blank-page"') == 6
+    assert "content: none" not in rendered["overlay"]
+    assert rendered["merged"] == ([b"part0", b"part1", b"part2"], b"%PDF-FOOTER%")
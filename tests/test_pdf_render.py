@@ -0,0 +1,127 @@
+import io
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+import pdf_render
+
+
+def _echo_render(html, base_url=None, **options):
+    if html == "crash":
+        os._exit(3)
+    if html == "fail":
+        raise ValueError("kaputt")
+    return f"%PDF {html} {options.get('optimize_images')}".encode()
+
+
+@pytest.fixture
+def fake_weasyprint(monkeypatch):
+    calls = {"css": [], "html": [], "fonts": 0}
+
+    class FontConfiguration:
+        def __init__(self):
+            calls["fonts"] += 1
+
+    class CSS:
+        def __init__(self, string=None, base_url=None, font_config=None, **kwargs):
+            calls["css"].append(string)
+            self.string = string
+            self.font_config = font_config
+
+    class HTML:
+        def __init__(self, string=None, base_url=None):
+            self.string = string
+
+        def write_pdf(self, stylesheets=None, font_config=None, **kwargs):
+            calls["html"].append((self.string, [sheet.string for sheet in stylesheets], font_config, kwargs))
+            return b"%PDF"
+
+    monkeypatch.setitem(sys.modules, "weasyprint", SimpleNamespace(HTML=HTML, CSS=CSS))
+    monkeypatch.setitem(sys.modules, "weasyprint.text.fonts", SimpleNamespace(FontConfiguration=FontConfiguration))
+    monkeypatch.setitem(sys.modules, "weasyprint.css.counters", None)
+    return calls
+
+
+def test_split_stylesheets_keeps_order_and_skips_linked_documents():
+    html = "<html><head><style>a { color: red; }</style><style type='text/css'>b { x: 1; }</style></head><body/></html>"
+    body, sheets = pdf_render.split_stylesheets(html)
+    assert sheets == ["a { color: red; }", "b { x: 1; }"]
+    assert "<style" not in body
+
+    linked = '<head><link rel="stylesheet" href="x.css"><style>a {}</style></head>'
+    assert pdf_render.split_stylesheets(linked) == (linked, [])
+
+
+def test_warm_renderer_compiles_each_stylesheet_once(fake_weasyprint):
+    renderer = pdf_render.WarmRenderer(cache_size=4)
+    doc = "<head><style>{css}</style></head><body>{n}</body>"
+
+    renderer.render(doc.format(css="p { margin: 0; }", n=1), base_url="/tmp", optimize_images=True)
+    renderer.render(doc.format(css="p { margin: 0; }", n=2), base_url="/tmp", optimize_images=True)
+    renderer.render(doc.format(css="h1 { margin: 0; }", n=3), base_url="/tmp")
+
+    assert fake_weasyprint["fonts"] == 1
+    assert fake_weasyprint["css"] == ["p { margin: 0; }", "h1 { margin: 0; }"]
+    body, sheets, font_config, kwargs = fake_weasyprint["html"][1]
+    assert body == "<head></head><body>2</body>"
+    assert sheets == ["p { margin: 0; }"] and font_config is not None
+    assert kwargs == {"optimize_images": True}
+    stats = renderer.stats()
+    assert (stats["rendered"], stats["stylesheet_hits"], stats["stylesheet_misses"]) == (3, 1, 2)
+
+
+def test_render_pdf_stays_in_process_without_app(fake_weasyprint, monkeypatch):
+    monkeypatch.setattr(pdf_render, "_local_renderer", None)
+    monkeypatch.setattr(pdf_render, "_pool", None)
+    assert pdf_render.get_render_pool() is None
+    assert pdf_render.render_pdf("<p>x</p>") == b"%PDF"
+    assert pdf_render.get_render_stats()["local"]["rendered"] == 1
+
+
+def test_pool_renders_in_worker_processes_and_recovers_from_crash():
+    pool = pdf_render.PdfRenderPool(2, render=_echo_render, warm_up=False)
+    try:
+        futures = [pool.submit(f"doc{i}", optimize_images=True) for i in range(6)]
+        assert [f.result(60) for f in futures] == [f"%PDF doc{i} True".encode() for i in range(6)]
+
+        with pytest.raises(pdf_render.PdfRenderError, match="ValueError: kaputt"):
+            pool.render("fail", timeout=60)
+        with pytest.raises(pdf_render.PdfRenderError, match="exitcode=3"):
+            pool.render("crash", timeout=60)
+        # Der ausgefallene Prozess wurde ersetzt.
+        assert pool.render("again", timeout=60) == b"%PDF again None"
+
+        stats = pool.stats()
+        assert (stats["rendered"], stats["failed"], stats["pending"]) == (7, 2, 0)
+        assert stats["pdfs_per_minute"] > 0
+    finally:
+        pool.close()
+
+
+def test_merge_pdfs_appends_parts_and_overlays_pages():
+    pypdf = pytest.importorskip("pypdf")
+
+    def _blank(pages, width=200):
+        writer = pypdf.PdfWriter()
+        for _ in range(pages):
+            writer.add_blank_page(width=width, height=300)
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        return buffer.getvalue()
+
+    merged = pdf_render.merge_pdfs([_blank(2), _blank(1, width=100)], overlay=_blank(3))
+    reader = pypdf.PdfReader(io.BytesIO(merged))
+    assert pdf_render.pdf_page_count(merged) == 3
+    assert [float(page.mediabox.width) for page in reader.pages] == [200, 200, 100]
+
+
+def test_render_pdfs_keeps_input_order_and_reports_progress(monkeypatch):
+    monkeypatch.setattr(pdf_render, "get_render_pool", lambda: None)
+    monkeypatch.setattr(pdf_render, "_render_locally", _echo_render)
+    done = []
+
+    result = pdf_render.render_pdfs(["a", "b", "c"], max_workers=1, on_done=done.append, optimize_images=True)
+    assert result == [b"%PDF a True", b"%PDF b True", b"%PDF c True"]
+    assert done == [1, 2, 3]
@@ -0,0 +1,135 @@
+import json
+import os
+
+import pytest
+
+import config
+import question_catalog
+import user_question_sets
+
+
+@pytest.fixture
+def catalog_dirs(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    user_dir = tmp_path / "data-user"
+    data_dir.mkdir()
+    user_dir.mkdir()
+    core = data_dir / "questions_core.json"
+    core.write_text(
+        json.dumps(
+            {
+                "meta": {"title": "Core", "language": "de"},
+                "questions": [{"question": "Q1", "options": ["a", "b"], "answer": 0, "weight": 1}],
+            }
+        ),
+        encoding="utf-8",
+    )
+    user = user_dir / "upload.json"
+    user.write_text(
+        json.dumps(
+            {
+                "meta": {"title": "Upload", "uploaded_by": "Alice", "uploaded_at": "2026-01-01T10:00:00"},
+                "questions": [
+                    {"question": "U1", "options": ["a", "b"], "answer": 0},
+                    {"question": "U2", "options": ["a", "b"], "answer": 1},
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(config, "get_package_dir", lambda: str(tmp_path))
+    monkeypatch.setattr(user_question_sets, "get_package_dir", lambda: str(tmp_path))
+    monkeypatch.setattr(config, "COMPILED_QUESTIONS_DIR", tmp_path / "compiled")
+    monkeypatch.setattr(question_catalog, "CATALOG_FILE", tmp_path / "var" / "catalog.json")
+    monkeypatch.setattr(question_catalog, "_ENTRIES", None)
+    config.list_question_files.clear()
+    config.load_questions.clear()
+    yield core, user
+    config.list_question_files.clear()
+    config.load_questions.clear()
+
+
+def _forbid_indexing(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("unchanged file was re-indexed")
+
+    monkeypatch.setattr(question_catalog, "_index_core_file", fail)
+    monkeypatch.setattr(question_catalog, "_index_user_file", fail)
+
+
+def test_catalog_indexes_metadata_without_touching_user_files(catalog_dirs):
+    core, user = catalog_dirs
+    user_bytes = user.read_bytes()
+
+    core_entry = question_catalog.get_entry(core.name)
+    assert core_entry.title == "Core"
+    assert core_entry.question_count == 1
+    assert core_entry.languages == ["de"]
+    assert core_entry.difficulty_profile == {"leicht": 1}
+
+    (user_entry,) = question_catalog.get_user_entries()
+    assert user_entry.identifier == user_question_sets._to_identifier(user.name)
+    assert user_entry.question_count == 2
+    assert user_entry.uploaded_by == "Alice"
+    assert user_entry.uploaded_at is not None
+    assert user_entry.label
+    assert user.read_bytes() == user_bytes
+
+    assert config.get_question_counts() == {core.name: 1}
+
+
+def test_catalog_refreshes_only_changed_files(catalog_dirs, monkeypatch):
+    core, user = catalog_dirs
+    question_catalog.refresh_catalog()
+
+    # A fresh process reads the sidecar instead of reloading unchanged sets.
+    monkeypatch.setattr(question_catalog, "_ENTRIES", None)
+    original_user_index = question_catalog._index_user_file
+    _forbid_indexing(monkeypatch)
+    assert len(question_catalog.refresh_catalog()) == 2
+
+    payload = json.loads(user.read_text(encoding="utf-8"))
+    payload["questions"].append({"question": "U3", "options": ["a", "b"], "answer": 0})
+    user.write_text(json.dumps(payload), encoding="utf-8")
+    stat = user.stat()
+    os.utime(user, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+    indexed = []
+
+    def counting(path, stat):
+        indexed.append(path.name)
+        return original_user_index(path, stat)
+
+    monkeypatch.setattr(question_catalog, "_index_user_file", counting)
+    (user_entry,) = question_catalog.get_user_entries()
+    assert indexed == [user.name]
+    assert user_entry.question_count == 3
+
+    user.unlink()
+    assert question_catalog.get_user_entries() == []
+
+
+def test_user_listings_come_from_catalog_and_never_rewrite_uploads(catalog_dirs, monkeypatch):
+    _, user = catalog_dirs
+    pasted = user.with_name("user_x_1.json")
+    pasted.write_text(
+        json.dumps({"meta": {"title": "pasted"}, "questions": [{"question": "P1", "options": ["a", "b"], "answer": 0}]}),
+        encoding="utf-8",
+    )
+    backup = user.with_name("user_x_1_backup_2.json")
+    backup.write_text(pasted.read_text(encoding="utf-8"), encoding="utf-8")
+    before = {path.name: path.read_bytes() for path in (user, pasted)}
+
+    question_catalog.refresh_catalog()
+    with monkeypatch.context() as patched:
+        patched.setattr(user_question_sets, "_build_question_set", lambda *a, **k: pytest.fail("listing parsed an upload"))
+        entries = user_question_sets.list_user_question_entries()
+    assert [entry.filename for entry in entries] == ["upload.json", "user_x_1.json"]
+    loaded = user_question_sets.get_user_question_set("user::upload.json").question_set
+    assert entries[0].get_test_duration_minutes(60) == loaded.get_test_duration_minutes(60)
+
+    info = user_question_sets.get_user_question_set("user::user_x_1.json")
+    assert info is not None and len(info.question_set) == 1
+    assert user_question_sets.get_user_question_set("user::../data/questions_core.json") is None
+    user_question_sets.list_user_question_sets()
+    assert {path.name: path.read_bytes() for path in (user, pasted)} == before
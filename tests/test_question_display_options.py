@@ -3,6 +3,7 @@ import types
 
 import main_view as mv
 from config import AppConfig
+from helpers.run_state import TestRun
 
 
 class _FakeCtx:
@@ -239,7 +240,7 @@ def test_render_question_view_smoke(monkeypatch):
         {
             "test_started": True,
             "optionen_shuffled": [["Richtig", "Falsch"]],
-            "frage_0_beantwortet": None,
+            "test_run": TestRun(1),
             "answered_indices": [],
             "skipped_questions": [],
             "initial_frage_indices": [0],
@@ -454,7 +455,7 @@ def test_render_question_view_keeps_block_markdown_in_question_and_options(monke
         {
             "test_started": True,
             "optionen_shuffled": [[markdown_option, html_option]],
-            "frage_0_beantwortet": None,
+            "test_run": TestRun(1),
             "answered_indices": [],
             "skipped_questions": [],
             "initial_frage_indices": [0],
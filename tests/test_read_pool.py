@@ -0,0 +1,77 @@
+import sqlite3
+import threading
+
+import pytest
+
+import database
+
+
+@pytest.fixture
+def pooled_db(monkeypatch, tmp_path):
+    db_file = str(tmp_path / "mc_test_data.db")
+    monkeypatch.setattr(database, "DATABASE_FILE", db_file)
+    monkeypatch.setenv("MC_DB_READ_POOL_SIZE", "2")
+    database.init_database()
+    yield db_file
+    database.close_read_pool()
+
+
+def test_read_connections_are_read_only_and_reused(pooled_db):
+    with database.db_read_connection() as conn:
+        assert conn is not database.get_db_connection()
+        assert conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0] == 0
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM answers")
+        first = conn
+
+    with database.db_read_connection() as conn:
+        assert conn is first
+
+    stats = database.get_db_pool_stats()
+    assert stats["open"] == 1
+    assert stats["in_use"] == 0
+    assert stats["acquisitions"] == 2
+
+
+def test_exhausted_pool_waits_for_release(pooled_db):
+    release = threading.Event()
+    acquired = threading.Barrier(3)
+
+    def hold():
+        with database.db_read_connection():
+            acquired.wait()
+            release.wait(5)
+
+    holders = [threading.Thread(target=hold) for _ in range(2)]
+    for thread in holders:
+        thread.start()
+    acquired.wait()
+    assert database.get_db_pool_stats()["in_use"] == 2
+
+    threading.Timer(0.05, release.set).start()
+    with database.db_read_connection() as conn:
+        assert conn.execute("SELECT 1").fetchone()[0] == 1
+    for thread in holders:
+        thread.join()
+
+    stats = database.get_db_pool_stats()
+    assert stats["waits"] == 1
+    assert stats["wait_seconds_max"] > 0
+    assert stats["max_in_use"] == 2
+    assert stats["fallbacks"] == 0
+
+
+def test_with_db_retry_counts_lock_retries(pooled_db, monkeypatch):
+    monkeypatch.setattr(database.time, "sleep", lambda _s: None)
+    attempts = []
+
+    @database.with_db_retry
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise sqlite3.OperationalError("database is locked")
+        return True
+
+    before = database.get_db_pool_stats()["lock_retries"]
+    assert flaky() is True
+    assert database.get_db_pool_stats()["lock_retries"] - before == 2
@@ -63,3 +63,128 @@ def test_recompute_session_summary_uses_best_per_question(monkeypatch, tmp_path)
     assert correct_count == 2
     # Since we monkeypatched questions to have 2 * weight(1) => max_points == 2 -> percent == 100
     assert int(round(percent)) == 100
+
+
+def test_save_answer_maintains_summary_incrementally(monkeypatch, tmp_path):
+    db_file = str(tmp_path / "mc_test_data.db")
+    monkeypatch.setattr(database, "DATABASE_FILE", db_file)
+    database.init_database()
+
+    def fake_load_questions(qfile, silent=False):
+        return make_qset(num_questions=4)
+
+    monkeypatch.setattr(config, "load_questions", fake_load_questions)
+
+    session_id = database.start_test_session("user_incr", "qset_incr")
+    assert session_id is not None
+
+    conn = database.get_db_connection()
+
+    def summary_row():
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT total_points, max_points, correct_count, percent, answers_count, end_time, duration_seconds "
+            "FROM test_session_summaries WHERE session_id = ?",
+            (session_id,),
+        )
+        return cur.fetchone()
+
+    # The session start creates the row with the set metadata ...
+    row = summary_row()
+    assert (row["answers_count"], row["total_points"], row["max_points"]) == (0, 0, 4)
+    # A started session without answers is not on the leaderboard yet.
+    assert database.get_all_logs_for_leaderboard("qset_incr") == []
+
+    # ... so saving answers never loads the question set again.
+    def fail_load_questions(qfile, silent=False):
+        raise AssertionError("load_questions on the answer path")
+
+    monkeypatch.setattr(config, "load_questions", fail_load_questions)
+
+    database.save_answer(session_id, 1, "A", 1, True)
+    row = summary_row()
+    assert row["answers_count"] == 1
+    assert row["max_points"] == 4
+
+    database.save_answer(session_id, 2, "B", 0, False)
+    database.save_answer(session_id, 2, "B (fixed)", 1, True)
+    database.save_answer(session_id, 3, "C", 0, False)
+
+    row = summary_row()
+    assert row["total_points"] == 2
+    assert row["correct_count"] == 2
+    assert row["answers_count"] == 3
+    assert int(round(row["percent"])) == 50
+    assert row["end_time"] is not None
+    assert row["duration_seconds"] is not None
+
+    # The incremental values match a full recompute (repair tool)
+    monkeypatch.setattr(config, "load_questions", fake_load_questions)
+    incremental = dict(row)
+    assert database.recompute_session_summary(session_id)
+    recomputed = dict(summary_row())
+    for key in ("total_points", "correct_count", "answers_count", "max_points", "end_time"):
+        assert incremental[key] == recomputed[key]
+    assert abs(incremental["duration_seconds"] - recomputed["duration_seconds"]) <= 1
+
+    leaderboard = database.get_all_logs_for_leaderboard("qset_incr")
+    assert [r["total_score"] for r in leaderboard] == [2]
+
+
+def test_ensure_session_summary_repairs_legacy_rows(monkeypatch, tmp_path):
+    db_file = str(tmp_path / "mc_test_data.db")
+    monkeypatch.setattr(database, "DATABASE_FILE", db_file)
+    database.init_database()
+
+    monkeypatch.setattr(config, "load_questions", lambda qfile, silent=False: make_qset(num_questions=2))
+
+    session_id = database.start_test_session("user_legacy", "qset_legacy")
+    database.save_answer(session_id, 1, "A", 1, True)
+    conn = database.get_db_connection()
+    # Simulate a snapshot written before incremental summaries existed
+    with conn:
+        conn.execute(
+            "UPDATE test_session_summaries SET answers_count = NULL, max_points = NULL, total_points = 0 "
+            "WHERE session_id = ?",
+            (session_id,),
+        )
+
+    database.save_answer(session_id, 2, "B", 0, False)
+    cur = conn.cursor()
+    cur.execute("SELECT total_points, max_points, answers_count FROM test_session_summaries WHERE session_id = ?", (session_id,))
+    row = cur.fetchone()
+    assert row["total_points"] == 1
+    assert row["answers_count"] == 2
+    assert row["max_points"] is None
+
+    assert database.ensure_session_summary(session_id)
+    cur.execute("SELECT total_points, max_points, percent FROM test_session_summaries WHERE session_id = ?", (session_id,))
+    row = cur.fetchone()
+    assert row["max_points"] == 2
+    assert int(round(row["percent"])) == 50
+
+
+def test_recompute_keeps_answers_saved_during_the_recompute(monkeypatch, tmp_path):
+    db_file = str(tmp_path / "mc_test_data.db")
+    monkeypatch.setattr(database, "DATABASE_FILE", db_file)
+    database.init_database()
+    monkeypatch.setattr(config, "load_questions", lambda qfile, silent=False: make_qset(num_questions=3))
+
+    session_id = database.start_test_session("user_race", "qset_race")
+    database.save_answer(session_id, 1, "A", 1, True)
+
+    # An answer arrives while the recompute is resolving the set metadata.
+    compute_metadata = database._compute_summary_metadata
+
+    def metadata_with_concurrent_answer(questions_file, tempo):
+        database.save_answer(session_id, 2, "B", 1, True)
+        return compute_metadata(questions_file, tempo)
+
+    monkeypatch.setattr(database, "_compute_summary_metadata", metadata_with_concurrent_answer)
+    assert database.recompute_session_summary(session_id)
+
+    row = database.get_db_connection().execute(
+        "SELECT total_points, correct_count, answers_count, max_points FROM test_session_summaries WHERE session_id = ?",
+        (session_id,),
+    ).fetchone()
+    assert (row["total_points"], row["correct_count"], row["answers_count"], row["max_points"]) == (2, 2, 2, 3)
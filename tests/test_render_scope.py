@@ -0,0 +1,125 @@
+import json
+
+import pytest
+
+import render_scope
+
+
+class RerunException(Exception):
+    """Stands in for Streamlit's exception; matched by class name."""
+
+
+class _Runtime:
+    def __init__(self, exists):
+        self._exists = exists
+
+    def exists(self):
+        return self._exists
+
+
+class _FakeStreamlit:
+    def __init__(self, runtime=True):
+        self.session_state = {}
+        self.runtime = _Runtime(runtime)
+        self.fragments = []
+        self.reruns = []
+
+    def fragment(self, func):
+        self.fragments.append(func.__qualname__)
+        return func
+
+    def rerun(self, scope="app"):
+        self.reruns.append(scope)
+
+
+@pytest.fixture
+def fake_st(monkeypatch):
+    fake = _FakeStreamlit()
+    monkeypatch.setattr(render_scope, "st", fake)
+    monkeypatch.delenv("MC_FRAGMENTS", raising=False)
+    monkeypatch.delenv("MC_RENDER_PROFILE_FILE", raising=False)
+    return fake
+
+
+def _answer_area(seen):
+    seen.append(render_scope.in_fragment_rerun())
+    render_scope.rerun_fragment()
+    return "done"
+
+
+def test_runs_directly_without_runtime_or_when_disabled(fake_st, monkeypatch):
+    fake_st.runtime = _Runtime(False)
+    assert render_scope.run_fragment("answer", _answer_area, []) == "done"
+    assert fake_st.fragments == []
+
+    fake_st.runtime = _Runtime(True)
+    monkeypatch.setenv("MC_FRAGMENTS", "0")
+    assert render_scope.run_fragment("answer", _answer_area, []) == "done"
+    assert fake_st.fragments == []
+    assert fake_st.reruns == ["app", "app"]
+
+
+def test_fragment_rerun_scope_depends_on_full_app_run(fake_st):
+    seen = []
+    with render_scope.measure_app_run():
+        render_scope.run_fragment("answer", _answer_area, seen)
+    render_scope.run_fragment("answer", _answer_area, seen)
+
+    assert fake_st.fragments == ["_answer_area", "_answer_area"]
+    assert seen == [False, True]
+    assert fake_st.reruns == ["app", "fragment"]
+    assert not render_scope.in_fragment_rerun()
+
+
+def test_profile_merges_rerun_chains_into_one_interaction(fake_st, tmp_path, monkeypatch):
+    profile = tmp_path / "profile.jsonl"
+    monkeypatch.setenv("MC_RENDER_PROFILE_FILE", str(profile))
+
+    def submit():
+        raise RerunException()
+
+    with pytest.raises(RerunException):
+        render_scope.run_fragment("answer", submit)
+    with render_scope.measure_app_run():
+        pass
+    render_scope.run_fragment("answer", lambda: None)
+
+    rows = [json.loads(line) for line in profile.read_text(encoding="utf-8").splitlines()]
+    assert [(row["kind"], row["runs"]) for row in rows] == [("fragment:answer", 2), ("fragment:answer", 1)]
+    assert all(row["fragments"] is True for row in rows)
+    assert render_scope._CHAIN_KEY not in fake_st.session_state
+
+
+class _FakeMsg:
+    def __init__(self, size):
+        self._size = size
+
+    def ByteSize(self):
+        return self._size
+
+
+class _FakeCtx:
+    def __init__(self):
+        self.sent = []
+        self._enqueue = self.sent.append
+
+
+def test_profile_counts_delta_bytes_per_interaction(fake_st, tmp_path, monkeypatch):
+    profile = tmp_path / "profile.jsonl"
+    monkeypatch.setenv("MC_RENDER_PROFILE_FILE", str(profile))
+    ctx = _FakeCtx()
+    monkeypatch.setattr(render_scope, "_script_run_ctx", lambda: ctx)
+    original_enqueue = ctx._enqueue
+
+    with render_scope.measure_app_run():
+        ctx._enqueue(_FakeMsg(1200))
+        ctx._enqueue(_FakeMsg(300))
+    render_scope.run_fragment("answer", lambda: ctx._enqueue(_FakeMsg(80)))
+
+    rows = [json.loads(line) for line in profile.read_text(encoding="utf-8").splitlines()]
+    assert [(row["kind"], row["delta_bytes"], row["delta_msgs"]) for row in rows] == [
+        ("app", 1500, 2),
+        ("fragment:answer", 80, 1),
+    ]
+    assert len(ctx.sent) == 3
+    assert ctx._enqueue == original_enqueue
@@ -0,0 +1,54 @@
+from helpers.run_state import TestRun, get_test_run, start_test_run
+
+
+def test_progress_counters_follow_answers_and_order():
+    state = {}
+    run = start_test_run(state, 4, [2, 0, 3, 1])
+
+    assert get_test_run(state) is run
+    assert (run.answered, run.remaining, run.next_unanswered()) == (0, 4, 2)
+
+    run.record_answer(2, 1, "A")
+    run.record_answer(2, 0, "B")  # erneute Antwort zählt nicht doppelt
+    assert (run.answered, run.remaining, run.next_unanswered()) == (1, 3, 0)
+
+    run.defer(0)
+    assert run.order == [2, 3, 1, 0]
+    assert run.next_unanswered() == 3
+    run.bring_to_front(1)
+    assert run.next_unanswered() == 1
+
+    for idx, points in ((0, -1), (1, 2), (3, 0)):
+        run.record_answer(idx, points, "x")
+    assert run.is_finished() and run.next_unanswered() is None
+    assert run.points_list() == [-1, 2, 0, 0]
+    assert run.points_list(5)[-1] is None
+
+    run.clear_answer(1)
+    assert (run.answered, run.next_unanswered(), run.answer(1)) == (3, 1, None)
+
+
+def test_flags_confidence_and_timestamps():
+    run = TestRun(2)
+    run.set_confidence(0, "sure")
+    run.set_explanation_visible(1, True)
+    run.set_shown_at(0, 12.5)
+
+    assert run.confidence(0) == "sure" and run.confidence(1) is None
+    assert run.explanation_visible(1) and run.any_explanation_visible()
+    assert run.shown_at(0) == 12.5 and run.explanation_shown_at(0) is None
+
+    run.set_shown_at(0, None)
+    run.set_explanation_visible(1, False)
+    assert run.shown_at(0) is None and not run.any_explanation_visible()
+
+
+def test_missing_run_behaves_like_missing_keys():
+    run = get_test_run({})
+
+    assert len(run) == 0
+    assert run.points(3) is None and not run.is_answered(3)
+    assert not run.explanation_visible(-1)
+    assert run.next_unanswered() is None
+    run.set_explanation_visible(3, True)
+    assert not run.any_explanation_visible()
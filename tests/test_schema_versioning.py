@@ -0,0 +1,69 @@
+import sqlite3
+
+import pytest
+
+import database
+
+
+@pytest.fixture
+def db_file(monkeypatch, tmp_path):
+    path = str(tmp_path / "mc_test_data.db")
+    monkeypatch.setattr(database, "DATABASE_FILE", path)
+    return path
+
+
+def _user_version(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def test_fresh_database_is_bootstrapped_once(db_file, monkeypatch):
+    database.init_database()
+    assert _user_version(db_file) == database.SCHEMA_VERSION
+
+    conn = database.get_db_connection()
+    tables = {r["name"] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert {"users", "test_sessions", "answers", "test_session_summaries"} <= tables
+
+    def fail(_conn):
+        raise AssertionError("schema was checked again on rerun")
+
+    monkeypatch.setattr(database, "_apply_schema_migrations", fail)
+    monkeypatch.setattr(database, "get_db_connection", fail)
+    skipped = database.get_schema_bootstrap_stats()["skipped"]
+    database.init_database()
+    assert database.get_schema_bootstrap_stats()["skipped"] == skipped + 1
+
+
+def test_legacy_database_without_user_version_is_migrated(db_file):
+    with sqlite3.connect(db_file) as conn:
+        conn.execute(
+            "CREATE TABLE test_sessions (session_id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " user_id TEXT NOT NULL, questions_file TEXT NOT NULL, start_time TIMESTAMP)"
+        )
+        conn.execute("INSERT INTO test_sessions (user_id, questions_file) VALUES ('u', 'q')")
+
+    database.init_database()
+
+    conn = database.get_db_connection()
+    cols = {r["name"] for r in conn.execute("PRAGMA table_info(test_sessions)")}
+    assert {"tempo", "mode"} <= cols
+    assert conn.execute("SELECT mode FROM test_sessions").fetchone()["mode"] == "exam"
+    assert _user_version(db_file) == database.SCHEMA_VERSION
+    assert database.get_schema_bootstrap_stats()["applied"] == [v for v, _n, _f in database._SCHEMA_MIGRATIONS]
+
+
+def test_only_pending_migrations_run(db_file, monkeypatch):
+    database.init_database()
+    ran = []
+    migrations = database._SCHEMA_MIGRATIONS + (
+        (database.SCHEMA_VERSION + 1, "test column", lambda conn: ran.append("new") or conn.execute("ALTER TABLE users ADD COLUMN note TEXT")),
+    )
+    monkeypatch.setattr(database, "_SCHEMA_MIGRATIONS", migrations)
+    monkeypatch.setattr(database, "SCHEMA_VERSION", migrations[-1][0])
+    monkeypatch.setattr(database, "_SCHEMA_READY", set())
+
+    database.init_database()
+    assert ran == ["new"]
+    assert _user_version(db_file) == migrations[-1][0]
+    assert database.get_schema_bootstrap_stats()["applied"] == [migrations[-1][0]]
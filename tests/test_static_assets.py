@@ -0,0 +1,52 @@
+import pytest
+
+import static_assets
+
+
+@pytest.fixture
+def assets(tmp_path, monkeypatch):
+    source_dir = tmp_path / "assets"
+    source_dir.mkdir()
+    (source_dir / "view.css").write_text(".mc-a { color: red; }\n", encoding="utf-8")
+    (source_dir / "sync.js").write_text("window.__mcSync = true;\n", encoding="utf-8")
+    monkeypatch.setattr(static_assets, "ASSET_DIR", source_dir)
+    monkeypatch.setattr(static_assets, "BUILD_DIR", tmp_path / "static" / "build")
+    static_assets.reset_assets()
+    yield source_dir
+    static_assets.reset_assets()
+
+
+def test_published_file_name_follows_content(assets, monkeypatch):
+    monkeypatch.setattr(static_assets, "static_assets_enabled", lambda: True)
+
+    url = static_assets.asset_url("view.css")
+    assert url.startswith("app/static/build/view.") and url.endswith(".css")
+    published = static_assets.BUILD_DIR / url.rsplit("/", 1)[1]
+    assert published.read_text(encoding="utf-8") == ".mc-a { color: red; }\n"
+    assert static_assets.stylesheet_html("view.css") == f'<style>@import url("{url}");</style>'
+
+    (assets / "view.css").write_text(".mc-a { color: blue; }\n", encoding="utf-8")
+    static_assets.reset_assets()
+    new_url = static_assets.asset_url("view.css")
+    assert new_url != url
+    assert [p.name for p in static_assets.BUILD_DIR.glob("view.*.css")] == [new_url.rsplit("/", 1)[1]]
+
+
+def test_inline_fallback_without_static_serving(assets, monkeypatch):
+    monkeypatch.setenv("MC_STATIC_ASSETS", "0")
+    state = {}
+
+    assert static_assets.stylesheet_html("view.css") == "<style>\n.mc-a { color: red; }\n</style>"
+    assert "window.__mcSync = true;" in static_assets.script_html("sync.js", state)
+    assert static_assets.script_html("sync.js", state) is None
+    assert not static_assets.BUILD_DIR.exists()
+
+
+def test_script_loader_is_sent_on_every_call(assets, monkeypatch):
+    monkeypatch.setattr(static_assets, "static_assets_enabled", lambda: True)
+    state = {}
+
+    first = static_assets.script_html("sync.js", state)
+    assert first == static_assets.script_html("sync.js", state)
+    assert static_assets.asset_url("sync.js") in first
+    assert "window.__mcSync" not in first
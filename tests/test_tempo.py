@@ -98,7 +98,8 @@ def test_initialize_session_state_defaults_to_ascending_difficulty():
 
         initialize_session_state(qs, app_config=None)
 
-        assert st.session_state.frage_indices == [1, 2, 0]
+        assert st.session_state.test_run.order == [1, 2, 0]
+        assert st.session_state.initial_frage_indices == [1, 2, 0]
 
 
 def test_start_test_session_persists_tempo():
@@ -64,6 +64,8 @@ def test_release_unreserved_pseudonyms_deletes_temp_sets(monkeypatch, tmp_path):
     conn = database.get_db_connection()
     old_time = (datetime.now(timezone.utc) - timedelta(hours=48)).isoformat()
     conn.execute("UPDATE test_sessions SET start_time = ? WHERE session_id = ?", (old_time, session_id))
+    # start_test_session legt die Summary-Zeile mit derselben Startzeit an.
+    conn.execute("UPDATE test_session_summaries SET start_time = ? WHERE session_id = ?", (old_time, session_id))
     conn.commit()
 
     deleted_users = database.release_unreserved_pseudonyms()
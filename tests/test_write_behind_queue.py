@@ -0,0 +1,117 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import database
+
+
+def _fresh_db(monkeypatch, tmp_path):
+    db_file = str(tmp_path / "mc_test_data.db")
+    monkeypatch.setattr(database, "DATABASE_FILE", db_file)
+    try:
+        database.get_db_connection.clear()
+    except Exception:
+        pass
+    database.init_database()
+    return db_file
+
+
+def _enable_write_behind(monkeypatch, interval_ms: str = "20"):
+    monkeypatch.setenv("MC_DB_WRITE_BEHIND", "1")
+    monkeypatch.setenv("MC_DB_WRITE_BEHIND_INTERVAL_MS", interval_ms)
+    database.shutdown_write_queue()
+
+
+def test_write_behind_batches_parallel_answers(monkeypatch, tmp_path):
+    _fresh_db(monkeypatch, tmp_path)
+    _enable_write_behind(monkeypatch)
+    session_id = database.start_test_session("wb_user", "qset_wb")
+    assert session_id is not None
+
+    def write_answer(question_nr: int):
+        return database.save_answer(session_id, question_nr, f"Option {question_nr}", 1, True)
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(write_answer, range(1, 65)))
+
+    # save_answer only returns after the group commit acknowledged the write
+    assert all(results)
+    cur = database.get_db_connection().cursor()
+    cur.execute("SELECT COUNT(*) AS c FROM answers WHERE session_id = ?", (session_id,))
+    assert int(cur.fetchone()["c"]) == 64
+
+    stats = database.get_write_queue_stats()
+    assert stats["enabled"] is True
+    assert stats["committed"] >= 64
+    assert stats["batches"] < 64
+    database.shutdown_write_queue()
+
+
+def test_write_behind_future_and_upsert_semantics(monkeypatch, tmp_path):
+    _fresh_db(monkeypatch, tmp_path)
+    _enable_write_behind(monkeypatch)
+    session_id = database.start_test_session("wb_future", "qset_wb")
+
+    first = database.save_answer_async(session_id, 1, "A", 0, False)
+    second = database.save_answer_async(session_id, 1, "A fixed", 1, True)
+    assert first.result(timeout=5) is True
+    assert second.result(timeout=5) is True
+    database.update_bookmarks(session_id, [1, 3])
+    database.add_feedback(session_id, 1, ["Tippfehler"])
+    assert database.flush_write_queue()
+
+    cur = database.get_db_connection().cursor()
+    cur.execute("SELECT COUNT(*) AS c, MAX(points) AS p FROM answers WHERE session_id = ? AND question_nr = 1", (session_id,))
+    row = cur.fetchone()
+    assert int(row["c"]) == 1
+    assert int(row["p"]) == 1
+    cur.execute("SELECT question_nr FROM bookmarks WHERE session_id = ? ORDER BY question_nr", (session_id,))
+    assert [r["question_nr"] for r in cur.fetchall()] == [1, 3]
+    cur.execute("SELECT COUNT(*) AS c FROM feedback WHERE session_id = ?", (session_id,))
+    assert int(cur.fetchone()["c"]) == 1
+    database.shutdown_write_queue()
+
+
+def test_write_behind_isolates_failing_write(monkeypatch, tmp_path):
+    _fresh_db(monkeypatch, tmp_path)
+    # Long interval so both writes land in the same batch
+    _enable_write_behind(monkeypatch, interval_ms="200")
+    session_id = database.start_test_session("wb_fail", "qset_wb")
+
+    bad = database.save_answer_async(session_id, 1, None, 1, True)  # violates NOT NULL
+    good = database.save_answer_async(session_id, 2, "B", 1, True)
+
+    assert good.result(timeout=5) is True
+    assert isinstance(bad.exception(timeout=5), database.sqlite3.IntegrityError)
+    cur = database.get_db_connection().cursor()
+    cur.execute("SELECT question_nr FROM answers WHERE session_id = ?", (session_id,))
+    assert [r["question_nr"] for r in cur.fetchall()] == [2]
+    database.shutdown_write_queue()
+
+
+def test_save_answer_async_without_write_behind_is_synchronous(monkeypatch, tmp_path):
+    _fresh_db(monkeypatch, tmp_path)
+    monkeypatch.delenv("MC_DB_WRITE_BEHIND", raising=False)
+    session_id = database.start_test_session("wb_sync", "qset_wb")
+
+    future = database.save_answer_async(session_id, 1, "A", 1, True)
+    assert future.done()
+    assert future.result() is True
+    assert database.get_write_queue_stats()["enabled"] is False
+
+
+def test_write_functions_return_the_same_contract_in_both_modes(monkeypatch, tmp_path):
+    _fresh_db(monkeypatch, tmp_path)
+    monkeypatch.delenv("MC_DB_WRITE_BEHIND", raising=False)
+    session_id = database.start_test_session("wb_contract", "qset_wb")
+
+    def write_all(question_nr):
+        return (
+            database.save_answer(session_id, question_nr, "A", 1, True),
+            database.update_bookmarks(session_id, [question_nr]),
+            database.add_feedback(session_id, question_nr, ["Tippfehler"]),
+            database.save_answer(session_id, question_nr, None, 1, True),  # violates NOT NULL
+        )
+
+    assert write_all(1) == (True, True, True, False)
+    _enable_write_behind(monkeypatch)
+    assert write_all(2) == (True, True, True, False)
+    database.shutdown_write_queue()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""Measure schema bootstrap cost: cold start, legacy per-rerun DDL, warm rerun.
+
+Usage: PYTHONPATH=. python tools/benchmark_init_database.py
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.getcwd())
+
+import database
+
+N = int(os.getenv('BENCH_INIT_N', '200'))
+
+
+def _timed(func, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return samples
+
+
+def _report(label, samples):
+    print(f'{label:<32} median {statistics.median(samples):8.3f} ms   max {max(samples):8.3f} ms')
+
+
+with tempfile.TemporaryDirectory(prefix='mc_bench_db_') as tmp:
+    database.DATABASE_FILE = os.path.join(tmp, 'bench.db')
+
+    _report('init_database (cold)', _timed(database.init_database, 1))
+    print(f"  applied migrations: {database.get_schema_bootstrap_stats()['applied']}")
+
+    # Previous behaviour: full create_tables + mode probes on every rerun.
+    _report('create_tables (legacy rerun)', _timed(database.create_tables, N))
+    _report('init_database (warm rerun)', _timed(database.init_database, N))
+    print(f"  stats: {database.get_schema_bootstrap_stats()}")
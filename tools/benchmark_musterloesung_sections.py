@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Musterlösung am Stück vs. in parallel gerenderten Abschnitten.
+
+Nimmt die ``--sets`` größten Fragensets aus ``data/`` und erzeugt je Set die
+Musterlösung ``--rounds`` Mal in beiden Modi:
+
+- ``single``: ein Dokument (``MC_PDF_PARALLEL_MIN_QUESTIONS=0``),
+- ``sections``: Abschnitte an Fragegrenzen über ``--workers`` Prozesse,
+  danach zusammengeführt und mit durchgehender Fußzeile überlagert.
+
+Ausgegeben werden Dauer und Seitenzahl je Modus; abweichende Seitenzahlen
+werden markiert. Der erste Durchlauf jedes Sets (Formeln, Fonts) wird nicht
+mitgemessen.
+
+Usage:
+    python tools/benchmark_musterloesung_sections.py [--sets 3] [--rounds 3] [--workers 4]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import pdf_export  # noqa: E402
+import pdf_render  # noqa: E402
+from config import AppConfig  # noqa: E402
+
+
+def _largest_sets(count):
+    sets = []
+    for path in (ROOT / 'data').glob('questions_*.json'):
+        try:
+            questions = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            continue
+        if isinstance(questions, dict):
+            questions = questions.get('questions', [])
+        sets.append((len(questions), path.name, questions))
+    sets.sort(key=lambda item: item[0], reverse=True)
+    return sets[:count]
+
+
+def _render(q_file, questions, app_config, parallel):
+    os.environ['MC_PDF_PARALLEL_MIN_QUESTIONS'] = '1' if parallel else '0'
+    started = time.perf_counter()
+    pdf_bytes = pdf_export.generate_musterloesung_pdf(q_file, questions, app_config, total_timeout=60.0)
+    return time.perf_counter() - started, pdf_render.pdf_page_count(pdf_bytes)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sets', type=int, default=3, help='Anzahl der größten Fragensets aus data/')
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args(argv)
+
+    if not pdf_render.pdf_merge_available():
+        print('pypdf ist nicht installiert – Abschnitte können nicht zusammengeführt werden.')
+        return 1
+    os.environ['MC_PDF_PARALLEL_WORKERS'] = str(args.workers)
+    app_config = AppConfig()
+    sets = _largest_sets(args.sets)
+    if not sets:
+        print('Keine Fragensets in data/ gefunden.')
+        return 1
+
+    for count, q_file, questions in sets:
+        print(f'{q_file} ({count} Fragen, {args.rounds} Runden)')
+        _render(q_file, questions, app_config, parallel=False)  # Aufwärmen
+        pages = {}
+        for label, parallel in (('single', False), ('sections', True)):
+            durations = []
+            for _ in range(args.rounds):
+                duration, pages[label] = _render(q_file, questions, app_config, parallel)
+                durations.append(duration)
+            print(f'  {label:<10} mean {statistics.mean(durations):7.2f} s   min {min(durations):7.2f} s   {pages[label]} Seiten')
+        if pages['single'] != pages['sections']:
+            print(f"  ! Seitenzahl weicht ab: {pages['single']} vs. {pages['sections']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
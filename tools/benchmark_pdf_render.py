@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Latenz und Durchsatz (PDFs/Minute) des PDF-Renderings: kalt, warm, Pool.
+
+Die Dokumente sind die Mini-Glossare der ersten ``--sets`` Fragensets aus
+``data/`` (das HTML wird einmal erzeugt und dann nur noch gerendert) oder
+eigene HTML-Dateien über ``--html``. Jeder Modus rendert dieselben
+Dokumente ``--rounds`` Mal:
+
+- ``cold``: ``HTML(string=...).write_pdf()`` wie bisher, ohne geteilte Fonts
+  und mit jedem Stylesheet neu geparst,
+- ``warm``: `pdf_render.WarmRenderer` im eigenen Prozess,
+- ``pool``: `pdf_render.PdfRenderPool` mit ``--workers`` Prozessen, alle
+  Dokumente gleichzeitig eingereiht (Start und Vorladen nicht mitgemessen).
+
+Usage:
+    python tools/benchmark_pdf_render.py [--sets 3] [--rounds 5] [--workers 2] [--modes cold,warm,pool]
+    python tools/benchmark_pdf_render.py --html exports/report_x.html --rounds 10
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import pdf_render  # noqa: E402
+
+
+def _p95(values):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+
+
+def _glossary_documents(count):
+    """HTML der Mini-Glossare, abgefangen vor dem Rendern."""
+    import pdf_export
+
+    captured = []
+
+    def _capture(html, base_url=None, **kwargs):
+        captured.append((html, base_url))
+        return b''
+
+    original = pdf_render.render_pdf
+    pdf_render.render_pdf = _capture
+    try:
+        for path in sorted((ROOT / 'data').glob('questions_*.json')):
+            if len(captured) >= count:
+                break
+            try:
+                questions = json.loads(path.read_text(encoding='utf-8'))
+                if isinstance(questions, dict):
+                    questions = questions.get('questions', [])
+                pdf_export.generate_mini_glossary_pdf(path.name, questions)
+            except ValueError:
+                continue  # Set ohne Mini-Glossar
+    finally:
+        pdf_render.render_pdf = original
+    return captured
+
+
+def _cold(html, base_url):
+    from weasyprint import HTML
+
+    return HTML(string=html, base_url=base_url).write_pdf(optimize_images=True)
+
+
+def _run_serial(label, documents, rounds, render):
+    durations = []
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for html, base_url in documents:
+            t0 = time.perf_counter()
+            render(html, base_url)
+            durations.append(time.perf_counter() - t0)
+    _report(label, durations, time.perf_counter() - started)
+
+
+def _run_pool(documents, rounds, workers):
+    pool = pdf_render.PdfRenderPool(workers)
+    try:
+        pool.start()
+        deadline = time.time() + 120
+        while pool.ready < workers and time.time() < deadline:
+            time.sleep(0.05)
+        started = time.perf_counter()
+        futures = []
+        for _ in range(rounds):
+            for html, base_url in documents:
+                futures.append((time.perf_counter(), pool.submit(html, base_url=base_url, optimize_images=True)))
+        durations = []
+        for submitted, future in futures:
+            future.result()
+            durations.append(time.perf_counter() - submitted)
+        _report(f'pool ({workers} workers)', durations, time.perf_counter() - started)
+    finally:
+        pool.close()
+
+
+def _report(label, durations, wall):
+    print(
+        f'  {label:<18} n={len(durations):<4} mean {statistics.mean(durations) * 1000:8.1f} ms   '
+        f'p95 {_p95(durations) * 1000:8.1f} ms   {len(durations) / wall * 60:7.1f} PDFs/min'
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sets', type=int, default=3, help='Anzahl Mini-Glossare aus data/')
+    parser.add_argument('--html', action='append', default=[], help='eigene HTML-Datei (mehrfach möglich)')
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--modes', default='cold,warm,pool')
+    args = parser.parse_args(argv)
+
+    if args.html:
+        documents = [(Path(p).read_text(encoding='utf-8'), str(Path(p).resolve())) for p in args.html]
+    else:
+        documents = _glossary_documents(args.sets)
+    if not documents:
+        print('Keine Dokumente gefunden.')
+        return 1
+    modes = [m.strip() for m in args.modes.split(',') if m.strip()]
+    print(f'{len(documents)} Dokument(e) x {args.rounds} Runden')
+
+    if 'cold' in modes:
+        _cold(*documents[0])  # Import von WeasyPrint nicht mitmessen
+        _run_serial('cold', documents, args.rounds, _cold)
+    if 'warm' in modes:
+        renderer = pdf_render.WarmRenderer()
+        renderer.preload()
+        _run_serial('warm', documents, args.rounds,
+                    lambda html, base_url: renderer.render(html, base_url=base_url, optimize_images=True))
+    if 'pool' in modes:
+        _run_pool(documents, args.rounds, args.workers)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
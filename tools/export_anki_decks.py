@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Mehrere Fragensets als ein Anki-Paket mit Deck-Hierarchie exportieren.
+
+Jedes Set wird ein Unterdeck von ``--parent`` (``<parent>::<Set-Titel>``).
+Die Sets werden nacheinander gelesen und direkt in das Paket geschrieben;
+ohne Angabe von Sets werden alle ``questions_*.json`` aus ``data/``
+exportiert.
+
+Usage:
+    python tools/export_anki_decks.py --out exports/mc_test.apkg [--parent MC-Test] [--locale de] [questions_X.json ...]
+"""
+import argparse
+import shutil
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import export_jobs  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('sets', nargs='*', help='Fragensets (Standard: alle aus data/)')
+    parser.add_argument('--out', required=True, help='Zieldatei (.apkg)')
+    parser.add_argument('--parent', default='MC-Test', help='Name des Elterndecks (leer: keine Hierarchie)')
+    parser.add_argument('--locale', default='de')
+    args = parser.parse_args(argv)
+
+    sets = args.sets or sorted(path.name for path in (ROOT / 'data').glob('questions_*.json'))
+    if not sets:
+        print('Keine Fragensets in data/ gefunden.')
+        return 1
+
+    out_path = Path(args.out)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with export_jobs.open_anki_apkg_bulk(sets, args.locale, parent_title=args.parent or None) as package:
+        with open(out_path, 'wb') as target:
+            shutil.copyfileobj(package, target)
+    print(f'{len(sets)} Fragenset(s) -> {out_path} ({out_path.stat().st_size / 1024:.1f} KiB)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
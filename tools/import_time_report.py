@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Import-Zeiten pro Modul für den Kaltstart von app.py.
+
+Startet einen frischen Interpreter mit ``python -X importtime -c "import app"``
+und listet die teuersten Module (kumuliert und eigene Zeit). Mit ``--save``
+wird das Ergebnis als JSON abgelegt; ``--baseline`` vergleicht dagegen und
+endet mit Exit-Code 1, wenn der Gesamtimport um mehr als ``--max-regression-ms``
+langsamer geworden ist.
+
+Usage:
+    python tools/import_time_report.py [--module app] [--top 25] [--project]
+    python tools/import_time_report.py --save var/import_baseline.json
+    python tools/import_time_report.py --baseline var/import_baseline.json --max-regression-ms 100
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def parse_importtime(stderr: str):
+    """Parst die Ausgabe von ``-X importtime`` in Einträge (Modul, eigene/kumulierte µs, Tiefe)."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3:
+            continue
+        try:
+            self_us = int(parts[0].strip())
+            cumulative_us = int(parts[1].strip())
+        except ValueError:
+            continue  # Kopfzeile
+        raw_name = parts[2]
+        name = raw_name.strip()
+        depth = (len(raw_name) - len(raw_name.lstrip(' ')) - 1) // 2
+        entries.append({'module': name, 'self_us': self_us, 'cumulative_us': cumulative_us, 'depth': depth})
+    return entries
+
+
+def _project_modules():
+    names = {p.stem for p in ROOT.glob('*.py')}
+    names.update(p.name for p in ROOT.iterdir() if (p / '__init__.py').exists())
+    return names
+
+
+def run_importtime(module: str):
+    env = dict(os.environ)
+    env.setdefault('STREAMLIT_GLOBAL_SHOW_WARNING_ON_DIRECT_EXECUTION', 'false')
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=str(ROOT),
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        tail = '\n'.join(line for line in proc.stderr.splitlines() if not line.startswith('import time:'))
+        raise SystemExit(f'import {module} failed:\n{tail[-2000:]}')
+    return parse_importtime(proc.stderr)
+
+
+def _print_table(title, rows, key):
+    print(title)
+    for row in rows:
+        print(f"  {row[key] / 1000.0:9.1f} ms  {row['module']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--module', default='app')
+    parser.add_argument('--top', type=int, default=25)
+    parser.add_argument('--project', action='store_true', help='nur Module aus diesem Repository anzeigen')
+    parser.add_argument('--save', help='Ergebnis als JSON speichern')
+    parser.add_argument('--baseline', help='mit gespeichertem JSON vergleichen')
+    parser.add_argument('--max-regression-ms', type=float, default=100.0)
+    args = parser.parse_args(argv)
+
+    entries = run_importtime(args.module)
+    roots = [e for e in entries if e['module'] == args.module]
+    total_us = roots[-1]['cumulative_us'] if roots else sum(e['self_us'] for e in entries)
+
+    shown = entries
+    if args.project:
+        project = _project_modules()
+        shown = [e for e in entries if e['module'].split('.', 1)[0] in project]
+
+    print(f'import {args.module}: {total_us / 1000.0:.1f} ms, {len(entries)} Module')
+    _print_table('Kumuliert:', sorted(shown, key=lambda e: e['cumulative_us'], reverse=True)[:args.top], 'cumulative_us')
+    _print_table('Eigene Zeit:', sorted(shown, key=lambda e: e['self_us'], reverse=True)[:args.top], 'self_us')
+
+    result = {
+        'module': args.module,
+        'total_ms': round(total_us / 1000.0, 1),
+        'modules': {e['module']: round(e['cumulative_us'] / 1000.0, 1) for e in entries},
+    }
+    if args.save:
+        Path(args.save).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.save).write_text(json.dumps(result, indent=2, sort_keys=True), encoding='utf-8')
+        print(f'gespeichert: {args.save}')
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        delta = result['total_ms'] - float(baseline.get('total_ms', 0.0))
+        new_modules = sorted(set(result['modules']) - set(baseline.get('modules', {})))
+        print(f"Baseline {baseline.get('total_ms')} ms -> {result['total_ms']} ms ({delta:+.1f} ms)")
+        if new_modules:
+            print('Neu geladen: ' + ', '.join(new_modules[:20]) + (' ...' if len(new_modules) > 20 else ''))
+        if delta > args.max_regression_ms:
+            print(f'Regression über {args.max_regression_ms:.0f} ms')
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
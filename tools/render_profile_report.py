@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Summarise server CPU and delta payload per interaction recorded via MC_RENDER_PROFILE_FILE.
+
+Record a session once with fragments disabled and once enabled, e.g.
+
+    MC_FRAGMENTS=0 MC_RENDER_PROFILE_FILE=var/render_profile.jsonl streamlit run app.py
+    MC_FRAGMENTS=1 MC_RENDER_PROFILE_FILE=var/render_profile.jsonl streamlit run app.py
+
+and click through the same questions (select an option, answer, bookmark, ...).
+
+Usage: python tools/render_profile_report.py var/render_profile.jsonl [more.jsonl ...]
+"""
+import json
+import statistics
+import sys
+from collections import defaultdict
+
+
+def _load(paths):
+    rows = []
+    for path in paths:
+        with open(path, encoding='utf-8') as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    continue
+    return rows
+
+
+def _p95(values):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+
+
+def _line(label, rows):
+    cpu = [r['cpu_ms'] for r in rows]
+    runs = [r['runs'] for r in rows]
+    # delta_bytes is missing from profiles recorded before it was added.
+    delta = [r['delta_bytes'] for r in rows if 'delta_bytes' in r]
+    delta_text = f'   delta mean {statistics.mean(delta) / 1024.0:7.1f} KiB   p95 {_p95(delta) / 1024.0:7.1f} KiB' if delta else ''
+    print(
+        f'  {label:<26} n={len(rows):<5} runs/interaction {statistics.mean(runs):4.2f}   '
+        f'cpu mean {statistics.mean(cpu):8.2f} ms   median {statistics.median(cpu):8.2f} ms   p95 {_p95(cpu):8.2f} ms'
+        + delta_text
+    )
+
+
+def main(argv):
+    if not argv:
+        print(__doc__)
+        return 2
+    rows = _load(argv)
+    if not rows:
+        print('no samples')
+        return 1
+    by_mode = defaultdict(list)
+    for row in rows:
+        by_mode[bool(row.get('fragments'))].append(row)
+    totals = {}
+    for enabled in (False, True):
+        mode_rows = by_mode.get(enabled)
+        if not mode_rows:
+            continue
+        print(f"MC_FRAGMENTS={'1' if enabled else '0'}")
+        _line('all interactions', mode_rows)
+        by_kind = defaultdict(list)
+        for row in mode_rows:
+            by_kind[row.get('kind', '?')].append(row)
+        for kind in sorted(by_kind):
+            _line(kind, by_kind[kind])
+        totals[enabled] = statistics.mean(r['cpu_ms'] for r in mode_rows)
+    if len(totals) == 2 and totals[True] > 0:
+        print(f'mean cpu per interaction: {totals[False]:.2f} ms -> {totals[True]:.2f} ms '
+              f'({totals[False] / totals[True]:.1f}x)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
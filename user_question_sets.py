@@ -385,64 +385,91 @@ def _iter_user_files() -> Iterable[Path]:
     yield from sorted(directory.glob("*.json"))
 
 
+def _load_user_question_set(path: Path) -> Optional[UserQuestionSetInfo]:
+    """Parse one stored upload; the file itself is never rewritten."""
+    try:
+        with path.open("r", encoding="utf-8") as fh:
+            data = json.load(fh)
+        question_set = _build_question_set(data, path.name, silent=True)
+        # Titel nur für die Anzeige ableiten (wie im Fragenset-Katalog).
+        ensure_meta_title(question_set, path.name)
+        meta = dict(question_set.meta)
+        uploaded_by = meta.get("uploaded_by") if isinstance(meta.get("uploaded_by"), str) else None
+        uploaded_by_hash = meta.get("uploaded_by_hash") if isinstance(meta.get("uploaded_by_hash"), str) else None
+        uploaded_at_raw = meta.get("uploaded_at")
+        uploaded_at: Optional[datetime] = None
+        if isinstance(uploaded_at_raw, str):
+            try:
+                uploaded_at = datetime.fromisoformat(uploaded_at_raw)
+            except ValueError:
+                uploaded_at = None
+
+        identifier = _to_identifier(path.name)
+        question_set.source_filename = identifier
+        return UserQuestionSetInfo(
+            identifier=identifier,
+            filename=path.name,
+            path=path,
+            question_set=question_set,
+            uploaded_by=uploaded_by,
+            uploaded_by_hash=uploaded_by_hash,
+            uploaded_at=uploaded_at,
+        )
+    except Exception:
+        return None
+
+
 def list_user_question_sets() -> list[UserQuestionSetInfo]:
+    """Fully parsed user sets. For listings use `list_user_question_entries`."""
     items: list[UserQuestionSetInfo] = []
     for path in _iter_user_files():
-        try:
-            with path.open("r", encoding="utf-8") as fh:
-                data = json.load(fh)
-            original_title = None
-            if isinstance(data, dict):
-                meta_in = data.get("meta")
-                if isinstance(meta_in, dict):
-                    original_title = meta_in.get("title")
-            question_set = _build_question_set(data, path.name, silent=True)
-            new_title = ensure_meta_title(question_set, path.name)
-            if new_title and (not original_title or (isinstance(original_title, str) and original_title.strip().lower() == "pasted")):
-                try:
-                    if isinstance(data, dict):
-                        meta_in = data.get("meta")
-                        if not isinstance(meta_in, dict):
-                            meta_in = {}
-                        meta_in["title"] = new_title
-                        data["meta"] = meta_in
-                        path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
-                except Exception:
-                    pass
-            meta = dict(question_set.meta)
-            uploaded_by = meta.get("uploaded_by") if isinstance(meta.get("uploaded_by"), str) else None
-            uploaded_by_hash = meta.get("uploaded_by_hash") if isinstance(meta.get("uploaded_by_hash"), str) else None
-            uploaded_at_raw = meta.get("uploaded_at")
-            uploaded_at: Optional[datetime] = None
-            if isinstance(uploaded_at_raw, str):
-                try:
-                    uploaded_at = datetime.fromisoformat(uploaded_at_raw)
-                except ValueError:
-                    uploaded_at = None
+        info = _load_user_question_set(path)
+        if info is not None:
+            items.append(info)
+    return items
 
-            identifier = _to_identifier(path.name)
-            question_set.source_filename = identifier
-            items.append(
-                UserQuestionSetInfo(
-                    identifier=identifier,
-                    filename=path.name,
-                    path=path,
-                    question_set=question_set,
-                    uploaded_by=uploaded_by,
-                    uploaded_by_hash=uploaded_by_hash,
-                    uploaded_at=uploaded_at,
-                )
-            )
+
+def list_user_question_entries() -> list:
+    """Catalog entries (`question_catalog.QuestionSetEntry`) of all user sets, newest first.
+
+    Backup copies are left out. Title, label, question count, languages and
+    upload metadata come from the catalog, so no upload is parsed here.
+    """
+    entries = [
+        entry for entry in _iter_user_entries()
+        if "_backup_" not in entry.identifier and "_pre_overwrite_" not in entry.identifier
+    ]
+
+    def _sort_key(entry) -> float:
+        try:
+            return entry.uploaded_at.timestamp() if entry.uploaded_at else 0.0
         except Exception:
-            continue
-    return items
+            return 0.0
+
+    return sorted(entries, key=_sort_key, reverse=True)
+
+
+def _iter_user_entries():
+    """Metadata-only view of all user sets from the question catalog.
+
+    Cleanup and deletion only need uploader and timestamps, so this avoids
+    parsing and sanitizing every file (and never rewrites them).
+    """
+    from question_catalog import get_user_entries
+
+    return get_user_entries()
 
 
 def get_user_question_set(identifier: str) -> Optional[UserQuestionSetInfo]:
-    for info in list_user_question_sets():
-        if info.identifier == identifier:
-            return info
-    return None
+    if not is_user_question_identifier(identifier):
+        return None
+    filename = _from_identifier(identifier)
+    if not filename or Path(filename).name != filename:
+        return None
+    path = _ensure_user_question_dir() / filename
+    if path.suffix != ".json" or not path.is_file():
+        return None
+    return _load_user_question_set(path)
 
 
 def validate_user_question_file(path: Path) -> QuestionSet:
@@ -479,7 +506,7 @@ def delete_user_question_set(identifier: str) -> None:
 
 
 def _delete_files(predicate) -> None:
-    for info in list_user_question_sets():
+    for info in _iter_user_entries():
         try:
             if predicate(info) and info.path.exists():
                 info.path.unlink()
@@ -508,7 +535,7 @@ def delete_sets_for_user_ids(user_ids: Iterable[str]) -> int:
     hashes.update(ids)
     deleted = 0
 
-    def _matches(info: UserQuestionSetInfo) -> bool:
+    def _matches(info) -> bool:
         try:
             if info.uploaded_by and info.uploaded_by in ids:
                 return True
@@ -518,7 +545,7 @@ def delete_sets_for_user_ids(user_ids: Iterable[str]) -> int:
             return False
         return False
 
-    for info in list_user_question_sets():
+    for info in _iter_user_entries():
         try:
             if _matches(info) and info.path.exists():
                 info.path.unlink()
@@ -540,7 +567,7 @@ def cleanup_stale_user_question_sets(hours: int = 24) -> int:
     now = datetime.now(timezone.utc)
     cutoff = now - timedelta(hours=hours)
 
-    for info in list_user_question_sets():
+    for info in _iter_user_entries():
         try:
             uploaded_at = info.uploaded_at
             # Fallback: use file mtime if no uploaded_at metadata
@@ -593,9 +620,9 @@ def cleanup_stale_user_question_sets(hours: int = 24) -> int:
                         if is_reserved:
                             # Use AppConfig to determine reserved retention days.
                             try:
-                                from config import AppConfig
+                                from config import get_app_config
 
-                                cfg = AppConfig()
+                                cfg = get_app_config()
                                 days = int(getattr(cfg, 'user_qset_reserved_retention_days', 14))
                             except Exception:
                                 days = 14